@@ -29,6 +29,8 @@ class ChatApi {
     await for (final event in client.postStream('/chat/stream', body: body)) {
       if (event.containsKey('chunk')) {
         yield ChatStreamChunk(event['chunk'] as String? ?? '');
+      } else if (event.containsKey('replace')) {
+        yield ChatStreamReplace(event['replace'] as String? ?? '');
       } else if (event.containsKey('error')) {
         yield ChatStreamError(event['error'] as String? ?? '');
       } else if (event['done'] == true) {
@@ -130,6 +132,12 @@ class ChatStreamChunk extends ChatStreamEvent {
   final String text;
 }
 
+/// The final reply differs from the streamed chunks; show [text] instead.
+class ChatStreamReplace extends ChatStreamEvent {
+  ChatStreamReplace(this.text);
+  final String text;
+}
+
 class ChatStreamError extends ChatStreamEvent {
   ChatStreamError(this.msg);
   final String msg;
@@ -619,6 +619,9 @@ class _ChatScreenState extends State<ChatScreen> {
               case ChatStreamChunk(:final text):
                 _currentReply += text;
                 break;
+              case ChatStreamReplace(:final text):
+                _currentReply = text;
+                break;
               case ChatStreamError(:final msg):
                 _currentReply = 'Error: $msg';
                 _loading = false;
@@ -10,14 +10,16 @@ Base Agent for MemScreen Agent System
 Integrates planning, skills, and memory into a unified agent.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 import asyncio
 import json
+import time
 
 from .planner import Planner, Plan, PlanStep
-from .base_skill import BaseSkill, SkillRegistry, SkillResult
+from .base_skill import BaseSkill, SkillRegistry, SkillResult, collect_blocking_calls
 
 
 @dataclass
@@ -28,6 +30,8 @@ class AgentConfig:
     version: str = "1.0.0"
     description: str = "MemScreen AI Agent"
     max_parallel_steps: int = 3
+    max_blocking_workers: int = 4  # threads for blocking skill work
+    step_timeout: Optional[float] = None  # seconds, unless the skill sets its own
     enable_memory: bool = True
     enable_learning: bool = True
 
@@ -63,11 +67,21 @@ class BaseAgent:
 
         # Initialize components
         self.skill_registry = SkillRegistry()
+
+        # Blocking skill and planner work (memory search, LLM calls) runs here, off the event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, self.config.max_blocking_workers),
+            thread_name_prefix="agent-skill",
+        )
         self.planner = Planner(
             llm_client=llm_client,
-            available_skills=self.skill_registry.list_skills()
+            available_skills=self.skill_registry.list_skills(),
+            executor=self._executor,
         )
 
+        # Slot releases of timed-out steps whose blocking calls still run
+        self._overrunning_steps: Set[asyncio.Task] = set()
+
         # Agent state
         self.current_plan: Optional[Plan] = None
         self.execution_history: List[Dict[str, Any]] = []
@@ -84,6 +98,7 @@ class BaseAgent:
         # Inject dependencies
         skill.memory_system = self.memory_system
         skill.llm_client = self.llm_client
+        skill.executor = self._executor
 
         # Register
         self.skill_registry.register(skill)
@@ -144,46 +159,48 @@ class BaseAgent:
 
     async def _execute_plan(self, plan: Plan) -> Dict[str, Any]:
         """
-        Execute a plan step by step.
+        Execute a plan as a dependency graph.
+
+        Each step starts as soon as all of its dependencies have completed,
+        bounded by ``max_parallel_steps`` overall and by the skill's
+        ``max_concurrency``. Steps that exceed their timeout fail; steps
+        whose dependencies never complete stay pending. A timeout cannot
+        stop blocking work already on the executor, so a timed-out step
+        keeps its slots until its ``run_blocking`` calls return.
 
         Args:
             plan: Plan to execute
 
         Returns:
-            Execution results
+            Execution results, with per-step timing (seconds from plan start)
         """
         results = []
         plan.status = "in_progress"
+        plan_start = time.perf_counter()
+        step_slots = asyncio.Semaphore(max(1, self.config.max_parallel_steps))
+        skill_slots: Dict[str, asyncio.Semaphore] = {}
+        running: Dict[asyncio.Task, PlanStep] = {}
 
-        while not plan.is_complete():
-            # Get pending steps (with dependencies met)
-            pending_steps = plan.get_pending_steps()
-
-            if not pending_steps:
-                # No steps ready but plan not complete - circular dependency or error
-                break
-
-            # Execute ready steps (up to max_parallel)
-            for step in pending_steps[:self.config.max_parallel_steps]:
+        def start_ready_steps():
+            for step in plan.get_pending_steps():
                 step.status = "in_progress"
-
-            # Execute in parallel
-            tasks = [
-                self._execute_step(step)
-                for step in pending_steps[:self.config.max_parallel_steps]
-            ]
-
-            step_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Process results
-            for step, result in zip(pending_steps[:self.config.max_parallel_steps], step_results):
+                task = asyncio.create_task(self._run_scheduled_step(step, step_slots, skill_slots, plan_start))
+                running[task] = step
+
+        start_ready_steps()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                step = running.pop(task)
+                result, timing = task.result()
                 if isinstance(result, Exception):
                     step.status = "failed"
                     step.error = str(result)
                     results.append({
                         "step_id": step.step_id,
                         "success": False,
-                        "error": str(result)
+                        "error": str(result),
+                        "timing": timing
                     })
                 else:
                     step.status = "completed"
@@ -192,11 +209,10 @@ class BaseAgent:
                         "step_id": step.step_id,
                         "success": result.success,
                         "data": result.data,
-                        "metadata": result.metadata
+                        "metadata": result.metadata,
+                        "timing": timing
                     })
-
-            # Small delay between batches
-            await asyncio.sleep(0.1)
+            start_ready_steps()
 
         # Update plan status
         if all(s.status == "completed" for s in plan.steps):
@@ -206,11 +222,84 @@ class BaseAgent:
             plan.status = "failed"
             success = False
 
+        results.sort(key=lambda r: r["step_id"])
         return {
             "success": success,
             "results": results,
-            "plan_status": plan.status
+            "plan_status": plan.status,
+            "elapsed": time.perf_counter() - plan_start
+        }
+
+    async def _run_scheduled_step(
+        self,
+        step: PlanStep,
+        step_slots: asyncio.Semaphore,
+        skill_slots: Dict[str, asyncio.Semaphore],
+        plan_start: float
+    ):
+        """
+        Run one step once a plan slot and a slot for its skill are free.
+
+        Returns:
+            (SkillResult or the exception that ended the step, timing dict)
+        """
+        skill = self.skill_registry.get(step.skill_name)
+        limit = getattr(skill, "max_concurrency", None)
+        timeout = getattr(skill, "timeout", None) or self.config.step_timeout
+        if limit and step.skill_name not in skill_slots:
+            skill_slots[step.skill_name] = asyncio.Semaphore(limit)
+        skill_slot = skill_slots.get(step.skill_name)
+
+        slots = [step_slots] + ([skill_slot] if skill_slot is not None else [])
+        ready_at = time.perf_counter()
+        overrunning = []
+        await step_slots.acquire()
+        try:
+            if skill_slot is not None:
+                await skill_slot.acquire()
+        except BaseException:
+            step_slots.release()
+            raise
+        try:
+            started_at = time.perf_counter()
+            with collect_blocking_calls() as calls:
+                try:
+                    result = await asyncio.wait_for(self._execute_step(step), timeout)
+                except asyncio.TimeoutError:
+                    print(f"[Agent] Step {step.step_id} timed out after {timeout}s")
+                    result = TimeoutError(f"Step {step.step_id} timed out after {timeout}s")
+                    overrunning = [f for f in calls if not f.done()]
+                except Exception as e:
+                    result = e
+            finished_at = time.perf_counter()
+        finally:
+            if overrunning:
+                # The step has failed, but its threads are still busy: count
+                # them against the limits until they actually return.
+                release = asyncio.create_task(self._release_when_done(overrunning, slots))
+                self._overrunning_steps.add(release)
+                release.add_done_callback(self._overrunning_steps.discard)
+            else:
+                for slot in slots:
+                    slot.release()
+
+        timing = {
+            "ready": ready_at - plan_start,
+            "started": started_at - plan_start,
+            "finished": finished_at - plan_start,
+            "queued": started_at - ready_at,
+            "duration": finished_at - started_at
         }
+        return result, timing
+
+    @staticmethod
+    async def _release_when_done(calls: List[Future], slots: List[asyncio.Semaphore]):
+        """Release a timed-out step's slots once its blocking calls have returned."""
+        try:
+            await asyncio.wait([asyncio.wrap_future(f) for f in calls])
+        finally:
+            for slot in slots:
+                slot.release()
 
     async def _execute_step(self, step: PlanStep) -> SkillResult:
         """
@@ -316,6 +405,10 @@ class BaseAgent:
 
         return await skill.execute(**kwargs)
 
+    def close(self):
+        """Shut down the executor used for blocking skill work."""
+        self._executor.shutdown(wait=False)
+
     def get_status(self) -> Dict[str, Any]:
         """
         Get current agent status.
@@ -11,9 +11,33 @@ All skills should inherit from BaseSkill and implement the execute method.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Any, Iterator, Optional, List, Set
 from dataclasses import dataclass
 from datetime import datetime
+import asyncio
+import functools
+
+# Executor futures started by ``run_blocking`` in the current plan step
+_blocking_calls: ContextVar[Optional[Set[Future]]] = ContextVar("agent_blocking_calls", default=None)
+
+
+@contextmanager
+def collect_blocking_calls() -> Iterator[Set[Future]]:
+    """
+    Collect the executor futures that ``run_blocking`` starts in this context.
+
+    Tasks created inside the block share the set, so the agent can tell
+    whether a step that timed out still has work running on its threads.
+    """
+    calls: Set[Future] = set()
+    token = _blocking_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _blocking_calls.reset(token)
 
 
 @dataclass
@@ -47,6 +71,8 @@ class BaseSkill(ABC):
     Base class for all skills in the MemScreen Agent system.
 
     Skills are reusable capabilities that an agent can use to accomplish tasks.
+    Blocking work (memory search, LLM requests) must go through
+    ``run_blocking`` so it does not stall the agent's event loop.
     """
 
     # Skill metadata (to be overridden by subclasses)
@@ -55,6 +81,10 @@ class BaseSkill(ABC):
     version: str = "1.0.0"
     parameters: List[SkillParameter] = []
 
+    # Scheduling hints for the agent (None = agent defaults)
+    max_concurrency: Optional[int] = None  # concurrent steps of this skill
+    timeout: Optional[float] = None  # seconds per step (does not interrupt run_blocking work)
+
     def __init__(self, memory_system=None, llm_client=None):
         """
         Initialize the skill.
@@ -65,6 +95,24 @@ class BaseSkill(ABC):
         """
         self.memory_system = memory_system
         self.llm_client = llm_client
+        self.executor: Optional[Executor] = None  # injected by the agent
+
+    async def run_blocking(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking call on the agent's executor and await its result.
+
+        Falls back to the event loop's default executor when the skill is
+        used outside an agent. Cancelling the await (e.g. on a step timeout)
+        does not stop the call; it keeps its worker thread until it returns.
+        """
+        call = functools.partial(func, *args, **kwargs)
+        if self.executor is None:
+            return await asyncio.get_running_loop().run_in_executor(None, call)
+        future = self.executor.submit(call)
+        calls = _blocking_calls.get()
+        if calls is not None:
+            calls.add(future)
+        return await asyncio.wrap_future(future)
 
     @abstractmethod
     async def execute(self, **kwargs) -> SkillResult:
@@ -13,6 +13,8 @@ Breaks down goals into executable steps using LLM.
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
+import asyncio
+from concurrent.futures import Executor
 import json
 import re
 
@@ -92,16 +94,18 @@ class Planner:
     Task planner that breaks down goals into executable steps.
     """
 
-    def __init__(self, llm_client, available_skills: List[str] = None):
+    def __init__(self, llm_client, available_skills: List[str] = None, executor: Optional[Executor] = None):
         """
         Initialize the planner.
 
         Args:
             llm_client: LLM client for generating plans
             available_skills: List of available skill names
+            executor: Executor for the blocking LLM call (the loop's default if None)
         """
         self.llm_client = llm_client
         self.available_skills = available_skills or []
+        self.executor = executor
 
     async def create_plan(self, goal: str, context: Dict[str, Any] = None) -> Plan:
         """
@@ -193,8 +197,12 @@ class Planner:
         """Generate plan using LLM."""
         try:
             if hasattr(self.llm_client, 'generate_response'):
-                response = self.llm_client.generate_response(
-                    messages=[{"role": "user", "content": prompt}]
+                # Blocking request; keep the event loop free while it runs
+                response = await asyncio.get_running_loop().run_in_executor(
+                    self.executor,
+                    lambda: self.llm_client.generate_response(
+                        messages=[{"role": "user", "content": prompt}]
+                    )
                 )
                 return response
             else:
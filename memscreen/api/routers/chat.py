@@ -2,10 +2,7 @@
 
 import asyncio
 import json
-import queue
-import threading
-from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from typing import Any, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
@@ -14,7 +11,40 @@ from pydantic import BaseModel
 from .. import deps
 
 router = APIRouter(prefix="/chat", tags=["chat"])
-_executor = ThreadPoolExecutor(max_workers=2)
+_REPLY_TIMEOUT = 180.0
+
+
+class _LoopChannel:
+    """
+    Per-request bridge from a presenter worker thread to the event loop.
+
+    ``put`` may be called from any thread; items are handed to the loop with
+    ``call_soon_threadsafe`` so the consumer wakes immediately instead of
+    polling. Items put after ``close`` (e.g. the client disconnected) are dropped.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue()
+        self.closed = False
+
+    def put(self, kind: str, payload: Any = None) -> None:
+        if self.closed:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (kind, payload))
+        except RuntimeError:
+            self.closed = True  # event loop already closed
+
+    async def get(self, timeout: float) -> Tuple[str, Any]:
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
 
 
 class ChatMessageBody(BaseModel):
@@ -48,17 +78,17 @@ async def chat_post(body: ChatMessageBody):
     if body.thread_id and not presenter.switch_chat_thread(body.thread_id):
         raise HTTPException(status_code=404, detail=f"Chat thread not found: {body.thread_id}")
 
-    loop = asyncio.get_event_loop()
-    result = [None, None]
-    done = threading.Event()
-
-    def on_done(ai_text: str, error_text: Optional[str]):
-        result[0], result[1] = ai_text, error_text
-        done.set()
-
-    presenter.send_message_sync(body.message, on_done=on_done)
-    await loop.run_in_executor(_executor, lambda: done.wait(180))
-    ai_text, error_text = result[0], result[1]
+    channel = _LoopChannel(asyncio.get_running_loop())
+    presenter.send_message_sync(
+        body.message,
+        on_done=lambda ai_text, error_text: channel.put("done", (ai_text, error_text)),
+    )
+    try:
+        _, (ai_text, error_text) = await channel.get(_REPLY_TIMEOUT)
+    except asyncio.TimeoutError:
+        ai_text, error_text = None, None
+    finally:
+        channel.close()
     if ai_text is None and error_text is None:
         return ChatReplyResponse(reply=None, error="Chat request timed out")
     if error_text:
@@ -68,64 +98,62 @@ async def chat_post(body: ChatMessageBody):
 
 @router.post("/stream")
 async def chat_stream(body: ChatMessageBody):
-    """Stream chat response via SSE."""
+    """
+    Stream chat response via SSE.
+
+    Events are ``{"chunk": text}`` to append, ``{"replace": text}`` when the
+    final reply differs from what was already streamed (drop the streamed
+    text and show this instead), then ``{"done": true, "full": text}`` with
+    the authoritative reply, or ``{"error": message}``.
+    """
     presenter = deps.get_chat_presenter()
     if not presenter:
         raise HTTPException(status_code=503, detail="Chat not available")
     if body.thread_id and not presenter.switch_chat_thread(body.thread_id):
         raise HTTPException(status_code=404, detail=f"Chat thread not found: {body.thread_id}")
 
-    chunk_queue: queue.Queue = queue.Queue()
-    full_response = [None]
-    sentinel = object()
-
-    class StreamView:
-        def on_message_added(self, role: str, content: str):
-            pass
-
-        def on_response_started(self):
-            pass
-
-        def on_response_chunk(self, chunk: str):
-            chunk_queue.put(chunk)
-
-        def on_response_completed(self, full: str):
-            full_response[0] = full
-            chunk_queue.put(sentinel)
-
-    presenter.set_view(StreamView())
+    channel = _LoopChannel(asyncio.get_running_loop())
 
-    def run_stream():
-        def on_done(ai_text: str, error_text: Optional[str]):
-            if error_text:
-                chunk_queue.put({"error": error_text})
-            else:
-                full_response[0] = ai_text
-                chunk_queue.put(ai_text)
-            chunk_queue.put(sentinel)
-
-        presenter.send_message_sync(body.message, on_done=on_done)
-
-    loop = asyncio.get_event_loop()
-    loop.run_in_executor(_executor, run_stream)
+    def on_done(ai_text: str, error_text: Optional[str]):
+        if error_text:
+            channel.put("error", error_text)
+        else:
+            channel.put("done", ai_text)
+
+    # Callbacks are scoped to this request; the shared presenter view is untouched.
+    presenter.send_message_sync(
+        body.message,
+        on_done=on_done,
+        on_chunk=lambda chunk: channel.put("chunk", chunk),
+        on_replace=lambda text: channel.put("replace", text),
+    )
 
     async def event_stream():
-        while True:
-            try:
-                item = chunk_queue.get_nowait()
-            except queue.Empty:
-                if full_response[0] is not None:
+        streamed = False
+        try:
+            while True:
+                try:
+                    kind, payload = await channel.get(_REPLY_TIMEOUT)
+                except asyncio.TimeoutError:
+                    yield _sse({"error": "Chat request timed out"})
+                    break
+                if kind == "chunk":
+                    streamed = True
+                    yield _sse({"chunk": payload})
+                elif kind == "replace":
+                    streamed = True
+                    yield _sse({"replace": payload})
+                elif kind == "error":
+                    yield _sse({"error": payload})
+                    break
+                else:
+                    # Replies without incremental output arrive as a single chunk.
+                    if not streamed:
+                        yield _sse({"chunk": payload})
+                    yield _sse({"done": True, "full": payload})
                     break
-                await asyncio.sleep(0.05)
-                continue
-            if item is sentinel:
-                break
-            if isinstance(item, dict) and "error" in item:
-                yield f"data: {json.dumps({'error': item['error']})}\n\n"
-                break
-            yield f"data: {json.dumps({'chunk': item})}\n\n"
-        if full_response[0] is not None:
-            yield f"data: {json.dumps({'done': True, 'full': full_response[0]})}\n\n"
+        finally:
+            channel.close()
 
     return StreamingResponse(
         event_stream(),
@@ -31,6 +31,7 @@ class RecordingStartBody(BaseModel):
     video_format: Optional[str] = None
     audio_format: Optional[str] = None
     audio_denoise: Optional[bool] = None
+    change_threshold: Optional[float] = None
 
 
 @router.post("/start")
@@ -106,6 +107,12 @@ async def recording_start(body: RecordingStartBody):
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to set audio denoise: {e}")
 
+    if body.change_threshold is not None:
+        try:
+            presenter.set_change_threshold(body.change_threshold)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid change_threshold: {e}")
+
     ok = await run_in_threadpool(
         presenter.start_recording,
         body.duration,
@@ -51,10 +51,19 @@ async def open_permission_settings(area: str = Query(...)):
 
 
 @router.get("/health")
-async def health(include_db: bool = Query(False), include_ollama: bool = Query(False)):
+async def health(
+    include_db: bool = Query(False),
+    include_ollama: bool = Query(False),
+    include_caches: bool = Query(False),
+):
     """Lightweight health check with optional deeper dependency probes."""
     out = {"status": "ok", "mode": "light"}
 
+    if include_caches:
+        from memscreen.cache import get_cache_registry
+
+        out["caches"] = get_cache_registry().stats()
+
     if include_db:
         try:
             from memscreen.config import get_config
@@ -8,24 +8,382 @@
 Intelligent caching system for MemScreen.
 
 This module provides advanced caching with LRU eviction, TTL support,
-and intelligent cache key generation.
+generation-based invalidation and intelligent cache key generation.
+
+Every in-process cache lives in a named namespace of one ``CacheRegistry``.
+The registry splits a global memory budget across its namespaces, so the
+process's total cache footprint is bounded and reported in one place.
 """
 
 import hashlib
+import itertools
 import json
 import logging
+import sys
+import threading
 import time
+import weakref
+import zlib
 from collections import OrderedDict
-from typing import Any, Optional, Dict, List, Callable
+from typing import Any, Optional, Dict, Hashable, Iterable, List, Callable, Tuple
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_BUDGET_MB = 256
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Approximate the bytes held by a cached value.
+
+    Arrays report ``nbytes``; strings, bytes and numbers their object size;
+    containers and plain objects are walked a few levels deep. The estimate
+    only needs to be proportional for budgeting, not exact.
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes + 96
+    size = sys.getsizeof(value, 64)
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None or _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        return size + sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, _depth + 1) for item in value)
+    fields = getattr(value, "__dict__", None)
+    if isinstance(fields, dict):
+        return size + estimate_size(fields, _depth + 1)
+    return size
+
+
+class CacheNamespace:
+    """
+    One named, thread-safe LRU/TTL cache inside a ``CacheRegistry``.
+
+    Entries are bounded by an entry count and by a byte budget assigned by
+    the registry. Lookups, inserts and evictions are O(1): the least
+    recently used entries are popped from the front of an ``OrderedDict``
+    until both bounds hold. Expired entries are dropped when read, evicted
+    like any other cold entry, or removed eagerly by ``sweep``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        weight: float = 1.0,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        """
+        Args:
+            name: Namespace name shown in registry stats
+            max_bytes: Byte budget (normally assigned by the registry)
+            max_entries: Maximum number of entries (None for no count limit)
+            ttl: Default time-to-live in seconds (None for no expiration)
+            weight: Share of the registry budget relative to other namespaces
+            sizeof: Size estimator for values (defaults to ``estimate_size``)
+        """
+        self.name = name
+        self.max_bytes = max(0, int(max_bytes))
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.weight = float(weight)
+        self._sizeof = sizeof or estimate_size
+        # key -> (value, size, expires_at)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value (marking it recently used) or ``default``."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            if item[2] is not None and item[2] <= time.time():
+                self._remove_locked(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value without touching recency or counters."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or (item[2] is not None and item[2] <= time.time()):
+                return default
+            return item[0]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: Optional[int] = None,
+    ) -> bool:
+        """
+        Store a value, evicting least recently used entries to stay in bounds.
+
+        Returns False if the value alone is larger than the namespace budget.
+        """
+        size = int(size if size is not None else self._sizeof(value))
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            if size > self.max_bytes:
+                self.rejected += 1
+                return False
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            self._evict_locked()
+            return True
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            return self._remove_locked(key)
+
+    def _remove_locked(self, key: Hashable) -> Any:
+        value, size, _ = self._entries.pop(key)
+        self._bytes -= size
+        return value
+
+    def _evict_locked(self) -> None:
+        while self._entries and (
+            self._bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def resize(self, max_bytes: Optional[int] = None, max_entries: Optional[int] = None) -> None:
+        """Change the bounds, evicting immediately if the cache no longer fits."""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = max(0, int(max_bytes))
+            if max_entries is not None:
+                self.max_entries = max_entries
+            self._evict_locked()
+
+    def sweep(self, stale: Optional[Callable[[Any], bool]] = None) -> Tuple[int, int]:
+        """
+        Remove expired entries, and entries for which ``stale(value)`` is true.
+
+        Returns:
+            (expired, stale) counts of removed entries
+        """
+        now = time.time()
+        expired = dropped = 0
+        with self._lock:
+            for key, (value, _, expires_at) in list(self._entries.items()):
+                if expires_at is not None and expires_at <= now:
+                    expired += 1
+                elif stale is not None and stale(value):
+                    dropped += 1
+                else:
+                    continue
+                self._remove_locked(key)
+            self.expirations += expired
+        return expired, dropped
+
+    def clear(self, reset_stats: bool = False) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if reset_stats:
+                self._reset_stats()
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rejected": self.rejected,
+            }
+
+
+_MISSING = object()
+
+
+class CacheRegistry:
+    """
+    Owns every cache namespace and splits one memory budget across them.
+
+    Each namespace receives ``budget * weight / total_weight`` bytes; the
+    split is recomputed whenever a namespace is added or the budget changes.
+    Namespaces are held weakly, so a cache owned by a discarded component
+    stops counting once it is garbage collected. Stores that bound
+    themselves (e.g. memory-mapped arrays) can ``register_source`` to be
+    reported alongside the namespaces.
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_CACHE_BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = max(0, int(budget_bytes))
+        self._namespaces: "weakref.WeakValueDictionary[str, CacheNamespace]" = weakref.WeakValueDictionary()
+        self._sources: Dict[str, Callable[[], Optional[Callable[[], Dict[str, Any]]]]] = {}
+        self._lock = threading.Lock()
+
+    def namespace(
+        self,
+        name: str,
+        *,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        weight: float = 1.0,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ) -> CacheNamespace:
+        """Return the namespace called ``name``, creating it on first use."""
+        with self._lock:
+            existing = self._namespaces.get(name)
+            if existing is not None:
+                return existing
+            namespace = CacheNamespace(
+                name, 0, max_entries=max_entries, ttl=ttl, weight=weight, sizeof=sizeof
+            )
+            self._namespaces[name] = namespace
+            self._rebalance_locked()
+            return namespace
+
+    def private_namespace(self, prefix: str, **kwargs) -> CacheNamespace:
+        """Create a namespace owned by one component instance (``prefix:<n>``)."""
+        return self.namespace(f"{prefix}:{next(_anonymous_ids)}", **kwargs)
+
+    def register_source(self, name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Report a self-bounded store (its ``stats()`` dict) next to the namespaces.
+
+        Bound methods are held weakly, so registering does not keep the store alive.
+        """
+        ref = weakref.WeakMethod(stats) if hasattr(stats, "__self__") else (lambda: stats)
+        with self._lock:
+            self._sources[name] = ref
+
+    def unregister_source(self, name: str) -> None:
+        with self._lock:
+            self._sources.pop(name, None)
+
+    def set_budget(self, budget_bytes: int) -> None:
+        with self._lock:
+            self.budget_bytes = max(0, int(budget_bytes))
+            self._rebalance_locked()
+
+    def _rebalance_locked(self) -> None:
+        namespaces = list(self._namespaces.values())
+        total_weight = sum(ns.weight for ns in namespaces) or 1.0
+        for ns in namespaces:
+            ns.resize(max_bytes=int(self.budget_bytes * ns.weight / total_weight))
+
+    def clear(self) -> None:
+        """Drop the entries of every namespace."""
+        with self._lock:
+            namespaces = list(self._namespaces.values())
+        for ns in namespaces:
+            ns.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Budget, total footprint and per-namespace statistics."""
+        with self._lock:
+            namespaces = sorted(self._namespaces.items())
+            sources = sorted(self._sources.items())
+        out: Dict[str, Any] = {
+            "budget_bytes": self.budget_bytes,
+            "bytes": 0,
+            "source_bytes": 0,
+            "namespaces": {},
+            "sources": {},
+        }
+        for name, ns in namespaces:
+            ns_stats = ns.stats()
+            out["namespaces"][name] = ns_stats
+            out["bytes"] += ns_stats["bytes"]
+        for name, ref in sources:
+            stats = ref()
+            if stats is None:
+                self.unregister_source(name)
+                continue
+            try:
+                source_stats = stats()
+            except Exception as e:
+                source_stats = {"error": str(e)}
+            out["sources"][name] = source_stats
+            out["source_bytes"] += int(source_stats.get("bytes", 0) or 0)
+        return out
+
+
+_registry: Optional[CacheRegistry] = None
+_registry_lock = threading.Lock()
+_anonymous_ids = itertools.count(1)
+
+
+def get_cache_registry() -> CacheRegistry:
+    """Process-wide cache registry; the budget comes from the ``cache`` config section."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            budget_mb = DEFAULT_CACHE_BUDGET_MB
+            try:
+                from memscreen.config import get_config
+
+                budget_mb = get_config().cache_budget_mb
+            except Exception as e:
+                logger.debug(f"Using default cache budget: {e}")
+            _registry = CacheRegistry(int(budget_mb * 1024 * 1024))
+        return _registry
+
 
 class CacheEntry:
     """Represents a single cache entry with metadata."""
 
-    def __init__(self, key: str, value: Any, ttl: Optional[float] = None):
+    def __init__(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        generations: Optional[Dict[str, int]] = None,
+    ):
         """
         Initialize a cache entry.
 
@@ -33,6 +391,7 @@ class CacheEntry:
             key: Cache key
             value: Cached value
             ttl: Time to live in seconds (None for no expiration)
+            generations: Scope generations the value was computed under
         """
         self.key = key
         self.value = value
@@ -40,6 +399,7 @@ class CacheEntry:
         self.ttl = ttl
         self.hits = 0
         self.last_access = self.created_at
+        self.generations = generations or {}
 
     def is_expired(self) -> bool:
         """Check if the cache entry has expired."""
@@ -60,28 +420,65 @@ class IntelligentCache:
     Features:
     - LRU eviction when cache is full
     - Per-entry TTL support
+    - Generation-based invalidation by scope
     - Cache statistics
-    - Automatic cleanup of expired entries
+    - Automatic cleanup of expired entries (optionally on a background thread)
+
+    All operations are thread-safe.
+
+    Scopes are plain strings such as ``"user_id=alice"``. An entry stored with
+    scopes remembers their generation counters; ``invalidate(scopes)`` bumps
+    them, which turns every dependent entry into a miss. ``invalidate()``
+    with no scopes bumps the global generation that all entries depend on.
+    Scopes are hashed onto a fixed set of ``GENERATION_BUCKETS`` counters, so
+    invalidating unbounded scope values (one per run_id) uses constant
+    memory; a collision only turns an unrelated entry into a miss.
     """
 
-    def __init__(self, max_size: int = 1000, default_ttl: Optional[float] = None):
+    GLOBAL_SCOPE = "*"
+    GENERATION_BUCKETS = 4096
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl: Optional[float] = None,
+        sweep_interval: Optional[float] = None,
+        name: Optional[str] = None,
+        registry: Optional[CacheRegistry] = None,
+    ):
         """
         Initialize the intelligent cache.
 
         Args:
             max_size: Maximum number of entries in cache
             default_ttl: Default time-to-live in seconds (None for no expiration)
+            sweep_interval: Seconds between background sweeps of expired and
+                invalidated entries (None disables the sweeper thread)
+            name: Registry namespace name (defaults to one private to this cache)
+            registry: Registry holding the entries (defaults to the global one)
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        registry = registry or get_cache_registry()
+        namespace_options = {
+            "max_entries": max_size,
+            "sizeof": lambda entry: estimate_size(entry.value) + 200,
+        }
+        self._cache = (
+            registry.namespace(name, **namespace_options)
+            if name
+            else registry.private_namespace("intelligent", **namespace_options)
+        )
+        self._generations: List[int] = [0] * self.GENERATION_BUCKETS
         self._stats = {
             "hits": 0,
             "misses": 0,
-            "evictions": 0,
-            "expirations": 0,
+            "invalidations": 0,
         }
-        self._lock = None  # For thread safety (can use threading.Lock if needed)
+        self._lock = threading.RLock()
+        self._sweeper_stop: Optional[threading.Event] = None
+        if sweep_interval:
+            self.start_sweeper(sweep_interval)
 
     def _generate_key(self, *args, **kwargs) -> str:
         """
@@ -131,29 +528,44 @@ class IntelligentCache:
             key: Cache key
 
         Returns:
-            Cached value or None if not found/expired
+            Cached value or None if not found/expired/invalidated
         """
-        # Move to end to mark as recently used (LRU)
-        if key in self._cache:
-            entry = self._cache[key]
-
-            # Check expiration
-            if entry.is_expired():
-                del self._cache[key]
-                self._stats["expirations"] += 1
+        with self._lock:
+            # The namespace drops expired entries and marks hits as recently used
+            entry = self._cache.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            if self._is_stale(entry):
+                self._cache.pop(key)
+                self._stats["invalidations"] += 1
                 self._stats["misses"] += 1
                 return None
 
-            # Mark as recently used
-            self._cache.move_to_end(key)
             entry.touch()
             self._stats["hits"] += 1
             return entry.value
 
-        self._stats["misses"] += 1
-        return None
+    def snapshot(self, scopes: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Capture current generations for the given scopes.
 
-    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        Take the snapshot before computing a value and pass it to ``set`` so a
+        write that lands while the value is being computed invalidates it.
+        """
+        with self._lock:
+            keys = {self.GLOBAL_SCOPE, *(scopes or ())}
+            return {scope: self._generations[self._bucket(scope)] for scope in keys}
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        scopes: Optional[Iterable[str]] = None,
+        generations: Optional[Dict[str, int]] = None,
+    ) -> None:
         """
         Set a value in the cache.
 
@@ -161,47 +573,90 @@ class IntelligentCache:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds (uses default_ttl if None)
+            scopes: Scopes whose invalidation should drop this entry
+            generations: Snapshot from ``snapshot()``; overrides ``scopes``
         """
         # Use default TTL if not specified
         if ttl is None and self.default_ttl is not None:
             ttl = self.default_ttl
 
-        # Create new entry
-        entry = CacheEntry(key, value, ttl)
+        with self._lock:
+            if generations is None:
+                generations = self.snapshot(scopes)
+
+            # Add or update entry; the namespace evicts least recently used entries
+            self._cache.set(key, CacheEntry(key, value, ttl, generations), ttl=ttl)
 
-        # Add or update entry
-        self._cache[key] = entry
-        self._cache.move_to_end(key)
+    def invalidate(self, scopes: Optional[Iterable[str]] = None) -> None:
+        """
+        Invalidate entries depending on any of the scopes.
 
-        # Evict oldest entry if cache is full
-        if len(self._cache) > self.max_size:
-            oldest_key = next(iter(self._cache))
-            del self._cache[oldest_key]
-            self._stats["evictions"] += 1
+        Args:
+            scopes: Scopes to bump; None invalidates every entry
+        """
+        with self._lock:
+            for scope in (scopes if scopes is not None else (self.GLOBAL_SCOPE,)):
+                self._generations[self._bucket(scope)] += 1
 
     def clear(self) -> None:
         """Clear all entries from the cache."""
-        self._cache.clear()
-        self._stats = {
-            "hits": 0,
-            "misses": 0,
-            "evictions": 0,
-            "expirations": 0,
-        }
+        with self._lock:
+            self._cache.clear(reset_stats=True)
+            self._stats = {
+                "hits": 0,
+                "misses": 0,
+                "invalidations": 0,
+            }
 
     def cleanup_expired(self) -> int:
         """
-        Remove all expired entries from the cache.
+        Remove all expired and invalidated entries from the cache.
 
         Returns:
             Number of entries removed
         """
-        expired_keys = [k for k, v in self._cache.items() if v.is_expired()]
-        for key in expired_keys:
-            del self._cache[key]
-            self._stats["expirations"] += 1
-
-        return len(expired_keys)
+        with self._lock:
+            expired, stale = self._cache.sweep(self._is_stale)
+            self._stats["invalidations"] += stale
+            return expired + stale
+
+    def start_sweeper(self, interval: float) -> None:
+        """Run cleanup_expired every ``interval`` seconds on a daemon thread."""
+        with self._lock:
+            if self._sweeper_stop is not None:
+                return
+            stop = threading.Event()
+            self._sweeper_stop = stop
+
+        # Hold only a weak reference so the thread does not keep the cache alive
+        cache_ref = weakref.ref(self)
+
+        def _sweep():
+            while not stop.wait(interval):
+                cache = cache_ref()
+                if cache is None:
+                    return
+                removed = cache.cleanup_expired()
+                if removed:
+                    logger.debug(f"Swept {removed} expired cache entries")
+                del cache
+
+        threading.Thread(target=_sweep, name="IntelligentCacheSweeper", daemon=True).start()
+
+    def stop_sweeper(self) -> None:
+        with self._lock:
+            stop, self._sweeper_stop = self._sweeper_stop, None
+        if stop is not None:
+            stop.set()
+
+    def _bucket(self, scope: str) -> int:
+        return zlib.crc32(scope.encode("utf-8")) % self.GENERATION_BUCKETS
+
+    def _is_stale(self, entry: CacheEntry) -> bool:
+        return any(
+            self._generations[self._bucket(scope)] != generation
+            for scope, generation in entry.generations.items()
+        )
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -210,30 +665,34 @@ class IntelligentCache:
         Returns:
             Dictionary with cache statistics
         """
-        total_requests = self._stats["hits"] + self._stats["misses"]
-        hit_rate = self._stats["hits"] / total_requests if total_requests > 0 else 0
-
-        return {
-            **self._stats,
-            "size": len(self._cache),
-            "max_size": self.max_size,
-            "hit_rate": hit_rate,
-        }
+        with self._lock:
+            total_requests = self._stats["hits"] + self._stats["misses"]
+            hit_rate = self._stats["hits"] / total_requests if total_requests > 0 else 0
+            store = self._cache.stats()
+
+            return {
+                **self._stats,
+                "evictions": store["evictions"],
+                "expirations": store["expirations"],
+                "size": store["size"],
+                "bytes": store["bytes"],
+                "max_size": self.max_size,
+                "hit_rate": hit_rate,
+            }
 
     def __len__(self) -> int:
         """Return the current cache size."""
         return len(self._cache)
 
     def __contains__(self, key: str) -> bool:
-        """Check if a key exists in the cache and is not expired."""
-        if key in self._cache:
-            entry = self._cache[key]
-            return not entry.is_expired()
-        return False
+        """Check if a key exists in the cache and is neither expired nor invalidated."""
+        with self._lock:
+            entry = self._cache.peek(key)
+            return entry is not None and not self._is_stale(entry)
 
 
 # Global cache instance for search results
-_search_cache = IntelligentCache(max_size=1000, default_ttl=300)  # 5 minutes TTL
+_search_cache = IntelligentCache(max_size=1000, default_ttl=300, sweep_interval=60, name="memory.search")  # 5 minutes TTL
 
 
 def cached_search(max_size: int = 1000, ttl: float = 300):
@@ -247,9 +706,13 @@ def cached_search(max_size: int = 1000, ttl: float = 300):
     Returns:
         Decorated function with caching
     """
-    cache = IntelligentCache(max_size=max_size, default_ttl=ttl)
-
     def decorator(func: Callable) -> Callable:
+        cache = IntelligentCache(
+            max_size=max_size,
+            default_ttl=ttl,
+            name=f"cached_search:{func.__module__}.{func.__qualname__}",
+        )
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
@@ -281,6 +744,10 @@ def cached_search(max_size: int = 1000, ttl: float = 300):
 
 
 __all__ = [
+    "CacheRegistry",
+    "CacheNamespace",
+    "get_cache_registry",
+    "estimate_size",
     "IntelligentCache",
     "CacheEntry",
     "cached_search",
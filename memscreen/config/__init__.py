@@ -62,6 +62,8 @@ class MemScreenConfig:
     DEFAULT_RECORDING_DURATION = 60  # seconds
     DEFAULT_RECORDING_INTERVAL = 2.0  # seconds
     DEFAULT_SCREENSHOT_INTERVAL = 2.0  # seconds
+    DEFAULT_RECORDING_CHANGE_THRESHOLD = 1.0  # mean abs diff (0-255); 0 keeps every frame
+    DEFAULT_RECORDING_CAPTURE_BACKEND = "auto"  # Options: "auto", "mss", "pil"
 
     # Performance tuning
     KM_BATCH_THRESHOLD = 20  # Keyboard/mouse batch threshold
@@ -129,6 +131,8 @@ class MemScreenConfig:
                 "duration": self.DEFAULT_RECORDING_DURATION,
                 "interval": self.DEFAULT_RECORDING_INTERVAL,
                 "screenshot_interval": self.DEFAULT_SCREENSHOT_INTERVAL,
+                "change_threshold": self.DEFAULT_RECORDING_CHANGE_THRESHOLD,
+                "capture_backend": self.DEFAULT_RECORDING_CAPTURE_BACKEND,
             },
             # Performance configuration
             "performance": {
@@ -136,6 +140,10 @@ class MemScreenConfig:
                 "flush_interval": self.FLUSH_INTERVAL,
                 "typing_session_threshold": self.TYPING_SESSION_THRESHOLD,
             },
+            # In-process caches share this memory budget (see memscreen.cache)
+            "cache": {
+                "budget_mb": 256,
+            },
             # UI configuration
             "ui": {
                 "chat_input_height": self.CHAT_INPUT_HEIGHT,
@@ -282,6 +290,17 @@ class MemScreenConfig:
         if os.getenv("MEMSCREEN_API_ENABLED", "").lower() in ("1", "true", "yes"):
             self._config["api"]["enabled"] = True
 
+        # Cache budget
+        if cache_budget := os.getenv("MEMSCREEN_CACHE_BUDGET_MB"):
+            try:
+                self._config["cache"]["budget_mb"] = int(cache_budget)
+            except ValueError:
+                pass
+
+        # Screen capture backend
+        if capture_backend := os.getenv("MEMSCREEN_CAPTURE_BACKEND"):
+            self._config["recording"]["capture_backend"] = capture_backend
+
     def _get_defaults_dict(self) -> Dict[str, Any]:
         """Get defaults as a dictionary."""
         temp_config = MemScreenConfig(config_path=None)
@@ -416,6 +435,16 @@ class MemScreenConfig:
         """Get default screenshot interval in seconds."""
         return self._config["recording"]["screenshot_interval"]
 
+    @property
+    def recording_change_threshold(self) -> float:
+        """Get minimum frame difference required to store a captured frame."""
+        return float(self._config["recording"]["change_threshold"])
+
+    @property
+    def recording_capture_backend(self) -> str:
+        """Get screen capture backend name (auto, mss, pil)."""
+        return self._config["recording"]["capture_backend"]
+
     # Performance properties
     @property
     def km_batch_threshold(self) -> int:
@@ -432,6 +461,11 @@ class MemScreenConfig:
         """Get typing session threshold in seconds."""
         return self._config["performance"]["typing_session_threshold"]
 
+    @property
+    def cache_budget_mb(self) -> int:
+        """Get the memory budget shared by all in-process caches, in MiB."""
+        return int(self._config.get("cache", {}).get("budget_mb", 256))
+
     # UI properties
     @property
     def chat_input_height(self) -> int:
@@ -490,6 +524,12 @@ class MemScreenConfig:
         """Get vision encoder cache size."""
         return self._config.get("vision_encoder", {}).get("cache_size", 1000)
 
+    @property
+    def vision_encoder_cache_dir(self) -> Path:
+        """Get directory of the persistent vision embedding cache."""
+        cache_dir = self._config.get("vision_encoder", {}).get("cache_dir")
+        return Path(cache_dir) if cache_dir else self.db_dir / "vision_cache"
+
     # Tiered memory properties
     @property
     def tiered_memory_enabled(self) -> bool:
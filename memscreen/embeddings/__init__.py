@@ -12,13 +12,16 @@ This module provides embedding functionality for various providers including:
 - Ollama embeddings
 - Vision embeddings (SigLIP/CLIP)
 - Mock embeddings for testing
+- Persistent embedding cache (text and vision)
 - Factory for creating embedder instances
 """
 
 from .base import BaseEmbedderConfig, EmbeddingBase
 from .ollama import OllamaEmbedding
+from .vision_cache import VisionEmbeddingCache
 from .vision_encoder import VisionEncoder, VisionEncoderConfig
-from .mock import MockEmbeddings
+from .mock import MockEmbeddings, MockVisionModel
+from .cache import EmbeddingCache, CachedEmbedding
 from .factory import EmbedderFactory
 
 __all__ = [
@@ -27,6 +30,10 @@ __all__ = [
     "OllamaEmbedding",
     "VisionEncoder",
     "VisionEncoderConfig",
+    "VisionEmbeddingCache",
     "MockEmbeddings",
+    "MockVisionModel",
+    "EmbeddingCache",
+    "CachedEmbedding",
     "EmbedderFactory",
 ]
@@ -24,6 +24,8 @@ class BaseEmbedderConfig(ABC):
         embedding_dims: Optional[int] = None,
         # Ollama specific
         ollama_base_url: Optional[str] = None,
+        embed_batch_size: int = 32,
+        embed_concurrency: int = 2,
         # Openai specific
         openai_base_url: Optional[str] = None,
         # Huggingface specific
@@ -58,6 +60,10 @@ class BaseEmbedderConfig(ABC):
         :type embedding_dims: Optional[int], optional
         :param ollama_base_url: Base URL for the Ollama API, defaults to None
         :type ollama_base_url: Optional[str], optional
+        :param embed_batch_size: Maximum number of texts per batched embedding request, defaults to 32
+        :type embed_batch_size: int, optional
+        :param embed_concurrency: Maximum number of batched embedding requests in flight, defaults to 2
+        :type embed_concurrency: int, optional
         :param model_kwargs: key-value arguments for the huggingface embedding model, defaults a dict inside init
         :type model_kwargs: Optional[Dict[str, Any]], defaults a dict inside init
         :param huggingface_base_url: Huggingface base URL to be use, defaults to None
@@ -90,6 +96,8 @@ class BaseEmbedderConfig(ABC):
 
         # Ollama specific
         self.ollama_base_url = ollama_base_url
+        self.embed_batch_size = max(1, int(embed_batch_size or 1))
+        self.embed_concurrency = max(1, int(embed_concurrency or 1))
 
         # Huggingface specific
         self.model_kwargs = model_kwargs or {}
@@ -122,6 +130,10 @@ class EmbeddingBase(ABC):
     :type config: Optional[BaseEmbedderConfig], optional
     """
 
+    # Post-processing applied to the model output (e.g. "l2norm"). Vectors of
+    # different variants are not comparable, so caches and collections key on it.
+    embedding_variant: Optional[str] = None
+
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
         if config is None:
             self.config = BaseEmbedderConfig()
@@ -0,0 +1,263 @@
+### copyright 2026 jixiangluo    ###
+### email:jixiangluo85@gmail.com ###
+### rights reserved by author    ###
+### time: 2026-02-01             ###
+### license: MIT                 ###
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .base import EmbeddingBase
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["EmbeddingCache", "CachedEmbedding"]
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding store keyed by (model, sha256(text)).
+
+    Vectors are stored as float32 blobs in SQLite so they survive restarts.
+    Rows carry a last-access timestamp; once the row count exceeds
+    ``max_entries`` the least recently used rows are evicted. Access times
+    from lookups are buffered and written together with the next insert so
+    cache hits do not turn reads into writes.
+    """
+
+    _TOUCH_FLUSH_SIZE = 256
+
+    def __init__(self, db_path: str, max_entries: int = 100_000):
+        """
+        Args:
+            db_path: SQLite file holding the cache (":memory:" for a private cache)
+            max_entries: Upper bound on cached vectors across all models
+        """
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._pending_touches: Dict[Tuple[str, str], float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._create_table()
+        self._count = self.connection.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    def _create_table(self) -> None:
+        with self._lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    model       TEXT NOT NULL,
+                    text_hash   TEXT NOT NULL,
+                    dims        INTEGER NOT NULL,
+                    vector      BLOB NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_access "
+                "ON embedding_cache(last_access)"
+            )
+            self.connection.commit()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the given text hashes (missing hashes are omitted)."""
+        if not hashes:
+            return {}
+        unique = list(dict.fromkeys(hashes))
+        found: Dict[str, List[float]] = {}
+        now = time.time()
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit.
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.connection.execute(
+                    f"SELECT text_hash, vector FROM embedding_cache "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32).tolist()
+                    self._pending_touches[(model, text_hash)] = now
+            self.hits += sum(1 for h in hashes if h in found)
+            self.misses += sum(1 for h in hashes if h not in found)
+            if len(self._pending_touches) >= self._TOUCH_FLUSH_SIZE:
+                self._flush_touches()
+                self.connection.commit()
+        return found
+
+    def put_many(self, model: str, items: Sequence[Tuple[str, Sequence[float]]]) -> None:
+        """Store (text_hash, vector) pairs and evict least recently used rows."""
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for text_hash, vector in items:
+            array = np.asarray(vector, dtype=np.float32).ravel()
+            rows.append((model, text_hash, int(array.size), array.tobytes(), now))
+
+        with self._lock:
+            try:
+                self._flush_touches()
+                before = self.connection.total_changes
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO embedding_cache "
+                    "(model, text_hash, dims, vector, last_access) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._count += self.connection.total_changes - before
+                self._evict_locked()
+                self.connection.commit()
+            except sqlite3.Error as e:
+                self.connection.rollback()
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def _flush_touches(self) -> None:
+        if not self._pending_touches:
+            return
+        self.connection.executemany(
+            "UPDATE embedding_cache SET last_access = ? WHERE model = ? AND text_hash = ?",
+            [(ts, model, text_hash) for (model, text_hash), ts in self._pending_touches.items()],
+        )
+        self._pending_touches.clear()
+
+    def _evict_locked(self) -> None:
+        overflow = self._count - self.max_entries
+        if overflow <= 0:
+            return
+        # Evict a little extra so a full cache does not delete on every insert.
+        overflow += self.max_entries // 20
+        cursor = self.connection.execute(
+            "DELETE FROM embedding_cache WHERE rowid IN ("
+            "SELECT rowid FROM embedding_cache ORDER BY last_access ASC LIMIT ?)",
+            (overflow,),
+        )
+        removed = max(0, cursor.rowcount)
+        self._count -= removed
+        self.evictions += removed
+
+    def clear(self, model: Optional[str] = None) -> None:
+        """Remove cached vectors for one model, or for all models."""
+        with self._lock:
+            self._pending_touches.clear()
+            if model is None:
+                self.connection.execute("DELETE FROM embedding_cache")
+            else:
+                self.connection.execute("DELETE FROM embedding_cache WHERE model = ?", (model,))
+            self.connection.commit()
+            self._count = self.connection.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._count,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self.connection is None:
+                return
+            try:
+                self._flush_touches()
+                self.connection.commit()
+            finally:
+                self.connection.close()
+                self.connection = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class CachedEmbedding(EmbeddingBase):
+    """
+    Embedder wrapper that serves repeated texts from an :class:`EmbeddingCache`.
+
+    ``embed_batch`` looks up all texts at once and only sends the misses to
+    the wrapped embedder. Other attributes are forwarded to the wrapped
+    embedder, so callers can keep treating this as the provider instance.
+    """
+
+    def __init__(self, embedder: EmbeddingBase, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+        self.config = embedder.config
+
+    def __getattr__(self, name):
+        # Only reached for attributes not defined on the wrapper.
+        if name == "embedder":
+            raise AttributeError(name)
+        return getattr(self.embedder, name)
+
+    @property
+    def embedding_variant(self) -> Optional[str]:
+        return getattr(self.embedder, "embedding_variant", None)
+
+    def _cache_model(self, memory_action: Optional[str]) -> str:
+        # Providers with per-action embedding types produce different vectors
+        # for the same text, so the type becomes part of the key; so does the
+        # output variant (vectors cached before normalization stay unused).
+        model = str(getattr(self.config, "model", None) or type(self.embedder).__name__)
+        if self.embedding_variant:
+            model = f"{model}@{self.embedding_variant}"
+        if memory_action:
+            variant = getattr(self.config, f"memory_{memory_action}_embedding_type", None)
+            if variant:
+                model = f"{model}#{variant}"
+        return model
+
+    def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        return self.embed_batch([text], memory_action)[0]
+
+    def embed_batch(self, texts: list, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        if not texts:
+            return []
+        model = self._cache_model(memory_action)
+        hashes = [EmbeddingCache.text_hash(text) for text in texts]
+        cached = self.cache.get_many(model, hashes)
+
+        missing: Dict[str, str] = {}
+        for text, text_hash in zip(texts, hashes):
+            if text_hash not in cached and text_hash not in missing:
+                missing[text_hash] = text
+
+        if missing:
+            pending = list(missing.items())
+            miss_texts = [text for _, text in pending]
+            if len(miss_texts) == 1:
+                vectors = [self.embedder.embed(miss_texts[0], memory_action)]
+            else:
+                vectors = self.embedder.embed_batch(miss_texts, memory_action)
+            computed = {text_hash: list(vector) for (text_hash, _), vector in zip(pending, vectors)}
+            self.cache.put_many(model, list(computed.items()))
+            cached.update(computed)
+
+        return [cached[text_hash] for text_hash in hashes]
@@ -6,10 +6,12 @@
 
 from typing import Optional, Literal
 
+import numpy as np
+
 from .base import BaseEmbedderConfig, EmbeddingBase
 
 
-__all__ = ["MockEmbeddings"]
+__all__ = ["MockEmbeddings", "MockVisionModel"]
 
 
 class MockEmbeddings(EmbeddingBase):
@@ -18,3 +20,33 @@ class MockEmbeddings(EmbeddingBase):
         Generate a mock embedding with dimension of 10.
         """
         return [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+
+
+class MockVisionModel:
+    """
+    Deterministic, CPU-only stand-in for the SentenceTransformer vision model.
+
+    Each image is downsampled to 8x8 RGB and projected with a fixed random
+    matrix, so similar images get similar unit vectors.
+    """
+
+    def __init__(self, dims: int = 64):
+        self.dims = dims
+        rng = np.random.default_rng(0)
+        self._projection = rng.standard_normal((8 * 8 * 3, dims)).astype(np.float32)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dims
+
+    def encode(self, images):
+        single = not isinstance(images, (list, tuple))
+        batch = [images] if single else list(images)
+        if not batch:
+            return np.empty((0, self.dims), dtype=np.float32)
+        pixels = np.stack([
+            np.asarray(image.convert("RGB").resize((8, 8)), dtype=np.float32).ravel() / 255.0
+            for image in batch
+        ])
+        embeddings = pixels @ self._projection
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-8
+        return embeddings[0] if single else embeddings
@@ -6,9 +6,10 @@
 
 import os
 from typing import Optional, Literal
-from ollama import Client
+from ollama import Client, ResponseError
 import logging
 import httpx
+import numpy as np
 
 from .base import BaseEmbedderConfig, EmbeddingBase
 
@@ -18,6 +19,10 @@ __all__ = ["OllamaEmbedding"]
 
 
 class OllamaEmbedding(EmbeddingBase):
+    # /api/embed returns L2-normalized vectors; the /api/embeddings fallback
+    # is normalized to match, so every path yields the same vector space.
+    embedding_variant = "l2norm"
+
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
         super().__init__(config)
 
@@ -26,6 +31,8 @@ class OllamaEmbedding(EmbeddingBase):
 
         # Create ollama client
         self.client = Client(host=self.config.ollama_base_url)
+        # None until the first request tells us whether /api/embed exists.
+        self._supports_embed_api: Optional[bool] = None
 
         # Fix for macOS system proxy issue: replace the internal httpx client
         # The ollama library uses httpx which picks up system proxy settings
@@ -79,13 +86,14 @@ class OllamaEmbedding(EmbeddingBase):
         Returns:
             list: The embedding vector.
         """
-        response = self.client.embeddings(model=self.config.model, prompt=text)
-        return response["embedding"]
+        return self._embed_many([text])[0]
 
     def embed_batch(self, texts: list, memory_action: Optional[Literal["add", "search", "update"]] = None):
         """
-        OPTIMIZATION: Get embeddings for multiple texts at once using Ollama batch API.
-        This is much faster than calling embed() for each text individually.
+        OPTIMIZATION: Get embeddings for multiple texts using Ollama's list-input /api/embed.
+
+        Texts are sent in chunks of ``config.embed_batch_size`` with at most
+        ``config.embed_concurrency`` requests in flight.
 
         Args:
             texts (list): List of texts to embed.
@@ -94,23 +102,59 @@ class OllamaEmbedding(EmbeddingBase):
         Returns:
             list: List of embedding vectors.
         """
-        try:
-            # Try to use Ollama's batch embedding endpoint if available
-            # Note: Ollama doesn't have a native batch API yet, so we optimize by using
-            # concurrent requests with thread pooling
-            import concurrent.futures
+        texts = list(texts)
+        if not texts:
+            return []
 
-            # Use ThreadPoolExecutor for parallel embedding generation
-            # This significantly speeds up embedding multiple texts
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                embeddings = list(executor.map(
-                    lambda text: self.embed(text, memory_action),
-                    texts
-                ))
+        batch_size = self.config.embed_batch_size
+        chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        workers = min(self.config.embed_concurrency, len(chunks))
 
-            return embeddings
+        try:
+            if workers <= 1:
+                results = [self._embed_many(chunk) for chunk in chunks]
+            else:
+                import concurrent.futures
 
+                with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(self._embed_many, chunks))
         except Exception as e:
             logger.warning(f"Batch embedding failed, falling back to sequential: {e}")
-            # Fallback to sequential processing
             return [self.embed(text, memory_action) for text in texts]
+
+        return [embedding for chunk_result in results for embedding in chunk_result]
+
+    def _embed_many(self, texts: list) -> list:
+        """Embed a list of texts in one request, or per text on servers without /api/embed."""
+        if self._supports_embed_api is not False:
+            try:
+                response = self.client.embed(model=self.config.model, input=texts)
+                self._supports_embed_api = True
+                return [list(embedding) for embedding in response["embeddings"]]
+            except (AttributeError, ResponseError) as e:
+                if not self._is_missing_embed_api(e):
+                    raise
+                self._supports_embed_api = False
+                logger.info("Ollama /api/embed is unavailable, using per-text /api/embeddings")
+
+        return [
+            self._l2_normalize(self.client.embeddings(model=self.config.model, prompt=text)["embedding"])
+            for text in texts
+        ]
+
+    @staticmethod
+    def _l2_normalize(vector) -> list:
+        array = np.asarray(vector, dtype=np.float64)
+        norm = np.linalg.norm(array)
+        return (array / norm).tolist() if norm > 0 else array.tolist()
+
+    @staticmethod
+    def _is_missing_embed_api(error: Exception) -> bool:
+        # Old python clients have no Client.embed; old servers answer 404 for
+        # the route. A 404 about the model itself is a real error.
+        if isinstance(error, AttributeError):
+            return True
+        if getattr(error, "status_code", None) not in (404, 405):
+            return False
+        message = str(getattr(error, "error", error)).lower()
+        return "model" not in message
@@ -0,0 +1,215 @@
+### copyright 2026 jixiangluo    ###
+### email:jixiangluo85@gmail.com ###
+### rights reserved by author    ###
+### time: 2026-02-06             ###
+### license: MIT                 ###
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["VisionEmbeddingCache"]
+
+
+class VisionEmbeddingCache:
+    """
+    Fixed-capacity vision embedding store keyed by an image hash.
+
+    Vectors live in a ``(capacity, dims)`` float16/float32 matrix. Slot keys
+    and last-access times sit in two parallel arrays. With a ``cache_dir`` all
+    three are memory-mapped files and ``index.json`` records the model, dims,
+    dtype and capacity they were created for; a mismatch starts a fresh cache.
+    Without a directory the same arrays are kept in RAM. When every slot is
+    taken, the least recently used ~5% are evicted together.
+    """
+
+    _KEY_DTYPE = "S64"
+    _HEADER = "index.json"
+
+    def __init__(
+        self,
+        dims: int,
+        capacity: int = 1000,
+        cache_dir: Optional[str] = None,
+        dtype: str = "float16",
+        model: str = "",
+    ):
+        """
+        Args:
+            dims: Embedding dimensions
+            capacity: Maximum number of cached vectors
+            cache_dir: Directory for the memory-mapped files (None keeps the cache in RAM)
+            dtype: Storage dtype, "float16" or "float32"
+            model: Model name; vectors from a different model are never reused
+        """
+        if dtype not in ("float16", "float32"):
+            raise ValueError(f"Unsupported cache dtype: {dtype}")
+        self.dims = int(dims)
+        self.capacity = max(1, int(capacity))
+        self.cache_dir = cache_dir
+        self.dtype = dtype
+        self.model = model
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._open()
+
+    def _open(self) -> None:
+        shape = (self.capacity, self.dims)
+        if self.cache_dir is None:
+            self._keys = np.zeros(self.capacity, dtype=self._KEY_DTYPE)
+            self._access = np.zeros(self.capacity, dtype=np.float64)
+            self._vectors = np.zeros(shape, dtype=self.dtype)
+        else:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            header = {
+                "version": 1,
+                "model": self.model,
+                "dims": self.dims,
+                "dtype": self.dtype,
+                "capacity": self.capacity,
+            }
+            header_path = os.path.join(self.cache_dir, self._HEADER)
+            reuse = self._read_header(header_path) == header
+            if not reuse and os.path.exists(header_path):
+                logger.info(f"Vision cache layout changed, starting a new cache in {self.cache_dir}")
+                os.remove(header_path)
+            mode = "r+" if reuse else "w+"
+            try:
+                self._keys = self._map("keys.bin", self._KEY_DTYPE, (self.capacity,), mode)
+                self._access = self._map("access.bin", np.float64, (self.capacity,), mode)
+                self._vectors = self._map("vectors.bin", self.dtype, shape, mode)
+            except (OSError, ValueError) as e:
+                if not reuse:
+                    raise
+                logger.warning(f"Vision cache files unreadable, recreating: {e}")
+                os.remove(header_path)
+                self._open()
+                return
+            if not reuse:
+                # Written last so a half-created cache is never reused.
+                tmp_path = header_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(header, f)
+                os.replace(tmp_path, header_path)
+
+        occupied = np.flatnonzero(self._keys != b"")
+        self._slots: Dict[bytes, int] = {bytes(self._keys[slot]): int(slot) for slot in occupied}
+        self._free = sorted(set(range(self.capacity)) - set(self._slots.values()), reverse=True)
+
+    def _map(self, name: str, dtype, shape, mode: str) -> np.memmap:
+        return np.memmap(os.path.join(self.cache_dir, name), dtype=dtype, mode=mode, shape=shape)
+
+    @staticmethod
+    def _read_header(path: str) -> Optional[Dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Return cached vectors for the given keys (missing keys are omitted).
+
+        Rows are gathered into one float32 array; the returned vectors are
+        views of it, detached from the cache so later evictions cannot
+        change them.
+        """
+        unique = list(dict.fromkeys(keys))
+        now = time.time()
+        with self._lock:
+            found = [(key, self._slots[key.encode()]) for key in unique if key.encode() in self._slots]
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+            if not found:
+                return {}
+            slots = np.fromiter((slot for _, slot in found), dtype=np.intp, count=len(found))
+            self._access[slots] = now
+            matrix = self._vectors[slots].astype(np.float32)
+        return {key: matrix[i] for i, (key, _) in enumerate(found)}
+
+    def put_many(self, items: Sequence[Tuple[str, np.ndarray]]) -> None:
+        """Store (key, vector) pairs, evicting least recently used vectors when full."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, vector in items:
+                raw = key.encode()
+                row = np.asarray(vector, dtype=np.float32).ravel()
+                if row.size != self.dims:
+                    raise ValueError(f"Vector has {row.size} dims, cache expects {self.dims}")
+                slot = self._slots.get(raw)
+                if slot is None:
+                    if not self._free:
+                        self._evict_locked()
+                    slot = self._free.pop()
+                self._vectors[slot] = row
+                self._access[slot] = now
+                # Key last, so a slot is never indexed before its vector is written.
+                self._keys[slot] = raw
+                self._slots[raw] = slot
+
+    def _evict_locked(self) -> None:
+        count = min(len(self._slots), max(1, self.capacity // 20))
+        slots = np.fromiter(self._slots.values(), dtype=np.intp, count=len(self._slots))
+        oldest = slots[np.argpartition(self._access[slots], count - 1)[:count]]
+        for slot in oldest.tolist():
+            del self._slots[bytes(self._keys[slot])]
+            self._keys[slot] = b""
+            self._access[slot] = 0.0
+            self._free.append(slot)
+        self.evictions += count
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key.encode() in self._slots
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._slots)
+
+    def clear(self) -> None:
+        """Drop every cached vector."""
+        with self._lock:
+            self._keys[:] = b""
+            self._access[:] = 0.0
+            self._slots.clear()
+            self._free = list(range(self.capacity - 1, -1, -1))
+            self._flush_locked()
+
+    def flush(self) -> None:
+        """Write memory-mapped pages back to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        for array in (self._vectors, self._access, self._keys):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._slots),
+                "max_size": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": int(self._vectors.nbytes),
+            }
+
+    def close(self) -> None:
+        self.flush()
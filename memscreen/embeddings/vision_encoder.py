@@ -12,15 +12,24 @@ using state-of-the-art vision-language models like SigLIP or CLIP. These embeddi
 cross-modal retrieval between text and visual content.
 """
 
-from typing import Optional, List, Dict, Union, Literal
+from typing import Any, Iterator, Optional, List, Dict, Sequence, Tuple, Union, Literal
 from pathlib import Path
 import hashlib
 import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 import numpy as np
 from PIL import Image
 
+from ..cache import get_cache_registry
+from .vision_cache import VisionEmbeddingCache
+
 logger = logging.getLogger(__name__)
 
 __all__ = [
@@ -28,43 +37,69 @@ __all__ = [
     "VisionEncoder",
 ]
 
+# Anything encode_image_batch / iter_encode_images accepts as one image
+ImageInput = Union[str, Path, Image.Image, np.ndarray]
+
 
 class VisionEncoderConfig:
     """
     Configuration for VisionEncoder.
 
     Args:
-        model_type: Type of vision model to use ("siglip" or "clip")
+        model_type: Type of vision model to use ("siglip", "clip", or "mock" for tests)
         device: Device to run model on ("cpu", "cuda", "mps")
-        cache_size: Size of LRU cache for encoded images
+        cache_size: Number of embeddings kept in the cache
         model_name: HuggingFace model name (auto-detected if None)
         embedding_dims: Expected embedding dimensions (auto-detected if None)
+        cache_dir: Directory for the persistent embedding cache (None = in-process only)
+        cache_dtype: Storage precision of cached embeddings ("float16" or "float32")
+        cache_key: Cache key, "content" (file bytes) or "perceptual" (pHash, reuses
+            embeddings across near-identical frames)
+        batch_size: Images per model call; bounds memory for long recordings
+        prefetch_chunks: Chunks decoded ahead of the model by the loader thread
+        use_worker_process: Run the model in a separate process
     """
 
     def __init__(
         self,
-        model_type: Literal["siglip", "clip"] = "siglip",
+        model_type: Literal["siglip", "clip", "mock"] = "siglip",
         device: str = "cpu",
         cache_size: int = 1000,
         model_name: Optional[str] = None,
         embedding_dims: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        cache_dtype: Literal["float16", "float32"] = "float16",
+        cache_key: Literal["content", "perceptual"] = "content",
+        batch_size: int = 32,
+        prefetch_chunks: int = 2,
+        use_worker_process: bool = False,
     ):
         self.model_type = model_type
         self.device = device
         self.cache_size = cache_size
         self.model_name = model_name
         self.embedding_dims = embedding_dims
+        self.cache_dir = cache_dir
+        self.cache_dtype = cache_dtype
+        self.cache_key = cache_key
+        self.batch_size = max(1, int(batch_size))
+        self.prefetch_chunks = max(1, int(prefetch_chunks))
+        self.use_worker_process = use_worker_process
 
         # Auto-detect model defaults
         if self.model_name is None:
             if model_type == "siglip":
                 self.model_name = "sentence-transformers/visual_model"
+            elif model_type == "mock":
+                self.model_name = "mock-vision"
             else:  # clip
                 self.model_name = "clip-ViT-B-32-multilingual-v1"
 
         if self.embedding_dims is None:
             if model_type == "siglip":
                 self.embedding_dims = 768
+            elif model_type == "mock":
+                self.embedding_dims = 64
             else:  # clip
                 self.embedding_dims = 512
 
@@ -100,8 +135,14 @@ class VisionEncoder:
 
         self.config = config
         self.model = None
-        self._cache = {}  # Simple LRU cache
-        self._cache_order = []  # Track insertion order for LRU
+        # Embedding cache keyed by image hash, opened on first use
+        self._cache: Optional[VisionEmbeddingCache] = None
+        self._cache_lock = threading.Lock()
+        # (path, mtime_ns, size) -> hash, so unchanged files are not re-read
+        self._hash_memo: Dict[Tuple[str, int, int], str] = {}
+        # Optional model worker process (config.use_worker_process)
+        self._worker: Optional[ProcessPoolExecutor] = None
+        self.last_encode_stats: Dict[str, float] = {}
 
         # Lazy loading - model is loaded on first use
         self._model_loaded = False
@@ -121,6 +162,13 @@ class VisionEncoder:
         if self._model_loaded:
             return
 
+        if self.config.model_type == "mock":
+            from .mock import MockVisionModel
+
+            self.model = MockVisionModel(self.config.embedding_dims)
+            self._model_loaded = True
+            return
+
         try:
             from sentence_transformers import SentenceTransformer
 
@@ -163,7 +211,7 @@ class VisionEncoder:
         Args:
             image_path: Path to the image file
             return_tensor: If True, return numpy array; otherwise return list
-            use_cache: Whether to use LRU cache for repeated images
+            use_cache: Whether to use the embedding cache for repeated images
 
         Returns:
             Visual embedding vector (768-dim for SigLIP, 512-dim for CLIP)
@@ -179,57 +227,34 @@ class VisionEncoder:
             # embedding: [0.123, -0.456, ..., 0.789]  # List[float]
             ```
         """
-        # Check cache first
-        if use_cache and image_path in self._cache:
-            self._update_cache_order(image_path)
-            if return_tensor:
-                return np.array(self._cache[image_path])
-            return self._cache[image_path]
-
-        # Load model on first use
-        if not self._model_loaded:
-            self._load_model()
-
-        # Verify image exists
-        if not Path(image_path).exists():
-            raise FileNotFoundError(f"Image not found: {image_path}")
-
         try:
-            # Load and preprocess image
-            image = Image.open(image_path).convert("RGB")
-
-            # Generate embedding
-            embedding = self.model.encode(image)
-
-            # Convert to list for JSON serialization
-            embedding_list = embedding.tolist()
-
-            # Cache the result
-            if use_cache:
-                self._add_to_cache(image_path, embedding_list)
-
-            if return_tensor:
-                return embedding
-            return embedding_list
-
+            _, embeddings = next(self._iter_chunks([image_path], use_cache, strict=True))
+        except FileNotFoundError:
+            raise
         except Exception as e:
             logger.error(f"Failed to encode image {image_path}: {e}")
             raise
 
+        if return_tensor:
+            return embeddings[0]
+        return embeddings[0].tolist()
+
     def encode_image_batch(
         self,
-        image_paths: List[str],
+        image_paths: Sequence[ImageInput],
         return_tensor: bool = False,
         use_cache: bool = True,
     ) -> Union[List[List[float]], np.ndarray]:
         """
         Encode multiple images in batch for better performance.
 
-        This is significantly faster than calling encode_image() multiple times
-        as it processes all images in one forward pass.
+        Images are encoded in chunks of ``config.batch_size`` (see
+        iter_encode_images), so long recordings do not go through the model
+        as one giant batch. Images whose content is already cached (including
+        from earlier runs) are not re-encoded.
 
         Args:
-            image_paths: List of image file paths
+            image_paths: Image file paths, PIL images or RGB uint8 arrays
             return_tensor: If True, return numpy array; otherwise return list of lists
             use_cache: Whether to use cache for already-encoded images
 
@@ -245,70 +270,302 @@ class VisionEncoder:
             # embeddings: [[0.1, ...], [0.2, ...], [0.3, ...]]
             ```
         """
-        if not self._model_loaded:
-            self._load_model()
-
-        # Check which images need encoding
-        images_to_encode = []
-        indices_to_encode = []
-        results = [None] * len(image_paths)
-
-        for i, path in enumerate(image_paths):
-            if use_cache and path in self._cache:
-                # Use cached version
-                self._update_cache_order(path)
-                results[i] = self._cache[path]
-            else:
-                # Mark for encoding
-                images_to_encode.append((i, path))
+        chunks = []
+        try:
+            for _, embeddings in self.iter_encode_images(image_paths, use_cache=use_cache):
+                chunks.append(embeddings)
+        except Exception as e:
+            # Return whatever we have
+            logger.error(f"Batch encoding failed: {e}")
 
-        if not images_to_encode:
-            # All cached
-            if return_tensor:
-                return np.array(results)
-            return results
+        if return_tensor:
+            if not chunks:
+                return np.empty((0, self.config.embedding_dims), dtype=np.float32)
+            return np.concatenate(chunks)
+        return [row.tolist() for chunk in chunks for row in chunk]
 
-        # Batch encode uncached images
-        try:
-            # Load images
-            images = []
-            for idx, path in images_to_encode:
-                if not Path(path).exists():
-                    logger.warning(f"Image not found, skipping: {path}")
-                    continue
-                img = Image.open(path).convert("RGB")
-                images.append((idx, img))
+    def iter_encode_images(
+        self,
+        images: Sequence[ImageInput],
+        batch_size: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> Iterator[Tuple[List[int], np.ndarray]]:
+        """
+        Stream embeddings for a long sequence of images, one chunk at a time.
 
-            # Extract images for batch processing
-            idx_list, img_list = zip(*images) if images else ([], [])
+        A loader thread hashes and decodes up to ``config.prefetch_chunks``
+        chunks ahead of the model, so at most a few chunks of decoded images
+        are held in memory. Missing or unreadable images are skipped.
+        Throughput is recorded in ``last_encode_stats``.
 
-            # Batch encode
-            embeddings = self.model.encode(list(img_list))
+        Args:
+            images: Image file paths, PIL images or RGB uint8 arrays (H, W, 3)
+            batch_size: Images per model call (defaults to config.batch_size)
+            use_cache: Whether to use the embedding cache
 
-            # Store results and cache
-            for idx, embedding in zip(idx_list, embeddings):
-                embedding_list = embedding.tolist()
-                results[idx] = embedding_list
+        Yields:
+            (indices, embeddings): input positions and a float32 array with one
+            row per position
+        """
+        yield from self._iter_chunks(images, use_cache, strict=False, batch_size=batch_size)
 
-                # Cache
-                original_path = image_paths[idx]
-                if use_cache:
-                    self._add_to_cache(original_path, embedding_list)
+    def _iter_chunks(
+        self,
+        images: Sequence[ImageInput],
+        use_cache: bool,
+        strict: bool,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Tuple[List[int], np.ndarray]]:
+        batch_size = max(1, int(batch_size or self.config.batch_size))
+        images = list(images)
+        started = time.perf_counter()
+        stats = {"frames": 0, "encoded": 0, "cached": 0, "chunks": 0}
+
+        if len(images) <= batch_size:
+            # Single chunk: nothing to overlap, so skip the loader thread
+            loaded = iter([self._load_chunk(images, 0, len(images), use_cache, strict)])
+            stop = None
+        else:
+            loaded, stop = self._start_loader(images, batch_size, use_cache, strict)
 
-            # Filter out None values (failed encodings)
-            final_results = [r for r in results if r is not None]
+        try:
+            for chunk in loaded:
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                indices, embeddings, encoded = self._finish_chunk(chunk, use_cache)
+                stats["frames"] += len(indices)
+                stats["encoded"] += encoded
+                stats["cached"] += len(indices) - encoded
+                stats["chunks"] += 1
+                if indices:
+                    yield indices, embeddings
+        finally:
+            if stop is not None:
+                stop.set()
+            elapsed = time.perf_counter() - started
+            stats["seconds"] = elapsed
+            stats["frames_per_sec"] = stats["frames"] / elapsed if elapsed > 0 else 0.0
+            self.last_encode_stats = stats
+            if stats["chunks"] > 1:
+                logger.info(
+                    f"Encoded {stats['frames']} images in {stats['chunks']} chunks "
+                    f"({stats['cached']} cached) at {stats['frames_per_sec']:.1f} frames/sec"
+                )
 
-            if return_tensor:
-                return np.array(final_results)
-            return final_results
+    def _start_loader(
+        self,
+        images: List[ImageInput],
+        batch_size: int,
+        use_cache: bool,
+        strict: bool,
+    ) -> Tuple[Iterator[Any], threading.Event]:
+        """Run _load_chunk for each chunk on a thread, a bounded number ahead."""
+        out: "queue.Queue[Any]" = queue.Queue(maxsize=self.config.prefetch_chunks)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    out.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def run():
+            try:
+                for start in range(0, len(images), batch_size):
+                    end = min(len(images), start + batch_size)
+                    if not put(self._load_chunk(images, start, end, use_cache, strict)):
+                        return
+            except BaseException as e:
+                put(e)
+                return
+            put(done)
+
+        threading.Thread(target=run, name="vision-loader", daemon=True).start()
+
+        def drain() -> Iterator[Any]:
+            while True:
+                item = out.get()
+                if item is done:
+                    return
+                yield item
+
+        return drain(), stop
+
+    def _load_chunk(
+        self,
+        images: List[ImageInput],
+        start: int,
+        end: int,
+        use_cache: bool,
+        strict: bool,
+    ) -> Dict[str, Any]:
+        """Hash one chunk, fetch cache hits and decode only the misses."""
+        keys: Dict[int, str] = {}
+        for i in range(start, end):
+            try:
+                keys[i] = self._input_key(images[i]) if use_cache else str(i)
+            except (OSError, ValueError) as e:
+                if strict:
+                    if isinstance(e, FileNotFoundError):
+                        raise FileNotFoundError(f"Image not found: {images[i]}") from e
+                    raise
+                logger.warning(f"Image not readable, skipping: {self._describe(images[i])}")
+
+        hits = self._get_cache().get_many(list(keys.values())) if use_cache else {}
+
+        pending: Dict[str, List[int]] = {}
+        for i, key in keys.items():
+            if key not in hits:
+                pending.setdefault(key, []).append(i)
+
+        # Decode each distinct image once
+        decoded: Dict[str, Image.Image] = {}
+        for key, positions in list(pending.items()):
+            try:
+                decoded[key] = self._to_pil(images[positions[0]])
+            except Exception as e:
+                if strict:
+                    raise
+                logger.warning(f"Image not readable, skipping: {self._describe(images[positions[0]])}: {e}")
+                for i in positions:
+                    keys.pop(i)
+                del pending[key]
+
+        return {"keys": keys, "hits": hits, "pending": pending, "decoded": decoded}
+
+    def _finish_chunk(self, chunk: Dict[str, Any], use_cache: bool) -> Tuple[List[int], np.ndarray, int]:
+        """Run the model on a loaded chunk and assemble its rows in input order."""
+        keys, hits, pending, decoded = chunk["keys"], chunk["hits"], chunk["pending"], chunk["decoded"]
+        fresh: Dict[str, np.ndarray] = {}
+        if pending:
+            batch_keys = list(pending)
+            embeddings = self._run_model([decoded[key] for key in batch_keys])
+            fresh = dict(zip(batch_keys, embeddings))
+            if use_cache:
+                self._get_cache().put_many(list(fresh.items()))
+
+        indices = sorted(keys)
+        dims = self.config.embedding_dims
+        matrix = np.empty((len(indices), dims), dtype=np.float32)
+        for row, i in enumerate(indices):
+            key = keys[i]
+            matrix[row] = fresh[key] if key in fresh else hits[key]
+        return indices, matrix, len(fresh)
+
+    def _run_model(self, images: List[Image.Image]) -> np.ndarray:
+        """Encode one chunk in-process or on the worker process."""
+        if self.config.use_worker_process:
+            arrays = [np.asarray(image, dtype=np.uint8) for image in images]
+            embeddings = self._get_worker().submit(_worker_encode, arrays).result()
+        else:
+            if not self._model_loaded:
+                self._load_model()
+            embeddings = self.model.encode(images)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        if embeddings.shape[1] != self.config.embedding_dims:
+            self.config.embedding_dims = embeddings.shape[1]
+        return embeddings
+
+    def _get_worker(self) -> ProcessPoolExecutor:
+        if self._worker is None:
+            self._worker = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_worker_init,
+                initargs=(self.config,),
+            )
+        return self._worker
+
+    def close(self):
+        """Stop the model worker process and flush the embedding cache."""
+        if self._worker is not None:
+            self._worker.shutdown(wait=True)
+            self._worker = None
+        if self._cache is not None:
+            self._cache.close()
+
+    def _input_key(self, image: ImageInput) -> str:
+        """Cache key for a path (file content) or an in-memory image (pixels)."""
+        if isinstance(image, (str, Path)):
+            return self.image_key(str(image))
+        pixels = np.ascontiguousarray(image if isinstance(image, np.ndarray) else np.asarray(image))
+        if self.config.cache_key == "perceptual":
+            try:
+                import imagehash
+
+                return f"p:{imagehash.phash(self._to_pil(pixels))}"
+            except ImportError:
+                pass
+        digest = hashlib.blake2b(digest_size=32)
+        digest.update(f"{pixels.shape}{pixels.dtype}".encode())
+        digest.update(pixels.data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _to_pil(image: ImageInput) -> Image.Image:
+        if isinstance(image, Image.Image):
+            return image.convert("RGB")
+        if isinstance(image, np.ndarray):
+            return Image.fromarray(np.asarray(image, dtype=np.uint8)).convert("RGB")
+        return Image.open(image).convert("RGB")
+
+    @staticmethod
+    def _describe(image: ImageInput) -> str:
+        if isinstance(image, np.ndarray):
+            return f"array{image.shape}"
+        return str(image)
+
+    def image_key(self, image_path: str) -> str:
+        """
+        Return the cache key for an image.
 
-        except Exception as e:
-            logger.error(f"Batch encoding failed: {e}")
-            # Return whatever we have
-            final_results = [r for r in results if r is not None]
-            if return_tensor:
-                return np.array(final_results)
-            return final_results
+        "content" keys hash the file bytes, so a path whose file changed gets a
+        new key; "perceptual" keys use compute_visual_hash.
+        """
+        st = os.stat(image_path)
+        memo_key = (str(image_path), st.st_mtime_ns, st.st_size)
+        key = self._hash_memo.get(memo_key)
+        if key is not None:
+            return key
+
+        if self.config.cache_key == "perceptual":
+            key = f"p:{self.compute_visual_hash(image_path)}"
+        else:
+            digest = hashlib.blake2b(digest_size=32)
+            with open(image_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            key = digest.hexdigest()
+
+        if len(self._hash_memo) >= 4 * self.config.cache_size:
+            self._hash_memo.clear()
+        self._hash_memo[memo_key] = key
+        return key
+
+    def _get_cache(self) -> VisionEmbeddingCache:
+        """Open the embedding cache, reopening it if the model's dims changed."""
+        with self._cache_lock:
+            cache = self._cache
+            if cache is None or cache.dims != self.config.embedding_dims:
+                if cache is not None:
+                    cache.close()
+                cache = VisionEmbeddingCache(
+                    dims=self.config.embedding_dims,
+                    capacity=self.config.cache_size,
+                    cache_dir=self.config.cache_dir,
+                    dtype=self.config.cache_dtype,
+                    model=f"{self.config.model_name}#{self.config.cache_key}",
+                )
+                # Already bounded by its capacity; the registry only reports it.
+                get_cache_registry().register_source(f"vision_encoder:{id(self):x}", cache.stats)
+                self._cache = cache
+            return cache
 
     def compute_visual_hash(self, image_path: str) -> str:
         """
@@ -458,31 +715,10 @@ class VisionEncoder:
             logger.warning(f"Failed to extract dominant colors: {e}")
             return [(128, 128, 128)] * n_colors
 
-    def _add_to_cache(self, key: str, value: List[float]):
-        """Add item to LRU cache."""
-        # Remove if already exists
-        if key in self._cache:
-            self._cache_order.remove(key)
-
-        # Add to cache
-        self._cache[key] = value
-        self._cache_order.append(key)
-
-        # Enforce cache size limit
-        while len(self._cache_order) > self.config.cache_size:
-            oldest_key = self._cache_order.pop(0)
-            del self._cache[oldest_key]
-
-    def _update_cache_order(self, key: str):
-        """Update cache order when item is accessed."""
-        if key in self._cache:
-            self._cache_order.remove(key)
-            self._cache_order.append(key)
-
     def clear_cache(self):
         """Clear the entire cache."""
-        self._cache.clear()
-        self._cache_order.clear()
+        self._get_cache().clear()
+        self._hash_memo.clear()
         logger.info("Vision encoder cache cleared")
 
     def get_cache_stats(self) -> Dict[str, int]:
@@ -490,12 +726,24 @@ class VisionEncoder:
         Get cache statistics.
 
         Returns:
-            Dict with 'size' and 'max_size' keys
+            Dict with 'size' and 'max_size' keys, plus hit/miss counters
         """
-        return {
-            "size": len(self._cache),
-            "max_size": self.config.cache_size,
-        }
+        return self._get_cache().stats()
+
+
+_WORKER_ENCODER: Optional[VisionEncoder] = None
+
+
+def _worker_init(config: VisionEncoderConfig):
+    """Load the model once in the worker process."""
+    global _WORKER_ENCODER
+    _WORKER_ENCODER = VisionEncoder(config)
+    _WORKER_ENCODER._load_model()
+
+
+def _worker_encode(arrays: List[np.ndarray]) -> np.ndarray:
+    images = [Image.fromarray(array) for array in arrays]
+    return np.asarray(_WORKER_ENCODER.model.encode(images), dtype=np.float32)
 
 
 # Convenience function for quick usage
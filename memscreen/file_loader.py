@@ -6,9 +6,15 @@ handling various text encodings including UTF-8, GBK, GB2312, Big5, and more.
 """
 
 import os
+import re
 from typing import Optional, Tuple, List, Dict
 from pathlib import Path
 
+_LAYOUT_CHARS = str.maketrans('', '', '\n\r\t')
+_CHINESE_CHARS = re.compile('[\u4e00-\u9fff]')
+_JAPANESE_CHARS = re.compile('[\u3040-\u309f\u30a0-\u30ff]')
+_KOREAN_CHARS = re.compile('[\uac00-\ud7af\u1100-\u11ff]')
+
 
 class FileLoader:
     """Intelligent file loader with encoding detection."""
@@ -28,6 +34,12 @@ class FileLoader:
         'latin-1',    # Fallback (will never fail)
     ]
 
+    # Encoding detection only looks at the start of a file, and candidate
+    # decodings are scored on a prefix: large files cost about the same
+    # to classify as small ones.
+    DETECTION_BYTES = 64 * 1024
+    VALIDATION_CHARS = 64 * 1024
+
     @staticmethod
     def count_valid_characters(content: str) -> Dict[str, int]:
         """
@@ -38,38 +50,28 @@ class FileLoader:
         if not content:
             return {'total': 0, 'printable': 0, 'chinese': 0, 'japanese': 0, 'korean': 0, 'replacement': 0}
 
-        stats = {
-            'total': len(content),
-            'printable': 0,
-            'chinese': 0,
-            'japanese': 0,
-            'korean': 0,
-            'replacement': 0,
-        }
-
-        for char in content:
-            # Check for replacement character
-            if char == '\ufffd':
-                stats['replacement'] += 1
-                continue
-
-            # Count printable ASCII
-            if char.isprintable():
-                stats['printable'] += 1
+        # Replacement characters are not counted in any other category
+        replacement = content.count('\ufffd')
 
-            # Count Chinese characters (CJK Unified Ideographs)
-            if '\u4e00' <= char <= '\u9fff':
-                stats['chinese'] += 1
-
-            # Count Japanese-specific characters (Hiragana and Katakana)
-            elif '\u3040' <= char <= '\u309f' or '\u30a0' <= char <= '\u30ff':
-                stats['japanese'] += 1
-
-            # Count Korean characters (Hangul)
-            elif '\uac00' <= char <= '\ud7af' or '\u1100' <= char <= '\u11ff':
-                stats['korean'] += 1
+        # Printable characters; line breaks and tabs never are, and removing
+        # them usually lets one C-level isprintable() call cover the rest
+        layout_free = content.translate(_LAYOUT_CHARS)
+        if layout_free.isprintable():
+            printable = len(layout_free)
+        else:
+            printable = sum(1 for char in layout_free if char.isprintable())
 
-        return stats
+        return {
+            'total': len(content),
+            'printable': printable - replacement,
+            # CJK Unified Ideographs
+            'chinese': len(_CHINESE_CHARS.findall(content)),
+            # Japanese-specific characters (Hiragana and Katakana)
+            'japanese': len(_JAPANESE_CHARS.findall(content)),
+            # Korean characters (Hangul)
+            'korean': len(_KOREAN_CHARS.findall(content)),
+            'replacement': replacement,
+        }
 
     @staticmethod
     def detect_language(content: str) -> Optional[str]:
@@ -160,21 +162,28 @@ class FileLoader:
 
         return is_valid, score
 
-    @staticmethod
-    def detect_encoding(file_path: str) -> Optional[str]:
+    @classmethod
+    def detect_encoding(cls, file_path: str, sample: Optional[bytes] = None) -> Optional[str]:
         """
         Detect file encoding using charset-normalizer or chardet library.
 
         Args:
             file_path: Path to the file
+            sample: Leading bytes of the file, if already read
 
         Returns:
             Detected encoding name or None
         """
+        if sample is None:
+            with open(file_path, 'rb') as f:
+                sample = f.read(cls.DETECTION_BYTES)
+        else:
+            sample = sample[:cls.DETECTION_BYTES]
+
         # Try charset-normalizer first (more accurate)
         try:
-            from charset_normalizer import from_path
-            result = from_path(file_path)
+            from charset_normalizer import from_bytes
+            result = from_bytes(sample)
             if result:
                 best_match = result.best()
                 if best_match:
@@ -206,18 +215,16 @@ class FileLoader:
         # Fallback to chardet
         try:
             import chardet
-            with open(file_path, 'rb') as f:
-                raw_data = f.read(10000)  # Read first 10KB for detection
-                result = chardet.detect(raw_data)
-                encoding = result.get('encoding')
-                confidence = result.get('confidence', 0)
+            result = chardet.detect(sample[:10000])  # First 10KB is enough for chardet
+            encoding = result.get('encoding')
+            confidence = result.get('confidence', 0)
 
-                print(f"[FileLoader] Detected encoding (chardet): {encoding} (confidence: {confidence:.2f})")
+            print(f"[FileLoader] Detected encoding (chardet): {encoding} (confidence: {confidence:.2f})")
 
-                # Use detected encoding if confidence is reasonable
-                # Lower threshold to 0.2 to catch more encodings
-                if encoding and confidence > 0.2:
-                    return encoding
+            # Use detected encoding if confidence is reasonable
+            # Lower threshold to 0.2 to catch more encodings
+            if encoding and confidence > 0.2:
+                return encoding
         except ImportError:
             print("[FileLoader] chardet not installed, using fallback detection")
         except Exception as e:
@@ -252,6 +259,14 @@ class FileLoader:
         }
         return lang_map.get(encoding)
 
+    @staticmethod
+    def _decode(raw: bytes, encoding: str) -> str:
+        """Strictly decode file bytes with universal newlines, as text-mode ``open`` does."""
+        content = raw.decode(encoding)
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
     @classmethod
     def read_file(cls, file_path: str, encoding: Optional[str] = None) -> Tuple[str, str]:
         """
@@ -274,12 +289,15 @@ class FileLoader:
         if not os.path.isfile(file_path):
             raise ValueError(f"Not a file: {file_path}")
 
+        # Read once; every candidate encoding decodes these bytes
+        with open(file_path, 'rb') as f:
+            raw_content = f.read()
+
         # If encoding specified, try it first
         if encoding:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
-                is_valid, score = cls.validate_content(content, encoding)
+                content = cls._decode(raw_content, encoding)
+                is_valid, score = cls.validate_content(content[:cls.VALIDATION_CHARS], encoding)
                 if is_valid:
                     print(f"[FileLoader] Successfully read with specified encoding: {encoding} (score: {score:.2f})")
                     return content, encoding
@@ -289,7 +307,7 @@ class FileLoader:
                 print(f"[FileLoader] Failed to read with encoding {encoding}: {e}")
 
         # Detect encoding with charset-normalizer/chardet
-        detected_encoding = cls.detect_encoding(file_path)
+        detected_encoding = cls.detect_encoding(file_path, sample=raw_content)
 
         # Build prioritized encoding list
         encodings_to_try: List[str] = []
@@ -331,11 +349,10 @@ class FileLoader:
 
         for enc in encodings_to_try:
             try:
-                with open(file_path, 'r', encoding=enc) as f:
-                    content = f.read()
+                content = cls._decode(raw_content, enc)
 
                 # Validate and score content (with encoding context)
-                is_valid, score = cls.validate_content(content, enc)
+                is_valid, score = cls.validate_content(content[:cls.VALIDATION_CHARS], enc)
 
                 # Print status
                 if is_valid:
@@ -439,8 +456,6 @@ class FileLoader:
 
         # Last resort: read as binary and decode with error handling
         print("[FileLoader] All encodings failed, using binary fallback")
-        with open(file_path, 'rb') as f:
-            raw_content = f.read()
 
         # Try UTF-8 with error replacement
         try:
@@ -2,17 +2,65 @@
 Folder Batch Processor
 
 This module provides batch processing capabilities for folders,
-including recursive scanning, file filtering, and progress tracking.
+including recursive scanning, file filtering, and progress tracking,
+and incremental ingestion of a folder into memory.
 """
 
 import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Iterator, Optional, Callable, Tuple
 from threading import Lock
 
 from .file_loader import FileLoader
 
 
+def _load_file_record(file_path: str, root_folder: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a single file into a record (module level so process pools can run it).
+
+    Returns:
+        Dictionary with file info or None:
+        {
+            'path': str,              # Absolute path
+            'relative_path': str,     # Relative path
+            'filename': str,          # Filename
+            'content': str,           # File content
+            'encoding': str,          # Encoding
+            'size': int               # Size in bytes
+        }
+    """
+    try:
+        # Read file using FileLoader
+        content, encoding = FileLoader.read_file(file_path)
+        filename = FileLoader.get_filename(file_path)
+
+        # Get relative path
+        try:
+            relative_path = os.path.relpath(file_path, root_folder)
+        except ValueError:
+            # Windows cross-drive path
+            relative_path = file_path
+
+        # Get file size
+        size = len(content.encode('utf-8'))
+
+        return {
+            'path': file_path,
+            'relative_path': relative_path,
+            'filename': filename,
+            'content': content,
+            'encoding': encoding,
+            'size': size
+        }
+
+    except Exception as e:
+        print(f"[FolderProcessor] Failed to load {file_path}: {e}")
+        return None
+
+
 class FolderProcessor:
     """Batch processor for text files in folders."""
 
@@ -114,55 +162,36 @@ class FolderProcessor:
         self,
         recursive: bool = True,
         max_files: Optional[int] = None,
-        max_size_mb: Optional[float] = None
+        max_size_mb: Optional[float] = None,
+        max_workers: int = 4
     ) -> Dict[str, Any]:
         """
         Batch process all text files in folder.
 
+        Keeps every loaded file in ``results['success']``; use ``iter_files``
+        or ``ingest`` for folders too large to hold in memory.
+
         Args:
             recursive: Whether to recursively process subdirectories
             max_files: Maximum number of files to process (None = no limit)
             max_size_mb: Maximum total file size limit in MB (None = no limit)
+            max_workers: Number of files decoded concurrently
 
         Returns:
             Dictionary with processing results
         """
         # Scan files
-        file_list = self.scan_directory(recursive=recursive)
-
-        # Apply file count limit
-        if max_files and len(file_list) > max_files:
-            print(f"[FolderProcessor] Limiting to {max_files} files (found {len(file_list)})")
-            file_list = file_list[:max_files]
-
+        file_list = self._scan_limited(recursive, max_files)
         total = len(file_list)
         print(f"[FolderProcessor] Found {total} text files to process")
 
         if total == 0:
             return self.results
 
-        # Process files
-        for idx, file_path in enumerate(file_list, 1):
-            # Progress callback
-            if self.callback:
-                self.callback(idx, total, file_path, 'processing')
-
-            # Load file
-            file_data = self._load_file(file_path)
-
-            if file_data:
-                with self._lock:
-                    self.results['success'].append(file_data)
-                    self.results['total_size'] += file_data['size']
-
-                if self.callback:
-                    self.callback(idx, total, file_data['filename'], 'success')
-            else:
-                with self._lock:
-                    self.results['failed'].append(file_path)
-
-                if self.callback:
-                    self.callback(idx, total, os.path.basename(file_path), 'failed')
+        for file_data in self.iter_files(file_list, max_workers=max_workers):
+            with self._lock:
+                self.results['success'].append(file_data)
+                self.results['total_size'] += file_data['size']
 
         # Calculate total size in MB
         self.results['total_size_mb'] = self.results['total_size'] / (1024 * 1024)
@@ -177,6 +206,86 @@ class FolderProcessor:
 
         return self.results
 
+    def _scan_limited(self, recursive: bool, max_files: Optional[int]) -> List[str]:
+        """Scan the folder and apply the file count limit."""
+        file_list = self.scan_directory(recursive=recursive)
+        if max_files and len(file_list) > max_files:
+            print(f"[FolderProcessor] Limiting to {max_files} files (found {len(file_list)})")
+            file_list = file_list[:max_files]
+        return file_list
+
+    def iter_files(
+        self,
+        file_list: Optional[List[str]] = None,
+        max_workers: int = 4,
+        use_processes: bool = False,
+        skip: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield loaded file records in scan order without accumulating them.
+
+        Up to ``max_workers`` files are decoded concurrently and at most
+        ``2 * max_workers`` records are buffered ahead of the consumer.
+        Failed and skipped files are recorded in ``results`` and reported
+        through the callback instead of being yielded.
+
+        Args:
+            file_list: Files to load (None = scan the folder recursively)
+            max_workers: Number of files decoded concurrently
+            use_processes: Decode in worker processes instead of threads
+                (encoding scoring is CPU-bound Python)
+            skip: Predicate for files that should not be loaded, e.g. ones
+                already ingested
+
+        Yields:
+            File records as returned by ``_load_file``
+        """
+        if file_list is None:
+            file_list = self.scan_directory(recursive=True)
+        total = len(file_list)
+        max_workers = max(1, int(max_workers))
+        pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+
+        with pool_class(max_workers=max_workers) as executor:
+            in_flight: deque = deque()
+            paths = iter(enumerate(file_list, 1))
+
+            def submit_next() -> bool:
+                for idx, file_path in paths:
+                    if skip is not None and skip(file_path):
+                        with self._lock:
+                            self.results['skipped'].append(file_path)
+                        if self.callback:
+                            self.callback(idx, total, os.path.basename(file_path), 'skipped')
+                        continue
+                    if self.callback:
+                        self.callback(idx, total, file_path, 'processing')
+                    in_flight.append((idx, file_path, self._submit_load(executor, file_path)))
+                    return True
+                return False
+
+            while len(in_flight) < 2 * max_workers and submit_next():
+                pass
+            while in_flight:
+                idx, file_path, future = in_flight.popleft()
+                file_data = future.result()
+                submit_next()
+
+                if file_data:
+                    if self.callback:
+                        self.callback(idx, total, file_data['filename'], 'success')
+                    yield file_data
+                else:
+                    with self._lock:
+                        self.results['failed'].append(file_path)
+                    if self.callback:
+                        self.callback(idx, total, os.path.basename(file_path), 'failed')
+
+    def _submit_load(self, executor: Executor, file_path: str):
+        if isinstance(executor, ProcessPoolExecutor):
+            return executor.submit(_load_file_record, file_path, self.root_folder)
+        return executor.submit(self._load_file, file_path)
+
     def _load_file(self, file_path: str) -> Optional[Dict[str, Any]]:
         """
         Load a single file.
@@ -185,43 +294,209 @@ class FolderProcessor:
             file_path: File path (absolute path)
 
         Returns:
-            Dictionary with file info or None:
-            {
-                'path': str,              # Absolute path
-                'relative_path': str,     # Relative path
-                'filename': str,          # Filename
-                'content': str,           # File content
-                'encoding': str,          # Encoding
-                'size': int               # Size in bytes
-            }
+            Dictionary with file info or None (see ``_load_file_record``)
         """
-        try:
-            # Read file using FileLoader
-            content, encoding = FileLoader.read_file(file_path)
-            filename = FileLoader.get_filename(file_path)
+        return _load_file_record(file_path, self.root_folder)
 
-            # Get relative path
+    @staticmethod
+    def chunk_text(content: str, chunk_size: int = 2000, overlap: int = 200) -> List[str]:
+        """
+        Split text into chunks of at most ``chunk_size`` characters.
+
+        Chunks end at a line break when one falls in the second half of the
+        window, and consecutive chunks share ``overlap`` characters.
+        """
+        content = content.strip()
+        if not content:
+            return []
+        chunk_size = max(1, int(chunk_size))
+        overlap = max(0, min(int(overlap), chunk_size // 2))
+        chunks = []
+        start = 0
+        while start < len(content):
+            end = min(start + chunk_size, len(content))
+            if end < len(content):
+                newline = content.rfind('\n', start + chunk_size // 2, end)
+                if newline != -1:
+                    end = newline + 1
+            chunk = content[start:end].strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= len(content):
+                break
+            start = max(end - overlap, start + 1)
+        return chunks
+
+    def ingest(
+        self,
+        memory,
+        *,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        manifest=None,
+        recursive: bool = True,
+        max_files: Optional[int] = None,
+        chunk_size: int = 2000,
+        chunk_overlap: int = 200,
+        batch_size: int = 64,
+        max_workers: int = 4,
+        use_processes: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Stream the folder's text files into memory as chunked memories.
+
+        Files are decoded in parallel (``iter_files``), split with
+        ``chunk_text`` and stored ``batch_size`` chunks at a time through
+        ``memory.add_texts`` (one embedding batch and one vector insert per
+        batch), so only the chunks of the current batch are held in memory.
+
+        With a ``manifest`` (``IngestManifestRepository``), files whose size
+        and mtime match the recorded version are skipped without being read,
+        and the memories of a changed file are replaced once its new chunks
+        are stored. Memories of recorded files that were deleted, or that no
+        longer load, are removed along with their manifest entries. The
+        manifest is kept per ``user_id``/``agent_id``/``run_id`` scope.
+
+        Args:
+            memory: Memory instance to store into
+            user_id: User ID the memories belong to
+            agent_id: Agent ID the memories belong to
+            run_id: Run ID the memories belong to
+            manifest: Ingestion manifest for incremental re-runs (None = ingest everything)
+            recursive: Whether to recursively process subdirectories
+            max_files: Maximum number of files to process (None = no limit)
+            chunk_size: Maximum characters per memory
+            chunk_overlap: Characters shared by consecutive chunks
+            batch_size: Chunks per embedding/insert batch
+            max_workers: Number of files decoded concurrently
+            use_processes: Decode in worker processes instead of threads
+
+        Returns:
+            Ingestion summary (file, chunk and memory counts, timing)
+        """
+        started = time.perf_counter()
+        file_list = self._scan_limited(recursive, max_files)
+
+        file_stats: Dict[str, Tuple[int, int]] = {}
+        for file_path in file_list:
             try:
-                relative_path = os.path.relpath(file_path, self.root_folder)
-            except ValueError:
-                # Windows cross-drive path
-                relative_path = file_path
-
-            # Get file size
-            size = len(content.encode('utf-8'))
-
-            return {
-                'path': file_path,
-                'relative_path': relative_path,
-                'filename': filename,
-                'content': content,
-                'encoding': encoding,
-                'size': size
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            file_stats[file_path] = (stat.st_size, stat.st_mtime_ns)
+        scope = "|".join(
+            f"{key}={value}"
+            for key, value in (("user_id", user_id), ("agent_id", agent_id), ("run_id", run_id))
+            if value
+        )
+        recorded = manifest.get_many(file_list, scope) if manifest is not None else {}
+
+        def unchanged(file_path: str) -> bool:
+            entry = recorded.get(file_path)
+            return entry is not None and entry[:2] == file_stats.get(file_path)
+
+        summary = {'files': 0, 'skipped': 0, 'failed': 0, 'chunks': 0, 'memories': 0, 'replaced': 0, 'removed': 0}
+        skipped_before = len(self.results['skipped'])
+        failed_before = len(self.results['failed'])
+        batch_size = max(1, int(batch_size))
+        pending: List[Tuple[str, str, Dict[str, Any]]] = []  # (path, chunk, metadata)
+        open_files: Dict[str, Dict[str, Any]] = {}  # files with chunks not yet stored
+
+        def delete_memories(memory_ids: List[str]):
+            for memory_id in memory_ids:
+                try:
+                    memory.delete(memory_id)
+                except Exception as e:
+                    print(f"[FolderProcessor] Failed to delete stale memory {memory_id}: {e}")
+
+        def finish_files(done: List[str]):
+            rows = []
+            for file_path in done:
+                state = open_files.pop(file_path)
+                old_ids = recorded.get(file_path, (0, 0, []))[2]
+                delete_memories(old_ids)
+                summary['replaced'] += len(old_ids)
+                size, mtime_ns = file_stats.get(file_path, (0, 0))
+                rows.append((file_path, size, mtime_ns, state['ids'], time.time()))
+            if manifest is not None:
+                manifest.record_many(rows, scope)
+
+        def flush(count: int):
+            batch, pending[:count] = pending[:count], []
+            if not batch:
+                return
+            ids = memory.add_texts(
+                [chunk for _, chunk, _ in batch],
+                user_id=user_id,
+                agent_id=agent_id,
+                run_id=run_id,
+                metadatas=[metadata for _, _, metadata in batch],
+            )
+            summary['memories'] += len(ids)
+            done = []
+            for (file_path, _, _), memory_id in zip(batch, ids):
+                state = open_files[file_path]
+                state['ids'].append(memory_id)
+                state['left'] -= 1
+                if state['left'] == 0:
+                    done.append(file_path)
+            finish_files(done)
+
+        records = self.iter_files(
+            file_list,
+            max_workers=max_workers,
+            use_processes=use_processes,
+            skip=unchanged if recorded else None,
+        )
+        for record in records:
+            chunks = self.chunk_text(record['content'], chunk_size, chunk_overlap)
+            summary['files'] += 1
+            summary['chunks'] += len(chunks)
+            open_files[record['path']] = {'ids': [], 'left': len(chunks)}
+            if not chunks:
+                finish_files([record['path']])
+                continue
+            for index, chunk in enumerate(chunks):
+                pending.append((record['path'], chunk, {
+                    'source': 'folder',
+                    'file_path': record['path'],
+                    'relative_path': record['relative_path'],
+                    'filename': record['filename'],
+                    'encoding': record['encoding'],
+                    'chunk_index': index,
+                    'chunk_count': len(chunks),
+                }))
+            while len(pending) >= batch_size:
+                flush(batch_size)
+        flush(len(pending))
+
+        if manifest is not None:
+            # Files that now fail to load, and recorded files that are gone
+            # (files merely outside this scan, e.g. past max_files, are kept).
+            orphaned = {
+                path: recorded[path][2]
+                for path in self.results['failed'][failed_before:]
+                if path in recorded
             }
-
-        except Exception as e:
-            print(f"[FolderProcessor] Failed to load {file_path}: {e}")
-            return None
+            for path, memory_ids in manifest.list_under(self.root_folder, scope).items():
+                if path not in file_stats and not os.path.isfile(path):
+                    orphaned[path] = memory_ids
+            for memory_ids in orphaned.values():
+                delete_memories(memory_ids)
+                summary['removed'] += len(memory_ids)
+            manifest.delete_many(orphaned, scope)
+
+        summary['skipped'] = len(self.results['skipped']) - skipped_before
+        summary['failed'] = len(self.results['failed']) - failed_before
+        summary['elapsed'] = time.perf_counter() - started
+        summary['files_per_sec'] = summary['files'] / summary['elapsed'] if summary['elapsed'] > 0 else 0.0
+        print(
+            f"[FolderProcessor] Ingested {summary['files']} files as {summary['memories']} memories "
+            f"({summary['skipped']} unchanged, {summary['failed']} failed, "
+            f"{summary['removed']} stale memories removed) in {summary['elapsed']:.2f}s"
+        )
+        return summary
 
     def get_summary(self) -> str:
         """
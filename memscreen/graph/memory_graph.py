@@ -12,9 +12,10 @@ Simple graph store implementation using NetworkX or in-memory data structures.
 
 import uuid
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from itertools import count
+from typing import Iterable, List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
-from collections import defaultdict, deque
+from collections import defaultdict
 
 from .base import BaseGraphStore
 from .models import GraphNode, GraphEdge, NodeType, EdgeType
@@ -28,6 +29,11 @@ class MemoryGraphStore(BaseGraphStore):
 
     Stores nodes and edges in memory with fast lookup.
     Suitable for development and small to medium datasets.
+
+    ``search_nodes`` is served from a character-trigram index over lowercased
+    labels and string properties (substring semantics are preserved) and a
+    property-value index for ``filters``. Both are maintained by add_node and
+    delete_node, so re-add a node after mutating its label or properties.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -41,6 +47,15 @@ class MemoryGraphStore(BaseGraphStore):
         self.nodes: Dict[str, GraphNode] = {}
         self.edges: Dict[str, GraphEdge] = {}
         self.adjacency: Dict[str, List[Tuple[str, str]]] = defaultdict(list)  # node_id -> [(neighbor_id, edge_id)]
+        self.incoming: Dict[str, List[Tuple[str, str]]] = defaultdict(list)  # node_id -> [(source_id, edge_id)]
+
+        # Search indexes
+        self._insertion_seq = count()
+        self._node_seq: Dict[str, int] = {}
+        self._search_text: Dict[str, List[str]] = {}
+        self._property_keys: Dict[str, List[Tuple[str, Any]]] = {}
+        self._trigram_index: Dict[str, Set[str]] = defaultdict(set)
+        self._property_index: Dict[Tuple[str, Any], Set[str]] = defaultdict(set)
 
     def add_node(self, node: GraphNode) -> str:
         """Add a node to the graph."""
@@ -50,7 +65,10 @@ class MemoryGraphStore(BaseGraphStore):
         if not node.created_at:
             node.created_at = datetime.now().isoformat()
 
+        if node.id in self.nodes:
+            self._unindex_node(node.id)
         self.nodes[node.id] = node
+        self._index_node(node)
         logger.debug(f"Added node: {node.id} - {node.label}")
         return node.id
 
@@ -73,6 +91,7 @@ class MemoryGraphStore(BaseGraphStore):
 
         self.edges[edge.id] = edge
         self.adjacency[edge.source].append((edge.target, edge.id))
+        self.incoming[edge.target].append((edge.source, edge.id))
 
         # For undirected graphs, also add reverse edge
         # Uncomment if you want bidirectional relationships:
@@ -107,27 +126,34 @@ class MemoryGraphStore(BaseGraphStore):
         Simple text-based search on node labels and properties.
         """
         query_lower = query.lower()
-        results = []
 
-        for node in self.nodes.values():
-            # Search in label
-            if query_lower in node.label.lower():
-                if filters is None or all(
-                    node.properties.get(k) == v for k, v in filters.items()
-                ):
-                    results.append(node)
-                    continue
-
-            # Search in properties
-            for key, value in node.properties.items():
-                if isinstance(value, str) and query_lower in value.lower():
-                    if filters is None or all(
-                        node.properties.get(k) == v for k, v in filters.items()
-                    ):
-                        results.append(node)
-                        break
-
-        return results[:limit]
+        candidates = self._filter_candidates(filters)
+        grams = self._trigrams(query_lower)
+        if grams:
+            postings = sorted((self._trigram_index.get(gram, set()) for gram in grams), key=len)
+            matched = set(postings[0])
+            for posting in postings[1:]:
+                matched &= posting
+                if not matched:
+                    return []
+            candidates = matched if candidates is None else candidates & matched
+
+        if candidates is None:
+            ordered: Iterable[str] = self.nodes.keys()
+        else:
+            ordered = sorted(candidates, key=self._node_seq.__getitem__)
+
+        results = []
+        for node_id in ordered:
+            node = self.nodes[node_id]
+            if not any(query_lower in text for text in self._search_text[node_id]):
+                continue
+            if filters is not None and not self._matches_filters(node, filters):
+                continue
+            results.append(node)
+            if len(results) >= limit:
+                break
+        return results
 
     def find_path(self, source_id: str, target_id: str, max_depth: int = 3) -> List[GraphNode]:
         """
@@ -144,49 +170,54 @@ class MemoryGraphStore(BaseGraphStore):
         if source_id not in self.nodes or target_id not in self.nodes:
             return []
 
-        # BFS to find shortest path
-        queue = deque([(source_id, [source_id])])
-        visited = {source_id}
-
-        while queue:
-            current_id, path = queue.popleft()
-
-            if current_id == target_id:
-                return [self.nodes[node_id] for node_id in path]
-
-            if len(path) >= max_depth + 1:
-                continue
-
-            for neighbor_id, _ in self.adjacency[current_id]:
-                if neighbor_id not in visited:
-                    visited.add(neighbor_id)
-                    queue.append((neighbor_id, path + [neighbor_id]))
-
-        return []  # No path found
+        # Level-by-level BFS with parent pointers instead of per-step path copies
+        parents: Dict[str, Optional[str]] = {source_id: None}
+        frontier = [source_id]
+        depth = 0
+        while frontier and target_id not in parents and depth < max_depth:
+            next_frontier = []
+            for current_id in frontier:
+                for neighbor_id, _ in self.adjacency.get(current_id, ()):
+                    if neighbor_id not in parents:
+                        parents[neighbor_id] = current_id
+                        next_frontier.append(neighbor_id)
+            frontier = next_frontier
+            depth += 1
+
+        if target_id not in parents:
+            return []  # No path found
+
+        path = []
+        node_id: Optional[str] = target_id
+        while node_id is not None:
+            path.append(self.nodes[node_id])
+            node_id = parents[node_id]
+        path.reverse()
+        return path
 
     def delete_node(self, node_id: str) -> bool:
         """Delete a node and its edges."""
         if node_id not in self.nodes:
             return False
 
-        # Delete all edges connected to this node
-        edges_to_delete = []
-        for edge_id, edge in self.edges.items():
-            if edge.source == node_id or edge.target == node_id:
-                edges_to_delete.append(edge_id)
-
-        for edge_id in edges_to_delete:
-            del self.edges[edge_id]
-
-        # Remove from adjacency lists
-        if node_id in self.adjacency:
-            del self.adjacency[node_id]
-
-        for node_id_key in self.adjacency:
-            self.adjacency[node_id_key] = [
-                (nid, eid) for nid, eid in self.adjacency[node_id_key]
-                if nid != node_id
-            ]
+        # Delete all edges connected to this node, touching only its neighbours
+        outgoing = self.adjacency.pop(node_id, [])
+        incoming = self.incoming.pop(node_id, [])
+        for neighbor_id, edge_id in outgoing:
+            self.edges.pop(edge_id, None)
+            if neighbor_id in self.incoming:
+                self.incoming[neighbor_id] = [
+                    (sid, eid) for sid, eid in self.incoming[neighbor_id] if sid != node_id
+                ]
+        for source_id, edge_id in incoming:
+            self.edges.pop(edge_id, None)
+            if source_id in self.adjacency:
+                self.adjacency[source_id] = [
+                    (nid, eid) for nid, eid in self.adjacency[source_id] if nid != node_id
+                ]
+
+        self._unindex_node(node_id)
+        self._node_seq.pop(node_id, None)
 
         # Delete node
         del self.nodes[node_id]
@@ -201,14 +232,21 @@ class MemoryGraphStore(BaseGraphStore):
             self.nodes.clear()
             self.edges.clear()
             self.adjacency.clear()
+            self.incoming.clear()
+            self._node_seq.clear()
+            self._search_text.clear()
+            self._property_keys.clear()
+            self._trigram_index.clear()
+            self._property_index.clear()
             logger.info("Cleared all nodes and edges")
             return True
 
         # Delete nodes matching filters
-        nodes_to_delete = []
-        for node_id, node in self.nodes.items():
-            if all(node.properties.get(k) == v for k, v in filters.items()):
-                nodes_to_delete.append(node_id)
+        candidates = self._filter_candidates(filters)
+        nodes_to_delete = [
+            node_id for node_id in (self.nodes if candidates is None else candidates)
+            if self._matches_filters(self.nodes[node_id], filters)
+        ]
 
         for node_id in nodes_to_delete:
             self.delete_node(node_id)
@@ -216,6 +254,75 @@ class MemoryGraphStore(BaseGraphStore):
         logger.info(f"Deleted {len(nodes_to_delete)} nodes matching filters")
         return True
 
+    # ==================== Index maintenance ====================
+
+    @staticmethod
+    def _trigrams(text: str) -> Set[str]:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @staticmethod
+    def _property_key(key: str, value: Any) -> Optional[Tuple[str, Any]]:
+        # None also matches nodes without the key, so it cannot be indexed
+        if value is None:
+            return None
+        try:
+            hash(value)
+        except TypeError:
+            return None
+        return (key, value)
+
+    @staticmethod
+    def _matches_filters(node: GraphNode, filters: Dict[str, Any]) -> bool:
+        return all(node.properties.get(k) == v for k, v in filters.items())
+
+    def _filter_candidates(self, filters: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """Intersect property-index postings for filters; None means no narrowing."""
+        if not filters:
+            return None
+        candidates: Optional[Set[str]] = None
+        for key, value in filters.items():
+            index_key = self._property_key(key, value)
+            if index_key is None:
+                continue
+            posting = self._property_index.get(index_key, set())
+            candidates = set(posting) if candidates is None else candidates & posting
+            if not candidates:
+                return set()
+        return candidates
+
+    def _index_node(self, node: GraphNode) -> None:
+        texts = [node.label.lower()]
+        texts.extend(v.lower() for v in node.properties.values() if isinstance(v, str))
+        # A replaced node keeps its sequence number, matching its position in self.nodes.
+        if node.id not in self._node_seq:
+            self._node_seq[node.id] = next(self._insertion_seq)
+        self._search_text[node.id] = texts
+        for gram in set().union(*(self._trigrams(text) for text in texts)):
+            self._trigram_index[gram].add(node.id)
+        index_keys = []
+        for key, value in node.properties.items():
+            index_key = self._property_key(key, value)
+            if index_key is not None:
+                self._property_index[index_key].add(node.id)
+                index_keys.append(index_key)
+        self._property_keys[node.id] = index_keys
+
+    def _unindex_node(self, node_id: str) -> None:
+        # Unindex from what was indexed: the node object may have been mutated since.
+        texts = self._search_text.pop(node_id, [])
+        for gram in set().union(*(self._trigrams(text) for text in texts)):
+            posting = self._trigram_index.get(gram)
+            if posting is not None:
+                posting.discard(node_id)
+                if not posting:
+                    del self._trigram_index[gram]
+        for index_key in self._property_keys.pop(node_id, []):
+            posting = self._property_index.get(index_key)
+            if posting is not None:
+                posting.discard(node_id)
+                if not posting:
+                    del self._property_index[index_key]
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get graph statistics."""
         return {
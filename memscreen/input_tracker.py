@@ -25,7 +25,7 @@ from memscreen.macos_permissions import (
     check_accessibility_permission,
     check_input_monitoring_permission,
 )
-from memscreen.storage import InputEventRepository
+from memscreen.storage import InputEventRepository, InputEventWriter
 
 
 class InputTracker:
@@ -35,7 +35,7 @@ class InputTracker:
     Features:
     - Captures all keyboard and mouse events
     - Stores in SQLite database for later analysis
-    - Minimal performance impact
+    - Batched background writes keep listener callbacks non-blocking
     - Thread-safe operation
     """
 
@@ -59,6 +59,7 @@ class InputTracker:
             "MEMSCREEN_TRACK_MOUSE_SCROLL", ""
         ).strip().lower() in {"1", "true", "yes", "on"}
         self.event_repo = InputEventRepository(self.db_path)
+        self.event_writer = InputEventWriter(self.event_repo)
 
         # Initialize database
         self._init_database()
@@ -74,7 +75,7 @@ class InputTracker:
 
     def _log_event(self, event_type: str, action: str, content: str = "", details: str = ""):
         """
-        Log an event to the database
+        Queue an event for the background database writer
 
         Args:
             event_type: 'keyboard' or 'mouse'
@@ -82,20 +83,14 @@ class InputTracker:
             content: The key or button name
             details: Additional details (position, modifiers, etc.)
         """
-        try:
-            local_time = datetime.datetime.now().astimezone().isoformat(timespec="seconds")
-            self.event_repo.insert_event(
-                event_type=event_type,
-                action=action,
-                content=content,
-                details=details,
-                operate_time=local_time,
-            )
-            print(f"[DEBUG] Event logged: {event_type} - {action}")  # Debug log
-        except Exception as e:
-            print(f"[ERROR] Failed to log event: {e}")
-            import traceback
-            traceback.print_exc()
+        local_time = datetime.datetime.now().astimezone().isoformat(timespec="seconds")
+        self.event_writer.submit(
+            event_type=event_type,
+            action=action,
+            content=content,
+            details=details,
+            operate_time=local_time,
+        )
 
     def _on_keyboard_press(self, key):
         """Handle keyboard press event"""
@@ -106,7 +101,6 @@ class InputTracker:
                 key_name = key.name
             else:
                 key_name = str(key)
-            print(f"[DEBUG] Keyboard press: {key_name}")  # Debug log
             self._log_event("keyboard", "press", key_name, "")
         except Exception as e:
             print(f"[ERROR] Keyboard press error: {e}")
@@ -214,6 +208,7 @@ class InputTracker:
             print("       Also grant Input Monitoring to the runtime process for keyboard events.")
 
         self.is_tracking = True
+        self.event_writer.start()
         startup_errors = []
         ready_events = []
 
@@ -308,11 +303,17 @@ class InputTracker:
             self.keyboard_listener.stop()
             print("[INFO] Keyboard listener stopped")
 
+        self.event_writer.stop()
+        stats = self.event_writer.stats()
+        if stats["dropped"]:
+            print(f"[WARNING] Dropped {stats['dropped']} input events under backpressure")
+
         print("[INFO] Input tracking stopped")
 
     def get_latest_event_id(self) -> int:
         """Return current max event id in storage."""
         try:
+            self.event_writer.flush()
             return self.event_repo.get_latest_event_id()
         except Exception as e:
             print(f"[ERROR] Failed to get latest event id: {e}")
@@ -329,6 +330,8 @@ class InputTracker:
             List of event dictionaries
         """
         try:
+            # Make queued events visible before reading
+            self.event_writer.flush()
             return self.event_repo.list_recent_events(limit=limit, since_id=since_id)
         except Exception as e:
             print(f"[ERROR] Failed to get recent events: {e}")
@@ -5,7 +5,7 @@
 ### license: MIT                 ###
 
 import os
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 
 from ollama import Client
 
@@ -185,6 +185,7 @@ class OllamaLLM(LLMBase):
         response_format=None,
         tools: Optional[List[Dict]] = None,
         tool_choice: str = "auto",
+        stream_callback: Optional[Callable[[str], None]] = None,
         **kwargs,
     ):
         """
@@ -195,6 +196,8 @@ class OllamaLLM(LLMBase):
             response_format (str or object, optional): Format of the response. Defaults to "text".
             tools (list, optional): List of tools that the model can call. Defaults to None.
             tool_choice (str, optional): Tool choice method. Defaults to "auto".
+            stream_callback (callable, optional): If given, the reply is streamed and each
+                text delta is passed to it as it arrives. The full text is still returned.
             **kwargs: Additional Ollama-specific parameters.
 
         Returns:
@@ -230,6 +233,16 @@ class OllamaLLM(LLMBase):
         # Remove OpenAI-specific parameters that Ollama doesn't support
         params.pop("max_tokens", None)  # Ollama uses different parameter names
 
+        if stream_callback is not None and not tools:
+            parts: List[str] = []
+            for part in self.client.chat(**params, stream=True):
+                message = part["message"] if isinstance(part, dict) else part.message
+                delta = (message["content"] if isinstance(message, dict) else message.content) or ""
+                if delta:
+                    parts.append(delta)
+                    stream_callback(delta)
+            return "".join(parts)
+
         response = self.client.chat(**params)
         return self._parse_response(response, tools)
 
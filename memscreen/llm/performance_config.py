@@ -5,7 +5,8 @@ Provides optimized settings for different use cases
 
 from typing import Dict, Optional, List
 from dataclasses import dataclass
-import time
+
+from ..cache import get_cache_registry
 
 
 @dataclass
@@ -61,7 +62,12 @@ class PerformanceOptimizer:
 
     def __init__(self, config: Optional[ModelPerformanceConfig] = None):
         self.config = config or ModelPerformanceConfig()
-        self.cache = {}
+        # Response cache with LRU + TTL eviction, bounded by the shared cache budget
+        self.cache = get_cache_registry().private_namespace(
+            "llm.responses",
+            max_entries=self.config.cache_max_size,
+            ttl=self.config.cache_ttl,
+        )
         self.performance_stats = {
             "total_requests": 0,
             "cache_hits": 0,
@@ -163,33 +169,18 @@ class PerformanceOptimizer:
         if not self.config.enable_cache:
             return None
 
-        if cache_key in self.cache:
-            cached_data = self.cache[cache_key]
-            # Check if cache is still valid
-            if time.time() - cached_data["timestamp"] < self.config.cache_ttl:
-                self.performance_stats["cache_hits"] += 1
-                return cached_data["response"]
-            else:
-                # Remove expired cache
-                del self.cache[cache_key]
-
-        return None
+        # Expired entries are dropped by the cache on lookup
+        response = self.cache.get(cache_key)
+        if response is not None:
+            self.performance_stats["cache_hits"] += 1
+        return response
 
     def add_to_cache(self, cache_key: str, response: str):
         """Add response to cache"""
         if not self.config.enable_cache:
             return
 
-        # Implement LRU cache if size exceeds limit
-        if len(self.cache) >= self.config.cache_max_size:
-            # Remove oldest entry
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k]["timestamp"])
-            del self.cache[oldest_key]
-
-        self.cache[cache_key] = {
-            "response": response,
-            "timestamp": time.time(),
-        }
+        self.cache.set(cache_key, response)
 
     def track_performance(self, duration: float):
         """Track performance metrics"""
@@ -16,9 +16,14 @@ This module implements a three-level conflict detection system:
 import hashlib
 import logging
 import json
-from typing import Dict, List, Optional, Literal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Literal, Tuple
 from datetime import datetime
-from collections import OrderedDict
+
+import numpy as np
+
+from ..cache import get_cache_registry
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +41,7 @@ class ConflictResolverConfig:
         similarity_threshold: Threshold for semantic similarity (0-1)
         enable_llm_check: Enable LLM-based conflict detection
         llm_cache_size: Size of LLM result cache
+        llm_max_workers: Concurrent LLM checks when analysing a batch
     """
 
     def __init__(
@@ -43,10 +49,12 @@ class ConflictResolverConfig:
         similarity_threshold: float = 0.95,
         enable_llm_check: bool = True,
         llm_cache_size: int = 1000,
+        llm_max_workers: int = 4,
     ):
         self.similarity_threshold = similarity_threshold
         self.enable_llm_check = enable_llm_check
         self.llm_cache_size = llm_cache_size
+        self.llm_max_workers = llm_max_workers
 
 
 class ConflictResolver:
@@ -103,9 +111,12 @@ class ConflictResolver:
         self.llm = llm
         self.config = config
 
-        # LRU cache for LLM conflict checks
-        self._conflict_cache = OrderedDict()
+        # LRU cache for LLM conflict checks, bounded by the shared cache budget
+        self._conflict_cache = get_cache_registry().private_namespace(
+            "conflict_resolver", max_entries=config.llm_cache_size
+        )
         self._cache_max_size = config.llm_cache_size
+        self.last_batch_stats: Dict[str, Any] = {}
 
         logger.info(
             f"ConflictResolver initialized "
@@ -138,54 +149,188 @@ class ConflictResolver:
             - resolution: str (suggested action)
             - existing_memory: Dict
         """
-        conflicts = []
-
-        # Generate hash for new memory
-        new_hash = hashlib.md5(new_memory.encode()).hexdigest()
-        new_embedding = self.embedding_model.embed(new_memory, "add")
-
-        for mem in existing_memories:
-            # Level 1: Hash-based duplicate detection
-            mem_hash = mem.get('hash')
-            if mem_hash and mem_hash == new_hash:
-                conflicts.append({
-                    'memory_id': mem['id'],
-                    'conflict_type': 'duplicate',
-                    'confidence': 1.0,
-                    'resolution': 'skip',
-                    'existing_memory': mem,
-                })
-                logger.info(f"Exact duplicate detected: {mem['id'][:8]}")
-                continue  # Exact duplicate, no need for further checks
-
-            # Level 2: Semantic similarity
-            mem_embedding = mem.get('embedding')
-            if mem_embedding:
-                similarity = self._cosine_similarity(new_embedding, mem_embedding)
-
-                if similarity >= self.config.similarity_threshold:
-                    # Level 3: LLM-based conflict detection
-                    if self.config.enable_llm_check:
-                        conflict_detail = self._llm_conflict_check(
-                            new_memory, mem['data']
-                        )
-                    else:
-                        # Fallback without LLM
-                        conflict_detail = {
-                            'type': 'equivalent',
-                            'confidence': similarity,
-                            'suggestion': 'skip',
-                        }
-
-                    conflicts.append({
-                        'memory_id': mem['id'],
-                        'conflict_type': conflict_detail['type'],
-                        'confidence': conflict_detail['confidence'],
-                        'resolution': conflict_detail['suggestion'],
-                        'existing_memory': mem,
-                    })
-
-        return conflicts
+        return self.detect_conflicts_batch([new_memory], existing_memories)[0]
+
+    def detect_conflicts_batch(
+        self,
+        new_memories: List[str],
+        existing_memories: List[Dict],
+    ) -> List[List[Dict]]:
+        """
+        Detect conflicts for several new memories against the same candidates.
+
+        New memories are embedded with one ``embed_batch`` call, as are
+        candidates that arrive without an embedding. Exact duplicates are
+        found by hash lookup; every other pair is scored at once with a
+        float32 cosine-similarity matrix. Pairs above the threshold go to
+        the LLM through a bounded thread pool (cached verdicts are reused).
+        Throughput is recorded in ``last_batch_stats``.
+
+        Args:
+            new_memories: New memory contents
+            existing_memories: Candidates, as accepted by ``detect_conflict``
+
+        Returns:
+            One conflict list per new memory, in input order
+        """
+        started = time.perf_counter()
+        results: List[List[Dict]] = [[] for _ in new_memories]
+        if not new_memories or not existing_memories:
+            self._record_batch_stats(len(new_memories), len(existing_memories), 0, 0, 0, started)
+            return results
+
+        # Level 1: exact duplicates via hash lookup
+        by_hash: Dict[str, List[int]] = {}
+        for j, mem in enumerate(existing_memories):
+            mem_hash = mem.get('hash') or hashlib.md5(str(mem.get('data', '')).encode()).hexdigest()
+            by_hash.setdefault(mem_hash, []).append(j)
+        duplicates = set()
+        for i, text in enumerate(new_memories):
+            for j in by_hash.get(hashlib.md5(text.encode()).hexdigest(), ()):
+                duplicates.add((i, j))
+
+        # Level 2: semantic similarity for every remaining pair at once
+        similarity = self._similarity_matrix(new_memories, existing_memories)
+        rows, cols = np.nonzero(similarity >= self.config.similarity_threshold)
+        similar = [(int(i), int(j)) for i, j in zip(rows, cols) if (int(i), int(j)) not in duplicates]
+
+        # Level 3: LLM analysis of the ambiguous pairs
+        details, llm_calls = self._check_pairs(new_memories, existing_memories, similar, similarity)
+
+        found: List[Tuple[int, int, Dict]] = [
+            (i, j, {'type': 'duplicate', 'confidence': 1.0, 'suggestion': 'skip'})
+            for i, j in duplicates
+        ]
+        found.extend((i, j, details[(i, j)]) for i, j in similar)
+        found.sort(key=lambda item: (item[0], item[1]))
+        for i, j, detail in found:
+            mem = existing_memories[j]
+            if (i, j) in duplicates:
+                logger.info(f"Exact duplicate detected: {str(mem['id'])[:8]}")
+            results[i].append({
+                'memory_id': mem['id'],
+                'conflict_type': detail['type'],
+                'confidence': detail['confidence'],
+                'resolution': detail['suggestion'],
+                'existing_memory': mem,
+            })
+
+        self._record_batch_stats(
+            len(new_memories), len(existing_memories), len(duplicates), len(similar), llm_calls, started
+        )
+        return results
+
+    def _similarity_matrix(self, new_memories: List[str], existing_memories: List[Dict]) -> np.ndarray:
+        """
+        Cosine similarity of every (new, existing) pair; missing vectors score 0.
+
+        Stored embeddings whose length differs from the current model's (e.g.
+        written by another embedding model) are re-embedded from their text.
+        """
+        missing = [j for j, mem in enumerate(existing_memories) if not self._has_embedding(mem)]
+        vectors = self._embed_many(
+            list(new_memories) + [str(existing_memories[j].get('data', '')) for j in missing]
+        )
+        computed = dict(zip(missing, vectors[len(new_memories):]))
+        new_vectors = vectors[:len(new_memories)]
+        dims = len(new_vectors[0]) if new_vectors else 0
+
+        stale = [
+            j for j, mem in enumerate(existing_memories)
+            if j not in computed and len(mem['embedding']) != dims
+        ]
+        if stale:
+            logger.info(f"Re-embedding {len(stale)} candidates with mismatched embedding dimensions")
+            computed.update(zip(stale, self._embed_many(
+                [str(existing_memories[j].get('data', '')) for j in stale]
+            )))
+        candidates = [
+            computed[j] if j in computed else existing_memories[j]['embedding']
+            for j in range(len(existing_memories))
+        ]
+        return self._normalized(new_vectors, dims) @ self._normalized(candidates, dims).T
+
+    @staticmethod
+    def _has_embedding(mem: Dict) -> bool:
+        embedding = mem.get('embedding')
+        return embedding is not None and len(embedding) > 0
+
+    def _embed_many(self, texts: List[str]) -> List[Any]:
+        if not texts:
+            return []
+        embed_batch = getattr(self.embedding_model, "embed_batch", None)
+        if embed_batch is not None:
+            return list(embed_batch(texts, "add"))
+        return [self.embedding_model.embed(text, "add") for text in texts]
+
+    @staticmethod
+    def _normalized(vectors: List[Any], dims: int) -> np.ndarray:
+        """Stack vectors into a float32 matrix of unit rows; zero or wrong-length rows stay zero."""
+        if all(vector is not None and len(vector) == dims for vector in vectors):
+            matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), dims)
+        else:
+            matrix = np.zeros((len(vectors), dims), dtype=np.float32)
+            for row, vector in enumerate(vectors):
+                if vector is not None and len(vector) == dims:
+                    matrix[row] = np.asarray(vector, dtype=np.float32).ravel()
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def _check_pairs(
+        self,
+        new_memories: List[str],
+        existing_memories: List[Dict],
+        pairs: List[Tuple[int, int]],
+        similarity: np.ndarray,
+    ) -> Tuple[Dict[Tuple[int, int], Dict], int]:
+        """Classify similar pairs, running uncached LLM checks concurrently."""
+        if not self.config.enable_llm_check:
+            # Fallback without LLM
+            return {
+                (i, j): {'type': 'equivalent', 'confidence': float(similarity[i, j]), 'suggestion': 'skip'}
+                for i, j in pairs
+            }, 0
+
+        details: Dict[Tuple[int, int], Dict] = {}
+        pending: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for i, j in pairs:
+            texts = (new_memories[i], str(existing_memories[j].get('data', '')))
+            cached = self._conflict_cache.get(self._conflict_cache_key(*texts))
+            if cached is not None:
+                details[(i, j)] = cached
+            else:
+                pending.setdefault(texts, []).append((i, j))
+
+        if pending:
+            workers = max(1, min(int(self.config.llm_max_workers), len(pending)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="conflict-llm") as pool:
+                verdicts = pool.map(lambda texts: self._llm_conflict_check(*texts), list(pending))
+                for texts, verdict in zip(list(pending), verdicts):
+                    for pair in pending[texts]:
+                        details[pair] = verdict
+        return details, len(pending)
+
+    def _record_batch_stats(
+        self,
+        new_count: int,
+        existing_count: int,
+        duplicates: int,
+        similar: int,
+        llm_calls: int,
+        started: float,
+    ) -> None:
+        elapsed = time.perf_counter() - started
+        pairs = new_count * existing_count
+        self.last_batch_stats = {
+            "new_memories": new_count,
+            "existing_memories": existing_count,
+            "pairs_checked": pairs,
+            "duplicates": duplicates,
+            "similar_pairs": similar,
+            "llm_calls": llm_calls,
+            "elapsed": elapsed,
+            "pairs_per_sec": pairs / elapsed if elapsed > 0 else 0.0,
+        }
 
     def resolve_conflict(
         self,
@@ -276,9 +421,10 @@ class ConflictResolver:
             Conflict details dict
         """
         # Check cache
-        cache_key = f"{hash(new_memory)}:{hash(existing_memory)}"
-        if cache_key in self._conflict_cache:
-            return self._conflict_cache[cache_key]
+        cache_key = self._conflict_cache_key(new_memory, existing_memory)
+        cached = self._conflict_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Build prompt
         prompt = f"""Analyze the relationship between these two statements:
@@ -370,41 +516,12 @@ Keep it concise but complete."""
             return f"{mem1} {mem2}"
 
     @staticmethod
-    def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
-        """
-        Calculate cosine similarity between two vectors.
-
-        Args:
-            vec1: First vector
-            vec2: Second vector
-
-        Returns:
-            Similarity score between 0 and 1
-        """
-        import math
-
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(b * b for b in vec2))
-
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0.0
-
-        return dot_product / (magnitude1 * magnitude2)
+    def _conflict_cache_key(new_memory: str, existing_memory: str) -> str:
+        return f"{hash(new_memory)}:{hash(existing_memory)}"
 
     def _add_to_cache(self, key: str, value: Dict):
-        """Add item to LRU cache."""
-        # Remove if exists
-        if key in self._conflict_cache:
-            del self._conflict_cache[key]
-
-        # Add to cache
-        self._conflict_cache[key] = value
-
-        # Enforce size limit
-        while len(self._conflict_cache) > self._cache_max_size:
-            # Remove oldest (first item)
-            self._conflict_cache.popitem(last=False)
+        """Add item to the LRU cache."""
+        self._conflict_cache.set(key, value)
 
     def clear_cache(self):
         """Clear the conflict cache."""
@@ -105,8 +105,11 @@ class DynamicMemoryManager:
         Returns:
             Dict containing the classification result and memory ID
         """
-        # Classify the input
-        classified = self.classifier.classify_input(text, use_llm=use_llm)
+        # Classify the input (pattern-only results are reused from the classifier's LRU)
+        if use_llm:
+            classified = self.classifier.classify_input(text, use_llm=True)
+        else:
+            classified = self.classifier.classify_cached(text)
 
         # Update statistics
         self.stats["total_classifications"] += 1
@@ -117,7 +120,7 @@ class DynamicMemoryManager:
         final_metadata.update({
             "category": classified.category.value,
             "confidence": classified.confidence,
-            "subcategories": classified.subcategories,
+            "subcategories": list(classified.subcategories),
         })
         final_metadata.update(classified.metadata)
 
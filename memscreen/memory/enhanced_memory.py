@@ -95,6 +95,7 @@ class EnhancedMemory:
                 model_type=self.config.vision_encoder_model_type,
                 device=self.config.vision_encoder_device,
                 cache_size=self.config.vision_encoder_cache_size,
+                cache_dir=str(self.config.vision_encoder_cache_dir),
             )
 
             self.vision_encoder = VisionEncoder(encoder_config)
@@ -157,6 +158,8 @@ class EnhancedMemory:
                 embedding_model=self.base_memory.embedding_model,
                 llm=self.base_memory.llm,
                 config=tiered_config,
+                db_path=getattr(self.base_memory.config, "history_db_path", None) or ":memory:",
+                invalidate_cache=getattr(self.base_memory, "invalidate_search_cache", None),
             )
 
             logger.info("Tiered memory manager initialized")
@@ -370,7 +373,8 @@ class EnhancedMemory:
         if not self.tiered_manager:
             return None
 
-        return self.tiered_manager._memory_tiers.get(memory_id)
+        tier = self.tiered_manager.get_tier(memory_id)
+        return tier.value if tier else None
 
     def promote_memory(self, memory_id: str) -> bool:
         """
@@ -387,18 +391,14 @@ class EnhancedMemory:
             return False
 
         try:
-            current_tier = self.tiered_manager._memory_tiers.get(memory_id)
+            from .tiered_memory_manager import MemoryTier
+
+            current_tier = self.tiered_manager.get_tier(memory_id)
             if current_tier:
-                if current_tier.value == "long_term":
-                    self.tiered_manager._move_to_tier(
-                        memory_id,
-                        self.tiered_manager.MemoryTier.SHORT_TERM
-                    )
-                elif current_tier.value == "short_term" and self.config.working_memory_enabled:
-                    self.tiered_manager._move_to_tier(
-                        memory_id,
-                        self.tiered_manager.MemoryTier.WORKING
-                    )
+                if current_tier == MemoryTier.LONG_TERM:
+                    self.tiered_manager._move_to_tier(memory_id, MemoryTier.SHORT_TERM)
+                elif current_tier == MemoryTier.SHORT_TERM and self.config.working_memory_enabled:
+                    self.tiered_manager._move_to_tier(memory_id, MemoryTier.WORKING)
                 return True
         except Exception as e:
             logger.error(f"Failed to promote memory: {e}")
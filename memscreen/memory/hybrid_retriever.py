@@ -15,6 +15,7 @@ import logging
 from typing import Dict, List, Optional, Union, Literal
 from pathlib import Path
 
+from ..cache import get_cache_registry
 from ..embeddings.base import EmbeddingBase
 from ..embeddings.vision_encoder import VisionEncoder, VisionEncoderConfig
 from ..vector_store.multimodal_chroma import MultimodalChromaDB
@@ -89,6 +90,8 @@ class HybridVisionRetriever:
         ```
     """
 
+    _CACHE_MAX_SIZE = 100
+
     def __init__(
         self,
         text_embedder: EmbeddingBase,
@@ -114,9 +117,12 @@ class HybridVisionRetriever:
 
         self.config = config
 
-        # Simple LRU cache for retrieval results
-        self._cache = {} if config.enable_caching else None
-        self._cache_order = [] if config.enable_caching else None
+        # LRU cache for retrieval results, bounded by the shared cache budget
+        self._cache = (
+            get_cache_registry().private_namespace("hybrid_retriever", max_entries=self._CACHE_MAX_SIZE)
+            if config.enable_caching
+            else None
+        )
 
         logger.info(
             f"HybridVisionRetriever initialized "
@@ -156,10 +162,10 @@ class HybridVisionRetriever:
 
         # Check cache
         cache_key = self._get_cache_key(query, image_path, filters, limit)
-        if self._cache is not None and cache_key in self._cache:
+        cached = self._cache.get(cache_key) if self._cache is not None else None
+        if cached is not None:
             logger.debug("Cache hit for retrieval")
-            self._update_cache_order(cache_key)
-            return self._cache[cache_key]
+            return cached
 
         # Query rewriting for better retrieval
         rewritten_query = query
@@ -202,6 +208,58 @@ class HybridVisionRetriever:
 
         return results
 
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        filters: Optional[Dict] = None,
+        limit: int = 10,
+    ) -> List[List[OutputData]]:
+        """
+        Retrieve memories for several text queries in one store round trip.
+
+        Cached queries are answered from the cache; the rest are embedded with
+        ``embed_batch`` and searched together via ``search_hybrid_batch``.
+
+        Args:
+            queries: Text queries
+            filters: Metadata filters to apply
+            limit: Maximum number of results per query
+
+        Returns:
+            One result list per query, in input order
+        """
+        results: List[Optional[List[OutputData]]] = [None] * len(queries)
+        pending = []
+        for i, query in enumerate(queries):
+            cache_key = self._get_cache_key(query, None, filters, limit)
+            cached = self._cache.get(cache_key) if self._cache is not None else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, cache_key))
+
+        if pending:
+            texts = [queries[i] for i, _ in pending]
+            if self.config.enable_query_rewriting:
+                texts = [self._rewrite_query_for_vision(text) for text in texts]
+            embeddings = self.text_embedder.embed_batch(texts, "search")
+            batch = self.vector_store.search_hybrid_batch(
+                query_text_embeddings=embeddings,
+                limit=limit,
+                filters=filters,
+                fusion_weight=self.config.fusion_weight,
+            )
+            for (i, cache_key), hits in zip(pending, batch):
+                results[i] = hits
+                if self._cache is not None:
+                    self._add_to_cache(cache_key, hits)
+
+        logger.info(
+            f"Batch retrieval for {len(queries)} queries "
+            f"({len(queries) - len(pending)} cached)"
+        )
+        return results
+
     def retrieve_text_only(
         self,
         query: str,
@@ -342,37 +400,15 @@ class HybridVisionRetriever:
         return hashlib.md5(key_string.encode()).hexdigest()
 
     def _add_to_cache(self, key: str, value: List[OutputData]):
-        """Add item to LRU cache."""
+        """Add item to the LRU cache."""
         if self._cache is None:
             return
-
-        # Remove if exists
-        if key in self._cache:
-            self._cache_order.remove(key)
-
-        # Add to cache
-        self._cache[key] = value
-        self._cache_order.append(key)
-
-        # Enforce cache size limit (100 items)
-        max_cache_size = 100
-        while len(self._cache_order) > max_cache_size:
-            oldest_key = self._cache_order.pop(0)
-            del self._cache[oldest_key]
-
-    def _update_cache_order(self, key: str):
-        """Update cache order when item is accessed."""
-        if self._cache is None or key not in self._cache:
-            return
-
-        self._cache_order.remove(key)
-        self._cache_order.append(key)
+        self._cache.set(key, value)
 
     def clear_cache(self):
         """Clear the retrieval cache."""
         if self._cache is not None:
             self._cache.clear()
-            self._cache_order.clear()
             logger.info("Hybrid retriever cache cleared")
 
     def get_cache_stats(self) -> Dict[str, int]:
@@ -380,16 +416,12 @@ class HybridVisionRetriever:
         Get cache statistics.
 
         Returns:
-            Dict with 'size' and 'max_size' keys
+            Dict with 'size', 'max_size' and byte/hit counters
         """
         if self._cache is None:
             return {"size": 0, "max_size": 0, "enabled": False}
 
-        return {
-            "size": len(self._cache),
-            "max_size": 100,
-            "enabled": True,
-        }
+        return {**self._cache.stats(), "enabled": True}
 
 
 # Convenience function for quick usage
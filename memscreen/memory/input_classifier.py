@@ -14,9 +14,9 @@ to optimize memory storage and retrieval.
 import json
 import logging
 import re
-from functools import lru_cache
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
 
+from ..cache import get_cache_registry
 from .dynamic_models import (
     MemoryCategory,
     QueryIntent,
@@ -26,6 +26,63 @@ from .dynamic_models import (
 
 logger = logging.getLogger(__name__)
 
+_PRIORITY_HIGH = re.compile(r'\b(urgent|important|asap|priority)\b', re.IGNORECASE)
+_PRIORITY_LOW = re.compile(r'\b(low priority|when possible|eventually)\b', re.IGNORECASE)
+_LANGUAGE_PATTERNS = {
+    "python": re.compile(r'\b(def |import |from |print\(|if __name__)\b', re.IGNORECASE),
+    "javascript": re.compile(r'\b(const |let |var |function |=> |async |await )\b', re.IGNORECASE),
+    "java": re.compile(r'\b(public|private|protected|class|void|int|String)\b', re.IGNORECASE),
+    "sql": re.compile(r'\b(SELECT|INSERT|UPDATE|DELETE|FROM|WHERE|JOIN)\b', re.IGNORECASE),
+}
+_URL = re.compile(r'https?://[^\s<>"]+')
+_EXPLANATORY = re.compile(r'\b(why|because|reason)\b', re.IGNORECASE)
+_PROCEDURAL = re.compile(r'\b(how to|how do)\b', re.IGNORECASE)
+_DEFINITIONAL = re.compile(r'\b(what is|define|explain)\b', re.IGNORECASE)
+_RECURRING = re.compile(r'\b(recurring|daily|weekly|monthly)\b', re.IGNORECASE)
+_ONE_TIME = re.compile(r'\b(one-time|just this|single)\b', re.IGNORECASE)
+
+
+class _PatternTable:
+    """
+    A ``{label: [regex, ...]}`` table compiled once.
+
+    ``counts`` needs every pattern evaluated on its own (patterns overlap, so
+    a single alternation would hide matches); it runs the precompiled
+    patterns, which keeps ``re``'s literal-prefix scanning that a combined
+    lookahead regex loses. ``first`` only needs to know whether a label
+    matches at all, so each label is one alternation tried in table order.
+    """
+
+    def __init__(self, table: Mapping[Hashable, Sequence[str]], flags: int = re.IGNORECASE):
+        self._patterns: List[Tuple[Hashable, List[re.Pattern]]] = [
+            (label, [re.compile(pattern, flags) for pattern in patterns])
+            for label, patterns in table.items()
+        ]
+        self._any: List[Tuple[Hashable, re.Pattern]] = [
+            (label, re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags))
+            for label, patterns in table.items()
+            if patterns
+        ]
+
+    def counts(self, text: str) -> Dict[Hashable, int]:
+        """Number of matching patterns per label (labels without a match are omitted)."""
+        scores: Dict[Hashable, int] = {}
+        for label, patterns in self._patterns:
+            score = 0
+            for pattern in patterns:
+                if pattern.search(text):
+                    score += 1
+            if score:
+                scores[label] = score
+        return scores
+
+    def first(self, text: str) -> Optional[Hashable]:
+        """First label, in table order, with any matching pattern."""
+        for label, pattern in self._any:
+            if pattern.search(text):
+                return label
+        return None
+
 
 class InputClassifier:
     """
@@ -174,16 +231,32 @@ class InputClassifier:
         ],
     }
 
-    def __init__(self, llm=None, enable_llm_fallback: bool = True):
+    _compiled: Dict[type, Tuple[_PatternTable, _PatternTable]] = {}
+
+    def __init__(self, llm=None, enable_llm_fallback: bool = True, cache_size: int = 1000):
         """
         Initialize the input classifier.
 
         Args:
             llm: Language model for advanced classification
             enable_llm_fallback: Whether to use LLM for ambiguous inputs
+            cache_size: Maximum number of results kept by ``classify_cached``
         """
         self.llm = llm
         self.enable_llm_fallback = enable_llm_fallback
+        self._category_table, self._intent_table = self._pattern_tables()
+        self._classification_cache = get_cache_registry().private_namespace(
+            "input_classifier", max_entries=cache_size
+        )
+
+    @classmethod
+    def _pattern_tables(cls) -> Tuple[_PatternTable, _PatternTable]:
+        """Compile PATTERNS and QUERY_PATTERNS once per class."""
+        tables = InputClassifier._compiled.get(cls)
+        if tables is None:
+            tables = (_PatternTable(cls.PATTERNS), _PatternTable(cls.QUERY_PATTERNS))
+            InputClassifier._compiled[cls] = tables
+        return tables
 
     def classify_input(
         self,
@@ -272,17 +345,8 @@ class InputClassifier:
 
     def _classify_by_patterns(self, text: str) -> Tuple[MemoryCategory, float]:
         """Classify using regex patterns (fast path)."""
-        text_lower = text.lower()
-
-        # Count matches for each category
-        scores = {}
-        for category, patterns in self.PATTERNS.items():
-            score = 0
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    score += 1
-            if score > 0:
-                scores[category] = score
+        # Count matching patterns for each category
+        scores = self._category_table.counts(text.lower())
 
         if not scores:
             return MemoryCategory.GENERAL, 0.5
@@ -327,15 +391,9 @@ Respond with JSON in this format:
 
     def _detect_query_intent(self, query: str) -> QueryIntent:
         """Detect the intent of a search query."""
-        query_lower = query.lower()
-
-        # Check each intent pattern
-        for intent, patterns in self.QUERY_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, query_lower, re.IGNORECASE):
-                    return intent
-
-        return QueryIntent.GENERAL_SEARCH
+        # First intent (in QUERY_PATTERNS order) with a matching pattern
+        intent = self._intent_table.first(query.lower())
+        return intent if intent is not None else QueryIntent.GENERAL_SEARCH
 
     def _get_target_categories(
         self,
@@ -412,29 +470,23 @@ Respond with JSON in this format:
 
         if category == MemoryCategory.TASK:
             # Extract priority and status
-            if re.search(r'\b(urgent|important|asap|priority)\b', text, re.IGNORECASE):
+            if _PRIORITY_HIGH.search(text):
                 metadata["priority"] = "high"
-            elif re.search(r'\b(low priority|when possible|eventually)\b', text, re.IGNORECASE):
+            elif _PRIORITY_LOW.search(text):
                 metadata["priority"] = "low"
             else:
                 metadata["priority"] = "medium"
 
         elif category == MemoryCategory.CODE:
             # Detect programming language
-            language_patterns = {
-                "python": r'\b(def |import |from |print\(|if __name__)\b',
-                "javascript": r'\b(const |let |var |function |=> |async |await )\b',
-                "java": r'\b(public|private|protected|class|void|int|String)\b',
-                "sql": r'\b(SELECT|INSERT|UPDATE|DELETE|FROM|WHERE|JOIN)\b',
-            }
-            for lang, pattern in language_patterns.items():
-                if re.search(pattern, text, re.IGNORECASE):
+            for lang, pattern in _LANGUAGE_PATTERNS.items():
+                if pattern.search(text):
                     metadata["language"] = lang
                     break
 
         elif category == MemoryCategory.REFERENCE:
             # Extract URLs
-            urls = re.findall(r'https?://[^\s<>"]+', text)
+            urls = _URL.findall(text)
             if urls:
                 metadata["urls"] = urls
 
@@ -445,25 +497,34 @@ Respond with JSON in this format:
         subcategories = []
 
         if category == MemoryCategory.QUESTION:
-            if re.search(r'\b(why|because|reason)\b', text, re.IGNORECASE):
+            if _EXPLANATORY.search(text):
                 subcategories.append("explanatory")
-            if re.search(r'\b(how to|how do)\b', text, re.IGNORECASE):
+            if _PROCEDURAL.search(text):
                 subcategories.append("procedural")
-            if re.search(r'\b(what is|define|explain)\b', text, re.IGNORECASE):
+            if _DEFINITIONAL.search(text):
                 subcategories.append("definitional")
 
         elif category == MemoryCategory.TASK:
-            if re.search(r'\b(recurring|daily|weekly|monthly)\b', text, re.IGNORECASE):
+            if _RECURRING.search(text):
                 subcategories.append("recurring")
-            if re.search(r'\b(one-time|just this|single)\b', text, re.IGNORECASE):
+            if _ONE_TIME.search(text):
                 subcategories.append("one-time")
 
         return subcategories
 
-    @lru_cache(maxsize=1000)
     def classify_cached(self, text: str) -> ClassifiedInput:
-        """Cached version of classify_input for frequently used inputs."""
-        return self.classify_input(text)
+        """
+        Cached version of classify_input for frequently used inputs.
+
+        Results are kept in a bounded LRU owned by this classifier; callers
+        share the returned object and must not modify it.
+        """
+        result = self._classification_cache.get(text)
+        if result is None:
+            result = self.classify_input(text)
+            # Key and result both hold the text; the rest is a few small fields.
+            self._classification_cache.set(text, result, size=2 * len(text) + 512)
+        return result
 
 
 __all__ = ["InputClassifier"]
@@ -18,14 +18,16 @@ import hashlib
 import json
 import logging
 import os
+import threading
 import uuid
 import warnings
-
 from copy import deepcopy
 from datetime import datetime
 from typing import Any, Dict, Optional, Union, Literal, List
 from functools import lru_cache
 
+import numpy as np
+
 from .base import MemoryBase
 from .models import MemoryConfig, MemoryItem, MemoryType
 from .dynamic_models import DynamicMemoryConfig, MemoryCategory
@@ -34,14 +36,15 @@ from .dynamic_manager import DynamicMemoryManager
 from .context_retriever import ContextRetriever
 
 # OPTIMIZATION: Use intelligent caching system
-from ..cache import IntelligentCache, cached_search
+# Shared, thread-safe search cache (5 min TTL, swept in the background)
+from ..cache import _search_cache
 
-# Global search cache instance
-_search_cache = IntelligentCache(max_size=1000, default_ttl=300)  # 5 min TTL
+# Payload keys that scope search cache invalidation
+_SEARCH_CACHE_SCOPE_KEYS = ("user_id", "agent_id", "run_id")
 
 # Import from sibling modules
 from ..llm import LlmFactory
-from ..embeddings import EmbedderFactory
+from ..embeddings import EmbedderFactory, EmbeddingCache, CachedEmbedding
 from ..vector_store import VectorStoreFactory
 from ..storage import SQLiteManager
 from ..prompts_core import (
@@ -166,6 +169,9 @@ class Memory(MemoryBase):
             self.config.embedder.config,
             self.config.vector_store.config,
         )
+        self.embedding_cache = None
+        if getattr(self.config, 'enable_embedding_cache', False):
+            self.embedding_model = self._wrap_embedding_cache(self.embedding_model)
         self.vector_store = VectorStoreFactory.create(
             self.config.vector_store.provider, self.config.vector_store.config
         )
@@ -178,6 +184,8 @@ class Memory(MemoryBase):
 
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
+        self._embedding_migration: Optional[threading.Thread] = None
+        self._sync_embedding_variant()
 
         # OPTIMIZATION: Performance tuning flags
         self.optimization_enabled = getattr(self.config, 'optimization_enabled', True)
@@ -316,6 +324,128 @@ class Memory(MemoryBase):
             logger.error(f"Configuration validation error: {e}")
             raise
 
+    def _wrap_embedding_cache(self, embedding_model):
+        """Wrap the embedder with the persistent on-disk embedding cache."""
+        cache_path = getattr(self.config, 'embedding_cache_path', None)
+        if not cache_path and self.config.history_db_path == ":memory:":
+            cache_path = ":memory:"
+        elif not cache_path:
+            cache_path = os.path.join(
+                os.path.dirname(os.path.abspath(self.config.history_db_path)), "embedding_cache.db"
+            )
+        try:
+            self.embedding_cache = EmbeddingCache(
+                cache_path,
+                max_entries=getattr(self.config, 'embedding_cache_max_entries', 100_000),
+            )
+        except Exception as e:
+            logger.warning(f"Embedding cache disabled: {e}")
+            return embedding_model
+        return CachedEmbedding(embedding_model, self.embedding_cache)
+
+    def _sync_embedding_variant(self) -> None:
+        """
+        Record the embedder's output variant on the collection.
+
+        Collections written before the variant was recorded hold raw vectors.
+        Moving them to "l2norm" only needs the stored vectors normalized, which
+        runs in the background (see ``normalize_stored_vectors``) so startup
+        never waits on it; other changes need an explicit ``reembed_all()``.
+        """
+        store = self.vector_store
+        if not hasattr(store, "get_col_metadata"):
+            return
+        variant = getattr(self.embedding_model, "embedding_variant", None) or "raw"
+        try:
+            metadata = store.get_col_metadata()
+            stored = metadata.get("embedding_variant", "raw")
+            if stored == variant or store.count() == 0:
+                if metadata.get("embedding_variant") != variant:
+                    store.set_col_metadata(embedding_variant=variant)
+            elif stored == "raw" and variant == "l2norm":
+                logger.info("Normalizing stored embeddings in the background")
+                self._embedding_migration = threading.Thread(
+                    target=self.normalize_stored_vectors, name="embedding-migration", daemon=True
+                )
+                self._embedding_migration.start()
+            else:
+                logger.warning(
+                    f"Collection holds {stored} embeddings but the embedder produces {variant}; "
+                    f"run Memory.reembed_all() to migrate"
+                )
+        except Exception as e:
+            logger.warning(f"Embedding variant check failed: {e}")
+
+    def normalize_stored_vectors(self, batch_size: int = 500) -> int:
+        """
+        L2-normalize every stored vector in place and mark the collection "l2norm".
+
+        Progress is kept in the ``embedding_migration_offset`` collection
+        metadata, so an interrupted run resumes where it stopped; the variant
+        is only recorded once every vector is normalized. Normalizing is
+        idempotent, so re-processing a batch after a crash is harmless.
+
+        Returns:
+            int: Number of vectors normalized in this run.
+        """
+        store = self.vector_store
+        done = 0
+        try:
+            offset = int(store.get_col_metadata().get("embedding_migration_offset", 0) or 0)
+            for ids, vectors in store.iter_vectors(batch_size, offset=offset):
+                normalized = []
+                for vector in vectors:
+                    array = np.asarray(vector, dtype=np.float32)
+                    norm = float(np.linalg.norm(array))
+                    normalized.append((array / norm if norm > 0 else array).tolist())
+                store.update_vectors(ids, normalized)
+                offset += len(ids)
+                done += len(ids)
+                store.set_col_metadata(embedding_migration_offset=offset)
+            store.set_col_metadata(embedding_variant="l2norm", embedding_migration_offset=0)
+        except Exception as e:
+            logger.warning(f"Embedding normalization stopped after {done} vectors, will resume: {e}")
+        else:
+            logger.info(f"Normalized {done} stored embeddings")
+        self.invalidate_search_cache()
+        return done
+
+    def reembed_all(self, batch_size: int = 100) -> int:
+        """
+        Recompute the vector of every stored memory from its text.
+
+        Runs on demand (it calls the embedding model for every memory) and
+        records the embedder's variant on the collection when it finishes.
+
+        Args:
+            batch_size (int, optional): Memories embedded per request. Defaults to 100.
+
+        Returns:
+            int: Number of memories re-embedded.
+        """
+        updated = 0
+        skipped = 0
+        for page in self.vector_store.iter_batches(batch_size):
+            entries = [e for e in page if (e.payload or {}).get("data")]
+            skipped += len(page) - len(entries)
+            if not entries:
+                continue
+            vectors = self.embedding_model.embed_batch([e.payload["data"] for e in entries], "update")
+            self.vector_store.update_vectors([e.id for e in entries], vectors)
+            updated += len(entries)
+        if skipped:
+            logger.warning(f"{skipped} memories have no text and kept their old vectors")
+        variant = getattr(self.embedding_model, "embedding_variant", None) or "raw"
+        self.vector_store.set_col_metadata(embedding_variant=variant, embedding_migration_offset=0)
+        self.invalidate_search_cache()
+        return updated
+
+    def get_embedding_cache_stats(self) -> Dict[str, Any]:
+        """Return embedding cache counters (empty when the cache is disabled)."""
+        if self.embedding_cache is None:
+            return {}
+        return self.embedding_cache.stats()
+
     def add(
         self,
         messages,
@@ -432,6 +562,73 @@ class Memory(MemoryBase):
 
         return {"results": vector_store_result}
 
+    def add_texts(
+        self,
+        texts: List[str],
+        *,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[str]:
+        """
+        Store raw texts as memories with one batched embedding call and one insert.
+
+        Equivalent to ``add(text, infer=False)`` per text, without vision or
+        graph processing; meant for bulk imports such as folder ingestion.
+
+        Args:
+            texts (List[str]): Texts to store, one memory each.
+            user_id (str, optional): ID of the user the memories belong to.
+            agent_id (str, optional): ID of the agent the memories belong to.
+            run_id (str, optional): ID of the run the memories belong to.
+            metadatas (List[dict], optional): Per-text metadata, aligned with ``texts``.
+
+        Returns:
+            list: IDs of the created memories, in the order of ``texts``.
+        """
+        if metadatas is not None and len(metadatas) != len(texts):
+            raise ValueError("metadatas must have one entry per text")
+        base_metadata, _ = _build_filters_and_metadata(user_id=user_id, agent_id=agent_id, run_id=run_id)
+        if not texts:
+            return []
+
+        if hasattr(self.embedding_model, "embed_batch"):
+            vectors = self.embedding_model.embed_batch(list(texts), "add")
+        else:
+            vectors = [self.embedding_model.embed(text, "add") for text in texts]
+
+        import pytz
+        created_at = datetime.now(pytz.timezone(self.config.timezone)).isoformat()
+        ids = []
+        payloads = []
+        for index, text in enumerate(texts):
+            payload = deepcopy(base_metadata)
+            if metadatas is not None and metadatas[index]:
+                payload.update(metadatas[index])
+            payload.setdefault("role", "user")
+            payload["data"] = text
+            payload["hash"] = hashlib.md5(text.encode()).hexdigest()
+            payload["created_at"] = created_at
+            ids.append(str(uuid.uuid4()))
+            payloads.append(payload)
+
+        self.vector_store.insert(vectors=vectors, ids=ids, payloads=payloads)
+        self.invalidate_search_cache(base_metadata)
+        for memory_id, payload in zip(ids, payloads):
+            self.db.add_history(
+                memory_id,
+                None,
+                payload["data"],
+                "ADD",
+                created_at=created_at,
+                actor_id=payload.get("actor_id"),
+                role=payload.get("role"),
+                immediate=False,  # Use batch writing
+            )
+        capture_event("memscreen.add_texts", self, {"count": len(ids), "sync_type": "sync"})
+        return ids
+
     def _add_to_vector_store(self, messages, metadata, filters, infer):
         """Add messages to the vector store."""
         if not infer:
@@ -605,6 +802,7 @@ class Memory(MemoryBase):
             # This is much faster than generating one by one
             try:
                 # Try batch embedding if the embedder supports it
+                # (one chunked /api/embed request per batch for Ollama)
                 if hasattr(self.embedding_model, 'embed_batch'):
                     embeddings_list = self.embedding_model.embed_batch(valid_facts, "add")
                 else:
@@ -641,7 +839,10 @@ class Memory(MemoryBase):
                 logger.error(f"Batch embedding/search failed: {e}, falling back to sequential")
                 # Fallback to original sequential method
                 for new_mem in valid_facts:
-                    messages_embeddings = self.embedding_model.embed(new_mem, "add")
+                    # Reuse batch embeddings when only the parallel search failed
+                    messages_embeddings = new_message_embeddings.get(new_mem)
+                    if messages_embeddings is None:
+                        messages_embeddings = self.embedding_model.embed(new_mem, "add")
                     new_message_embeddings[new_mem] = messages_embeddings
 
                     existing_memories = self.vector_store.search(
@@ -1002,6 +1203,7 @@ class Memory(MemoryBase):
         limit: int = 100,
         filters: Optional[Dict[str, Any]] = None,
         threshold: Optional[float] = None,
+        vectors: Optional[List[float]] = None,
     ):
         """
         Searches for memories based on a query
@@ -1013,6 +1215,7 @@ class Memory(MemoryBase):
             limit (int, optional): Limit the number of results. Defaults to 100.
             filters (dict, optional): Filters to apply to the search. Defaults to None..
             threshold (float, optional): Minimum score for a memory to be included in the results. Defaults to None.
+            vectors (list, optional): Precomputed query embedding (see ``embed_query``). Defaults to None.
 
         Returns:
             dict: A dictionary containing the search results, typically under a "results" key,
@@ -1041,7 +1244,9 @@ class Memory(MemoryBase):
         )
 
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_memories = executor.submit(self._search_vector_store, query, effective_filters, limit, threshold)
+            future_memories = executor.submit(
+                self._search_vector_store, query, effective_filters, limit, threshold, vectors
+            )
             future_graph_entities = (
                 executor.submit(self.graph.search, query, effective_filters, limit) if self.enable_graph else None
             )
@@ -1068,24 +1273,30 @@ class Memory(MemoryBase):
         else:
             return {"results": original_memories}
 
-    def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None):
+    def embed_query(self, query: str) -> List[float]:
+        """Embed ``query`` exactly as ``search`` would, so callers can reuse the vector."""
+        return self.embedding_model.embed(query, "search")
+
+    def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None, vectors=None):
         """Search vector store for memories with intelligent caching."""
         # OPTIMIZATION: Check cache first before doing expensive vector search
-        # Generate cache key from query, filters, limit
-        cache_key = f"{query}:{str(sorted(filters.items()))}:{limit}"
-
-        # Try to get from cache
-        cached_result = _search_cache.get(cache_key)
-        if cached_result is not None:
-            logger.debug(f"Cache hit for search query: {query[:50]}...")
-            # Apply threshold filter if needed
-            if threshold is not None:
-                cached_result = [m for m in cached_result if m.get("score", 0) >= threshold]
-            return cached_result
+        # Generate cache key from collection, query, filters, limit
+        cache_key = f"{self.collection_name}:{query}:{str(sorted(filters.items()))}:{limit}"
+
+        if self.enable_search_cache:
+            cached_result = _search_cache.get(cache_key)
+            if cached_result is not None:
+                logger.debug(f"Cache hit for search query: {query[:50]}...")
+                # Apply threshold filter if needed
+                if threshold is not None:
+                    cached_result = [m for m in cached_result if (m.get("score") or 0) >= threshold]
+                return cached_result
+            # Snapshot before searching so a concurrent write invalidates this result
+            generations = _search_cache.snapshot(self._search_cache_scopes(filters))
 
         # Cache miss - perform actual search
         logger.debug(f"Cache miss for search query: {query[:50]}...")
-        embeddings = self.embedding_model.embed(query, "search")
+        embeddings = vectors if vectors is not None else self.embedding_model.embed(query, "search")
         memories = self.vector_store.search(query=query, vectors=embeddings, limit=limit, filters=filters)
 
         promoted_payload_keys = [
@@ -1117,22 +1328,45 @@ class Memory(MemoryBase):
             if additional_metadata:
                 memory_item_dict["metadata"] = additional_metadata
 
-            if threshold is None or mem.score >= threshold:
-                original_memories.append(memory_item_dict)
+            original_memories.append(memory_item_dict)
 
         # OPTIMIZATION: Store results in cache for future queries
         # Cache the results before threshold filtering (more reusable)
-        _search_cache.set(cache_key, original_memories)
-
-        # Periodic cache cleanup (every 100 searches)
-        import random
-        if random.random() < 0.01:  # 1% chance to cleanup
-            expired = _search_cache.cleanup_expired()
-            if expired > 0:
-                logger.debug(f"Cleaned up {expired} expired cache entries")
+        if self.enable_search_cache:
+            _search_cache.set(cache_key, original_memories, generations=generations)
 
+        if threshold is not None:
+            original_memories = [m for m in original_memories if (m.get("score") or 0) >= threshold]
         return original_memories
 
+    def _search_cache_scopes(self, filters: Optional[Dict[str, Any]]) -> List[str]:
+        """Scopes a search result depends on: its id filters, or the whole collection."""
+        filters = filters or {}
+        scopes = [
+            f"{self.collection_name}|{key}={filters[key]}"
+            for key in _SEARCH_CACHE_SCOPE_KEYS
+            if filters.get(key) is not None
+        ]
+        return scopes or [f"{self.collection_name}|*"]
+
+    def invalidate_search_cache(self, payload: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Invalidate cached searches that a write may have changed.
+
+        Args:
+            payload: Payload of the written memory; None invalidates every cached search
+        """
+        if payload is None:
+            _search_cache.invalidate()
+            return
+        scopes = [f"{self.collection_name}|*"]
+        scopes.extend(
+            f"{self.collection_name}|{key}={payload[key]}"
+            for key in _SEARCH_CACHE_SCOPE_KEYS
+            if payload.get(key) is not None
+        )
+        _search_cache.invalidate(scopes)
+
     def update(self, memory_id, data):
         """
         Update a memory by ID.
@@ -1230,6 +1464,7 @@ class Memory(MemoryBase):
             ids=[memory_id],
             payloads=[metadata],
         )
+        self.invalidate_search_cache(metadata)
         # OPTIMIZATION: Use batch database writing for better performance
         # Pass immediate=False to use batch writing (default behavior)
         self.db.add_history(
@@ -1325,6 +1560,7 @@ class Memory(MemoryBase):
             vector=embeddings,
             payload=new_metadata,
         )
+        self.invalidate_search_cache(new_metadata)
         logger.info(f"Updating memory with ID {memory_id=} with {data=}")
 
         # OPTIMIZATION: Use batch database writing
@@ -1348,6 +1584,7 @@ class Memory(MemoryBase):
         existing_memory = self.vector_store.get(vector_id=memory_id)
         prev_value = existing_memory.payload["data"]
         self.vector_store.delete(vector_id=memory_id)
+        self.invalidate_search_cache(existing_memory.payload)
         # OPTIMIZATION: Use batch database writing
         # Delete operations are also batched, but we set immediate=True
         # for deletes as they're less frequent and more critical
@@ -1374,10 +1611,13 @@ class Memory(MemoryBase):
         logger.warning("Resetting all memories")
 
         if hasattr(self.db, "connection") and self.db.connection:
-            self.db.connection.execute("DROP TABLE IF EXISTS history")
-            self.db.connection.close()
+            self.db.reset()
+            self.db.close()
 
-        self.db = SQLiteManager(self.config.history_db_path)
+        self.db = SQLiteManager(
+            self.config.history_db_path,
+            enable_batch_writing=getattr(self.config, 'enable_batch_writing', True),
+        )
 
         if hasattr(self.vector_store, "reset"):
             self.vector_store = VectorStoreFactory.reset(self.vector_store)
@@ -1387,6 +1627,7 @@ class Memory(MemoryBase):
             self.vector_store = VectorStoreFactory.create(
                 self.config.vector_store.provider, self.config.vector_store.config
             )
+        self.invalidate_search_cache()
         capture_event("memscreen.reset", self, {"sync_type": "sync"})
 
     # ========== Dynamic Memory Methods ==========
@@ -1446,6 +1687,7 @@ class Memory(MemoryBase):
             metadata=processed_metadata,
             use_llm=use_llm_classification,
         )
+        self.invalidate_search_cache(processed_metadata)
 
         logger.info(f"Added memory with classification: {result['classification']['category']}")
         return result
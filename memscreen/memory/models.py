@@ -194,6 +194,18 @@ class MemoryConfig(BaseModel):
         description="Path to the history database",
         default=os.path.join(memscreen_dir, "history.db"),
     )
+    enable_embedding_cache: bool = Field(
+        description="Cache embeddings on disk keyed by model and text hash",
+        default=True,
+    )
+    embedding_cache_path: Optional[str] = Field(
+        description="Path to the embedding cache database (defaults next to the history database)",
+        default=None,
+    )
+    embedding_cache_max_entries: int = Field(
+        description="Maximum number of cached embeddings before LRU eviction",
+        default=100_000,
+    )
     enable_graph: bool = Field(
         description="Enable knowledge graph memory",
         default=False,
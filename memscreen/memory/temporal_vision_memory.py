@@ -14,6 +14,8 @@ This module provides functionality to:
 """
 
 import logging
+import os
+import tempfile
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
@@ -36,6 +38,9 @@ class TemporalMemoryConfig:
         scene_change_threshold: Threshold for detecting scene changes
         min_event_duration: Minimum duration for an event (seconds)
         max_gap_duration: Maximum gap between frames for same event (seconds)
+        use_visual_embeddings: Encode frames with the vision encoder for distances
+        threshold_window: Compute the change threshold over a trailing window of
+            this many distances instead of the whole segment (None = whole segment)
     """
 
     def __init__(
@@ -43,10 +48,14 @@ class TemporalMemoryConfig:
         scene_change_threshold: float = 0.3,
         min_event_duration: float = 1.0,
         max_gap_duration: float = 2.0,
+        use_visual_embeddings: bool = True,
+        threshold_window: Optional[int] = None,
     ):
         self.scene_change_threshold = scene_change_threshold
         self.min_event_duration = min_event_duration
         self.max_gap_duration = max_gap_duration
+        self.use_visual_embeddings = use_visual_embeddings
+        self.threshold_window = threshold_window
 
 
 class TemporalVisionMemory:
@@ -166,26 +175,67 @@ class TemporalVisionMemory:
         Returns:
             List of feature dicts per frame
         """
-        features = []
+        embeddings = self._encode_frames(frames) if self.config.use_visual_embeddings else None
 
-        # For efficiency, we'd save frames to disk and batch encode
-        # For now, placeholder implementation
+        features = []
         for i, frame in enumerate(frames):
-            # TODO: Save frame to temp file, encode with vision_encoder
-            # For now, use simple features
-
-            feature = {
+            features.append({
                 'frame_index': i,
                 'brightness': float(np.mean(frame)),
                 'contrast': float(np.std(frame)),
-                # 'embedding': vision_encoding,  # TODO
-                'embedding': None,  # Placeholder
-            }
-            features.append(feature)
+                'embedding': embeddings[i] if embeddings else None,
+            })
 
         logger.debug(f"Extracted features from {len(frames)} frames")
         return features
 
+    def _encode_frames(self, frames: List[np.ndarray]) -> Optional[List[List[float]]]:
+        """
+        Encode all frames with one encode_image_batch call.
+
+        Returns:
+            One embedding per frame, or None if no encoder is available or
+            encoding did not cover every frame
+        """
+        encoder = self.vision_encoder
+        if encoder is None or not hasattr(encoder, 'encode_image_batch'):
+            return None
+
+        if hasattr(encoder, 'iter_encode_images'):
+            # Frames go to the encoder as arrays, streamed in bounded chunks
+            try:
+                embeddings = encoder.encode_image_batch(
+                    [np.asarray(frame, dtype=np.uint8) for frame in frames],
+                    return_tensor=True,
+                )
+            except Exception as e:
+                logger.warning(f"Frame encoding failed, using pixel statistics: {e}")
+                return None
+            if len(embeddings) != len(frames):
+                logger.warning("Frame encoding incomplete, using pixel statistics")
+                return None
+            return [embedding.tolist() for embedding in embeddings]
+
+        try:
+            from PIL import Image
+
+            with tempfile.TemporaryDirectory(prefix="memscreen_frames_") as tmp_dir:
+                paths = []
+                for i, frame in enumerate(frames):
+                    path = os.path.join(tmp_dir, f"frame_{i:06d}.png")
+                    Image.fromarray(np.asarray(frame, dtype=np.uint8)).save(path)
+                    paths.append(path)
+                # The cache is keyed by content, so re-processed frames are not re-encoded
+                embeddings = encoder.encode_image_batch(paths)
+        except Exception as e:
+            logger.warning(f"Frame encoding failed, using pixel statistics: {e}")
+            return None
+
+        if embeddings is None or len(embeddings) != len(frames):
+            logger.warning("Frame encoding incomplete, using pixel statistics")
+            return None
+        return [list(embedding) for embedding in embeddings]
+
     def _detect_scene_changes(
         self,
         frame_features: List[Dict],
@@ -208,23 +258,9 @@ class TemporalVisionMemory:
         if len(frame_features) < 2:
             return events
 
-        # Compute distances between consecutive frames
-        distances = []
-        for i in range(1, len(frame_features)):
-            dist = self._compute_frame_distance(
-                frame_features[i-1],
-                frame_features[i]
-            )
-            distances.append(dist)
-
-        if not distances:
-            return events
-
-        # Detect peaks (scene changes)
-        threshold = np.mean(distances) + self.config.scene_change_threshold * np.std(distances)
+        distances = self._compute_frame_distances(frame_features)
         change_points = [
-            i for i, d in enumerate(distances)
-            if d > threshold
+            int(i) for i in np.flatnonzero(distances > self._change_thresholds(distances))
         ]
 
         # Build events from change points
@@ -254,6 +290,62 @@ class TemporalVisionMemory:
 
         return events
 
+    def _compute_frame_distances(self, frame_features: List[Dict]) -> np.ndarray:
+        """
+        Compute distances between all consecutive frames at once.
+
+        Equivalent to calling _compute_frame_distance on each pair: cosine
+        distance where both frames have embeddings, pixel-statistics distance
+        otherwise.
+
+        Args:
+            frame_features: List of frame features
+
+        Returns:
+            Array of len(frame_features) - 1 distances
+        """
+        brightness = np.array([f['brightness'] for f in frame_features], dtype=np.float64)
+        contrast = np.array([f['contrast'] for f in frame_features], dtype=np.float64)
+        distances = np.abs(np.diff(brightness)) / 255.0 + np.abs(np.diff(contrast)) / 100.0
+
+        has_embedding = np.array([bool(f.get('embedding')) for f in frame_features])
+        if not has_embedding.any():
+            return distances
+
+        dims = len(next(f['embedding'] for f in frame_features if f.get('embedding')))
+        matrix = np.zeros((len(frame_features), dims), dtype=np.float32)
+        for i, feature in enumerate(frame_features):
+            if has_embedding[i]:
+                matrix[i] = feature['embedding']
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1.0)
+        cosine = 1.0 - np.einsum('ij,ij->i', matrix[:-1], matrix[1:])
+
+        both = has_embedding[:-1] & has_embedding[1:]
+        return np.where(both, cosine.astype(np.float64), distances)
+
+    def _change_thresholds(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Per-distance change threshold: mean + k * std.
+
+        Uses the whole segment by default, or a trailing window of
+        ``threshold_window`` distances computed with running sums.
+        """
+        k = self.config.scene_change_threshold
+        window = self.config.threshold_window
+        if not window or window >= len(distances):
+            return np.full(len(distances), np.mean(distances) + k * np.std(distances))
+
+        window = max(1, int(window))
+        csum = np.concatenate(([0.0], np.cumsum(distances)))
+        csum_sq = np.concatenate(([0.0], np.cumsum(distances * distances)))
+        ends = np.arange(1, len(distances) + 1)
+        starts = np.maximum(0, ends - window)
+        counts = ends - starts
+        mean = (csum[ends] - csum[starts]) / counts
+        var = (csum_sq[ends] - csum_sq[starts]) / counts - mean * mean
+        return mean + k * np.sqrt(np.maximum(var, 0.0))
+
     def _compute_frame_distance(
         self,
         frame1: Dict,
@@ -14,11 +14,14 @@ This module provides a three-tier memory system:
 """
 
 import logging
+import time
 import uuid
-from typing import Dict, List, Optional, Literal
+from typing import Any, Callable, Dict, List, Optional, Literal
 from datetime import datetime, timedelta
 from enum import Enum
 
+from ..storage import MemoryTierRepository
+
 logger = logging.getLogger(__name__)
 
 __all__ = [
@@ -47,6 +50,8 @@ class TieredMemoryConfig:
         enable_working_memory: Enable working memory tier
         auto_decay: Enable automatic memory decay
         auto_compress: Enable automatic memory compression
+        tier_weights: Retrieval weight per tier (similarity x tier weight x importance)
+        decay_batch_size: Max memories handled per decay sweep batch
     """
 
     def __init__(
@@ -58,6 +63,8 @@ class TieredMemoryConfig:
         enable_working_memory: bool = False,  # Disabled in phase 1
         auto_decay: bool = True,
         auto_compress: bool = True,
+        tier_weights: Optional[Dict[str, float]] = None,
+        decay_batch_size: int = 500,
     ):
         self.working_memory_hours = working_memory_hours
         self.short_term_days = short_term_days
@@ -66,6 +73,14 @@ class TieredMemoryConfig:
         self.enable_working_memory = enable_working_memory
         self.auto_decay = auto_decay
         self.auto_compress = auto_compress
+        self.tier_weights = {
+            MemoryTier.WORKING.value: 1.0,
+            MemoryTier.SHORT_TERM.value: 0.85,
+            MemoryTier.LONG_TERM.value: 0.7,
+        }
+        if tier_weights:
+            self.tier_weights.update(tier_weights)
+        self.decay_batch_size = decay_batch_size
 
 
 class TieredMemoryManager:
@@ -105,6 +120,8 @@ class TieredMemoryManager:
         embedding_model,
         llm,
         config: Optional[TieredMemoryConfig] = None,
+        db_path: str = ":memory:",
+        invalidate_cache: Optional[Callable[[Optional[Dict]], None]] = None,
     ):
         """
         Initialize the tiered memory manager.
@@ -114,6 +131,9 @@ class TieredMemoryManager:
             embedding_model: Text embedding model
             llm: LLM for generating summaries
             config: Manager configuration
+            db_path: SQLite database holding tier and access state
+            invalidate_cache: Called with the written payload (None for "any")
+                after every vector-store write, e.g. ``Memory.invalidate_search_cache``
         """
         from .importance_scorer import ImportanceScorer
 
@@ -124,14 +144,14 @@ class TieredMemoryManager:
         self.embedding_model = embedding_model
         self.llm = llm
         self.config = config
+        self._invalidate_cache = invalidate_cache
 
         # Importance scorer
         self.scorer = ImportanceScorer()
 
-        # In-memory tracking (TODO: persist to database)
-        self._memory_tiers = {}  # memory_id -> tier
-        self._access_counts = {}  # memory_id -> count
-        self._last_accessed = {}  # memory_id -> timestamp
+        # Tier, access counts and decay boundaries persist across restarts
+        self._tiers = MemoryTierRepository(db_path)
+        self._tiers.ensure_schema()
 
         logger.info(
             f"TieredMemoryManager initialized "
@@ -180,12 +200,13 @@ class TieredMemoryManager:
             text_embedding = self.embedding_model.embed(content, "add")
 
         # Prepare payload
+        created_at = datetime.now()
         payload = metadata.copy()
         payload.update({
             "data": content,
             "tier": tier.value,
             "importance_score": importance_score,
-            "created_at": datetime.now().isoformat(),
+            "created_at": created_at.isoformat(),
             "access_count": 0,
         })
 
@@ -196,11 +217,16 @@ class TieredMemoryManager:
             vision_embeddings=[vision_embedding] if vision_embedding else None,
             payloads=[payload],
         )
+        self._written(payload)
 
         # Track tier and access
-        self._memory_tiers[memory_id] = tier
-        self._access_counts[memory_id] = 0
-        self._last_accessed[memory_id] = datetime.now()
+        self._tiers.upsert(
+            memory_id=memory_id,
+            tier=tier.value,
+            importance=importance_score,
+            created_at=created_at.timestamp(),
+            next_decay_at=self._next_decay_at(tier, created_at.timestamp()),
+        )
 
         logger.info(
             f"Added memory {memory_id[:8]} to {tier.value} "
@@ -220,8 +246,8 @@ class TieredMemoryManager:
         Retrieve memories, promoting accessed items.
 
         Strategy:
-        1. Search from highest tier to lowest
-        2. Stop when enough results found
+        1. Search all enabled tiers with one ``$in``-filtered vector query
+        2. Re-rank by similarity x tier weight x importance
         3. Promote accessed memories
 
         Args:
@@ -231,14 +257,11 @@ class TieredMemoryManager:
             filters: Metadata filters
 
         Returns:
-            List of memories with metadata
+            List of memories with metadata, ``score`` set to the ranking score
         """
         query_embedding = self.embedding_model.embed(query, "search")
 
-        results = []
-        searched_tiers = []
-
-        # Determine search order
+        # Determine tiers to search
         if tier:
             tiers_to_search = [tier]
         else:
@@ -251,40 +274,62 @@ class TieredMemoryManager:
         # Filter out disabled tiers
         if not self.config.enable_working_memory:
             tiers_to_search = [t for t in tiers_to_search if t != MemoryTier.WORKING]
+        if not tiers_to_search:
+            return []
 
-        # Search each tier
-        for current_tier in tiers_to_search:
-            tier_filter = {"tier": current_tier.value}
-            if filters:
-                tier_filter.update(filters)
-
-            tier_results = self.vector_store.search_text(
-                query_embedding=query_embedding,
-                filters=tier_filter,
-                limit=limit,
-            )
-
-            results.extend(tier_results)
-            searched_tiers.append(current_tier)
+        tier_filter = dict(filters or {})
+        tier_filter["tier"] = {"$in": [t.value for t in tiers_to_search]}
 
-            if len(results) >= limit:
-                break
+        # Over-fetch so re-ranking can lift lower-similarity, higher-tier hits
+        candidates = self.vector_store.search_text(
+            query_embedding=query_embedding,
+            filters=tier_filter,
+            limit=limit * 2,
+        )
 
-        # Take only top results
-        results = results[:limit]
+        for result in candidates:
+            result.score = self._rank_score(result)
+        results = sorted(
+            (r for r in candidates if r.id),
+            key=lambda r: r.score,
+            reverse=True,
+        )[:limit]
 
         # Promote accessed memories
-        for result in results:
-            if result.id:
-                self._promote_memory(result.id, searched_tiers)
+        self._promote_memories([r.id for r in results])
 
         logger.info(
             f"Retrieved {len(results)} memories "
-            f"(tiers={[t.value for t in searched_tiers]})"
+            f"(tiers={[t.value for t in tiers_to_search]}, candidates={len(candidates)})"
         )
 
         return results
 
+    def get_tier(self, memory_id: str) -> Optional[MemoryTier]:
+        """Return the tracked tier of a memory, or None if it is unknown."""
+        state = self._tiers.get_state(memory_id)
+        return MemoryTier(state["tier"]) if state else None
+
+    def _rank_score(self, result) -> float:
+        """Similarity x tier weight x importance for one search hit."""
+        payload = result.payload or {}
+        distance = result.score if result.score is not None else 0.0
+        similarity = 1.0 / (1.0 + max(float(distance), 0.0))
+        tier_weight = self.config.tier_weights.get(payload.get("tier"), 1.0)
+        try:
+            importance = float(payload.get("importance_score", 0.5))
+        except (TypeError, ValueError):
+            importance = 0.5
+        return similarity * tier_weight * importance
+
+    def _next_decay_at(self, tier: MemoryTier, created_at: float) -> Optional[float]:
+        """Epoch seconds at which a memory of this age leaves ``tier``."""
+        if tier == MemoryTier.WORKING:
+            return created_at + self.config.working_memory_hours * 3600
+        if tier == MemoryTier.SHORT_TERM:
+            return created_at + self.config.short_term_days * 86400
+        return None
+
     def _determine_initial_tier(
         self,
         importance_score: float,
@@ -312,61 +357,70 @@ class TieredMemoryManager:
         else:
             return MemoryTier.LONG_TERM
 
-    def _promote_memory(self, memory_id: str, from_tiers: List[MemoryTier]):
+    def _promote_memories(self, memory_ids: List[str]):
         """
-        Promote memory to higher tier if frequently accessed.
+        Record access for retrieved memories and promote them if warranted.
 
         Promotion rules:
         - Working Memory: No promotion (already highest)
-        - Short-term → Working: If accessed 3+ times in 1 hour
+        - Short-term → Working: If accessed 3+ times
         - Long-term → Short-term: If accessed at all
 
         Args:
-            memory_id: Memory to promote
-            from_tiers: Tiers it was found in
+            memory_ids: Memories returned by a retrieval
         """
-        current_tier = self._memory_tiers.get(memory_id)
+        states = self._tiers.record_access(memory_ids, time.time())
 
-        if current_tier is None:
-            return  # Unknown memory
+        for memory_id, state in states.items():
+            current_tier = MemoryTier(state["tier"])
 
-        if current_tier == MemoryTier.WORKING:
-            return  # Already highest
-
-        # Update access count
-        self._access_counts[memory_id] = self._access_counts.get(memory_id, 0) + 1
-        self._last_accessed[memory_id] = datetime.now()
-
-        # Short-term → Working
-        if current_tier == MemoryTier.SHORT_TERM:
-            if self.config.enable_working_memory:
-                # Check access frequency
-                access_count = self._access_counts[memory_id]
-                if access_count >= 3:
-                    self._move_to_tier(memory_id, MemoryTier.WORKING)
+            # Short-term → Working
+            if current_tier == MemoryTier.SHORT_TERM:
+                if self.config.enable_working_memory and state["access_count"] >= 3:
+                    self._move_to_tier(memory_id, MemoryTier.WORKING, state["created_at"])
                     logger.info(f"Promoted {memory_id[:8]} to Working Memory")
 
-        # Long-term → Short-term
-        elif current_tier == MemoryTier.LONG_TERM:
-            self._move_to_tier(memory_id, MemoryTier.SHORT_TERM)
-            logger.info(f"Promoted {memory_id[:8]} to Short-term Memory")
+            # Long-term → Short-term
+            elif current_tier == MemoryTier.LONG_TERM:
+                self._move_to_tier(memory_id, MemoryTier.SHORT_TERM, state["created_at"])
+                logger.info(f"Promoted {memory_id[:8]} to Short-term Memory")
 
-    def _move_to_tier(self, memory_id: str, new_tier: MemoryTier):
+    def _move_to_tier(
+        self,
+        memory_id: str,
+        new_tier: MemoryTier,
+        created_at: Optional[float] = None,
+    ):
         """
         Move memory to a different tier.
 
         Args:
             memory_id: Memory to move
             new_tier: Target tier
+            created_at: Creation time (epoch seconds), looked up if omitted
         """
         # Update metadata
         self.vector_store.update(
             memory_id=memory_id,
             payload={"tier": new_tier.value},
         )
+        # The partial payload lacks the scope keys, so drop every cached search.
+        self._written(None)
 
         # Update tracking
-        self._memory_tiers[memory_id] = new_tier
+        if created_at is None:
+            state = self._tiers.get_state(memory_id)
+            created_at = state["created_at"] if state else time.time()
+        self._tiers.set_tier(memory_id, new_tier.value, self._next_decay_at(new_tier, created_at))
+
+    def _written(self, payload: Optional[Dict]) -> None:
+        """Invalidate cached searches after a vector-store write."""
+        if self._invalidate_cache is None:
+            return
+        try:
+            self._invalidate_cache(payload)
+        except Exception as e:
+            logger.warning(f"Search cache invalidation failed: {e}")
 
     def decay_and_compress(self):
         """
@@ -377,6 +431,8 @@ class TieredMemoryManager:
         2. Demote old Short-term → Long-term
         3. Compress Long-term memories
 
+        Only memories whose age crossed their tier boundary since the last
+        sweep are read, in batches, with payloads fetched in bulk.
         Should be called periodically (e.g., daily).
         """
         if not self.config.auto_decay:
@@ -384,66 +440,81 @@ class TieredMemoryManager:
 
         logger.info("Starting memory decay and compression...")
 
-        now = datetime.now()
+        now = time.time()
         demoted_count = 0
         compressed_count = 0
 
-        # Process all memories
-        for memory_id, tier in list(self._memory_tiers.items()):
-            # Get creation time
-            try:
-                memory_data = self.vector_store.get(memory_id)
-                if not memory_data.get("text_data"):
-                    continue
-
-                created_at_str = memory_data["text_data"].payload.get("created_at")
-                if not created_at_str:
-                    continue
-
-                created_at = datetime.fromisoformat(created_at_str)
-                age = now - created_at
-
-            except Exception as e:
-                logger.warning(f"Failed to process {memory_id[:8]}: {e}")
-                continue
-
-            # Working Memory → Short-term
-            if tier == MemoryTier.WORKING:
-                if age.total_seconds() > self.config.working_memory_hours * 3600:
-                    self._move_to_tier(memory_id, MemoryTier.SHORT_TERM)
+        after = None
+        while True:
+            due = self._tiers.list_due(now, after=after, limit=self.config.decay_batch_size)
+            if not due:
+                break
+            after = (due[-1]["next_decay_at"], due[-1]["memory_id"])
+
+            payloads = self._get_payloads(
+                [state["memory_id"] for state in due if state["tier"] == MemoryTier.SHORT_TERM.value]
+            )
+            kept = []
+
+            for state in due:
+                memory_id = state["memory_id"]
+                tier = MemoryTier(state["tier"])
+
+                # Working Memory → Short-term
+                if tier == MemoryTier.WORKING:
+                    self._move_to_tier(memory_id, MemoryTier.SHORT_TERM, state["created_at"])
                     demoted_count += 1
 
-            # Short-term → Long-term
-            elif tier == MemoryTier.SHORT_TERM:
-                if age.days > self.config.short_term_days:
+                # Short-term → Long-term
+                elif tier == MemoryTier.SHORT_TERM:
                     # Check access frequency
-                    access_count = self._access_counts.get(memory_id, 0)
-                    if access_count < 2:  # Rarely accessed
+                    if state["access_count"] < 2:  # Rarely accessed
                         if self.config.auto_compress:
-                            self._compress_and_archive(memory_id)
+                            self._compress_and_archive(memory_id, payload=payloads.get(memory_id))
                         else:
-                            self._move_to_tier(memory_id, MemoryTier.LONG_TERM)
+                            self._move_to_tier(memory_id, MemoryTier.LONG_TERM, state["created_at"])
                         demoted_count += 1
                         compressed_count += 1
+                    else:
+                        kept.append(memory_id)
+
+            # Frequently used memories stay put and need no further checks
+            self._tiers.clear_decay(kept)
+
+            if len(due) < self.config.decay_batch_size:
+                break
 
         logger.info(
             f"Decay complete: demoted={demoted_count}, compressed={compressed_count}"
         )
 
-    def _compress_and_archive(self, memory_id: str):
+    def _get_payloads(self, memory_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch text-collection payloads for several memories in one call."""
+        if not memory_ids:
+            return {}
+        store = getattr(self.vector_store, "text_store", self.vector_store)
+        try:
+            entries = store.get_many(memory_ids)
+        except Exception as e:
+            logger.warning(f"Bulk payload fetch failed: {e}")
+            return {}
+        return {memory_id: entry.payload for memory_id, entry in entries.items() if entry.payload}
+
+    def _compress_and_archive(self, memory_id: str, payload: Optional[Dict] = None):
         """
         Compress memory using LLM summarization.
 
         Args:
             memory_id: Memory to compress
+            payload: Prefetched text payload (fetched if omitted)
         """
         try:
             # Get memory data
-            memory_data = self.vector_store.get(memory_id)
-            if not memory_data.get("text_data"):
+            if payload is None:
+                payload = self._get_payloads([memory_id]).get(memory_id)
+            if not payload:
                 return
 
-            payload = memory_data["text_data"].payload
             content = payload.get("data", "")
 
             if not content:
@@ -485,9 +556,10 @@ Be concise but complete."""
                 payload=updated_payload,
                 text_embedding=summary_embedding,
             )
+            self._written(updated_payload)
 
             # Update tier tracking
-            self._memory_tiers[memory_id] = MemoryTier.LONG_TERM
+            self._tiers.set_tier(memory_id, MemoryTier.LONG_TERM.value, None)
 
             logger.info(f"Compressed and archived {memory_id[:8]}")
 
@@ -501,25 +573,18 @@ Be concise but complete."""
         Returns:
             Dict with tier counts and capacities
         """
-        tier_counts = {
-            MemoryTier.WORKING: 0,
-            MemoryTier.SHORT_TERM: 0,
-            MemoryTier.LONG_TERM: 0,
-        }
-
-        for tier in self._memory_tiers.values():
-            tier_counts[tier] = tier_counts.get(tier, 0) + 1
+        tier_counts = self._tiers.tier_counts()
 
         return {
             "tier_counts": {
-                "working": tier_counts[MemoryTier.WORKING],
-                "short_term": tier_counts[MemoryTier.SHORT_TERM],
-                "long_term": tier_counts[MemoryTier.LONG_TERM],
+                "working": tier_counts.get(MemoryTier.WORKING.value, 0),
+                "short_term": tier_counts.get(MemoryTier.SHORT_TERM.value, 0),
+                "long_term": tier_counts.get(MemoryTier.LONG_TERM.value, 0),
             },
             "capacities": {
                 "working": self.config.working_capacity,
                 "short_term": self.config.short_term_capacity,
                 "long_term": None,  # Unlimited
             },
-            "total_memories": len(self._memory_tiers),
+            "total_memories": sum(tier_counts.values()),
         }
@@ -13,6 +13,9 @@ import re
 import hashlib
 import threading
 import uuid
+import concurrent.futures
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, Callable, Tuple
 import asyncio
@@ -22,6 +25,9 @@ from .agent_executor import AgentExecutor
 from memscreen.cv2_loader import get_cv2
 from memscreen.services.chat_fallback_loader import ChatFallbackDataService
 from memscreen.services.chat_model_capability import ChatModelCapabilityService
+from memscreen.cache import get_cache_registry
+from memscreen.services.frame_sampler import get_frame_sampler
+from memscreen.storage import ChatThreadRepository
 
 # Import Agent system (kept for compatibility)
 try:
@@ -54,6 +60,72 @@ class ChatMessage:
         }
 
 
+class _ThinkStreamFilter:
+    """Forward streamed model text to a callback, holding back <think>...</think> spans."""
+
+    _OPEN = "<think>"
+    _CLOSE = "</think>"
+
+    def __init__(self, on_chunk: Callable[[str], None]):
+        self.on_chunk = on_chunk
+        self._emitted: List[str] = []
+        self._buffer = ""
+        self._in_think = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._emitted)
+
+    def __call__(self, delta: str) -> None:
+        self._buffer += delta
+        out: List[str] = []
+        while self._buffer:
+            tag = self._CLOSE if self._in_think else self._OPEN
+            lower = self._buffer.lower()
+            idx = lower.find(tag)
+            if idx >= 0:
+                if not self._in_think:
+                    out.append(self._buffer[:idx])
+                self._buffer = self._buffer[idx + len(tag):]
+                self._in_think = not self._in_think
+                continue
+            # Hold back a suffix that could be the start of a split tag.
+            keep = 0
+            for k in range(min(len(tag) - 1, len(lower)), 0, -1):
+                if tag.startswith(lower[-k:]):
+                    keep = k
+                    break
+            if not self._in_think:
+                out.append(self._buffer[:len(self._buffer) - keep])
+            self._buffer = self._buffer[len(self._buffer) - keep:]
+            break
+
+        text = "".join(out)
+        if not self._emitted:
+            text = text.lstrip()
+        if text:
+            self._emitted.append(text)
+            self.on_chunk(text)
+
+    def finish(self, final: str, on_replace: Optional[Callable[[str], None]] = None) -> None:
+        """
+        Bring the streamed text in line with the final reply.
+
+        Text appended after generation (e.g. evidence) is sent as one more
+        chunk. If the final reply no longer starts with what was streamed
+        (sanitizing, a fallback reply), ``on_replace`` receives the whole
+        final text so the client can discard the streamed chunks.
+        """
+        streamed = self.text
+        if final.startswith(streamed):
+            if len(final) > len(streamed):
+                self._emitted.append(final[len(streamed):])
+                self.on_chunk(self._emitted[-1])
+        elif on_replace is not None:
+            self._emitted = [final]
+            on_replace(final)
+
+
 class ChatPresenter(BasePresenter):
     """
     Presenter for AI Chat functionality.
@@ -72,6 +144,10 @@ class ChatPresenter(BasePresenter):
     - Update model dropdown
     """
 
+    # Constant probe queries of the tiered-context fan-out (embedded once at startup).
+    _RECORDING_PROBE_QUERY = "screen recording timeline what was seen"
+    _PROCESS_PROBE_QUERY = "keyboard mouse workflow recent activity planning"
+
     def __init__(
         self,
         view=None,
@@ -96,10 +172,12 @@ class ChatPresenter(BasePresenter):
 
         # Chat state
         self.conversation_history: List[ChatMessage] = []
+        # Metadata for every thread; message lists are loaded lazily per thread.
         self._chat_threads: Dict[str, List[ChatMessage]] = {}
         self._chat_thread_meta: Dict[str, Dict[str, Any]] = {}
         self._active_thread_id: str = ""
         self._chat_threads_store_path = self._get_chat_threads_store_path()
+        self._chat_thread_store = ChatThreadRepository(self._chat_threads_store_path)
         self.current_model = "qwen3.5:4b"
         self.available_models = []
 
@@ -124,9 +202,8 @@ class ChatPresenter(BasePresenter):
         # OPTIMIZATION: Reusable event loop for async operations
         self._event_loop = None
 
-        # OPTIMIZATION: Response cache for repeated queries
-        self._response_cache = {}  # query_hash -> response
-        self._cache_max_size = 100
+        # OPTIMIZATION: Response cache for repeated queries (query_hash -> response)
+        self._response_cache = get_cache_registry().private_namespace("chat.responses", max_entries=100)
 
         # OPTIMIZATION: Smart search limit (reduce results for faster processing)
         self._smart_search_limit = 5  # Only get top 5 results
@@ -141,10 +218,18 @@ class ChatPresenter(BasePresenter):
             "long_term": 3,
         }
 
+        # Tiered-context retrieval fan-out
+        self.retrieval_max_workers = 4
+        self.retrieval_budget_seconds = 8.0
+        self._retrieval_pool: Optional[ThreadPoolExecutor] = None
+        self._retrieval_pool_lock = threading.Lock()
+        # Searches still running after their turn's budget, on retired pools.
+        self._retrieval_stragglers: set = set()
+        self._probe_vectors: Dict[str, List[float]] = {}
+
         self._is_initialized = False
         self._easyocr_reader = None
-        self._video_ocr_cache: Dict[str, Dict[str, Any]] = {}
-        self._visual_frame_cache: Dict[str, Dict[str, Any]] = {}
+        self._video_ocr_cache = get_cache_registry().private_namespace("chat.video_ocr", max_entries=80)
         self._model_pull_attempted = set()
         self.auto_pull_missing_models = True
         self.max_auto_pull_seconds = 240
@@ -231,6 +316,9 @@ class ChatPresenter(BasePresenter):
             self._is_initialized = True
             print("[ChatPresenter] Initialized successfully")
             threading.Thread(target=self._warmup_visual_evidence, daemon=True).start()
+            threading.Thread(target=self._compact_chat_threads, daemon=True).start()
+            if self.memory_system:
+                threading.Thread(target=self._warmup_retrieval_probes, daemon=True).start()
         except Exception as e:
             self.handle_error(e, "Failed to initialize ChatPresenter")
             raise
@@ -245,6 +333,10 @@ class ChatPresenter(BasePresenter):
         if self._event_loop and not self._event_loop.is_closed():
             self._event_loop.close()
 
+        if self._retrieval_pool is not None:
+            self._retrieval_pool.shutdown(wait=False)
+            self._retrieval_pool = None
+
         self._is_initialized = False
 
     def _get_event_loop(self):
@@ -279,32 +371,29 @@ class ChatPresenter(BasePresenter):
         import hashlib
         scope = f"{self._active_thread_id}::{query}"
         query_hash = hashlib.md5(scope.encode()).hexdigest()
-
-        # Simple cache eviction if full
-        if len(self._response_cache) >= self._cache_max_size:
-            # Remove oldest entry (first key)
-            oldest_key = next(iter(self._response_cache))
-            del self._response_cache[oldest_key]
-
-        self._response_cache[query_hash] = response
+        self._response_cache.set(query_hash, response)
 
     def _default_thread_title(self) -> str:
         return "New Chat"
 
     def _get_chat_threads_store_path(self) -> str:
-        """Resolve persistent thread storage path."""
+        """Resolve the dedicated SQLite database that persists chat threads."""
         try:
             from memscreen.config import get_config
 
-            path = get_config().db_dir / "chat_threads.json"
-            path.parent.mkdir(parents=True, exist_ok=True)
-            return str(path)
+            db_dir = get_config().db_dir
+            db_dir.mkdir(parents=True, exist_ok=True)
+            return str(db_dir / "chat_threads.db")
         except Exception:
             home = os.path.expanduser("~")
-            fallback = os.path.join(home, ".memscreen", "chat_threads.json")
+            fallback = os.path.join(home, ".memscreen", "chat_threads.db")
             os.makedirs(os.path.dirname(fallback), exist_ok=True)
             return fallback
 
+    def _legacy_chat_threads_path(self) -> str:
+        """Single-file JSON store used before threads moved to SQLite."""
+        return os.path.join(os.path.dirname(self._chat_threads_store_path), "chat_threads.json")
+
     def _new_thread_id(self) -> str:
         return f"thread_{uuid.uuid4().hex[:12]}"
 
@@ -315,16 +404,32 @@ class ChatPresenter(BasePresenter):
             return clean
         return clean[: max(0, limit - 3)].rstrip() + "..."
 
+    def _thread_messages(self, thread_id: str, cache: bool = True) -> List[ChatMessage]:
+        """Return a thread's messages, reading its log from the store on first use."""
+        messages = self._chat_threads.get(thread_id)
+        if messages is not None:
+            return messages
+        messages = []
+        try:
+            for row in self._chat_thread_store.load_messages(thread_id):
+                messages.append(ChatMessage(row["role"], row["content"], row["timestamp"]))
+        except Exception as e:
+            print(f"[Chat] failed to load chat thread {thread_id}: {e}")
+        if cache:
+            self._chat_threads[thread_id] = messages
+        return messages
+
     def _sync_active_conversation(self) -> None:
-        if not self._chat_threads:
+        if not self._chat_thread_meta:
             thread_id = self._create_thread_internal(switch=True, persist=False)
             self._active_thread_id = thread_id
-        if self._active_thread_id not in self._chat_threads:
-            self._active_thread_id = next(iter(self._chat_threads))
-        self.conversation_history = self._chat_threads[self._active_thread_id]
+        if self._active_thread_id not in self._chat_thread_meta:
+            self._active_thread_id = next(iter(self._chat_thread_meta))
+        self.conversation_history = self._thread_messages(self._active_thread_id)
 
     def _update_thread_meta(self, thread_id: Optional[str] = None, touch_updated: bool = True) -> None:
         target_id = thread_id or self._active_thread_id
+        # Threads whose messages are not loaded keep their stored metadata.
         if not target_id or target_id not in self._chat_threads:
             return
 
@@ -370,34 +475,37 @@ class ChatPresenter(BasePresenter):
             current_title = self._summarize_thread_text(str(meta.get("title", "")), limit=36)
             meta["title"] = current_title or self._default_thread_title()
 
-    def _persist_chat_threads(self) -> None:
-        """Persist threads to disk so thread history survives restarts."""
+    def _persist_thread_meta(self, thread_id: Optional[str] = None) -> None:
+        """Persist one thread's metadata row."""
+        target_id = thread_id or self._active_thread_id
+        meta = self._chat_thread_meta.get(target_id)
+        if not meta:
+            return
         try:
-            self._sync_active_conversation()
-            payload = {
-                "active_thread_id": self._active_thread_id,
-                "threads": [],
-            }
-            for thread_id, messages in self._chat_threads.items():
-                self._update_thread_meta(thread_id=thread_id, touch_updated=False)
-                payload["threads"].append(
-                    {
-                        "id": thread_id,
-                        "meta": self._chat_thread_meta.get(thread_id, {}).copy(),
-                        "messages": [msg.to_dict() for msg in messages],
-                    }
-                )
-            payload["threads"].sort(
-                key=lambda item: str((item.get("meta") or {}).get("updated_at", "")),
-                reverse=True,
-            )
+            self._chat_thread_store.save_thread(target_id, meta)
+        except Exception as e:
+            print(f"[Chat] failed to persist chat thread: {e}")
 
-            tmp_path = self._chat_threads_store_path + ".tmp"
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(payload, f, indent=2, ensure_ascii=False)
-            os.replace(tmp_path, self._chat_threads_store_path)
+    def _persist_active_thread_id(self) -> None:
+        try:
+            self._chat_thread_store.set_state("active_thread_id", self._active_thread_id)
+        except Exception as e:
+            print(f"[Chat] failed to persist active chat thread: {e}")
+
+    def _persist_thread_messages(self, thread_id: Optional[str] = None) -> None:
+        """Rewrite a thread's whole message log (after it was cleared or replaced)."""
+        target_id = thread_id or self._active_thread_id
+        meta = self._chat_thread_meta.get(target_id)
+        if not meta or target_id not in self._chat_threads:
+            return
+        try:
+            self._chat_thread_store.replace_thread(
+                target_id,
+                [msg.to_dict() for msg in self._chat_threads[target_id]],
+                meta,
+            )
         except Exception as e:
-            print(f"[Chat] failed to persist chat threads: {e}")
+            print(f"[Chat] failed to persist chat thread: {e}")
 
     def _create_thread_internal(
         self,
@@ -424,84 +532,122 @@ class ChatPresenter(BasePresenter):
             self._active_thread_id = thread_id
             self.conversation_history = self._chat_threads[thread_id]
         if persist:
-            self._persist_chat_threads()
+            self._persist_thread_meta(thread_id)
+            if switch:
+                self._persist_active_thread_id()
         return thread_id
 
     def _load_chat_threads(self) -> None:
-        """Load persisted threads from disk."""
+        """Load thread metadata from the store; messages are read when a thread is opened."""
         self._chat_threads = {}
         self._chat_thread_meta = {}
         self._active_thread_id = ""
 
         try:
-            if os.path.exists(self._chat_threads_store_path):
-                with open(self._chat_threads_store_path, "r", encoding="utf-8") as f:
-                    raw = json.load(f)
-                if isinstance(raw, dict):
-                    for item in raw.get("threads", []) or []:
-                        if not isinstance(item, dict):
-                            continue
-                        thread_id = str(item.get("id", "")).strip() or self._new_thread_id()
-                        meta = item.get("meta", {}) or {}
-                        messages_raw = item.get("messages", []) or []
-                        messages: List[ChatMessage] = []
-                        for msg_data in messages_raw:
-                            if not isinstance(msg_data, dict):
-                                continue
-                            role = str(msg_data.get("role", "assistant"))
-                            content = str(msg_data.get("content", ""))
-                            timestamp = str(msg_data.get("timestamp", ""))
-                            messages.append(ChatMessage(role, content, timestamp))
-                        self._chat_threads[thread_id] = messages
-                        self._chat_thread_meta[thread_id] = {
-                            "id": thread_id,
-                            "title": self._summarize_thread_text(str(meta.get("title", "")), limit=36)
-                            or self._default_thread_title(),
-                            "preview": self._summarize_thread_text(str(meta.get("preview", "")), limit=88),
-                            "created_at": str(meta.get("created_at", "")) or datetime.now().isoformat(),
-                            "updated_at": str(meta.get("updated_at", "")) or datetime.now().isoformat(),
-                            "message_count": int(meta.get("message_count", len(messages)) or len(messages)),
-                            "auto_title": bool(meta.get("auto_title", False)),
-                        }
-                    requested_active = str(raw.get("active_thread_id", "")).strip()
-                    if requested_active in self._chat_threads:
-                        self._active_thread_id = requested_active
+            self._migrate_legacy_chat_threads()
+            for meta in self._chat_thread_store.list_threads():
+                self._chat_thread_meta[meta["id"]] = meta
+            requested_active = str(self._chat_thread_store.get_state("active_thread_id") or "").strip()
+            if requested_active in self._chat_thread_meta:
+                self._active_thread_id = requested_active
         except Exception as e:
             print(f"[Chat] failed to load chat threads: {e}")
             self._chat_threads = {}
             self._chat_thread_meta = {}
             self._active_thread_id = ""
 
-        if not self._chat_threads:
+        if not self._chat_thread_meta:
             self._create_thread_internal(switch=True, persist=False)
 
         self._sync_active_conversation()
-        for thread_id in list(self._chat_threads.keys()):
-            self._update_thread_meta(thread_id=thread_id, touch_updated=False)
-        self._persist_chat_threads()
+
+    def _compact_chat_threads(self) -> None:
+        """Reclaim space left by rewritten threads; runs in the background after startup."""
+        try:
+            if self._chat_thread_store.compact():
+                print("[Chat] compacted chat thread store")
+        except Exception as e:
+            print(f"[Chat] chat thread store compaction skipped: {e}")
+
+    def _migrate_legacy_chat_threads(self) -> None:
+        """Import the old chat_threads.json into the store once, then set it aside."""
+        legacy_path = self._legacy_chat_threads_path()
+        if not os.path.exists(legacy_path):
+            return
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        if isinstance(raw, dict):
+            for item in raw.get("threads", []) or []:
+                if not isinstance(item, dict):
+                    continue
+                thread_id = str(item.get("id", "")).strip() or self._new_thread_id()
+                meta = item.get("meta", {}) or {}
+                messages: List[ChatMessage] = []
+                for msg_data in item.get("messages", []) or []:
+                    if not isinstance(msg_data, dict):
+                        continue
+                    role = str(msg_data.get("role", "assistant"))
+                    content = str(msg_data.get("content", ""))
+                    timestamp = str(msg_data.get("timestamp", ""))
+                    messages.append(ChatMessage(role, content, timestamp))
+                self._chat_threads[thread_id] = messages
+                self._chat_thread_meta[thread_id] = {
+                    "id": thread_id,
+                    "title": self._summarize_thread_text(str(meta.get("title", "")), limit=36)
+                    or self._default_thread_title(),
+                    "preview": "",
+                    "created_at": str(meta.get("created_at", "")) or datetime.now().isoformat(),
+                    "updated_at": str(meta.get("updated_at", "")) or datetime.now().isoformat(),
+                    "message_count": len(messages),
+                    "auto_title": bool(meta.get("auto_title", False)),
+                }
+                self._update_thread_meta(thread_id=thread_id, touch_updated=False)
+            self._chat_thread_store.import_threads(
+                (thread_id, self._chat_thread_meta[thread_id], [msg.to_dict() for msg in messages])
+                for thread_id, messages in self._chat_threads.items()
+            )
+            requested_active = str(raw.get("active_thread_id", "")).strip()
+            if requested_active in self._chat_thread_meta:
+                self._chat_thread_store.set_state("active_thread_id", requested_active)
+        os.replace(legacy_path, legacy_path + ".migrated")
+        self._chat_threads = {}
+        self._chat_thread_meta = {}
+        print(f"[Chat] migrated chat threads from {legacy_path}")
 
     def _append_history_message(self, role: str, content: str, timestamp: str = "") -> ChatMessage:
-        """Append one message to the active thread and persist thread metadata."""
+        """Append one message to the active thread's log and update its metadata."""
         self._sync_active_conversation()
         msg = ChatMessage(role, content, timestamp)
         self.conversation_history.append(msg)
         self._update_thread_meta()
-        self._persist_chat_threads()
+        thread_id = self._active_thread_id
+        try:
+            self._chat_thread_store.append_message(
+                thread_id,
+                len(self.conversation_history) - 1,
+                msg.to_dict(),
+                self._chat_thread_meta[thread_id],
+            )
+        except Exception as e:
+            print(f"[Chat] failed to persist chat message: {e}")
         return msg
 
     def _mark_active_thread_changed(self, touch_updated: bool = True) -> None:
         self._sync_active_conversation()
         self._update_thread_meta(touch_updated=touch_updated)
-        self._persist_chat_threads()
+        self._persist_thread_messages()
 
     def _thread_has_messages(self, thread_id: str) -> bool:
-        return bool(self._chat_threads.get(thread_id, []))
+        messages = self._chat_threads.get(thread_id)
+        if messages is not None:
+            return bool(messages)
+        return int(self._chat_thread_meta.get(thread_id, {}).get("message_count", 0) or 0) > 0
 
     def _find_reusable_empty_thread_id(self) -> str:
         """Find an existing empty thread so 'New Chat' does not create endless blanks."""
         empty_ids = [
-            tid for tid, messages in self._chat_threads.items()
-            if not messages
+            tid for tid in self._chat_thread_meta
+            if not self._thread_has_messages(tid)
         ]
         if not empty_ids:
             return ""
@@ -524,7 +670,7 @@ class ChatPresenter(BasePresenter):
         if memory_thread_id:
             return memory_thread_id == active_thread_id
         # Legacy chat memories had no thread id; only allow them when threading has not split yet.
-        return len(self._chat_threads) <= 1
+        return len(self._chat_thread_meta) <= 1
 
     def _filter_memories_for_active_thread(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
@@ -546,8 +692,8 @@ class ChatPresenter(BasePresenter):
     def get_thread_history(self, thread_id: Optional[str] = None) -> List[ChatMessage]:
         """Get history for a specific thread without changing active selection."""
         target_id = str(thread_id or "").strip()
-        if target_id and target_id in self._chat_threads:
-            return self._chat_threads[target_id].copy()
+        if target_id and target_id in self._chat_thread_meta:
+            return self._thread_messages(target_id, cache=False).copy()
         return self.get_conversation_history()
 
     def list_chat_threads(self) -> List[Dict[str, Any]]:
@@ -556,7 +702,7 @@ class ChatPresenter(BasePresenter):
         for thread_id in list(self._chat_threads.keys()):
             self._update_thread_meta(thread_id=thread_id, touch_updated=False)
         ordered_ids = sorted(
-            self._chat_threads.keys(),
+            self._chat_thread_meta.keys(),
             key=lambda tid: str(self._chat_thread_meta.get(tid, {}).get("updated_at", "")),
             reverse=True,
         )
@@ -570,7 +716,7 @@ class ChatPresenter(BasePresenter):
                     "preview": str(meta.get("preview", "")),
                     "created_at": str(meta.get("created_at", "")),
                     "updated_at": str(meta.get("updated_at", "")),
-                    "message_count": int(meta.get("message_count", len(self._chat_threads.get(tid, [])))),
+                    "message_count": int(meta.get("message_count", 0) or 0),
                     "is_active": tid == self._active_thread_id,
                 }
             )
@@ -586,7 +732,8 @@ class ChatPresenter(BasePresenter):
         # Reuse the current empty thread instead of creating endless blank threads.
         if not self._thread_has_messages(self._active_thread_id):
             self._update_thread_meta(touch_updated=False)
-            self._persist_chat_threads()
+            self._persist_thread_meta()
+            self._persist_active_thread_id()
             thread_id = self._active_thread_id
         else:
             reusable_id = self._find_reusable_empty_thread_id()
@@ -610,12 +757,17 @@ class ChatPresenter(BasePresenter):
 
     def switch_chat_thread(self, thread_id: str) -> bool:
         target_id = str(thread_id or "").strip()
-        if not target_id or target_id not in self._chat_threads:
+        if not target_id or target_id not in self._chat_thread_meta:
             return False
+        # Only the active thread's messages stay in memory.
+        self._chat_threads = {
+            tid: messages for tid, messages in self._chat_threads.items()
+            if tid == target_id
+        }
         self._active_thread_id = target_id
         self._sync_active_conversation()
         self._update_thread_meta(touch_updated=False)
-        self._persist_chat_threads()
+        self._persist_active_thread_id()
         return True
 
     def get_available_models(self) -> List[str]:
@@ -1728,32 +1880,25 @@ class ChatPresenter(BasePresenter):
             if not reader:
                 return ""
 
-            cap = cv2.VideoCapture(video_path)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 0
-            if total_frames <= 0:
-                cap.release()
-                return ""
-
             ratios = (
                 0.08, 0.2, 0.32, 0.45, 0.58, 0.7, 0.82, 0.92
             ) if dense else (0.2, 0.5, 0.8)
-            idxs = sorted({max(0, min(total_frames - 1, int(total_frames * r))) for r in ratios})
+            # Downscale for OCR speed.
+            samples = get_frame_sampler().sample(
+                video_path,
+                lambda total: {max(0, min(total - 1, int(total * r))) for r in ratios},
+                max_width=1400,
+            )
+            if not samples:
+                return ""
+
             frame_candidates: List[Tuple[int, List[str]]] = []
             start_ts = time.time()
             time_budget = 8.0 if dense else 4.5
-            for idx in idxs:
+            for sample in samples:
                 if (time.time() - start_ts) > time_budget:
                     break
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ok, frame = cap.read()
-                if not ok:
-                    continue
-                # Downscale for OCR speed.
-                h, w = frame.shape[:2]
-                if w > 1400:
-                    new_w = 1400
-                    new_h = int(h * (new_w / w))
-                    frame = cv2.resize(frame, (new_w, new_h))
+                frame = sample["frame"]
                 try:
                     results = reader.readtext(frame, detail=0, paragraph=True)
                 except Exception:
@@ -1773,9 +1918,8 @@ class ChatPresenter(BasePresenter):
                 score = sum(min(len(t), 48) for t in items) + informative * 20
                 frame_candidates.append((score, items))
 
-            cap.release()
             if not frame_candidates:
-                self._video_ocr_cache[cache_key] = {"mtime": mtime, "text": ""}
+                self._video_ocr_cache.set(cache_key, {"mtime": mtime, "text": ""})
                 return ""
 
             frame_candidates.sort(key=lambda x: x[0], reverse=True)
@@ -1801,11 +1945,7 @@ class ChatPresenter(BasePresenter):
             if len(merged) > max_len:
                 merged = merged[:max_len] + "..."
 
-            self._video_ocr_cache[cache_key] = {"mtime": mtime, "text": merged}
-            if len(self._video_ocr_cache) > 80:
-                # Remove one oldest inserted item to cap memory.
-                oldest_key = next(iter(self._video_ocr_cache))
-                del self._video_ocr_cache[oldest_key]
+            self._video_ocr_cache.set(cache_key, {"mtime": mtime, "text": merged})
             return merged
         except Exception as e:
             print(f"[Chat] quick video OCR failed: {e}")
@@ -2086,40 +2226,12 @@ class ChatPresenter(BasePresenter):
             return []
 
         try:
-            mtime = os.path.getmtime(video_path)
-            cache_key = f"{video_path}:{max_samples}"
-            cached = self._visual_frame_cache.get(cache_key)
-            if cached and cached.get("mtime") == mtime:
-                return cached.get("frames", [])
-
-            cap = cv2.VideoCapture(video_path)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 0
-            fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
-            if total_frames <= 0:
-                cap.release()
-                return []
-
             ratios = [0.35, 0.75] if max_samples > 1 else [0.5]
-            idxs = []
-            for r in ratios[:max_samples]:
-                idxs.append(max(0, min(total_frames - 1, int(total_frames * r))))
-            idxs = sorted(set(idxs))
-
-            out: List[Tuple[float, Any]] = []
-            for idx in idxs:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ok, frame = cap.read()
-                if not ok:
-                    continue
-                t_sec = (idx / fps) if fps > 0 else 0.0
-                out.append((t_sec, frame))
-
-            cap.release()
-            self._visual_frame_cache[cache_key] = {"mtime": mtime, "frames": out}
-            if len(self._visual_frame_cache) > 80:
-                oldest_key = next(iter(self._visual_frame_cache))
-                del self._visual_frame_cache[oldest_key]
-            return out
+            samples = get_frame_sampler().sample(
+                video_path,
+                lambda total: [max(0, min(total - 1, int(total * r))) for r in ratios[:max_samples]],
+            )
+            return [(float(sample["time_offset"]), sample["frame"]) for sample in samples]
         except Exception as e:
             print(f"[Chat] sample video frames failed: {e}")
             return []
@@ -2243,30 +2355,16 @@ class ChatPresenter(BasePresenter):
             if not reader:
                 return []
 
-            cap = cv2.VideoCapture(video_path)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 0
-            fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
-            if total_frames <= 0:
-                cap.release()
-                return []
-
-            if total_frames <= 8:
-                idxs = list(range(total_frames))
-            else:
+            def _timeline_indices(total_frames: int) -> List[int]:
+                if total_frames <= 8:
+                    return list(range(total_frames))
                 ratios = [0.08, 0.3, 0.55, 0.82]
-                idxs = sorted({max(0, min(total_frames - 1, int(total_frames * r))) for r in ratios})
+                return sorted({max(0, min(total_frames - 1, int(total_frames * r))) for r in ratios})
 
             rows: List[Dict[str, Any]] = []
-            for idx in idxs:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ok, frame = cap.read()
-                if not ok:
-                    continue
-                h, w = frame.shape[:2]
-                if w > 1400:
-                    new_w = 1400
-                    new_h = int(h * (new_w / w))
-                    frame = cv2.resize(frame, (new_w, new_h))
+            for sample in get_frame_sampler().sample(video_path, _timeline_indices, max_width=1400):
+                idx = sample["source_frame"]
+                frame = sample["frame"]
                 try:
                     results = reader.readtext(frame, detail=0, paragraph=True)
                 except Exception:
@@ -2284,18 +2382,16 @@ class ChatPresenter(BasePresenter):
                 text = "".join(picked)
                 if not text:
                     continue
-                t_sec = (idx / fps) if fps > 0 else 0.0
                 rows.append(
                     {
                         "frame_index": len(rows),
                         "source_frame": int(idx),
-                        "time_offset": round(float(t_sec), 2),
+                        "time_offset": float(sample["time_offset"]),
                         "text": text,
                     }
                 )
                 if len(rows) >= max_points:
                     break
-            cap.release()
             return rows
         except Exception as e:
             print(f"[Chat] extract frame timeline text failed: {e}")
@@ -2423,35 +2519,14 @@ class ChatPresenter(BasePresenter):
         if cv2 is None or not os.path.exists(video_path):
             return []
         try:
-            cap = cv2.VideoCapture(video_path)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 0
-            fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
-            if total_frames <= 0:
-                cap.release()
-                return []
-
-            if total_frames <= max_samples:
-                idxs = list(range(total_frames))
-            else:
+            def _dense_indices(total_frames: int) -> List[int]:
+                if total_frames <= max_samples:
+                    return list(range(total_frames))
                 ratios = [0.02, 0.14, 0.28, 0.42, 0.56, 0.7, 0.84, 0.96]
                 idxs = [max(0, min(total_frames - 1, int(total_frames * r))) for r in ratios]
-                idxs = sorted(set(idxs))[:max_samples]
+                return sorted(set(idxs))[:max_samples]
 
-            out: List[Dict[str, Any]] = []
-            for idx in idxs:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ok, frame = cap.read()
-                if not ok:
-                    continue
-                out.append(
-                    {
-                        "source_frame": int(idx),
-                        "time_offset": round((idx / fps) if fps > 0 else 0.0, 2),
-                        "frame": frame,
-                    }
-                )
-            cap.release()
-            return out
+            return get_frame_sampler().sample(video_path, _dense_indices)
         except Exception as e:
             print(f"[Chat] dense frame sampling failed: {e}")
             return []
@@ -2775,6 +2850,9 @@ class ChatPresenter(BasePresenter):
 
             embeddings = embedding_model.embed(memory_text, "update")
             vector_store.update(vector_id=memory_id, vector=embeddings, payload=payload)
+            invalidate = getattr(self.memory_system, "invalidate_search_cache", None)
+            if callable(invalidate):
+                invalidate(payload)
         except Exception as e:
             print(f"[Chat] update memory from harness failed: {e}")
 
@@ -4640,6 +4718,147 @@ class ChatPresenter(BasePresenter):
 
         return "\n".join(evidence_lines), stats
 
+    def _warmup_retrieval_probes(self) -> None:
+        """Embed the constant fan-out probe queries once so chat turns skip those embeddings."""
+        embed_query = getattr(self.memory_system, "embed_query", None)
+        if not callable(embed_query):
+            return
+        for probe in (self._RECORDING_PROBE_QUERY, self._PROCESS_PROBE_QUERY):
+            if probe in self._probe_vectors:
+                continue
+            try:
+                self._probe_vectors[probe] = embed_query(probe)
+            except Exception as e:
+                print(f"[Chat] Probe query warmup failed: {e}")
+                return
+
+    def _search_memory_results(self, query: str, **kwargs) -> List[Dict[str, Any]]:
+        """Run one memory search and return thread-filtered result dicts."""
+        vectors = self._probe_vectors.get(query)
+        if vectors is not None and self._search_accepts_vectors():
+            kwargs["vectors"] = vectors
+        result = self.memory_system.search(query=query, **kwargs)
+        return self._filter_memories_for_active_thread(self._as_result_list(result))
+
+    def _search_accepts_vectors(self) -> bool:
+        """Whether ``memory_system.search`` takes precomputed query vectors."""
+        try:
+            params = inspect.signature(self.memory_system.search).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return any(p.name == "vectors" or p.kind is inspect.Parameter.VAR_KEYWORD for p in params)
+
+    def _get_retrieval_pool(self) -> ThreadPoolExecutor:
+        if self._retrieval_pool is None:
+            with self._retrieval_pool_lock:
+                if self._retrieval_pool is None:
+                    self._retrieval_pool = ThreadPoolExecutor(
+                        max_workers=self.retrieval_max_workers,
+                        thread_name_prefix="chat-retrieval",
+                    )
+        return self._retrieval_pool
+
+    def _retire_retrieval_pool(self, pool: ThreadPoolExecutor, stragglers) -> None:
+        """
+        Hand searches that overran the budget to a retired pool.
+
+        Running futures cannot be cancelled, so the next turn gets a fresh pool
+        instead of queueing behind them. Retired threads exit once their search
+        returns; at most ``retrieval_max_workers`` stragglers are tolerated
+        before pools are reused again, which bounds the thread count.
+        """
+        with self._retrieval_pool_lock:
+            self._retrieval_stragglers = {f for f in self._retrieval_stragglers if not f.done()}
+            if len(self._retrieval_stragglers) + len(stragglers) > self.retrieval_max_workers:
+                return
+            self._retrieval_stragglers.update(stragglers)
+            if self._retrieval_pool is pool:
+                self._retrieval_pool = None
+        pool.shutdown(wait=False)
+
+    def _fan_out_tiered_retrieval(
+        self,
+        query: str,
+        *,
+        need_recording_fallback: bool,
+        need_process_fallback: bool,
+    ) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """
+        Run the tiered-context searches concurrently within ``retrieval_budget_seconds``.
+
+        Returns the merged memories (main search first, then recording and
+        process probes, deduped by id) and the recording-DB fallback rows,
+        which are prefetched alongside so they are ready if vector memory has
+        no recordings. Searches still running at the deadline are dropped; the
+        fallback rows are then None and the caller loads them itself if needed.
+        """
+        tasks: Dict[str, Callable[[], Any]] = {}
+        if hasattr(self.memory_system, "smart_search"):
+            tasks["main"] = lambda: self._filter_memories_for_active_thread(
+                self._as_result_list(self.memory_system.smart_search(query=query, user_id="default_user", limit=18))
+            )
+        else:
+            tasks["main"] = lambda: self._search_memory_results(query, user_id="default_user", limit=18, threshold=0.0)
+        if need_recording_fallback:
+            tasks["recording"] = lambda: self._search_memory_results(
+                self._RECORDING_PROBE_QUERY,
+                user_id="default_user",
+                filters={"type": "screen_recording"},
+                limit=8,
+                threshold=0.0,
+            )
+            tasks["recording_db"] = lambda: self._load_recent_recordings_from_db(limit=5)
+        if need_process_fallback:
+            tasks["process"] = lambda: self._search_memory_results(
+                self._PROCESS_PROBE_QUERY,
+                user_id="default_user",
+                filters={"type": "process_session"},
+                limit=8,
+                threshold=0.0,
+            )
+
+        pool = self._get_retrieval_pool()
+        futures = {pool.submit(task): name for name, task in tasks.items()}
+        done, pending = concurrent.futures.wait(futures, timeout=self.retrieval_budget_seconds)
+        running = {f for f in pending if not f.cancel()}
+        if running:
+            self._retire_retrieval_pool(pool, running)
+        if pending:
+            print(
+                "[Chat] Retrieval budget exceeded; continuing without: "
+                + ", ".join(sorted(futures[f] for f in pending))
+            )
+
+        results: Dict[str, Any] = {}
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as err:
+                print(f"[Chat] Tiered {name} search failed: {err}")
+
+        memories: List[Any] = []
+        seen_ids = set()
+        for name in ("main", "recording", "process"):
+            for mem in results.get(name) or []:
+                mem_id = str(mem.get("id") or "") if isinstance(mem, dict) else ""
+                if mem_id:
+                    if mem_id in seen_ids:
+                        continue
+                    seen_ids.add(mem_id)
+                memories.append(mem)
+        if "recording_db" in results:
+            return memories, results["recording_db"] or []
+        return memories, None
+
+    @staticmethod
+    def _as_result_list(result: Any) -> List[Any]:
+        if isinstance(result, dict):
+            return result.get("results", []) or []
+        if isinstance(result, list):
+            return result
+        return []
+
     def _build_tiered_memory_context(self, query: str) -> Tuple[str, Dict[str, Any]]:
         """Build a tiered (working/short/long) context string for faster and better grounded answers."""
         stats = {
@@ -4692,83 +4911,11 @@ class ChatPresenter(BasePresenter):
                     return "\n".join(context_parts), stats
             return "", stats
 
-        memories = []
-        try:
-            if hasattr(self.memory_system, "smart_search"):
-                result = self.memory_system.smart_search(
-                    query=query,
-                    user_id="default_user",
-                    limit=18,
-                )
-            else:
-                result = self.memory_system.search(
-                    query=query,
-                    user_id="default_user",
-                    limit=18,
-                    threshold=0.0,
-                )
-
-            if isinstance(result, dict):
-                memories = result.get("results", []) or []
-            elif isinstance(result, list):
-                memories = result
-            memories = self._filter_memories_for_active_thread(memories)
-        except Exception as mem_err:
-            print(f"[Chat] Tiered memory search failed: {mem_err}")
-            memories = []
-
-        # If user asks temporal "what did I see" style questions, always pull recent screen recordings.
-        if need_recording_fallback:
-            try:
-                recording_result = self.memory_system.search(
-                    query="screen recording timeline what was seen",
-                    user_id="default_user",
-                    filters={"type": "screen_recording"},
-                    limit=8,
-                    threshold=0.0,
-                )
-                extra_memories = []
-                if isinstance(recording_result, dict):
-                    extra_memories = recording_result.get("results", []) or []
-                elif isinstance(recording_result, list):
-                    extra_memories = recording_result
-                extra_memories = self._filter_memories_for_active_thread(extra_memories)
-
-                if extra_memories:
-                    seen_ids = {str(m.get("id")) for m in memories if isinstance(m, dict)}
-                    for mem in extra_memories:
-                        mem_id = str(mem.get("id")) if isinstance(mem, dict) else ""
-                        if mem_id and mem_id in seen_ids:
-                            continue
-                        memories.append(mem)
-            except Exception as rec_err:
-                print(f"[Chat] Recording fallback search failed: {rec_err}")
-
-        if need_process_fallback:
-            try:
-                process_result = self.memory_system.search(
-                    query="keyboard mouse workflow recent activity planning",
-                    user_id="default_user",
-                    filters={"type": "process_session"},
-                    limit=8,
-                    threshold=0.0,
-                )
-                extra_process_memories = []
-                if isinstance(process_result, dict):
-                    extra_process_memories = process_result.get("results", []) or []
-                elif isinstance(process_result, list):
-                    extra_process_memories = process_result
-                extra_process_memories = self._filter_memories_for_active_thread(extra_process_memories)
-
-                if extra_process_memories:
-                    seen_ids = {str(m.get("id")) for m in memories if isinstance(m, dict)}
-                    for mem in extra_process_memories:
-                        mem_id = str(mem.get("id")) if isinstance(mem, dict) else ""
-                        if mem_id and mem_id in seen_ids:
-                            continue
-                        memories.append(mem)
-            except Exception as proc_err:
-                print(f"[Chat] Process fallback search failed: {proc_err}")
+        memories, prefetched_db_rows = self._fan_out_tiered_retrieval(
+            query,
+            need_recording_fallback=need_recording_fallback,
+            need_process_fallback=need_process_fallback,
+        )
 
         now = datetime.now()
         working_cutoff = now - timedelta(hours=self.working_memory_hours)
@@ -4812,7 +4959,10 @@ class ChatPresenter(BasePresenter):
 
         # Fallback: if vector memory has no recording entries yet, use recording DB timeline.
         if need_recording_fallback and stats["recording_count"] == 0:
-            db_rows = self._load_recent_recordings_from_db(limit=5)
+            db_rows = prefetched_db_rows
+            if db_rows is None:
+                # The prefetch did not finish within the budget (or failed).
+                db_rows = self._load_recent_recordings_from_db(limit=5) or []
             for row in db_rows:
                 when = row.get("timestamp", "Unknown time")
                 basename = row.get("basename", "")
@@ -5171,10 +5321,20 @@ class ChatPresenter(BasePresenter):
         self,
         user_message: str,
         on_done: Callable[[str, Optional[str]], None],
+        on_chunk: Optional[Callable[[str], None]] = None,
+        on_replace: Optional[Callable[[str], None]] = None,
     ) -> None:
         """
         Send a message in background and return full response via callback.
 
+        Callbacks are per call and never touch ``self.view``, so concurrent
+        API requests do not see each other's output. When ``on_chunk`` is
+        given, model text is streamed to it as it is generated (think tags
+        removed) and any evidence appended afterwards is sent as a final
+        chunk. If post-processing changes text that was already streamed,
+        ``on_replace`` receives the whole final reply instead; ``on_done``
+        always receives the complete reply.
+
         Optimizations:
         - Auto model selection based on query + memory complexity
         - Tiered memory context (working/short-term/long-term)
@@ -5447,7 +5607,11 @@ class ChatPresenter(BasePresenter):
                     messages.append(msg.to_dict())
                 messages.append({"role": "user", "content": user_message})
 
-                response = llm.generate_response(messages)
+                stream_filter = _ThinkStreamFilter(on_chunk) if on_chunk else None
+                if stream_filter is not None:
+                    response = llm.generate_response(messages, stream_callback=stream_filter)
+                else:
+                    response = llm.generate_response(messages)
                 ai_text = str(response).strip() if response else ""
                 ai_text = self._sanitize_ai_text(ai_text)
                 if not ai_text:
@@ -5549,6 +5713,9 @@ class ChatPresenter(BasePresenter):
                 self._append_history_message("user", user_message)
                 self._append_history_message("assistant", ai_text)
 
+                if stream_filter is not None:
+                    stream_filter.finish(ai_text, on_replace)
+
                 # Return to UI/API first for better perceived latency.
                 on_done(ai_text, None)
 
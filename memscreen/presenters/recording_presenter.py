@@ -23,6 +23,14 @@ from .base_presenter import BasePresenter
 from memscreen.audio import AudioRecorder, AudioSource
 from memscreen.cv2_loader import get_cv2
 from memscreen.services.model_capability import RecordingModelCapabilityService
+from memscreen.services.frame_change import FrameChangeDetector
+from memscreen.services.frame_sampler import get_frame_sampler
+from memscreen.services.screen_capture import (
+    PILCaptureBackend,
+    ScreenCaptureBackend,
+    create_capture_backend,
+)
+from memscreen.services.video_sink import StreamingVideoSink
 from memscreen.storage import RecordingMetadataRepository
 
 SUPPORTED_VIDEO_FORMATS = ("mp4", "mov", "mkv", "avi")
@@ -93,7 +101,7 @@ class RecordingPresenter(BasePresenter):
         self.recording_thread = None
         self._save_thread = None  # Thread for saving recording to database
         self._memory_index_ready_event = threading.Event()
-        self.recording_frames = []
+        self._active_sink: Optional[StreamingVideoSink] = None
         self.recording_start_time = None
 
         # Recording settings (with defaults)
@@ -103,6 +111,11 @@ class RecordingPresenter(BasePresenter):
         self.video_format = "mp4"
         self.audio_output_format = "wav"
         self.audio_denoise = True
+        self.encoder_queue_size = 4  # frames buffered ahead of the video encoder
+        self.change_threshold = config.recording_change_threshold
+        self._change_detector = FrameChangeDetector(threshold=self.change_threshold)
+        self.capture_backend_name = config.recording_capture_backend
+        self._capture_backend: Optional[ScreenCaptureBackend] = None
 
         # Audio recording
         self.audio_recorder = AudioRecorder(output_dir=audio_dir)
@@ -214,6 +227,9 @@ class RecordingPresenter(BasePresenter):
             "interval": self.interval,
             "output_dir": self.output_dir,
             "frame_count": self.frame_count,
+            "encoder_pending_frames": self._active_sink.pending if self._active_sink else 0,
+            "change_detection": self._change_detector.stats(),
+            "capture_backend": self._capture_backend.name if self._capture_backend else self.capture_backend_name,
             "elapsed_time": time.time() - self.recording_start_time if self.recording_start_time else 0
         }
 
@@ -269,6 +285,20 @@ class RecordingPresenter(BasePresenter):
         self.audio_recorder.set_noise_reduction(self.audio_denoise)
         print(f"[RecordingPresenter] Audio denoise set to: {self.audio_denoise}")
 
+    def set_change_threshold(self, threshold: float):
+        """
+        Set the minimum frame difference required to store a captured frame.
+
+        Args:
+            threshold: Mean absolute difference on a 0-255 scale; 0 stores every frame
+        """
+        value = float(threshold)
+        if value < 0:
+            raise ValueError(f"change_threshold must be >= 0, got {threshold}")
+        self.change_threshold = value
+        self._change_detector.threshold = value
+        print(f"[RecordingPresenter] Change threshold set to: {self.change_threshold}")
+
     def get_audio_sources(self) -> list:
         """
         Get list of available audio sources.
@@ -375,8 +405,9 @@ class RecordingPresenter(BasePresenter):
         try:
             self.duration = duration
             self.interval = interval
+            self._discard_active_sink()
+            self._change_detector.reset()
             self.is_recording = True
-            self.recording_frames = []
             self.recording_start_time = time.time()
             self.frame_count = 0
             print(
@@ -451,13 +482,15 @@ class RecordingPresenter(BasePresenter):
                 self.recording_thread.join(timeout=10)
 
             # Save the recording with audio
-            if self.recording_frames:
+            sink = self._active_sink
+            self._active_sink = None
+            if sink is not None and sink.frames_submitted > 0:
                 self._memory_index_ready_event.clear()
 
                 # Save in background thread (non-daemon to ensure database save completes)
                 save_thread = threading.Thread(
                     target=self._save_recording,
-                    args=(self.recording_frames, audio_file),
+                    args=(sink, audio_file, self._change_detector.repeat_markers()),
                     daemon=False  # Changed: must complete database save
                 )
                 save_thread.start()
@@ -469,6 +502,8 @@ class RecordingPresenter(BasePresenter):
                 # Ensure memory has at least placeholder timeline before returning.
                 self._memory_index_ready_event.wait(timeout=8)
             else:
+                if sink is not None:
+                    sink.abort()
                 self._memory_index_ready_event.set()
 
             # Notify view
@@ -856,6 +891,66 @@ class RecordingPresenter(BasePresenter):
         area_b = float(max(1, (bx2 - bx1) * (by2 - by1)))
         return inter / min(area_a, area_b)
 
+    def _resolve_capture_bbox(self) -> Optional[Tuple[int, int, int, int]]:
+        """Resolve the screen area for the current mode (None = backend full screen)."""
+        if self.region_bbox:
+            return tuple(self.region_bbox)
+        if self.screen_index is not None:
+            # Single screen mode - get screen bbox from screen utils
+            try:
+                from memscreen.utils import get_screen_by_index
+                screen_info = get_screen_by_index(self.screen_index)
+                if screen_info:
+                    return screen_info.bbox
+                print(f"[RecordingPresenter] Invalid screen index {self.screen_index}, falling back to all screens")
+            except Exception as screen_error:
+                print(f"[RecordingPresenter] Error getting screen bbox: {screen_error}, falling back to all screens")
+            return None
+        # Full screen mode (all screens)
+        try:
+            from memscreen.utils import get_combined_screen_bbox
+            return get_combined_screen_bbox()
+        except Exception:
+            return None
+
+    def _get_capture_backend(self) -> ScreenCaptureBackend:
+        """Return the configured capture backend, creating it on first use."""
+        if self._capture_backend is None:
+            try:
+                self._capture_backend = create_capture_backend(self.capture_backend_name)
+            except Exception as e:
+                print(f"[RecordingPresenter] Capture backend '{self.capture_backend_name}' unavailable: {e}")
+                self._capture_backend = PILCaptureBackend()
+        return self._capture_backend
+
+    def _capture_screen_frame(self) -> np.ndarray:
+        """
+        Capture one BGR frame for the current recording mode.
+
+        Window-follow mode captures the target window directly when possible.
+        If a non-PIL backend fails, capture falls back to PIL ImageGrab for the
+        rest of the session.
+        """
+        if self.region_bbox:
+            self._refresh_window_follow_bbox_if_needed()
+            if self._window_follow_enabled:
+                frame = self._capture_window_frame_by_id(self._window_follow_window_id)
+                if frame is not None:
+                    return frame
+                # If direct window capture fails temporarily, fall back to region.
+
+        bbox = self._resolve_capture_bbox()
+        backend = self._get_capture_backend()
+        try:
+            return backend.grab(bbox)
+        except Exception as e:
+            if isinstance(backend, PILCaptureBackend):
+                raise
+            print(f"[RecordingPresenter] {backend.name} capture failed ({e}), falling back to PIL ImageGrab")
+            backend.close()
+            self._capture_backend = PILCaptureBackend()
+            return self._capture_backend.grab(bbox)
+
     def get_recording_mode(self) -> Dict[str, Any]:
         """
         Get current recording mode information.
@@ -889,38 +984,9 @@ class RecordingPresenter(BasePresenter):
                 print("[RecordingPresenter] cv2 not available: cannot capture preview")
                 return None
 
-            from PIL import ImageGrab
-
             # Capture screen with region and screen selection support
             try:
-                if self.region_bbox:
-                    self._refresh_window_follow_bbox_if_needed()
-                    if self._window_follow_enabled:
-                        win_frame = self._capture_window_frame_by_id(self._window_follow_window_id)
-                        if win_frame is not None:
-                            return win_frame
-                    # Custom region mode
-                    screenshot = ImageGrab.grab(bbox=self.region_bbox)
-                elif self.screen_index is not None:
-                    # Single screen mode - get screen bbox from screen utils
-                    try:
-                        from memscreen.utils import get_screen_by_index
-                        screen_info = get_screen_by_index(self.screen_index)
-                        if screen_info:
-                            screenshot = ImageGrab.grab(bbox=screen_info.bbox)
-                        else:
-                            print(f"[RecordingPresenter] Invalid screen index {self.screen_index}, falling back to all screens")
-                            screenshot = ImageGrab.grab()
-                    except Exception as screen_error:
-                        print(f"[RecordingPresenter] Error getting screen bbox: {screen_error}, falling back to all screens")
-                        screenshot = ImageGrab.grab()
-                else:
-                    # Full screen mode (all screens)
-                    try:
-                        from memscreen.utils import get_combined_screen_bbox
-                        screenshot = ImageGrab.grab(bbox=get_combined_screen_bbox())
-                    except Exception:
-                        screenshot = ImageGrab.grab()
+                return self._capture_screen_frame()
             except Exception as grab_error:
                 error_msg = str(grab_error).lower()
                 # Check if it's a permission error
@@ -933,16 +999,6 @@ class RecordingPresenter(BasePresenter):
                     # Some other error
                     raise grab_error
 
-            # Convert to numpy array and ensure proper format
-            frame_array = np.array(screenshot)
-            # Ensure uint8 format
-            if frame_array.dtype != np.uint8:
-                frame_array = frame_array.astype(np.uint8)
-            # Convert RGB to BGR
-            frame = cv2.cvtColor(frame_array, cv2.COLOR_RGB2BGR)
-
-            return frame
-
         except ImportError as e:
             # cv2 import failed - likely due to PyInstaller bundling issue
             print(f"[RecordingPresenter] cv2 not available: {e}")
@@ -1097,13 +1153,9 @@ class RecordingPresenter(BasePresenter):
 
             # Fallback metrics from video itself if DB misses.
             if frame_count <= 0 or fps <= 0:
-                cv2 = get_cv2()
-                if cv2 is not None:
-                    cap = cv2.VideoCapture(filename)
-                    if cap.isOpened():
-                        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or frame_count or 0)
-                        fps = float(cap.get(cv2.CAP_PROP_FPS) or fps or 0)
-                    cap.release()
+                probed_frames, probed_fps = get_frame_sampler().probe(filename)
+                frame_count = int(probed_frames or frame_count or 0)
+                fps = float(probed_fps or fps or 0)
 
             if fps <= 0:
                 fps = 1.0 / self.interval if self.interval > 0 else 1.0
@@ -1238,6 +1290,8 @@ Content Tags: {", ".join(content_tags)}
             print("[RecordingPresenter] ERROR: cv2 not available for recording")
             self.is_recording = False
             return
+        detector = self._change_detector
+        detector.start_segment()
         # Capture the very first frame immediately on start.
         # Waiting a full interval before first capture can trigger false startup
         # timeout for users with larger saved interval values.
@@ -1266,8 +1320,6 @@ Content Tags: {", ".join(content_tags)}
             return
 
         try:
-            from PIL import ImageGrab
-
             while self.is_recording:
                 current_time = time.time()
                 elapsed = current_time - self.recording_start_time
@@ -1291,20 +1343,20 @@ Content Tags: {", ".join(content_tags)}
                         self.view.show_error(self.last_start_error)
                     break
 
-                # Check if it's time to save a new video segment
+                # Check if it's time to roll over to a new video segment
                 time_since_last_save = current_time - last_save_time
                 if time_since_last_save >= self.duration:
-                    # Save current frames as a video segment
-                    if len(self.recording_frames) > 0:
-                        frames_to_save = list(self.recording_frames)
-                        self.recording_frames = []
+                    sink = self._active_sink
+                    if sink is not None and sink.frames_submitted > 0:
+                        self._active_sink = None
 
-                        # Save in background thread
+                        # Finalize in background thread; the next frame opens a new sink
                         threading.Thread(
                             target=self._save_video_segment,
-                            args=(frames_to_save,),
+                            args=(sink, detector.repeat_markers()),
                             daemon=True
                         ).start()
+                        detector.start_segment()
 
                     last_save_time = current_time
 
@@ -1312,86 +1364,29 @@ Content Tags: {", ".join(content_tags)}
                 time_since_last_shot = current_time - last_screenshot_time
                 if time_since_last_shot >= self.interval:
                     try:
-                        frame = None
                         # Capture screen with region and screen selection support
-                        if self.region_bbox:
-                            self._refresh_window_follow_bbox_if_needed()
-                            if self._window_follow_enabled:
-                                frame = self._capture_window_frame_by_id(self._window_follow_window_id)
-                                if frame is None:
-                                    # If direct window capture fails temporarily, fall back to region.
-                                    screenshot = ImageGrab.grab(bbox=self.region_bbox)
-                            else:
-                                screenshot = ImageGrab.grab(bbox=self.region_bbox)
-                            # Custom region mode
-                        elif self.screen_index is not None:
-                            # Single screen mode - get screen bbox from screen utils
-                            try:
-                                from memscreen.utils import get_screen_by_index
-                                screen_info = get_screen_by_index(self.screen_index)
-                                if screen_info:
-                                    screenshot = ImageGrab.grab(bbox=screen_info.bbox)
-                                else:
-                                    print(f"[RecordingPresenter] Invalid screen index {self.screen_index}, falling back to all screens")
-                                    screenshot = ImageGrab.grab()
-                            except Exception as screen_error:
-                                print(f"[RecordingPresenter] Error getting screen bbox: {screen_error}, falling back to all screens")
-                                screenshot = ImageGrab.grab()
-                        else:
-                            # Full screen mode (all screens)
-                            try:
-                                from memscreen.utils import get_combined_screen_bbox
-                                screenshot = ImageGrab.grab(bbox=get_combined_screen_bbox())
-                            except Exception:
-                                screenshot = ImageGrab.grab()
-
-                        if frame is None:
-                            # Convert to numpy array
-                            frame_array = np.array(screenshot)
-
-                            # Debug: print dtype
-                            if self.frame_count == 0:
-                                print(f"[Recording] Initial frame dtype: {frame_array.dtype}, shape: {frame_array.shape}")
-
-                            # Handle different data types
-                            if frame_array.dtype == np.float64 or frame_array.dtype == np.float32:
-                                # Float images - normalize to 0-255
-                                if frame_array.max() <= 1.0:
-                                    frame_array = np.clip(frame_array * 255, 0, 255).astype(np.uint8)
-                                else:
-                                    frame_array = np.clip(frame_array, 0, 255).astype(np.uint8)
-                            elif frame_array.dtype != np.uint8:
-                                # Any other non-uint8 type
-                                frame_array = np.clip(frame_array, 0, 255).astype(np.uint8)
-
-                            # Ensure we have the right shape and channels
-                            if len(frame_array.shape) == 2:
-                                # Grayscale - convert to RGB
-                                frame_array = cv2.cvtColor(frame_array, cv2.COLOR_GRAY2RGB)
-                            elif len(frame_array.shape) == 3 and frame_array.shape[2] == 4:
-                                # RGBA - convert to RGB
-                                frame_array = cv2.cvtColor(frame_array, cv2.COLOR_RGBA2RGB)
-
-                            # Now convert RGB to BGR for OpenCV
-                            if len(frame_array.shape) == 3 and frame_array.shape[2] == 3:
-                                frame = cv2.cvtColor(frame_array, cv2.COLOR_RGB2BGR)
-                            else:
-                                frame = frame_array
-
-                        # Validate final frame
-                        if frame.dtype != np.uint8:
-                            print(f"[Recording] Warning: frame dtype is still {frame.dtype}, converting...")
-                            frame = frame.astype(np.uint8)
-
-                        # Keep frame size stable for VideoWriter (window move/resize can change bbox).
-                        if self.recording_frames:
-                            base_h, base_w = self.recording_frames[0].shape[:2]
-                            cur_h, cur_w = frame.shape[:2]
-                            if cur_h != base_h or cur_w != base_w:
-                                frame = cv2.resize(frame, (base_w, base_h))
-
-                        # Add to frames list
-                        self.recording_frames.append(frame)
+                        frame = self._capture_screen_frame()
+
+                        if self.frame_count == 0:
+                            print(
+                                f"[Recording] Initial frame shape: {frame.shape} "
+                                f"(backend={self._capture_backend.name if self._capture_backend else 'window'})"
+                            )
+
+                        # Frames (nearly) identical to the last stored one are not handed
+                        # to the encoder; it re-writes the previous frame instead, so the
+                        # video keeps its wall-clock length and stays in sync with audio.
+                        keep_frame, _change_score = detector.check(frame, current_time - last_save_time)
+
+                        # Stream frame to the segment encoder. The sink keeps the frame
+                        # size stable for VideoWriter (window move/resize can change bbox).
+                        if keep_frame or self._active_sink is None:
+                            if self._active_sink is None:
+                                self._active_sink = self._open_segment_sink(cv2)
+                            if not self._active_sink.write(frame, captured_at=current_time):
+                                print("[Recording] Encoder is falling behind, frame dropped")
+                        elif not self._active_sink.repeat(captured_at=current_time):
+                            print("[Recording] Encoder is falling behind, frame dropped")
                         self.frame_count += 1
                         consecutive_capture_failures = 0
                         last_screenshot_time = current_time
@@ -1443,64 +1438,74 @@ Content Tags: {", ".join(content_tags)}
             self.is_recording = False
             self.handle_error(e, "Error during recording")
 
-    def _save_video_segment(self, frames):
+    def _open_segment_sink(self, cv2) -> StreamingVideoSink:
+        """Open a streaming encoder for a new video segment."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return StreamingVideoSink(
+            cv2,
+            self._build_video_output_path("segment", timestamp),
+            1.0 / self.interval,
+            open_writer=self._open_video_writer,
+            normalize_size=self._normalize_video_size,
+            max_pending=self.encoder_queue_size,
+        )
+
+    def _discard_active_sink(self) -> None:
+        """Abort an encoder left over from a recording that ended on its own."""
+        sink = self._active_sink
+        self._active_sink = None
+        if sink is not None:
+            sink.abort()
+
+    def _close_video_sink(self, sink: StreamingVideoSink) -> Tuple[Optional[str], int, float, float]:
+        """
+        Flush and release a streaming sink.
+
+        Returns:
+            (filename, frame_count, fps, duration); filename is None if nothing
+            was written. ``duration`` is the wall-clock span of the capture.
+        """
+        stats = sink.close()
+        frame_count = int(stats["frames_written"])
+        if stats["error"]:
+            print(f"[RecordingPresenter] Encoder reported an error: {stats['error']}")
+        if stats["frames_dropped"]:
+            print(f"[RecordingPresenter] Encoder dropped {stats['frames_dropped']} frames")
+        if frame_count <= 0 or not os.path.exists(sink.path):
+            return None, 0, sink.fps, 0.0
+        return sink.path, frame_count, sink.fps, float(stats["wall_seconds"])
+
+    def _save_video_segment(self, sink: StreamingVideoSink, repeat_markers=None):
         """
-        Save a video segment to disk and add to memory.
+        Finalize a streamed video segment and add it to memory.
 
         Args:
-            frames: List of video frames
+            sink: Streaming sink holding the encoded segment
+            repeat_markers: Optional repeat markers from the change detector
         """
         try:
-            cv2 = get_cv2()
-            if cv2 is None:
-                print("[RecordingPresenter] ERROR: cv2 not available for saving video")
-                return
-
-            if not frames:
+            filename, frame_count, fps, duration = self._close_video_sink(sink)
+            if not filename:
                 return
 
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = self._build_video_output_path("segment", timestamp)
-
-            # Save video
-            fps = 1.0 / self.interval
-            target_w, target_h = self._normalize_video_size(frames[0].shape[1], frames[0].shape[0])
-            if target_w != frames[0].shape[1] or target_h != frames[0].shape[0]:
-                normalized = []
-                for frame in frames:
-                    if frame.shape[1] != target_w or frame.shape[0] != target_h:
-                        frame = cv2.resize(frame, (target_w, target_h))
-                    normalized.append(frame)
-                frames = normalized
-            out, filename, _used_ext = self._open_video_writer(
-                cv2,
-                filename,
-                fps,
-                (target_w, target_h),
-            )
-
-            for frame in frames:
-                out.write(frame)
-
-            out.release()
-
             # Get file size
             file_size = os.path.getsize(filename)
 
             # Save to database
-            self._save_to_database(filename, len(frames), fps, len(frames) / fps, file_size)
+            self._save_to_database(
+                filename, frame_count, fps, duration, file_size,
+                repeat_markers=repeat_markers,
+            )
 
             # Add to memory system
             if self.memory_system:
-                self._add_video_to_memory(filename, len(frames), fps)
+                self._add_video_to_memory(filename, frame_count, fps, duration)
             else:
                 self._memory_index_ready_event.set()
                 captured_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                duration = len(frames) / fps if fps > 0 else 0
                 threading.Thread(
                     target=self._enrich_recording_memory,
-                    args=(None, filename, len(frames), fps, captured_at, duration),
+                    args=(None, filename, frame_count, fps, captured_at, duration),
                     daemon=True,
                 ).start()
 
@@ -1509,55 +1514,31 @@ Content Tags: {", ".join(content_tags)}
         except Exception as e:
             self.handle_error(e, "Failed to save video segment")
 
-    def _save_recording(self, frames, audio_file=None):
+    def _save_recording(self, sink: StreamingVideoSink, audio_file=None, repeat_markers=None):
         """
         Save final recording when user stops recording.
 
         Args:
-            frames: List of video frames
+            sink: Streaming sink holding the last (possibly only) segment
             audio_file: Optional path to audio file to merge
+            repeat_markers: Optional repeat markers from the change detector
         """
         try:
-            print(f"[RecordingPresenter] 🎬 Starting to save recording... ({len(frames)} frames)")
-
-            cv2 = get_cv2()
-            if cv2 is None:
-                print("[RecordingPresenter] ERROR: cv2 not available for saving recording")
-                self.show_error("Video recording is not available")
-                return
+            print(f"[RecordingPresenter] 🎬 Starting to save recording... ({sink.frames_submitted} frames)")
 
-            if not frames:
+            filename, frame_count, fps, duration = self._close_video_sink(sink)
+            if not filename:
                 print("[RecordingPresenter] WARNING: No frames to save")
                 self.show_info("No frames to save")
+                self._memory_index_ready_event.set()
                 return
 
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = self._build_video_output_path("recording", timestamp)
-
-            print(f"[RecordingPresenter] 📁 Saving to file: {filename}")
-
-            # Save video
-            fps = 1.0 / self.interval
-            target_w, target_h = self._normalize_video_size(frames[0].shape[1], frames[0].shape[0])
-            if target_w != frames[0].shape[1] or target_h != frames[0].shape[0]:
-                normalized = []
-                for frame in frames:
-                    if frame.shape[1] != target_w or frame.shape[0] != target_h:
-                        frame = cv2.resize(frame, (target_w, target_h))
-                    normalized.append(frame)
-                frames = normalized
-            out, filename, _used_ext = self._open_video_writer(
-                cv2,
-                filename,
-                fps,
-                (target_w, target_h),
-            )
-
-            for frame in frames:
-                out.write(frame)
-
-            out.release()
+            # The final segment is published under the "recording" prefix.
+            base_dir, base_name = os.path.split(filename)
+            if base_name.startswith("segment_"):
+                final_name = os.path.join(base_dir, "recording_" + base_name[len("segment_"):])
+                os.replace(filename, final_name)
+                filename = final_name
 
             print(f"[RecordingPresenter] ✅ Video file saved: {filename}")
 
@@ -1577,17 +1558,19 @@ Content Tags: {", ".join(content_tags)}
             db_audio_file = audio_file if (audio_file and os.path.exists(audio_file)) else None
             if not merged_audio and db_audio_file:
                 print("[RecordingPresenter] Audio was recorded but not merged into video.")
-            self._save_to_database(filename, len(frames), fps, len(frames) / fps, file_size, db_audio_file)
+            self._save_to_database(
+                filename, frame_count, fps, duration, file_size, db_audio_file,
+                repeat_markers=repeat_markers,
+            )
 
             # Add to memory system
             if self.memory_system:
-                self._add_video_to_memory(filename, len(frames), fps)
+                self._add_video_to_memory(filename, frame_count, fps, duration)
             else:
                 captured_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                duration = len(frames) / fps if fps > 0 else 0
                 threading.Thread(
                     target=self._enrich_recording_memory,
-                    args=(None, filename, len(frames), fps, captured_at, duration),
+                    args=(None, filename, frame_count, fps, captured_at, duration),
                     daemon=True,
                 ).start()
 
@@ -1794,7 +1777,9 @@ Content Tags: {", ".join(content_tags)}
             print(f"[RecordingPresenter] ffmpeg(reencode) merge failed: {e} {stderr}")
             return video_file
 
-    def _save_to_database(self, filename, frame_count, fps, duration, file_size, audio_file=None):
+    def _save_to_database(
+        self, filename, frame_count, fps, duration, file_size, audio_file=None, repeat_markers=None
+    ):
         """Save recording metadata to database"""
         try:
             print(f"[RecordingPresenter] 📝 Saving to database: {filename}")
@@ -1821,6 +1806,7 @@ Content Tags: {", ".join(content_tags)}
                 analysis_status="pending",
                 audio_file=audio_file,
                 audio_source=audio_source_str,
+                repeat_markers=json.dumps(repeat_markers) if repeat_markers else None,
             )
 
             if rowid:
@@ -1836,7 +1822,7 @@ Content Tags: {", ".join(content_tags)}
             traceback.print_exc()
             self.handle_error(e, "Failed to save to database")
 
-    def _add_video_to_memory(self, filename, frame_count, fps):
+    def _add_video_to_memory(self, filename, frame_count, fps, duration=None):
         """
         Add recording to memory in two phases:
         1) fast placeholder entry (immediate, no vision call)
@@ -1848,7 +1834,8 @@ Content Tags: {", ".join(content_tags)}
                 return
 
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            duration = frame_count / fps if fps > 0 else 0
+            if not duration:
+                duration = frame_count / fps if fps > 0 else 0
             base_name = os.path.basename(filename)
 
             # Fast memory write so chat can immediately reference "when" evidence.
@@ -2112,6 +2099,9 @@ When users ask about what was on their screen or what they were doing, reference
 
             embeddings = embedding_model.embed(memory_text, "update")
             vector_store.update(vector_id=memory_id, vector=embeddings, payload=payload)
+            invalidate = getattr(self.memory_system, "invalidate_search_cache", None)
+            if callable(invalidate):
+                invalidate(payload)
 
             db = getattr(self.memory_system, "db", None)
             if db and hasattr(db, "add_history"):
@@ -2564,33 +2554,29 @@ When users ask about what was on their screen or what they were doing, reference
 
             frame_details = []  # Store structured frame information
             all_text_found = []
-            cap = cv2.VideoCapture(filename)
-
-            for sample_idx, frame_idx in enumerate(sample_indices):
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
-                if ret:
-                    # Calculate timestamp for this frame
-                    timestamp = frame_idx / fps if fps > 0 else 0
-
-                    # Use vision model only for the first few samples to reduce latency.
-                    frame_text = self.model_capability.extract_text_from_frame(
-                        frame,
-                        use_vision=(sample_idx < 2),
-                    )
+            samples = get_frame_sampler().sample(filename, sample_indices)
 
-                    # Store frame details
-                    frame_info = {
-                        "frame_number": frame_idx,
-                        "timestamp": round(timestamp, 2),
-                        "text": frame_text
-                    }
-                    frame_details.append(frame_info)
+            for sample_idx, sample in enumerate(samples):
+                frame_idx = sample["source_frame"]
+                # Calculate timestamp for this frame
+                timestamp = frame_idx / fps if fps > 0 else 0
+
+                # Use vision model only for the first few samples to reduce latency.
+                frame_text = self.model_capability.extract_text_from_frame(
+                    sample["frame"],
+                    use_vision=(sample_idx < 2),
+                )
 
-                    if frame_text:
-                        all_text_found.append(frame_text)
+                # Store frame details
+                frame_info = {
+                    "frame_number": frame_idx,
+                    "timestamp": round(timestamp, 2),
+                    "text": frame_text
+                }
+                frame_details.append(frame_info)
 
-            cap.release()
+                if frame_text:
+                    all_text_found.append(frame_text)
 
             # Combine all found text for backward compatibility
             combined_text = " | ".join(all_text_found) if all_text_found else "Screen recording captured (no clear text detected)"
@@ -2607,6 +2593,7 @@ When users ask about what was on their screen or what they were doing, reference
         try:
             if os.path.exists(filename):
                 os.remove(filename)
+            get_frame_sampler().invalidate(filename)
 
             self.recordings_repo.delete_recording(filename)
 
@@ -2627,6 +2614,10 @@ When users ask about what was on their screen or what they were doing, reference
         if self.is_recording:
             print("[RecordingPresenter] Stopping active recording...")
             self.stop_recording()
+        self._discard_active_sink()
+        if self._capture_backend is not None:
+            self._capture_backend.close()
+            self._capture_backend = None
 
         # Wait for save thread to complete
         if self._save_thread and self._save_thread.is_alive():
@@ -5,11 +5,15 @@
 ### license: MIT                 ###
 
 import datetime
+import threading
 from collections import defaultdict, Counter
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, Tuple, Optional
 import json
 
-from memscreen.storage import InputEventRepository
+from memscreen.storage import InputEventRepository, ProcessMiningSummaryRepository
+
+# Longest activity subsequence counted by discover_sequences
+MAX_SEQUENCE_LENGTH = 5
 
 
 class ProcessMiningAnalyzer:
@@ -24,6 +28,8 @@ class ProcessMiningAnalyzer:
         """
         self.db_path = db_path
         self.events_repo = InputEventRepository(db_path)
+        self.summary_repo = ProcessMiningSummaryRepository(db_path)
+        self._summary_lock = threading.Lock()
     
     def load_event_logs(self, 
                        start_time: Optional[datetime.datetime] = None,
@@ -46,56 +52,50 @@ class ProcessMiningAnalyzer:
             operate_type=operate_type,
         )
 
-        events = []
-        for row in rows:
-            event_id = int(row.get("id") or 0)
-            operate_time = row.get("timestamp")
-            operate_type = str(row.get("operate_type") or "")
-            action = str(row.get("action") or "")
-            content = row.get("content")
-            details = row.get("details")
-            # Parse timestamp - handle multiple formats
-            if isinstance(operate_time, str):
+        return [self._row_to_event(row) for row in rows]
+
+    @staticmethod
+    def _parse_timestamp(operate_time) -> datetime.datetime:
+        # Parse timestamp - handle multiple formats
+        if isinstance(operate_time, str):
+            try:
+                return datetime.datetime.fromisoformat(operate_time)
+            except:
                 try:
-                    timestamp = datetime.datetime.fromisoformat(operate_time)
+                    return datetime.datetime.strptime(operate_time, "%Y-%m-%d %H:%M:%S.%f")
                 except:
                     try:
-                        timestamp = datetime.datetime.strptime(operate_time, "%Y-%m-%d %H:%M:%S.%f")
+                        return datetime.datetime.strptime(operate_time, "%Y-%m-%d %H:%M:%S")
                     except:
-                        try:
-                            timestamp = datetime.datetime.strptime(operate_time, "%Y-%m-%d %H:%M:%S")
-                        except:
-                            # Fallback: use current time if parsing fails
-                            print(f"[WARNING] Failed to parse timestamp: {operate_time}, using current time")
-                            timestamp = datetime.datetime.now()
-            elif isinstance(operate_time, datetime.datetime):
-                timestamp = operate_time
-            else:
-                # SQLite might return datetime as string in some cases
-                print(f"[WARNING] Unexpected timestamp type: {type(operate_time)}, using current time")
-                timestamp = datetime.datetime.now()
-            
+                        # Fallback: use current time if parsing fails
+                        print(f"[WARNING] Failed to parse timestamp: {operate_time}, using current time")
+                        return datetime.datetime.now()
+        elif isinstance(operate_time, datetime.datetime):
+            return operate_time
+        # SQLite might return datetime as string in some cases
+        print(f"[WARNING] Unexpected timestamp type: {type(operate_time)}, using current time")
+        return datetime.datetime.now()
+
+    def _row_to_event(self, row: Dict) -> Dict:
+        """Convert a repository row into an event-log entry."""
+        operate_type = str(row.get("operate_type") or "")
+        action = str(row.get("action") or "")
+        timestamp = self._parse_timestamp(row.get("timestamp"))
+
+        return {
+            "id": int(row.get("id") or 0),
+            "timestamp": timestamp,
             # Create activity name from type and action
-            activity = f"{operate_type}_{action}"
-            
+            "activity": f"{operate_type}_{action}",
+            "resource": operate_type,
             # Extract case_id from session (group events by time windows or sessions)
             # For now, use a simple grouping by hour
-            case_id = timestamp.strftime("%Y%m%d_%H")
-            
-            event = {
-                "id": event_id,
-                "timestamp": timestamp,
-                "activity": activity,
-                "resource": operate_type,
-                "case_id": case_id,
-                "action": action,
-                "content": content,
-                "details": details,
-                "operate_type": operate_type
-            }
-            events.append(event)
-        
-        return events
+            "case_id": timestamp.strftime("%Y%m%d_%H"),
+            "action": action,
+            "content": row.get("content"),
+            "details": row.get("details"),
+            "operate_type": operate_type
+        }
     
     def analyze_activity_frequency(self, events: List[Dict]) -> Dict[str, int]:
         """
@@ -141,7 +141,7 @@ class ProcessMiningAnalyzer:
         sequence_counter = Counter()
         for seq in sequences:
             # Count all subsequences of length 2 to 5
-            for length in range(2, min(6, len(seq) + 1)):
+            for length in range(2, min(MAX_SEQUENCE_LENGTH + 1, len(seq) + 1)):
                 for i in range(len(seq) - length + 1):
                     subsequence = tuple(seq[i:i+length])
                     sequence_counter[subsequence] += 1
@@ -317,11 +317,228 @@ class ProcessMiningAnalyzer:
             "total_mouse_events": len(mouse_events)
         }
     
+    # ==================== Incremental summaries ====================
+
+    @staticmethod
+    def _initial_summary_state() -> Dict[str, Any]:
+        return {
+            "last_event_id": 0,
+            "total_events": 0,
+            "first_timestamp": None,
+            "last_timestamp": None,
+            "gap_sum": 0.0,
+            "gap_count": 0,
+            "gap_min": None,
+            "gap_max": None,
+            "case_id": None,
+            "case_tail": [],
+            "keyboard_total": 0,
+            "keyboard_last_timestamp": None,
+            "keyboard_last_content": "",
+            "typing_current": 0,
+            "typing_sessions": 0,
+            "typing_session_events": 0,
+            "shortcuts": 0,
+            "mouse_total": 0,
+            "mouse_last_action": None,
+            "mouse_last_content": "",
+            "click_patterns": {},
+        }
+
+    def update_summaries(self, batch_size: int = 5000) -> int:
+        """
+        Fold events added since the last update into the persistent summaries.
+
+        Events are read in ascending id order from the stored ``since_id``
+        cursor, so each call costs O(new events) regardless of history size.
+
+        Args:
+            batch_size: Events read and committed per transaction
+
+        Returns:
+            Number of newly processed events
+        """
+        with self._summary_lock:
+            state = {**self._initial_summary_state(), **self.summary_repo.load_state()}
+            if self.events_repo.get_latest_event_id() < int(state["last_event_id"]):
+                # Event log was cleared or replaced; rebuild from scratch.
+                self.summary_repo.reset()
+                state = self._initial_summary_state()
+
+            processed = 0
+            while True:
+                rows = self.events_repo.list_events_after(int(state["last_event_id"]), limit=batch_size)
+                if not rows:
+                    break
+
+                activities: Counter = Counter()
+                ngrams: Counter = Counter()
+                hours: Counter = Counter()
+                weekdays: Counter = Counter()
+                cases = set()
+                for row in rows:
+                    event = self._row_to_event(row)
+                    self._fold_event(state, event, ngrams)
+                    activities[event["activity"]] += 1
+                    hours[event["timestamp"].hour] += 1
+                    weekdays[event["timestamp"].strftime("%A")] += 1
+                    cases.add(event["case_id"])
+                state["last_event_id"] = int(rows[-1]["id"])
+
+                self.summary_repo.apply_batch(
+                    state=state,
+                    activities=activities,
+                    ngrams=ngrams,
+                    hours=hours,
+                    weekdays=weekdays,
+                    cases=sorted(cases),
+                )
+                processed += len(rows)
+                if len(rows) < batch_size:
+                    break
+            return processed
+
+    def _fold_event(self, state: Dict[str, Any], event: Dict, ngrams: Counter) -> None:
+        """Advance the running state by one event (mirrors the batch analyses)."""
+        timestamp = event["timestamp"]
+        activity = event["activity"]
+        state["total_events"] += 1
+        if state["first_timestamp"] is None:
+            state["first_timestamp"] = timestamp.isoformat()
+
+        gap = self._seconds_between(state["last_timestamp"], timestamp)
+        if gap is not None:
+            state["gap_sum"] += gap
+            state["gap_count"] += 1
+            state["gap_min"] = gap if state["gap_min"] is None else min(state["gap_min"], gap)
+            state["gap_max"] = gap if state["gap_max"] is None else max(state["gap_max"], gap)
+        state["last_timestamp"] = timestamp.isoformat()
+
+        # Subsequences of length 2..MAX_SEQUENCE_LENGTH ending at this event
+        if event["case_id"] != state["case_id"]:
+            state["case_id"] = event["case_id"]
+            state["case_tail"] = []
+        tail = state["case_tail"] + [activity]
+        for length in range(2, min(MAX_SEQUENCE_LENGTH, len(tail)) + 1):
+            ngrams[tuple(tail[-length:])] += 1
+        state["case_tail"] = tail[-(MAX_SEQUENCE_LENGTH - 1):]
+
+        content = event.get("content") or ""
+        if event["operate_type"] == "keyboard":
+            state["keyboard_total"] += 1
+            key_gap = self._seconds_between(state["keyboard_last_timestamp"], timestamp)
+            if key_gap is not None and key_gap < 2.0:
+                state["typing_current"] += 1
+            else:
+                if state["typing_current"] >= 3:
+                    state["typing_sessions"] += 1
+                    state["typing_session_events"] += state["typing_current"]
+                state["typing_current"] = 1
+            if key_gap is not None and key_gap < 0.5:
+                previous = state["keyboard_last_content"]
+                if any(mod in previous.lower() or mod in content.lower() for mod in ["ctrl", "alt", "shift"]):
+                    state["shortcuts"] += 1
+            state["keyboard_last_timestamp"] = timestamp.isoformat()
+            state["keyboard_last_content"] = content
+        elif event["operate_type"] == "mouse" and event["action"] in ["press", "release"]:
+            state["mouse_total"] += 1
+            if state["mouse_last_action"] == "press" and event["action"] == "release":
+                previous = state["mouse_last_content"].lower()
+                button = "left_click" if "left" in previous else "right_click" if "right" in previous else None
+                if button:
+                    state["click_patterns"][button] = state["click_patterns"].get(button, 0) + 1
+            state["mouse_last_action"] = event["action"]
+            state["mouse_last_content"] = content
+
+    def _seconds_between(self, earlier: Optional[str], later: datetime.datetime) -> Optional[float]:
+        if earlier is None:
+            return None
+        try:
+            return (later - self._parse_timestamp(earlier)).total_seconds()
+        except TypeError:
+            # Naive and timezone-aware timestamps cannot be compared
+            return None
+
+    def _summary_report(self) -> Dict[str, Any]:
+        """Build a generate_full_report-compatible report from the summaries."""
+        state = {**self._initial_summary_state(), **self.summary_repo.load_state()}
+        total = int(state["total_events"])
+        if not total:
+            return {"error": "No events found in the specified time range"}
+
+        start, end = state["first_timestamp"], state["last_timestamp"]
+        span = self._seconds_between(start, self._parse_timestamp(end)) or 0
+
+        directly_follows = {
+            (gram[0], gram[1]): count for gram, count in self.summary_repo.ngram_counts(length=2)
+        }
+        outgoing = defaultdict(int)
+        for (from_act, _to_act), count in directly_follows.items():
+            outgoing[from_act] += count
+        activities = {act for edge in directly_follows for act in edge}
+
+        typing_sessions = state["typing_sessions"]
+        typing_events = state["typing_session_events"]
+        if state["typing_current"] >= 3:
+            typing_sessions += 1
+            typing_events += state["typing_current"]
+
+        return {
+            "summary": {
+                "total_events": total,
+                "time_range": {"start": start, "end": end},
+            },
+            "activity_frequency": self.summary_repo.activity_counts(),
+            "frequent_sequences": self.summary_repo.ngram_counts(min_count=2),
+            "time_patterns": {
+                "total_events": total,
+                "time_span": {"start": start, "end": end, "duration_seconds": span},
+                "average_duration_between_events": (
+                    state["gap_sum"] / state["gap_count"] if state["gap_count"] else 0
+                ),
+                "min_duration": state["gap_min"] or 0,
+                "max_duration": state["gap_max"] or 0,
+                "hourly_distribution": self.summary_repo.hour_counts(),
+                "daily_distribution": self.summary_repo.weekday_counts(),
+            },
+            "workflow_patterns": {
+                "activities": list(activities),
+                "directly_follows": directly_follows,
+                "transition_probabilities": {
+                    f"{from_act} -> {to_act}": count / outgoing[from_act]
+                    for (from_act, to_act), count in directly_follows.items()
+                },
+                "total_cases": self.summary_repo.case_count(),
+            },
+            "common_patterns": {
+                "typing_sessions": typing_sessions,
+                "average_typing_session_length": typing_events / typing_sessions if typing_sessions else 0,
+                "click_patterns": dict(state["click_patterns"]),
+                "shortcut_patterns": state["shortcuts"],
+                "total_keyboard_events": state["keyboard_total"],
+                "total_mouse_events": state["mouse_total"],
+            },
+        }
+
+    @staticmethod
+    def _covers_full_history(start_time: Optional[datetime.datetime],
+                             end_time: Optional[datetime.datetime]) -> bool:
+        # "All time" ranges pass end_time=now; anything ending earlier is a window.
+        if start_time is not None:
+            return False
+        if end_time is None:
+            return True
+        now = datetime.datetime.now(end_time.tzinfo)
+        return end_time >= now - datetime.timedelta(minutes=1)
+
     def generate_full_report(self, 
                             start_time: Optional[datetime.datetime] = None,
                             end_time: Optional[datetime.datetime] = None) -> Dict[str, any]:
         """
         Generate a comprehensive process mining report
+
+        Full-history requests (no start time, end time now or unset) are served
+        from the incremental summaries; bounded windows are analysed directly.
         
         Args:
             start_time: Start time filter (optional)
@@ -330,6 +547,11 @@ class ProcessMiningAnalyzer:
         Returns:
             Dictionary with complete analysis results
         """
+        if self._covers_full_history(start_time, end_time):
+            processed = self.update_summaries()
+            print(f"[INFO] Process mining summaries updated with {processed} new events")
+            return self._summary_report()
+
         print("[INFO] Loading event logs from database...")
         events = self.load_event_logs(start_time, end_time)
         
@@ -0,0 +1,145 @@
+"""Capture-time change detection for screen frames."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class FrameChangeDetector:
+    """
+    Decide whether a captured frame differs enough from the last kept frame.
+
+    Frames are reduced to a small grayscale thumbnail and compared with the
+    thumbnail of the last kept frame using mean absolute difference on a
+    0-255 scale. Frames scoring below ``threshold`` are reported as repeats.
+    Runs of repeats are tracked as compact ``[frame_index, first_offset,
+    last_offset, count]`` markers and stored with the recording metadata
+    for reference; the encoder re-writes the previous frame for each repeat,
+    so the video itself keeps the capture's wall-clock timing.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 1.0,
+        thumb_size: int = 32,
+        max_hold_seconds: Optional[float] = 30.0,
+    ):
+        """
+        Args:
+            threshold: Minimum mean absolute difference to keep a frame; 0 keeps all
+            thumb_size: Side length of the comparison thumbnail
+            max_hold_seconds: Always keep a frame after this many seconds of repeats
+        """
+        self.threshold = max(0.0, float(threshold))
+        self.thumb_size = max(4, int(thumb_size))
+        self.max_hold_seconds = max_hold_seconds
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the reference frame, markers and counters."""
+        self.start_segment()
+        self.frames_seen = 0
+        self.frames_kept = 0
+        self.frames_skipped = 0
+        self.last_score = 0.0
+
+    def start_segment(self) -> None:
+        """
+        Begin a new output segment.
+
+        The next frame is always kept (it becomes the segment's first frame)
+        and repeat markers restart at frame index 0. Counters are cumulative.
+        """
+        self._reference: Optional[np.ndarray] = None
+        self._reference_time = 0.0
+        self._kept_index = -1
+        self._markers: List[List[Any]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def check(self, frame: np.ndarray, offset: float) -> Tuple[bool, float]:
+        """
+        Score a frame against the last kept frame.
+
+        Args:
+            frame: BGR/RGB/grayscale uint8 frame
+            offset: Capture time in seconds relative to the segment start
+
+        Returns:
+            (keep, score)
+        """
+        self.frames_seen += 1
+        if not self.enabled:
+            self._keep(None, offset)
+            return True, 0.0
+
+        thumb = self._thumbnail(frame)
+        if self._reference is None or self._reference.shape != thumb.shape:
+            score = 255.0
+        else:
+            score = float(np.mean(np.abs(thumb - self._reference)))
+        self.last_score = score
+
+        held_too_long = (
+            self.max_hold_seconds is not None
+            and offset - self._reference_time >= self.max_hold_seconds
+        )
+        if score >= self.threshold or held_too_long:
+            self._keep(thumb, offset)
+            return True, score
+
+        self.frames_skipped += 1
+        last = self._markers[-1] if self._markers else None
+        if last is not None and last[0] == self._kept_index:
+            last[2] = round(offset, 3)
+            last[3] += 1
+        else:
+            self._markers.append([self._kept_index, round(offset, 3), round(offset, 3), 1])
+        return False, score
+
+    def repeat_markers(self) -> List[List[Any]]:
+        """Return run-length repeat markers collected since the last reset."""
+        return [list(marker) for marker in self._markers]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters suitable for status reporting."""
+        seen = self.frames_seen
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "frames_seen": seen,
+            "frames_kept": self.frames_kept,
+            "frames_skipped": self.frames_skipped,
+            "skip_ratio": (self.frames_skipped / seen) if seen else 0.0,
+            "last_score": self.last_score,
+        }
+
+    def _keep(self, thumb: Optional[np.ndarray], offset: float) -> None:
+        self._reference = thumb
+        self._reference_time = offset
+        self._kept_index += 1
+        self.frames_kept += 1
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        # Subsample to a few pixels per cell first so we never copy the full frame
+        # (much cheaper than an area resize on 4K captures), then block-average
+        # into the thumbnail grid.
+        size = self.thumb_size
+        height, width = frame.shape[:2]
+        step_h = max(1, height // (size * 4))
+        step_w = max(1, width // (size * 4))
+        sampled = frame[::step_h, ::step_w]
+        height, width = sampled.shape[:2]
+        bh = max(1, height // size)
+        bw = max(1, width // size)
+        rows = min(size, height // bh)
+        cols = min(size, width // bw)
+        cropped = sampled[: rows * bh, : cols * bw].astype(np.float32)
+        small = cropped.reshape((rows, bh, cols, bw) + cropped.shape[2:]).mean(axis=(1, 3))
+        if small.ndim == 3:
+            small = small[:, :, :3].mean(axis=2)
+        return small
@@ -0,0 +1,252 @@
+"""Shared single-pass frame sampler for recorded videos."""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from memscreen.cache import CacheNamespace, CacheRegistry, get_cache_registry
+from memscreen.cv2_loader import get_cv2
+
+IndexSelector = Union[Sequence[int], Callable[[int], Iterable[int]]]
+
+
+class _SampleCacheEntry:
+    __slots__ = ("total_frames", "fps", "frames", "nbytes")
+
+    def __init__(self, total_frames: int, fps: float):
+        self.total_frames = total_frames
+        self.fps = fps
+        self.frames: Dict[int, Any] = {}
+        self.nbytes = 0
+
+
+class VideoFrameSampler:
+    """
+    Decode sampled frames from a video in one sequential pass.
+
+    Seeking with ``CAP_PROP_POS_FRAMES`` makes the decoder restart from the
+    previous keyframe for every sample. The sampler instead opens the file
+    once, walks forward with ``grab()`` (no colour conversion) between the
+    requested indices and only ``read()``s the frames it hands out. Large
+    gaps still fall back to a seek.
+
+    Decoded frames are cached per (filename, mtime, max_width) in a
+    ``CacheRegistry`` namespace, so recording reanalysis and chat evidence
+    collection reuse each other's work and the frames count against the
+    global cache budget. Returned frames are shared with the cache and must
+    be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        max_cache_bytes: Optional[int] = None,
+        max_cache_files: int = 32,
+        use_grab: bool = True,
+        max_sequential_gap: int = 600,
+        cache_weight: float = 4.0,
+        registry: Optional[CacheRegistry] = None,
+    ):
+        """
+        Args:
+            max_cache_bytes: Fixed cap on cached frame memory (None takes a
+                share of the registry budget)
+            max_cache_files: Upper bound on cached videos
+            use_grab: Skip unwanted frames with grab() instead of read()
+            max_sequential_gap: Seek instead of decoding forward past this many frames
+            cache_weight: Share of the registry budget relative to other namespaces
+            registry: Registry holding the frames (defaults to the global one)
+        """
+        self.max_cache_files = int(max_cache_files)
+        self.use_grab = use_grab
+        self.max_sequential_gap = int(max_sequential_gap)
+        registry = registry or get_cache_registry()
+        if max_cache_bytes is None:
+            self._cache = registry.private_namespace(
+                "frame_sampler", max_entries=self.max_cache_files, weight=cache_weight
+            )
+        else:
+            self._cache = CacheNamespace(
+                f"frame_sampler:{id(self):x}", max_cache_bytes, max_entries=self.max_cache_files
+            )
+            registry.register_source(self._cache.name, self.stats)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.decoded_frames = 0
+
+    @property
+    def max_cache_bytes(self) -> int:
+        return self._cache.max_bytes
+
+    # ==================== Public API ====================
+
+    def probe(self, video_path: str) -> Tuple[int, float]:
+        """Return (total_frames, fps) for a video, using the cache when possible."""
+        try:
+            mtime = os.path.getmtime(video_path)
+        except OSError:
+            return 0, 0.0
+        for path, cached_mtime, width in self._cache.keys():
+            if path == video_path and cached_mtime == mtime:
+                entry = self._cache.peek((path, cached_mtime, width))
+                if entry is not None:
+                    return entry.total_frames, entry.fps
+
+        cv2 = get_cv2()
+        if cv2 is None:
+            return 0, 0.0
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                return 0, 0.0
+            return int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0), float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        finally:
+            cap.release()
+
+    def sample(
+        self,
+        video_path: str,
+        indices: IndexSelector,
+        max_width: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return decoded frames for the requested indices.
+
+        Args:
+            video_path: Video file to sample
+            indices: Frame indices, or a callable mapping total_frames to indices
+            max_width: Downscale frames wider than this (None keeps full size)
+
+        Returns:
+            List of {"source_frame", "time_offset", "frame"} dicts in index order.
+            Indices past the end of the video are skipped.
+        """
+        cv2 = get_cv2()
+        if cv2 is None or not os.path.exists(video_path):
+            return []
+
+        mtime = os.path.getmtime(video_path)
+        key = (video_path, mtime, int(max_width or 0))
+
+        entry = self._cache.get(key)
+
+        cap = None
+        try:
+            if entry is None:
+                cap = cv2.VideoCapture(video_path)
+                if not cap.isOpened():
+                    return []
+                entry = _SampleCacheEntry(
+                    int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0),
+                    float(cap.get(cv2.CAP_PROP_FPS) or 0.0),
+                )
+
+            total_frames = entry.total_frames
+            if total_frames <= 0:
+                return []
+            requested = indices(total_frames) if callable(indices) else indices
+            wanted = sorted(
+                {int(idx) for idx in requested if 0 <= int(idx) < total_frames}
+            )
+            missing = [idx for idx in wanted if idx not in entry.frames]
+            self.hits += len(wanted) - len(missing)
+            self.misses += len(missing)
+
+            if missing:
+                if cap is None:
+                    cap = cv2.VideoCapture(video_path)
+                    if not cap.isOpened():
+                        return []
+                decoded = self._decode(cv2, cap, missing, max_width)
+                entry = self._store(key, entry, decoded)
+
+            fps = entry.fps
+            return [
+                {
+                    "source_frame": idx,
+                    "time_offset": round((idx / fps) if fps > 0 else 0.0, 2),
+                    "frame": entry.frames[idx],
+                }
+                for idx in wanted
+                if idx in entry.frames
+            ]
+        finally:
+            if cap is not None:
+                cap.release()
+
+    def invalidate(self, video_path: Optional[str] = None) -> None:
+        """Drop cached frames for one video, or for all videos."""
+        for key in self._cache.keys():
+            if video_path is None or key[0] == video_path:
+                self._cache.pop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache and decode counters."""
+        with self._lock:
+            return {
+                "files": len(self._cache),
+                "bytes": self._cache.bytes,
+                "max_bytes": self.max_cache_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "decoded_frames": self.decoded_frames,
+            }
+
+    # ==================== Internals ====================
+
+    def _decode(self, cv2, cap, indices: List[int], max_width: Optional[int]) -> Dict[int, Any]:
+        """Decode sorted indices in one forward pass."""
+        out: Dict[int, Any] = {}
+        position = 0
+        for idx in indices:
+            gap = idx - position
+            if gap < 0 or gap > self.max_sequential_gap:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+                position = idx
+            else:
+                while position < idx:
+                    ok = cap.grab() if self.use_grab else cap.read()[0]
+                    self.decoded_frames += 1
+                    if not ok:
+                        return out
+                    position += 1
+
+            ok, frame = cap.read()
+            self.decoded_frames += 1
+            position += 1
+            if not ok or frame is None:
+                break
+
+            if max_width:
+                height, width = frame.shape[:2]
+                if width > max_width:
+                    frame = cv2.resize(frame, (int(max_width), int(height * (max_width / width))))
+            out[idx] = frame
+        return out
+
+    def _store(self, key, entry: _SampleCacheEntry, decoded: Dict[int, Any]) -> _SampleCacheEntry:
+        with self._lock:
+            entry = self._cache.peek(key, entry)
+            for idx, frame in decoded.items():
+                if idx not in entry.frames:
+                    entry.frames[idx] = frame
+                    entry.nbytes += int(getattr(frame, "nbytes", 0))
+            # A video larger than the whole budget is returned but not kept.
+            self._cache.set(key, entry, size=entry.nbytes)
+        return entry
+
+
+_default_sampler: Optional[VideoFrameSampler] = None
+_default_sampler_lock = threading.Lock()
+
+
+def get_frame_sampler() -> VideoFrameSampler:
+    """Return the process-wide frame sampler shared by presenters."""
+    global _default_sampler
+    if _default_sampler is None:
+        with _default_sampler_lock:
+            if _default_sampler is None:
+                _default_sampler = VideoFrameSampler()
+    return _default_sampler
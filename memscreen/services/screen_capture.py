@@ -0,0 +1,151 @@
+"""Pluggable screen capture backends returning BGR frames."""
+
+from __future__ import annotations
+
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from memscreen.cv2_loader import get_cv2
+
+BBox = Tuple[int, int, int, int]
+
+SUPPORTED_CAPTURE_BACKENDS = ("auto", "mss", "pil")
+
+
+class ScreenCaptureBackend:
+    """Capture a screen area as a BGR ``uint8`` ndarray."""
+
+    name = "base"
+
+    def grab(self, bbox: Optional[BBox] = None) -> np.ndarray:
+        """
+        Capture one frame.
+
+        Args:
+            bbox: (left, top, right, bottom) in screen coordinates, or None
+                  for the backend's full-screen default
+
+        Returns:
+            BGR ndarray of shape (height, width, 3)
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release backend resources."""
+
+
+class MssCaptureBackend(ScreenCaptureBackend):
+    """
+    Capture through ``mss`` raw BGRA buffers.
+
+    The screenshot buffer is viewed as a NumPy array without copying and the
+    alpha channel is dropped with a single slice, so one contiguous BGR copy
+    is the only full-frame allocation per capture. ``mss`` handles are not
+    thread-safe, so one handle is kept per calling thread.
+    """
+
+    name = "mss"
+
+    def __init__(self):
+        import mss  # noqa: F401  (fail fast when the dependency is missing)
+
+        self._local = threading.local()
+        self._handles: List[object] = []
+        self._handles_lock = threading.Lock()
+
+    def _handle(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            import mss
+
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._handles_lock:
+                self._handles.append(sct)
+        return sct
+
+    def grab(self, bbox: Optional[BBox] = None) -> np.ndarray:
+        sct = self._handle()
+        if bbox is None:
+            monitor = sct.monitors[0]
+        else:
+            left, top, right, bottom = (int(v) for v in bbox)
+            monitor = {
+                "left": left,
+                "top": top,
+                "width": max(1, right - left),
+                "height": max(1, bottom - top),
+            }
+        shot = sct.grab(monitor)
+        # shot.size is in physical pixels (e.g. 2x on Retina), not the bbox size.
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return np.ascontiguousarray(bgra[:, :, :3])
+
+    def close(self) -> None:
+        with self._handles_lock:
+            handles, self._handles = self._handles, []
+        for sct in handles:
+            try:
+                sct.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+
+class PILCaptureBackend(ScreenCaptureBackend):
+    """Capture through ``PIL.ImageGrab`` (portable fallback)."""
+
+    name = "pil"
+
+    def grab(self, bbox: Optional[BBox] = None) -> np.ndarray:
+        from PIL import ImageGrab
+
+        screenshot = ImageGrab.grab(bbox=bbox) if bbox is not None else ImageGrab.grab()
+        return pil_image_to_bgr(screenshot)
+
+
+def pil_image_to_bgr(image) -> np.ndarray:
+    """Convert a PIL image (RGB/RGBA/L, any dtype) to a BGR uint8 ndarray."""
+    cv2 = get_cv2()
+    frame_array = np.array(image)
+
+    # Handle different data types
+    if frame_array.dtype == np.float64 or frame_array.dtype == np.float32:
+        # Float images - normalize to 0-255
+        if frame_array.max() <= 1.0:
+            frame_array = np.clip(frame_array * 255, 0, 255).astype(np.uint8)
+        else:
+            frame_array = np.clip(frame_array, 0, 255).astype(np.uint8)
+    elif frame_array.dtype != np.uint8:
+        frame_array = np.clip(frame_array, 0, 255).astype(np.uint8)
+
+    if frame_array.ndim == 2:
+        return cv2.cvtColor(frame_array, cv2.COLOR_GRAY2BGR)
+    if frame_array.shape[2] == 4:
+        return cv2.cvtColor(frame_array, cv2.COLOR_RGBA2BGR)
+    return cv2.cvtColor(frame_array, cv2.COLOR_RGB2BGR)
+
+
+def create_capture_backend(name: str = "auto") -> ScreenCaptureBackend:
+    """
+    Create a capture backend by name.
+
+    Args:
+        name: "mss", "pil" or "auto" (mss when importable, otherwise PIL)
+    """
+    normalized = str(name or "auto").strip().lower()
+    if normalized not in SUPPORTED_CAPTURE_BACKENDS:
+        raise ValueError(
+            f"Unsupported capture backend: {name}. "
+            f"Supported: {', '.join(SUPPORTED_CAPTURE_BACKENDS)}"
+        )
+    if normalized in ("auto", "mss"):
+        try:
+            return MssCaptureBackend()
+        except ImportError:
+            if normalized == "mss":
+                raise
+            print("[ScreenCapture] mss is unavailable, using PIL ImageGrab")
+    return PILCaptureBackend()
@@ -0,0 +1,250 @@
+"""Streaming video sink that encodes captured frames on a background thread."""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_STOP = object()
+_REPEAT = object()
+
+
+class StreamingVideoSink:
+    """
+    Encode frames into one video file as they are captured.
+
+    Frames are handed to a bounded queue and written by a dedicated encoder
+    thread, so the capture loop never holds more than ``max_pending`` frames
+    in memory. The underlying ``VideoWriter`` is opened lazily with the size
+    of the first frame; later frames with a different size are resized to it.
+
+    Each frame is placed on the ``1/fps`` slot of its capture time: ``repeat``
+    writes the last encoded frame again for a capture that was skipped (for
+    example by change detection), and late captures are padded the same way,
+    so the file keeps the wall-clock timeline of the capture and stays in sync
+    with audio recorded alongside it. Gaps longer than ``max_gap_seconds``
+    (system sleep, clock jumps) are padded only up to that length; the
+    timeline is then re-anchored on the late frame and the rest of the gap
+    is counted in ``gap_seconds_skipped``.
+    """
+
+    def __init__(
+        self,
+        cv2,
+        path: str,
+        fps: float,
+        open_writer: Callable[[Any, str, float, Tuple[int, int]], Tuple[Any, str, str]],
+        normalize_size: Optional[Callable[[int, int], Tuple[int, int]]] = None,
+        max_pending: int = 4,
+        put_timeout: float = 2.0,
+        max_gap_seconds: float = 30.0,
+    ):
+        """
+        Args:
+            cv2: Loaded cv2 module (see ``memscreen.cv2_loader.get_cv2``)
+            path: Requested output path; codec fallback may change the extension
+            fps: Output frame rate
+            open_writer: Callable ``(cv2, path, fps, (w, h)) -> (writer, path, ext)``
+            normalize_size: Optional callable mapping raw ``(w, h)`` to encoder size
+            max_pending: Maximum number of frames buffered ahead of the encoder
+            put_timeout: Seconds to wait for queue space before dropping a frame
+            max_gap_seconds: Longest capture gap filled with repeated frames
+        """
+        self._cv2 = cv2
+        self.path = path
+        self.fps = fps
+        self._open_writer = open_writer
+        self._normalize_size = normalize_size
+        self._put_timeout = max(0.0, float(put_timeout))
+        self._max_gap_frames = max(0, int(max_gap_seconds * fps)) if fps > 0 else 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(max_pending)))
+
+        self._writer = None
+        self._size: Optional[Tuple[int, int]] = None
+        self._closed = False
+        self.frames_submitted = 0
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_repeated = 0
+        self.gap_seconds_skipped = 0.0
+        self.encode_seconds = 0.0
+        self.first_frame_at: Optional[float] = None
+        self.last_frame_at: Optional[float] = None
+        self._last_frame = None
+        self.error: Optional[BaseException] = None
+        self.started_at = time.time()
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="StreamingVideoSink",
+            daemon=True,
+        )
+        self._thread.start()
+
+    # ==================== Capture side ====================
+
+    def write(self, frame, captured_at: Optional[float] = None) -> bool:
+        """
+        Queue one BGR frame for encoding.
+
+        Args:
+            frame: BGR frame
+            captured_at: Capture time (epoch seconds, defaults to now)
+
+        Returns:
+            True if the frame was accepted, False if the sink is closed,
+            failed, or the encoder fell behind for longer than ``put_timeout``.
+        """
+        return self._submit(frame, captured_at)
+
+    def repeat(self, captured_at: Optional[float] = None) -> bool:
+        """
+        Queue the previously written frame again for the current capture slot.
+
+        Returns:
+            False if nothing has been written yet or the frame could not be queued.
+        """
+        if self.frames_submitted == 0:
+            return False
+        return self._submit(_REPEAT, captured_at)
+
+    def _submit(self, item, captured_at: Optional[float]) -> bool:
+        if self._closed or self.error is not None:
+            return False
+        captured_at = time.time() if captured_at is None else float(captured_at)
+        if self.first_frame_at is not None and self.fps > 0:
+            # Late captures (slow grab, busy loop) repeat the previous frame so
+            # every frame lands on the slot of its capture time.
+            slot = int(round((captured_at - self.first_frame_at) * self.fps))
+            missing = slot - self.frames_submitted
+            for _ in range(min(missing, self._max_gap_frames)):
+                if not self._put(_REPEAT):
+                    return False
+            if missing > self._max_gap_frames:
+                # Re-anchor so this frame takes the next slot instead of the whole gap.
+                anchor = captured_at - self.frames_submitted / self.fps
+                self.gap_seconds_skipped += anchor - self.first_frame_at
+                self.first_frame_at = anchor
+        if not self._put(item):
+            return False
+        if self.first_frame_at is None:
+            self.first_frame_at = captured_at
+        self.last_frame_at = captured_at
+        return True
+
+    def _put(self, item) -> bool:
+        try:
+            self._queue.put(item, timeout=self._put_timeout)
+        except queue.Full:
+            self.frames_dropped += 1
+            return False
+        self.frames_submitted += 1
+        return True
+
+    @property
+    def wall_seconds(self) -> float:
+        """Timeline span covered by the submitted frames (one frame slot past the last).
+
+        Excludes ``gap_seconds_skipped``.
+        """
+        if self.first_frame_at is None:
+            return 0.0
+        slot = 1.0 / self.fps if self.fps > 0 else 0.0
+        return max(0.0, self.last_frame_at - self.first_frame_at) + slot
+
+    @property
+    def pending(self) -> int:
+        """Number of frames waiting for the encoder."""
+        return self._queue.qsize()
+
+    def close(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Flush pending frames, release the writer and return a summary.
+
+        Safe to call more than once.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        return self.stats()
+
+    def abort(self) -> None:
+        """Stop encoding and remove the partially written file."""
+        self.close(timeout=5)
+        if os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of sink counters."""
+        return {
+            "filename": self.path,
+            "frames_submitted": self.frames_submitted,
+            "frames_written": self.frames_written,
+            "frames_dropped": self.frames_dropped,
+            "frames_repeated": self.frames_repeated,
+            "wall_seconds": self.wall_seconds,
+            "gap_seconds_skipped": self.gap_seconds_skipped,
+            "pending": self.pending,
+            "encode_seconds": self.encode_seconds,
+            "error": str(self.error) if self.error is not None else None,
+        }
+
+    # ==================== Encoder thread ====================
+
+    def _run(self) -> None:
+        try:
+            while True:
+                frame = self._queue.get()
+                if frame is _STOP:
+                    break
+                if self.error is not None:
+                    continue
+                try:
+                    started = time.perf_counter()
+                    if frame is _REPEAT:
+                        if self._last_frame is None:
+                            continue
+                        self._writer.write(self._last_frame)
+                        self.frames_written += 1
+                        self.frames_repeated += 1
+                    else:
+                        self._encode(frame)
+                    self.encode_seconds += time.perf_counter() - started
+                except Exception as e:
+                    self.error = e
+                    print(f"[StreamingVideoSink] Encoding failed for {self.path}: {e}")
+        finally:
+            if self._writer is not None:
+                try:
+                    self._writer.release()
+                except Exception as e:
+                    print(f"[StreamingVideoSink] Failed to release writer: {e}")
+                self._writer = None
+
+    def _encode(self, frame) -> None:
+        height, width = frame.shape[:2]
+        if self._writer is None:
+            size = (int(width), int(height))
+            if self._normalize_size is not None:
+                size = tuple(self._normalize_size(width, height))
+            self._writer, self.path, _used_ext = self._open_writer(
+                self._cv2,
+                self.path,
+                self.fps,
+                size,
+            )
+            self._size = size
+
+        target_w, target_h = self._size
+        if width != target_w or height != target_h:
+            frame = self._cv2.resize(frame, (target_w, target_h))
+        self._writer.write(frame)
+        self._last_frame = frame
+        self.frames_written += 1
@@ -137,12 +137,14 @@ class SummarySkill(BaseSkill):
         """Generate summary using LLM."""
         try:
             if hasattr(self.llm_client, 'generate_response'):
-                response = self.llm_client.generate_response(
+                response = await self.run_blocking(
+                    self.llm_client.generate_response,
                     messages=[{"role": "user", "content": prompt}]
                 )
                 return response.strip()
             elif hasattr(self.llm_client, 'chat'):
-                response = self.llm_client.chat(
+                response = await self.run_blocking(
+                    self.llm_client.chat,
                     messages=[{"role": "user", "content": prompt}]
                 )
                 return response.strip()
@@ -76,7 +76,8 @@ class SearchMemorySkill(BaseSkill):
 
             # Search in memory system
             if self.memory_system and hasattr(self.memory_system, 'search'):
-                results = self.memory_system.search(
+                results = await self.run_blocking(
+                    self.memory_system.search,
                     query=query,
                     user_id=user_id,
                     top_k=top_k
@@ -10,10 +10,15 @@ Storage module for MemScreen.
 This module provides database management classes for storing memory history.
 """
 
-from .input_events import InputEventRepository
+from .chat_threads import ChatThreadRepository
+from .ingest_manifest import IngestManifestRepository
+from .input_events import InputEventRepository, InputEventWriter
+from .memory_tiers import MemoryTierRepository
 from .memory_versions import MemoryVersionRepository
+from .pool import SQLiteConnectionPool, close_pools, get_pool
+from .process_mining_summary import ProcessMiningSummaryRepository
 from .process_sessions import ProcessSessionRepository
 from .recordings import RecordingMetadataRepository
 from .sqlite import SQLiteManager
 
-__all__ = ["SQLiteManager", "RecordingMetadataRepository", "ProcessSessionRepository", "InputEventRepository", "MemoryVersionRepository"]
+__all__ = ["SQLiteManager", "RecordingMetadataRepository", "ProcessSessionRepository", "ProcessMiningSummaryRepository", "InputEventRepository", "InputEventWriter", "MemoryVersionRepository", "MemoryTierRepository", "ChatThreadRepository", "IngestManifestRepository", "SQLiteConnectionPool", "get_pool", "close_pools"]
@@ -0,0 +1,237 @@
+"""SQLite repository for chat threads: a small metadata index plus an append-only message log."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .pool import get_pool
+
+_META_COLUMNS = ("title", "preview", "created_at", "updated_at", "message_count", "auto_title")
+
+
+class ChatThreadRepository:
+    """
+    Encapsulates SQLite access for persisted chat threads.
+
+    ``chat_threads`` holds one row of metadata per thread, so listing threads
+    never touches message bodies. ``chat_messages`` is an append-only log keyed
+    by ``(thread_id, seq)``: persisting a message is one INSERT plus one
+    metadata UPSERT, independent of how many messages already exist. Rewriting
+    a thread (clear/import) deletes its rows, and ``compact`` reclaims the
+    freed pages once enough of them have piled up.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+
+    def ensure_schema(self) -> None:
+        with self._connection():
+            pass
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Pooled connection with the schema created (checked once per schema version)."""
+        pool = get_pool(self.db_path)
+        with pool.connection() as conn:
+            pool.schema_cached(conn, "chat_threads", self._create_schema)
+            yield conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> bool:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chat_threads (
+                thread_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                preview TEXT NOT NULL DEFAULT '',
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                message_count INTEGER NOT NULL DEFAULT 0,
+                auto_title INTEGER NOT NULL DEFAULT 1
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chat_messages (
+                thread_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                timestamp TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (thread_id, seq)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chat_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+            """
+        )
+        conn.commit()
+        return True
+
+    @staticmethod
+    def _meta_params(thread_id: str, meta: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
+            thread_id,
+            str(meta.get("title", "")),
+            str(meta.get("preview", "")),
+            str(meta.get("created_at", "")),
+            str(meta.get("updated_at", "")),
+            int(meta.get("message_count", 0) or 0),
+            1 if meta.get("auto_title", True) else 0,
+        )
+
+    @staticmethod
+    def _upsert_meta(conn: sqlite3.Connection, rows: List[Tuple[Any, ...]]) -> None:
+        conn.executemany(
+            """
+            INSERT INTO chat_threads (
+                thread_id, title, preview, created_at, updated_at, message_count, auto_title
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(thread_id) DO UPDATE SET
+                title = excluded.title,
+                preview = excluded.preview,
+                created_at = excluded.created_at,
+                updated_at = excluded.updated_at,
+                message_count = excluded.message_count,
+                auto_title = excluded.auto_title
+            """,
+            rows,
+        )
+
+    def save_thread(self, thread_id: str, meta: Dict[str, Any]) -> None:
+        """Insert or update one thread's metadata row."""
+        with self._connection() as conn:
+            self._upsert_meta(conn, [self._meta_params(thread_id, meta)])
+            conn.commit()
+
+    def append_message(
+        self,
+        thread_id: str,
+        seq: int,
+        message: Dict[str, Any],
+        meta: Dict[str, Any],
+    ) -> None:
+        """Append message ``seq`` (0-based position) to a thread and update its metadata."""
+        with self._connection() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO chat_messages (thread_id, seq, role, content, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    thread_id,
+                    int(seq),
+                    str(message.get("role", "assistant")),
+                    str(message.get("content", "")),
+                    str(message.get("timestamp", "")),
+                ),
+            )
+            self._upsert_meta(conn, [self._meta_params(thread_id, meta)])
+            conn.commit()
+
+    def replace_thread(
+        self,
+        thread_id: str,
+        messages: Iterable[Dict[str, Any]],
+        meta: Dict[str, Any],
+    ) -> None:
+        """Rewrite a thread's whole log, e.g. after it was cleared or imported."""
+        self.import_threads([(thread_id, meta, list(messages))])
+
+    def import_threads(
+        self,
+        threads: Iterable[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]],
+    ) -> None:
+        """Write several ``(thread_id, meta, messages)`` threads in one transaction."""
+        threads = list(threads)
+        if not threads:
+            return
+        with self._connection() as conn:
+            for thread_id, meta, messages in threads:
+                conn.execute("DELETE FROM chat_messages WHERE thread_id = ?", (thread_id,))
+                conn.executemany(
+                    """
+                    INSERT INTO chat_messages (thread_id, seq, role, content, timestamp)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            thread_id,
+                            seq,
+                            str(msg.get("role", "assistant")),
+                            str(msg.get("content", "")),
+                            str(msg.get("timestamp", "")),
+                        )
+                        for seq, msg in enumerate(messages)
+                    ],
+                )
+            self._upsert_meta(conn, [self._meta_params(thread_id, meta) for thread_id, meta, _ in threads])
+            conn.commit()
+
+    def list_threads(self) -> List[Dict[str, Any]]:
+        """Return every thread's metadata, most recently updated first."""
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                f"""
+                SELECT thread_id, {", ".join(_META_COLUMNS)}
+                FROM chat_threads
+                ORDER BY updated_at DESC
+                """
+            ).fetchall()
+        threads = []
+        for row in rows:
+            item = dict(row)
+            item["id"] = item.pop("thread_id")
+            item["auto_title"] = bool(item["auto_title"])
+            threads.append(item)
+        return threads
+
+    def load_messages(self, thread_id: str) -> List[Dict[str, Any]]:
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT role, content, timestamp FROM chat_messages WHERE thread_id = ? ORDER BY seq",
+                (thread_id,),
+            ).fetchall()
+        return [{"role": role, "content": content, "timestamp": timestamp} for role, content, timestamp in rows]
+
+    def get_state(self, key: str) -> Optional[str]:
+        with self._connection() as conn:
+            row = conn.execute("SELECT value FROM chat_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO chat_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+            conn.commit()
+
+    def compact(self, min_free_ratio: float = 0.25) -> bool:
+        """
+        VACUUM the database when at least ``min_free_ratio`` of its pages are free.
+
+        Returns True if the file was compacted.
+        """
+        if self.db_path == ":memory:":
+            return False
+        with self._connection() as conn:
+            page_count = int(conn.execute("PRAGMA page_count").fetchone()[0] or 0)
+            free_pages = int(conn.execute("PRAGMA freelist_count").fetchone()[0] or 0)
+            if not page_count or free_pages / page_count < min_free_ratio:
+                return False
+            conn.commit()
+            conn.execute("VACUUM")
+            # In WAL mode the rewritten pages only reach the main file on checkpoint.
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return True
@@ -0,0 +1,129 @@
+"""SQLite repository for the folder-ingestion manifest (which file versions are already in memory)."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .pool import get_pool
+
+_CHUNK = 500
+
+
+class IngestManifestRepository:
+    """
+    Encapsulates SQLite access for ingested files.
+
+    One row per (scope, file path) records the ``size`` and ``mtime_ns`` of
+    the version that was ingested and the ids of the memories created from
+    it, so a re-run can skip unchanged files and replace the memories of
+    changed ones. The scope identifies who the memories belong to, so
+    ingesting the same folder for another user or run starts fresh.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+
+    def ensure_schema(self) -> None:
+        with self._connection():
+            pass
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Pooled connection with the schema created (checked once per schema version)."""
+        pool = get_pool(self.db_path)
+        with pool.connection() as conn:
+            pool.schema_cached(conn, "ingest_manifest", self._create_schema)
+            yield conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> bool:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(ingest_manifest)")}
+        legacy = bool(columns) and "scope" not in columns
+        if legacy:
+            # Manifests written before scopes keep their rows under the empty scope.
+            conn.execute("ALTER TABLE ingest_manifest RENAME TO ingest_manifest_legacy")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingest_manifest (
+                scope TEXT NOT NULL DEFAULT '',
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                memory_ids TEXT NOT NULL DEFAULT '[]',
+                ingested_at REAL NOT NULL,
+                PRIMARY KEY (scope, path)
+            )
+            """
+        )
+        if legacy:
+            conn.execute(
+                """
+                INSERT INTO ingest_manifest (scope, path, size, mtime_ns, memory_ids, ingested_at)
+                SELECT '', path, size, mtime_ns, memory_ids, ingested_at FROM ingest_manifest_legacy
+                """
+            )
+            conn.execute("DROP TABLE ingest_manifest_legacy")
+        conn.commit()
+        return True
+
+    def get_many(self, paths: Iterable[str], scope: str = "") -> Dict[str, Tuple[int, int, List[str]]]:
+        """Return ``{path: (size, mtime_ns, memory_ids)}`` for the paths recorded in ``scope``."""
+        paths = list(dict.fromkeys(paths))
+        found: Dict[str, Tuple[int, int, List[str]]] = {}
+        with self._connection() as conn:
+            for start in range(0, len(paths), _CHUNK):
+                chunk = paths[start:start + _CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    "SELECT path, size, mtime_ns, memory_ids FROM ingest_manifest "
+                    f"WHERE scope = ? AND path IN ({placeholders})",
+                    [scope, *chunk],
+                ).fetchall()
+                for path, size, mtime_ns, memory_ids in rows:
+                    found[path] = (int(size), int(mtime_ns), json.loads(memory_ids or "[]"))
+        return found
+
+    def list_under(self, folder: str, scope: str = "") -> Dict[str, List[str]]:
+        """Return ``{path: memory_ids}`` for every path recorded in ``scope`` below ``folder``."""
+        prefix = os.path.join(folder, "")
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT path, memory_ids FROM ingest_manifest WHERE scope = ? AND path >= ? AND path < ?",
+                (scope, prefix, prefix + "\U0010ffff"),
+            ).fetchall()
+        return {path: json.loads(memory_ids or "[]") for path, memory_ids in rows}
+
+    def record_many(self, rows: Iterable[Tuple[str, int, int, List[str], float]], scope: str = "") -> None:
+        """Upsert ``(path, size, mtime_ns, memory_ids, ingested_at)`` rows into ``scope``."""
+        params = [
+            (scope, path, int(size), int(mtime_ns), json.dumps(list(memory_ids)), float(ingested_at))
+            for path, size, mtime_ns, memory_ids, ingested_at in rows
+        ]
+        if not params:
+            return
+        with self._connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO ingest_manifest (scope, path, size, mtime_ns, memory_ids, ingested_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(scope, path) DO UPDATE SET
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    memory_ids = excluded.memory_ids,
+                    ingested_at = excluded.ingested_at
+                """,
+                params,
+            )
+            conn.commit()
+
+    def delete_many(self, paths: Iterable[str], scope: str = "") -> None:
+        params = [(scope, path) for path in dict.fromkeys(paths)]
+        if not params:
+            return
+        with self._connection() as conn:
+            conn.executemany("DELETE FROM ingest_manifest WHERE scope = ? AND path = ?", params)
+            conn.commit()
@@ -2,9 +2,16 @@
 
 from __future__ import annotations
 
-import os
+import queue
 import sqlite3
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .pool import get_pool
+
+EventRow = Tuple[Optional[str], str, str, str, str]
 
 
 class InputEventRepository:
@@ -14,41 +21,47 @@ class InputEventRepository:
         self.db_path = db_path
 
     def ensure_schema(self) -> None:
-        db_dir = os.path.dirname(self.db_path)
-        if db_dir:
-            os.makedirs(db_dir, exist_ok=True)
+        with self._connection():
+            pass
 
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS keyboard_mouse_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    operate_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    operate_type TEXT NOT NULL,
-                    action TEXT NOT NULL,
-                    content TEXT,
-                    details TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_operate_time
-                ON keyboard_mouse_logs(operate_time)
-                """
-            )
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_operate_type
-                ON keyboard_mouse_logs(operate_type)
-                """
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Pooled connection with the schema created (checked once per schema version)."""
+        pool = get_pool(self.db_path)
+        with pool.connection() as conn:
+            pool.schema_cached(conn, "input_events", self._create_schema)
+            yield conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> bool:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS keyboard_mouse_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                operate_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                operate_type TEXT NOT NULL,
+                action TEXT NOT NULL,
+                content TEXT,
+                details TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
-            conn.commit()
-        finally:
-            conn.close()
+            """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_operate_time
+            ON keyboard_mouse_logs(operate_time)
+            """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_operate_type
+            ON keyboard_mouse_logs(operate_type)
+            """
+        )
+        conn.commit()
+        return True
 
     def insert_event(
         self,
@@ -59,10 +72,7 @@ class InputEventRepository:
         details: str = "",
         operate_time: Optional[str] = None,
     ) -> int:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        try:
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -73,25 +83,41 @@ class InputEventRepository:
             )
             conn.commit()
             return int(cursor.lastrowid or 0)
-        finally:
-            conn.close()
 
-    def get_latest_event_id(self) -> int:
-        self.ensure_schema()
+    def insert_events(self, rows: Sequence[EventRow], conn: Optional[sqlite3.Connection] = None) -> int:
+        """
+        Insert many events in one transaction.
 
-        conn = sqlite3.connect(self.db_path)
-        try:
+        Args:
+            rows: (operate_time, event_type, action, content, details) tuples
+            conn: Optional open connection to reuse (the caller keeps ownership)
+
+        Returns:
+            Number of inserted rows
+        """
+        if not rows:
+            return 0
+        if conn is None:
+            with self._connection() as pooled:
+                return self.insert_events(rows, conn=pooled)
+        with conn:
+            conn.executemany(
+                """
+                INSERT INTO keyboard_mouse_logs (operate_time, operate_type, action, content, details)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                list(rows),
+            )
+        return len(rows)
+
+    def get_latest_event_id(self) -> int:
+        with self._connection() as conn:
             row = conn.execute("SELECT COALESCE(MAX(id), 0) FROM keyboard_mouse_logs").fetchone()
             return int((row or [0])[0] or 0)
-        finally:
-            conn.close()
 
     def list_recent_events(self, *, limit: int = 100, since_id: Optional[int] = None) -> List[Dict[str, Any]]:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
             if since_id is not None and since_id >= 0:
                 rows = conn.execute(
                     """
@@ -114,8 +140,22 @@ class InputEventRepository:
                     (int(limit),),
                 ).fetchall()
             return [self._normalize_row(row) for row in rows]
-        finally:
-            conn.close()
+
+    def list_events_after(self, since_id: int, *, limit: int = 5000) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` events with id > since_id in ascending id order."""
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                """
+                SELECT id, operate_time, operate_type, action, content, details
+                FROM keyboard_mouse_logs
+                WHERE id > ?
+                ORDER BY id ASC
+                LIMIT ?
+                """,
+                (int(since_id), int(limit)),
+            ).fetchall()
+            return [self._normalize_row(row) for row in rows]
 
     def list_events(
         self,
@@ -124,8 +164,6 @@ class InputEventRepository:
         end_time: Optional[str] = None,
         operate_type: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        self.ensure_schema()
-
         query = (
             "SELECT id, operate_time, operate_type, action, content, details "
             "FROM keyboard_mouse_logs WHERE 1=1"
@@ -143,13 +181,10 @@ class InputEventRepository:
             params.append(str(operate_type))
         query += " ORDER BY operate_time ASC"
 
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
             rows = conn.execute(query, params).fetchall()
             return [self._normalize_row(row) for row in rows]
-        finally:
-            conn.close()
 
     @staticmethod
     def _normalize_row(row: sqlite3.Row) -> Dict[str, Any]:
@@ -161,3 +196,151 @@ class InputEventRepository:
             "content": row["content"],
             "details": row["details"],
         }
+
+
+class InputEventWriter:
+    """
+    Background writer that batches input events into SQLite.
+
+    Listener callbacks only enqueue a tuple. A daemon thread drains the
+    bounded queue and writes with ``executemany`` in a single transaction
+    every ``batch_size`` events or ``flush_interval`` seconds, on one
+    long-lived WAL connection. When the queue is full new events are
+    dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(
+        self,
+        repository: InputEventRepository,
+        batch_size: int = 64,
+        flush_interval: float = 0.25,
+        max_pending: int = 10000,
+    ):
+        """
+        Args:
+            repository: Repository that owns the event table
+            batch_size: Write as soon as this many events are buffered
+            flush_interval: Maximum seconds an event waits before being written
+            max_pending: Queue bound; events beyond it are dropped
+        """
+        self.repository = repository
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self._queue: "queue.Queue[Optional[EventRow]]" = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._batch: List[EventRow] = []
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self.events_submitted = 0
+        self.events_written = 0
+        self.events_dropped = 0
+        self.batches_written = 0
+        self.write_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="InputEventWriter", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        event_type: str,
+        action: str,
+        content: str = "",
+        details: str = "",
+        operate_time: Optional[str] = None,
+    ) -> bool:
+        """Queue one event without blocking. Returns False if it was dropped."""
+        try:
+            self._queue.put_nowait((operate_time, event_type, action, content, details))
+        except queue.Full:
+            self.events_dropped += 1
+            return False
+        self.events_submitted += 1
+        return True
+
+    def flush(self) -> int:
+        """Write everything queued so far; safe to call from any thread."""
+        with self._write_lock:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    self._batch.append(item)
+            if not self._batch:
+                return 0
+            batch, self._batch = self._batch, []
+            try:
+                if self._conn is None:
+                    self.repository.ensure_schema()
+                    self._conn = sqlite3.connect(self.repository.db_path, check_same_thread=False)
+                written = self.repository.insert_events(batch, conn=self._conn)
+            except Exception as e:
+                self.write_errors += 1
+                self.events_dropped += len(batch)
+                print(f"[ERROR] Failed to write {len(batch)} input events: {e}")
+                return 0
+            self.events_written += written
+            self.batches_written += 1
+            return written
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the writer thread after writing pending events."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            try:
+                self._queue.put_nowait(None)  # wake the writer
+            except queue.Full:
+                pass
+            thread.join(timeout=timeout)
+        self._thread = None
+        self.flush()
+        with self._write_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "submitted": self.events_submitted,
+            "written": self.events_written,
+            "dropped": self.events_dropped,
+            "pending": self._queue.qsize() + len(self._batch),
+            "batches": self.batches_written,
+            "write_errors": self.write_errors,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if first is None:
+                break
+            deadline = time.monotonic() + self.flush_interval
+            with self._write_lock:
+                self._batch.append(first)
+            while len(self._batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    break
+                with self._write_lock:
+                    self._batch.append(item)
+            self.flush()
@@ -0,0 +1,182 @@
+"""SQLite repository for tiered-memory state (tier, access stats, decay boundary)."""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .pool import get_pool
+
+
+class MemoryTierRepository:
+    """
+    Encapsulates SQLite access for the tier of each memory.
+
+    Times are stored as epoch seconds. ``next_decay_at`` is the moment the
+    memory's age crosses its current tier boundary, so a decay sweep only
+    has to read rows whose boundary has passed.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+
+    def ensure_schema(self) -> None:
+        with self._connection():
+            pass
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Pooled connection with the schema created (checked once per schema version)."""
+        pool = get_pool(self.db_path)
+        with pool.connection() as conn:
+            pool.schema_cached(conn, "memory_tiers", self._create_schema)
+            yield conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> bool:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS memory_tiers (
+                memory_id TEXT PRIMARY KEY,
+                tier TEXT NOT NULL,
+                importance REAL,
+                created_at REAL NOT NULL,
+                access_count INTEGER NOT NULL DEFAULT 0,
+                last_accessed REAL,
+                next_decay_at REAL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_memory_tiers_tier ON memory_tiers(tier)")
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_tiers_next_decay
+            ON memory_tiers(next_decay_at) WHERE next_decay_at IS NOT NULL
+            """
+        )
+        conn.commit()
+        return True
+
+    def upsert(
+        self,
+        *,
+        memory_id: str,
+        tier: str,
+        importance: Optional[float],
+        created_at: float,
+        next_decay_at: Optional[float],
+    ) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO memory_tiers (
+                    memory_id, tier, importance, created_at,
+                    access_count, last_accessed, next_decay_at
+                ) VALUES (?, ?, ?, ?, 0, ?, ?)
+                ON CONFLICT(memory_id) DO UPDATE SET
+                    tier = excluded.tier,
+                    importance = excluded.importance,
+                    next_decay_at = excluded.next_decay_at
+                """,
+                (memory_id, tier, importance, float(created_at), float(created_at), next_decay_at),
+            )
+            conn.commit()
+
+    def set_tier(self, memory_id: str, tier: str, next_decay_at: Optional[float]) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE memory_tiers SET tier = ?, next_decay_at = ? WHERE memory_id = ?",
+                (tier, next_decay_at, memory_id),
+            )
+            conn.commit()
+
+    def clear_decay(self, memory_ids: Iterable[str]) -> None:
+        """Mark memories as having no pending boundary (e.g. kept after a sweep)."""
+        ids = [(memory_id,) for memory_id in memory_ids]
+        if not ids:
+            return
+        with self._connection() as conn:
+            conn.executemany("UPDATE memory_tiers SET next_decay_at = NULL WHERE memory_id = ?", ids)
+            conn.commit()
+
+    def record_access(self, memory_ids: List[str], accessed_at: float) -> Dict[str, Dict[str, Any]]:
+        """Bump access stats for tracked memories and return their updated state."""
+        ids = list(dict.fromkeys(memory_ids))
+        if not ids:
+            return {}
+        with self._connection() as conn:
+            conn.executemany(
+                """
+                UPDATE memory_tiers
+                SET access_count = access_count + 1, last_accessed = ?
+                WHERE memory_id = ?
+                """,
+                [(float(accessed_at), memory_id) for memory_id in ids],
+            )
+            conn.commit()
+            return self._fetch(conn, ids)
+
+    def get_states(self, memory_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        ids = list(dict.fromkeys(memory_ids))
+        if not ids:
+            return {}
+        with self._connection() as conn:
+            return self._fetch(conn, ids)
+
+    def get_state(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_states([memory_id]).get(memory_id)
+
+    def list_due(
+        self,
+        now: float,
+        *,
+        after: Optional[Tuple[float, str]] = None,
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return memories whose tier boundary has passed, oldest boundary first.
+
+        ``after`` is the ``(next_decay_at, memory_id)`` of the last row of the
+        previous page, so a sweep reads each due row once.
+        """
+        last_at, last_id = after if after is not None else (float("-inf"), "")
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                """
+                SELECT * FROM memory_tiers
+                WHERE next_decay_at IS NOT NULL AND next_decay_at <= ?
+                  AND (next_decay_at > ? OR (next_decay_at = ? AND memory_id > ?))
+                ORDER BY next_decay_at, memory_id
+                LIMIT ?
+                """,
+                (float(now), last_at, last_at, last_id, int(limit)),
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    def tier_counts(self) -> Dict[str, int]:
+        with self._connection() as conn:
+            rows = conn.execute("SELECT tier, COUNT(*) FROM memory_tiers GROUP BY tier").fetchall()
+            return {str(tier): int(count) for tier, count in rows}
+
+    def delete(self, memory_id: str) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM memory_tiers WHERE memory_id = ?", (memory_id,))
+            conn.commit()
+
+    @staticmethod
+    def _fetch(conn: sqlite3.Connection, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        conn.row_factory = sqlite3.Row
+        states: Dict[str, Dict[str, Any]] = {}
+        # Stay well below SQLite's bound-parameter limit.
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT * FROM memory_tiers WHERE memory_id IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            for row in rows:
+                states[row["memory_id"]] = dict(row)
+        return states
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import json
-import os
 import sqlite3
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from .pool import get_pool
 
 
 class MemoryVersionRepository:
@@ -15,43 +17,49 @@ class MemoryVersionRepository:
         self.db_path = str(db_path)
 
     def ensure_schema(self) -> None:
-        db_dir = os.path.dirname(self.db_path)
-        if db_dir:
-            os.makedirs(db_dir, exist_ok=True)
+        with self._connection():
+            pass
 
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS memory_versions (
-                    version_id TEXT PRIMARY KEY,
-                    memory_id TEXT NOT NULL,
-                    content TEXT,
-                    metadata TEXT,
-                    parent_version TEXT,
-                    change_type TEXT DEFAULT 'add',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (parent_version) REFERENCES memory_versions(version_id),
-                    FOREIGN KEY (memory_id) REFERENCES memories(id)
-                )
-                """
-            )
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_memory_id
-                ON memory_versions(memory_id)
-                """
-            )
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_created_at
-                ON memory_versions(created_at DESC)
-                """
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Pooled connection with the schema created (checked once per schema version)."""
+        pool = get_pool(self.db_path)
+        with pool.connection() as conn:
+            pool.schema_cached(conn, "memory_versions", self._create_schema)
+            yield conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> bool:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS memory_versions (
+                version_id TEXT PRIMARY KEY,
+                memory_id TEXT NOT NULL,
+                content TEXT,
+                metadata TEXT,
+                parent_version TEXT,
+                change_type TEXT DEFAULT 'add',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (parent_version) REFERENCES memory_versions(version_id),
+                FOREIGN KEY (memory_id) REFERENCES memories(id)
             )
-            conn.commit()
-        finally:
-            conn.close()
+            """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_id
+            ON memory_versions(memory_id)
+            """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_created_at
+            ON memory_versions(created_at DESC)
+            """
+        )
+        conn.commit()
+        return True
 
     def insert_version(
         self,
@@ -64,10 +72,7 @@ class MemoryVersionRepository:
         change_type: str = "update",
         created_at: Optional[str] = None,
     ) -> str:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        try:
+        with self._connection() as conn:
             conn.execute(
                 """
                 INSERT INTO memory_versions (
@@ -87,18 +92,10 @@ class MemoryVersionRepository:
             )
             conn.commit()
             return version_id
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
 
     def get_version(self, version_id: str) -> Optional[Dict[str, Any]]:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
             row = conn.execute(
                 """
                 SELECT version_id, memory_id, content, metadata,
@@ -111,15 +108,10 @@ class MemoryVersionRepository:
             if row is None:
                 return None
             return self._normalize_row(row)
-        finally:
-            conn.close()
 
     def list_versions(self, memory_id: str, *, limit: int = 50) -> List[Dict[str, Any]]:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 """
                 SELECT version_id, memory_id, content, metadata,
@@ -132,24 +124,14 @@ class MemoryVersionRepository:
                 (memory_id, int(limit)),
             ).fetchall()
             return [self._normalize_row(row) for row in rows]
-        finally:
-            conn.close()
 
     def list_memory_ids(self) -> List[str]:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with self._connection() as conn:
             rows = conn.execute("SELECT DISTINCT memory_id FROM memory_versions").fetchall()
             return [str(row[0]) for row in rows]
-        finally:
-            conn.close()
 
     def get_stats(self) -> Dict[str, Any]:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with self._connection() as conn:
             total_versions = int(
                 (conn.execute("SELECT COUNT(*) FROM memory_versions").fetchone() or [0])[0] or 0
             )
@@ -163,8 +145,6 @@ class MemoryVersionRepository:
                 "total_memories": total_memories,
                 "avg_versions_per_memory": round(avg_versions, 2),
             }
-        finally:
-            conn.close()
 
     @staticmethod
     def _normalize_row(row: sqlite3.Row) -> Dict[str, Any]:
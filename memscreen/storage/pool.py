@@ -0,0 +1,195 @@
+"""Shared SQLite connection pool for the storage repositories."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Applied once per physical connection instead of on every query.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Return SQLite's schema cookie; it changes whenever any DDL runs."""
+    row = conn.execute("PRAGMA schema_version").fetchone()
+    return int((row or [0])[0] or 0)
+
+
+class SQLiteConnectionPool:
+    """
+    Reuses open connections to one SQLite database across repositories.
+
+    Connections are created with WAL and tuned pragmas, checked out with
+    ``connection()`` and returned with any open transaction rolled back and
+    ``row_factory`` reset. If the database file is deleted or replaced the
+    idle connections are discarded on the next checkout. ``schema_cached``
+    memoises schema work (DDL, column introspection) until
+    ``PRAGMA schema_version`` changes.
+    """
+
+    def __init__(self, db_path: str, max_idle: int = 4, timeout: float = 5.0):
+        self.db_path = db_path
+        self.max_idle = max(1, int(max_idle))
+        self.timeout = float(timeout)
+        self._lock = threading.Lock()
+        self._idle: List[Tuple[sqlite3.Connection, int]] = []
+        self._generation = 0
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._schema_cache: Dict[str, Tuple[int, Any]] = {}
+        # Every connection to ":memory:" is a separate database, so share one.
+        self._memory_conn: Optional[sqlite3.Connection] = None
+        self._memory_lock = threading.RLock() if db_path == ":memory:" else None
+        self.connections_created = 0
+        self.checkouts = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection for the duration of the ``with`` block."""
+        if self._memory_lock is not None:
+            with self._memory_lock:
+                if self._memory_conn is None:
+                    self._memory_conn = self._connect()
+                self.checkouts += 1
+                try:
+                    yield self._memory_conn
+                finally:
+                    self._reset(self._memory_conn)
+            return
+
+        conn, generation = self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            self._release(conn, generation, healthy=False)
+            raise
+        self._release(conn, generation, healthy=True)
+
+    def schema_cached(self, conn: sqlite3.Connection, key: str, build: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Return ``build(conn)``, recomputed only after the schema changes."""
+        version = schema_version(conn)
+        with self._lock:
+            hit = self._schema_cache.get(key)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        value = build(conn)
+        version = schema_version(conn)
+        with self._lock:
+            self._schema_cache[key] = (version, value)
+        return value
+
+    def close(self) -> None:
+        """Close idle connections; checked-out ones are closed on return."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._generation += 1
+            self._schema_cache.clear()
+        for conn, _ in idle:
+            conn.close()
+        if self._memory_lock is not None:
+            with self._memory_lock:
+                if self._memory_conn is not None:
+                    self._memory_conn.close()
+                    self._memory_conn = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "created": self.connections_created,
+                "checkouts": self.checkouts,
+            }
+
+    def _acquire(self) -> Tuple[sqlite3.Connection, int]:
+        file_id = self._file_identity()
+        stale: List[Tuple[sqlite3.Connection, int]] = []
+        conn: Optional[sqlite3.Connection] = None
+        with self._lock:
+            if self._file_id is not None and file_id != self._file_id:
+                stale, self._idle = self._idle, []
+                self._generation += 1
+                self._schema_cache.clear()
+                self._file_id = None
+            if self._idle:
+                conn, generation = self._idle.pop()
+            else:
+                generation = self._generation
+            self.checkouts += 1
+        for old, _ in stale:
+            old.close()
+        if conn is None:
+            conn = self._connect()
+            with self._lock:
+                if self._file_id is None:
+                    self._file_id = self._file_identity()
+        return conn, generation
+
+    def _release(self, conn: sqlite3.Connection, generation: int, *, healthy: bool) -> None:
+        try:
+            self._reset(conn)
+        except sqlite3.Error:
+            healthy = False
+        with self._lock:
+            keep = healthy and generation == self._generation and len(self._idle) < self.max_idle
+            if keep:
+                self._idle.append((conn, generation))
+        if not keep:
+            conn.close()
+
+    @staticmethod
+    def _reset(conn: sqlite3.Connection) -> None:
+        conn.row_factory = None
+        if conn.in_transaction:
+            conn.rollback()
+
+    def _connect(self) -> sqlite3.Connection:
+        db_dir = os.path.dirname(self.db_path) if self._memory_lock is None else ""
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self.connections_created += 1
+        return conn
+
+    def _file_identity(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        return st.st_dev, st.st_ino
+
+
+_POOLS: Dict[str, SQLiteConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(db_path: str) -> SQLiteConnectionPool:
+    """Return the process-wide pool for ``db_path``."""
+    key = db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    pool = _POOLS.get(key)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(key)
+            if pool is None:
+                pool = SQLiteConnectionPool(key)
+                _POOLS[key] = pool
+    return pool
+
+
+def close_pools() -> None:
+    """Close every pooled connection (e.g. before deleting database files)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
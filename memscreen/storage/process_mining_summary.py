@@ -0,0 +1,164 @@
+"""SQLite repository for incremental process-mining summaries."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .pool import get_pool
+
+NGRAM_SEPARATOR = "\x1f"
+
+
+class ProcessMiningSummaryRepository:
+    """
+    Persists running process-mining aggregates next to the input event log.
+
+    Counters are stored in small keyed tables and the miner's cursor/state in
+    ``pm_state``. ``apply_batch`` updates both in one transaction so the
+    summaries never drift from the ``since_id`` cursor.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+    def ensure_schema(self) -> None:
+        with self._connection():
+            pass
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Pooled connection with the schema created (checked once per schema version)."""
+        pool = get_pool(self.db_path)
+        with pool.connection() as conn:
+            pool.schema_cached(conn, "process_mining_summary", self._create_schema)
+            yield conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> bool:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pm_activity_counts (
+                activity TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS pm_ngram_counts (
+                ngram TEXT PRIMARY KEY,
+                length INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS pm_hour_counts (
+                hour INTEGER PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS pm_weekday_counts (
+                day TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS pm_cases (
+                case_id TEXT PRIMARY KEY
+            );
+            CREATE TABLE IF NOT EXISTS pm_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            """
+        )
+        conn.commit()
+        return True
+
+    def load_state(self) -> Dict[str, Any]:
+        with self._connection() as conn:
+            row = conn.execute("SELECT value FROM pm_state WHERE key = 'miner'").fetchone()
+        if not row or not row[0]:
+            return {}
+        try:
+            return json.loads(row[0])
+        except (TypeError, ValueError):
+            return {}
+
+    def apply_batch(
+        self,
+        *,
+        state: Mapping[str, Any],
+        activities: Mapping[str, int],
+        ngrams: Mapping[Tuple[str, ...], int],
+        hours: Mapping[int, int],
+        weekdays: Mapping[str, int],
+        cases: List[str],
+    ) -> None:
+        """Add counter deltas and store the new miner state atomically."""
+        with self._connection() as conn:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO pm_activity_counts (activity, count) VALUES (?, ?) "
+                    "ON CONFLICT(activity) DO UPDATE SET count = count + excluded.count",
+                    list(activities.items()),
+                )
+                conn.executemany(
+                    "INSERT INTO pm_ngram_counts (ngram, length, count) VALUES (?, ?, ?) "
+                    "ON CONFLICT(ngram) DO UPDATE SET count = count + excluded.count",
+                    [(NGRAM_SEPARATOR.join(gram), len(gram), count) for gram, count in ngrams.items()],
+                )
+                conn.executemany(
+                    "INSERT INTO pm_hour_counts (hour, count) VALUES (?, ?) "
+                    "ON CONFLICT(hour) DO UPDATE SET count = count + excluded.count",
+                    list(hours.items()),
+                )
+                conn.executemany(
+                    "INSERT INTO pm_weekday_counts (day, count) VALUES (?, ?) "
+                    "ON CONFLICT(day) DO UPDATE SET count = count + excluded.count",
+                    list(weekdays.items()),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO pm_cases (case_id) VALUES (?)",
+                    [(case_id,) for case_id in cases],
+                )
+                conn.execute(
+                    "INSERT INTO pm_state (key, value) VALUES ('miner', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (json.dumps(dict(state), ensure_ascii=False),),
+                )
+
+    def reset(self) -> None:
+        """Drop all summaries so the next update rebuilds them from the log."""
+        with self._connection() as conn:
+            with conn:
+                for table in (
+                    "pm_activity_counts",
+                    "pm_ngram_counts",
+                    "pm_hour_counts",
+                    "pm_weekday_counts",
+                    "pm_cases",
+                    "pm_state",
+                ):
+                    conn.execute(f"DELETE FROM {table}")
+
+    def activity_counts(self) -> Dict[str, int]:
+        return dict(self._fetch("SELECT activity, count FROM pm_activity_counts"))
+
+    def ngram_counts(self, *, min_count: int = 1, length: Optional[int] = None) -> List[Tuple[List[str], int]]:
+        """Return (ngram, count) pairs ordered by count descending."""
+        query = "SELECT ngram, count FROM pm_ngram_counts WHERE count >= ?"
+        params: List[Any] = [int(min_count)]
+        if length is not None:
+            query += " AND length = ?"
+            params.append(int(length))
+        query += " ORDER BY count DESC, rowid ASC"
+        return [(ngram.split(NGRAM_SEPARATOR), int(count)) for ngram, count in self._fetch(query, params)]
+
+    def hour_counts(self) -> Dict[int, int]:
+        return {int(hour): int(count) for hour, count in self._fetch("SELECT hour, count FROM pm_hour_counts")}
+
+    def weekday_counts(self) -> Dict[str, int]:
+        return dict(self._fetch("SELECT day, count FROM pm_weekday_counts"))
+
+    def case_count(self) -> int:
+        rows = self._fetch("SELECT COUNT(*) FROM pm_cases")
+        return int(rows[0][0] if rows else 0)
+
+    def _fetch(self, query: str, params: Optional[List[Any]] = None) -> List[Tuple[Any, ...]]:
+        with self._connection() as conn:
+            return conn.execute(query, params or []).fetchall()
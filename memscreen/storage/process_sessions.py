@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import json
-import os
 import sqlite3
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from .pool import get_pool
 
 
 class ProcessSessionRepository:
@@ -15,28 +17,34 @@ class ProcessSessionRepository:
         self.db_path = db_path
 
     def ensure_schema(self) -> None:
-        db_dir = os.path.dirname(self.db_path)
-        if db_dir:
-            os.makedirs(db_dir, exist_ok=True)
+        with self._connection():
+            pass
 
-        conn = sqlite3.connect(self.db_path)
-        try:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    start_time TEXT,
-                    end_time TEXT,
-                    event_count INTEGER,
-                    keystrokes INTEGER,
-                    clicks INTEGER,
-                    events_json TEXT
-                )
-                """
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Pooled connection with the schema created (checked once per schema version)."""
+        pool = get_pool(self.db_path)
+        with pool.connection() as conn:
+            pool.schema_cached(conn, "process_sessions", self._create_schema)
+            yield conn
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> bool:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                start_time TEXT,
+                end_time TEXT,
+                event_count INTEGER,
+                keystrokes INTEGER,
+                clicks INTEGER,
+                events_json TEXT
             )
-            conn.commit()
-        finally:
-            conn.close()
+            """
+        )
+        conn.commit()
+        return True
 
     def insert_session(
         self,
@@ -45,12 +53,10 @@ class ProcessSessionRepository:
         start_time: str,
         end_time: str,
     ) -> int:
-        self.ensure_schema()
         keystrokes = sum(1 for event in events if event.get("type") == "keypress")
         clicks = sum(1 for event in events if event.get("type") == "click")
 
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        try:
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -68,8 +74,6 @@ class ProcessSessionRepository:
             )
             conn.commit()
             return int(cursor.lastrowid or 0)
-        finally:
-            conn.close()
 
     def list_sessions(
         self,
@@ -77,11 +81,8 @@ class ProcessSessionRepository:
         limit: int = 20,
         include_events: bool = False,
     ) -> List[Dict[str, Any]]:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
             columns = ["id", "start_time", "end_time", "event_count", "keystrokes", "clicks"]
             if include_events:
                 columns.append("events_json")
@@ -90,8 +91,6 @@ class ProcessSessionRepository:
                 (int(limit),),
             ).fetchall()
             return [self._normalize_row(row, include_events=include_events) for row in rows]
-        finally:
-            conn.close()
 
     def get_session(
         self,
@@ -99,11 +98,8 @@ class ProcessSessionRepository:
         *,
         include_events: bool = False,
     ) -> Optional[Dict[str, Any]]:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        with self._connection() as conn:
+            conn.row_factory = sqlite3.Row
             columns = ["id", "start_time", "end_time", "event_count", "keystrokes", "clicks"]
             if include_events:
                 columns.append("events_json")
@@ -114,33 +110,21 @@ class ProcessSessionRepository:
             if row is None:
                 return None
             return self._normalize_row(row, include_events=include_events)
-        finally:
-            conn.close()
 
     def delete_session(self, session_id: int) -> int:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with self._connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM sessions WHERE id = ?", (int(session_id),))
             conn.commit()
             return int(cursor.rowcount or 0)
-        finally:
-            conn.close()
 
     def delete_all_sessions(self) -> int:
-        self.ensure_schema()
-
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with self._connection() as conn:
             cursor = conn.cursor()
             count_row = cursor.execute("SELECT COUNT(*) FROM sessions").fetchone()
             cursor.execute("DELETE FROM sessions")
             conn.commit()
             return int((count_row or [0])[0] or 0)
-        finally:
-            conn.close()
 
     def _normalize_row(self, row: sqlite3.Row, *, include_events: bool) -> Dict[str, Any]:
         data = {
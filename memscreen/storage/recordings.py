@@ -14,6 +14,8 @@ import sqlite3
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
+from .pool import get_pool
+
 
 class RecordingMetadataRepository:
     """Encapsulates SQLite access for recording metadata."""
@@ -34,6 +36,7 @@ class RecordingMetadataRepository:
         "analysis_status",
         "audio_file",
         "audio_source",
+        "repeat_markers",
     )
 
     _column_defaults = {
@@ -52,87 +55,88 @@ class RecordingMetadataRepository:
         "analysis_status": "pending",
         "audio_file": None,
         "audio_source": None,
+        "repeat_markers": None,
     }
 
     def __init__(self, db_path: str):
         self.db_path = db_path
 
     def ensure_schema(self) -> None:
-        db_dir = os.path.dirname(self.db_path)
-        if db_dir:
-            os.makedirs(db_dir, exist_ok=True)
-
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS recordings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    filename TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    frame_count INTEGER,
-                    fps REAL,
-                    duration REAL,
-                    file_size INTEGER,
-                    recording_mode TEXT DEFAULT 'fullscreen',
-                    region_bbox TEXT,
-                    window_title TEXT,
-                    content_tags TEXT,
-                    content_keywords TEXT,
-                    content_summary TEXT,
-                    analysis_status TEXT,
-                    audio_file TEXT,
-                    audio_source TEXT
-                )
-                """
-            )
+        pool = get_pool(self.db_path)
+        with pool.connection() as conn:
+            pool.schema_cached(conn, "recordings", self._create_recordings_schema)
 
-            for statement in (
-                "ALTER TABLE recordings ADD COLUMN recording_mode TEXT DEFAULT 'fullscreen'",
-                "ALTER TABLE recordings ADD COLUMN region_bbox TEXT",
-                "ALTER TABLE recordings ADD COLUMN window_title TEXT",
-                "ALTER TABLE recordings ADD COLUMN content_tags TEXT",
-                "ALTER TABLE recordings ADD COLUMN content_summary TEXT",
-                "ALTER TABLE recordings ADD COLUMN content_keywords TEXT",
-                "ALTER TABLE recordings ADD COLUMN analysis_status TEXT",
-                "ALTER TABLE recordings ADD COLUMN audio_file TEXT",
-                "ALTER TABLE recordings ADD COLUMN audio_source TEXT",
-            ):
-                try:
-                    cursor.execute(statement)
-                except sqlite3.OperationalError:
-                    pass
+    def ensure_saved_regions_schema(self) -> None:
+        pool = get_pool(self.db_path)
+        with pool.connection() as conn:
+            pool.schema_cached(conn, "saved_regions", self._create_saved_regions_schema)
 
-            conn.commit()
-        finally:
-            conn.close()
+    @staticmethod
+    def _create_recordings_schema(conn: sqlite3.Connection) -> bool:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS recordings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                filename TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                frame_count INTEGER,
+                fps REAL,
+                duration REAL,
+                file_size INTEGER,
+                recording_mode TEXT DEFAULT 'fullscreen',
+                region_bbox TEXT,
+                window_title TEXT,
+                content_tags TEXT,
+                content_keywords TEXT,
+                content_summary TEXT,
+                analysis_status TEXT,
+                audio_file TEXT,
+                audio_source TEXT,
+                repeat_markers TEXT
+            )
+            """
+        )
 
-    def ensure_saved_regions_schema(self) -> None:
-        db_dir = os.path.dirname(self.db_path)
-        if db_dir:
-            os.makedirs(db_dir, exist_ok=True)
+        for statement in (
+            "ALTER TABLE recordings ADD COLUMN recording_mode TEXT DEFAULT 'fullscreen'",
+            "ALTER TABLE recordings ADD COLUMN region_bbox TEXT",
+            "ALTER TABLE recordings ADD COLUMN window_title TEXT",
+            "ALTER TABLE recordings ADD COLUMN content_tags TEXT",
+            "ALTER TABLE recordings ADD COLUMN content_summary TEXT",
+            "ALTER TABLE recordings ADD COLUMN content_keywords TEXT",
+            "ALTER TABLE recordings ADD COLUMN analysis_status TEXT",
+            "ALTER TABLE recordings ADD COLUMN audio_file TEXT",
+            "ALTER TABLE recordings ADD COLUMN audio_source TEXT",
+            "ALTER TABLE recordings ADD COLUMN repeat_markers TEXT",
+        ):
+            try:
+                cursor.execute(statement)
+            except sqlite3.OperationalError:
+                pass
+
+        conn.commit()
+        return True
 
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS saved_regions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    region_type TEXT NOT NULL,
-                    bbox TEXT NOT NULL,
-                    window_title TEXT,
-                    window_app TEXT,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    last_used DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+    @staticmethod
+    def _create_saved_regions_schema(conn: sqlite3.Connection) -> bool:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS saved_regions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                region_type TEXT NOT NULL,
+                bbox TEXT NOT NULL,
+                window_title TEXT,
+                window_app TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_used DATETIME DEFAULT CURRENT_TIMESTAMP
             )
-            conn.commit()
-        finally:
-            conn.close()
+            """
+        )
+        conn.commit()
+        return True
 
     def list_recordings(
         self,
@@ -145,13 +149,11 @@ class RecordingMetadataRepository:
         if not os.path.exists(self.db_path):
             return []
 
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            if not self._table_exists(conn, "recordings"):
-                return []
-
+        with get_pool(self.db_path).connection() as conn:
+            conn.row_factory = sqlite3.Row
             selected_columns = self._selected_columns(conn)
+            if not selected_columns:
+                return []
             order_clause = "timestamp DESC" if order != "rowid_desc" else "rowid DESC"
             query = f"SELECT {', '.join(selected_columns)} FROM recordings ORDER BY {order_clause}"
             params: List[Any] = []
@@ -181,20 +183,16 @@ class RecordingMetadataRepository:
                     rows = filtered_rows
 
             return rows
-        finally:
-            conn.close()
 
     def get_recording(self, filename: str) -> Optional[Dict[str, Any]]:
         if not os.path.exists(self.db_path):
             return None
 
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            if not self._table_exists(conn, "recordings"):
-                return None
-
+        with get_pool(self.db_path).connection() as conn:
+            conn.row_factory = sqlite3.Row
             selected_columns = self._selected_columns(conn)
+            if not selected_columns:
+                return None
             row = conn.execute(
                 f"SELECT {', '.join(selected_columns)} FROM recordings WHERE filename = ? ORDER BY rowid DESC LIMIT 1",
                 (filename,),
@@ -202,8 +200,6 @@ class RecordingMetadataRepository:
             if not row:
                 return None
             return self._normalize_row(row)
-        finally:
-            conn.close()
 
     def get_recording_metrics(self, filename: str) -> Tuple[int, float, str, float]:
         row = self.get_recording(filename)
@@ -233,22 +229,22 @@ class RecordingMetadataRepository:
         analysis_status: str = "pending",
         audio_file: Optional[str] = None,
         audio_source: Optional[str] = None,
+        repeat_markers: Optional[str] = None,
         timestamp: Optional[str] = None,
     ) -> int:
         self.ensure_schema()
         insert_timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        try:
+        with get_pool(self.db_path).connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
                 INSERT INTO recordings (
                     filename, timestamp, frame_count, fps, duration, file_size,
                     recording_mode, region_bbox, window_title, content_tags, content_keywords,
-                    content_summary, analysis_status, audio_file, audio_source
+                    content_summary, analysis_status, audio_file, audio_source, repeat_markers
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     filename,
@@ -266,12 +262,11 @@ class RecordingMetadataRepository:
                     analysis_status,
                     audio_file,
                     audio_source,
+                    repeat_markers,
                 ),
             )
             conn.commit()
             return int(cursor.lastrowid or 0)
-        finally:
-            conn.close()
 
     def update_content_metadata(
         self,
@@ -285,8 +280,7 @@ class RecordingMetadataRepository:
         if not os.path.exists(self.db_path):
             return 0
 
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        try:
+        with get_pool(self.db_path).connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -304,23 +298,24 @@ class RecordingMetadataRepository:
             )
             conn.commit()
             return int(cursor.rowcount or 0)
-        finally:
-            conn.close()
 
     def delete_recording(self, filename: str) -> int:
         if not os.path.exists(self.db_path):
             return 0
 
-        conn = sqlite3.connect(self.db_path)
-        try:
+        with get_pool(self.db_path).connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM recordings WHERE filename = ?", (filename,))
             conn.commit()
             return int(cursor.rowcount or 0)
-        finally:
-            conn.close()
 
     def _selected_columns(self, conn: sqlite3.Connection) -> List[str]:
+        """Known columns present in ``recordings`` (empty if the table is missing)."""
+        return get_pool(self.db_path).schema_cached(conn, "recordings.columns", self._introspect_columns)
+
+    def _introspect_columns(self, conn: sqlite3.Connection) -> List[str]:
+        if not self._table_exists(conn, "recordings"):
+            return []
         available = self._table_columns(conn, "recordings")
         return [column for column in self._recording_columns if column in available]
 
@@ -4,10 +4,12 @@
 ### time: 2026-02-01             ###
 ### license: MIT                 ###
 
+import atexit
 import logging
 import sqlite3
 import threading
 import uuid
+import weakref
 from typing import Any, Dict, List, Optional
 from collections import deque
 import time
@@ -15,10 +17,54 @@ import time
 logger = logging.getLogger(__name__)
 
 
+_HISTORY_INSERT_SQL = """
+    INSERT INTO history (
+        id, memory_id, old_memory, new_memory, event,
+        created_at, updated_at, is_deleted, actor_id, role
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Operations the batch writer knows how to replay: name -> parameterised SQL.
+HISTORY_OPERATIONS: Dict[str, str] = {
+    "add_history": _HISTORY_INSERT_SQL,
+}
+
+# Seconds a history read waits for queued writes before reading what is committed.
+READ_BARRIER_TIMEOUT = 2.0
+
+_LIVE_WRITERS: "weakref.WeakSet[BatchWriter]" = weakref.WeakSet()
+
+
+def _flush_live_writers() -> None:
+    """atexit hook: make every queued history write durable before exit."""
+    for writer in list(_LIVE_WRITERS):
+        try:
+            writer.close()
+        except Exception as e:
+            logger.error(f"Failed to flush history writes at exit: {e}")
+
+
+atexit.register(_flush_live_writers)
+
+
 class BatchWriter:
-    """Batch writer for SQLite operations to improve performance."""
+    """
+    Write-behind queue for SQLite history operations.
+
+    Callers enqueue named operations (see ``HISTORY_OPERATIONS``) and return
+    immediately. A daemon thread commits the queue in one transaction as soon
+    as ``batch_size`` operations are pending or the oldest one has waited
+    ``flush_interval`` seconds. ``flush()`` writes everything queued so far
+    from the calling thread and ``wait_durable()`` blocks until it has been
+    committed. When a batch fails it is retried operation by operation, so
+    one bad operation cannot hold back the others; an operation that keeps
+    failing while others succeed is dropped after ``max_retries`` attempts.
+    Operations that fail together (e.g. a locked database) stay queued.
+    Pending writes are flushed on ``close()`` and at interpreter exit.
+    """
 
-    def __init__(self, db_manager, batch_size=50, flush_interval=1.0):
+    def __init__(self, db_manager, batch_size=50, flush_interval=1.0, operations=None, max_retries=3):
         """
         Initialize batch writer.
 
@@ -26,58 +72,273 @@ class BatchWriter:
             db_manager: SQLiteManager instance
             batch_size: Number of operations to batch before auto-flush
             flush_interval: Maximum time in seconds before auto-flush
+            operations: Extra ``name -> SQL`` operations to accept
+            max_retries: Failed attempts before an isolated failing operation is dropped
         """
         self.db_manager = db_manager
-        self.batch_size = batch_size
-        self.flush_interval = flush_interval
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.max_retries = max(1, int(max_retries))
+        self.operations = dict(HISTORY_OPERATIONS)
+        self.operations.update(operations or {})
         self.queue = deque()
         self.last_flush = time.time()
-        self._lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._oldest_enqueued: Optional[float] = None
+        self._enqueued = 0
+        self._durable = 0
+        self._closed = False
+        self._flush_requested = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.max_queue_depth = 0
+        self.batches_written = 0
+        self.operations_written = 0
+        self.flush_errors = 0
+        self.operations_dropped = 0
+        self.last_error: Optional[str] = None
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self._total_flush_latency = 0.0
+
+        _LIVE_WRITERS.add(self)
+        self._start()
+
+    def register_operation(self, name: str, sql: str) -> None:
+        """Allow ``add(name, *params)`` to queue ``sql`` with positional params."""
+        self.operations[name] = sql
 
     def add(self, operation, *args, **kwargs):
         """Add operation to batch queue."""
-        with self._lock:
-            self.queue.append((operation, args, kwargs))
-            # Auto-flush if batch size reached
-            if len(self.queue) >= self.batch_size:
-                self.flush()
+        if operation not in self.operations:
+            raise ValueError(f"Unknown batch operation: {operation}")
+        if kwargs:
+            raise TypeError("Batch operations take positional parameters only")
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchWriter is closed")
+            if not self.queue:
+                self._oldest_enqueued = time.monotonic()
+            self.queue.append((operation, args, 0))
+            self._enqueued += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+            if len(self.queue) == 1 or len(self.queue) >= self.batch_size:
+                self._cond.notify_all()
 
     def flush(self):
-        """Flush all queued operations to database."""
-        if not self.queue:
-            return
-
-        with self._lock:
-            with self.db_manager._lock:
-                try:
-                    self.db_manager.connection.execute("BEGIN")
-                    cur = self.db_manager.connection.cursor()
-
-                    for operation, args, kwargs in self.queue:
-                        if operation == "add_history":
-                            cur.execute(
-                                """
-                                INSERT INTO history (
-                                    id, memory_id, old_memory, new_memory, event,
-                                    created_at, updated_at, is_deleted, actor_id, role
-                                )
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                """,
-                                args
-                            )
-
-                    self.db_manager.connection.execute("COMMIT")
-                    self.queue.clear()
-                    self.last_flush = time.time()
-
-                except Exception as e:
-                    self.db_manager.connection.execute("ROLLBACK")
-                    logger.error(f"Batch flush failed: {e}")
+        """Commit all queued operations now. Returns the number written."""
+        with self._flush_lock:
+            with self._cond:
+                if not self.queue:
+                    return 0
+                batch = list(self.queue)
+                self.queue.clear()
+                self._oldest_enqueued = None
+
+            started = time.perf_counter()
+            try:
+                self._write(batch)
+            except Exception as e:
+                if len(batch) == 1 and not self._single_failure_counts(e):
+                    self._requeue(batch, e)
                     raise
+                logger.warning(f"Batch flush failed, retrying {len(batch)} operations one by one: {e}")
+                return self._flush_isolated(batch, started)
+
+            self._record_written(len(batch), 0, started)
+            return len(batch)
+
+    def _flush_isolated(self, batch, started: float) -> int:
+        """Write each operation in its own transaction; requeue or drop the failures."""
+        written = 0
+        failures = []
+        for item in batch:
+            try:
+                self._write([item])
+                written += 1
+            except Exception as e:
+                failures.append((item, e))
+
+        retry = []
+        dropped = 0
+        for (operation, args, attempts), error in failures:
+            # Failures are only charged to an operation when they are its own:
+            # others in the same pass went through, or the error is not transient.
+            if written or self._single_failure_counts(error):
+                attempts += 1
+            if attempts >= self.max_retries:
+                dropped += 1
+                logger.error(f"Dropping history operation {operation!r} after {attempts} failed attempts: {error}")
+            else:
+                retry.append((operation, args, attempts))
+
+        self._record_written(written, dropped, started)
+        if retry:
+            self._requeue(retry, failures[-1][1])
+            raise failures[-1][1]
+        return written
+
+    @staticmethod
+    def _single_failure_counts(error: Exception) -> bool:
+        # OperationalError covers locks, busy timeouts and missing tables,
+        # which can clear up; anything else will fail the same way again.
+        return not isinstance(error, sqlite3.OperationalError)
+
+    def _requeue(self, items, error: Exception) -> None:
+        with self._cond:
+            self.queue.extendleft(reversed(items))
+            self._oldest_enqueued = time.monotonic()
+            self.flush_errors += 1
+            self.last_error = str(error)
+        logger.error(f"Batch flush failed ({len(items)} operations kept for retry): {error}")
+
+    def _record_written(self, written: int, dropped: int, started: float) -> None:
+        latency = time.perf_counter() - started
+        with self._cond:
+            self._durable += written + dropped
+            self.operations_dropped += dropped
+            if written:
+                self.batches_written += 1
+                self.operations_written += written
+            self.last_flush = time.time()
+            self.last_flush_latency = latency
+            self.max_flush_latency = max(self.max_flush_latency, latency)
+            self._total_flush_latency += latency
+            self._cond.notify_all()
+
+    def wait_durable(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every operation queued before this call is committed
+        (or dropped after repeated failures).
+
+        Returns False if ``timeout`` elapsed first. Without a running writer
+        thread the queue is flushed from the calling thread, and False is
+        returned if that flush fails.
+        """
+        with self._cond:
+            target = self._enqueued
+            if self._durable >= target:
+                return True
+            running = self._thread is not None and self._thread.is_alive()
+            if running:
+                self._flush_requested = True
+                self._cond.notify_all()
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while self._durable < target:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining if remaining is not None else self.flush_interval)
+                    if self._thread is None or not self._thread.is_alive():
+                        break
+                if self._durable >= target:
+                    return True
+        try:
+            self.flush()
+        except Exception:
+            return False
+        return self._durable >= target
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the writer thread and flush anything still queued."""
+        with self._cond:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        if getattr(self.db_manager, "connection", None) is not None:
+            self.flush()
+        elif self.queue:
+            logger.error(f"Dropping {len(self.queue)} history writes: SQLite connection already closed")
+        _LIVE_WRITERS.discard(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and flush latency counters."""
+        with self._cond:
+            batches = self.batches_written
+            return {
+                "queue_depth": len(self.queue),
+                "max_queue_depth": self.max_queue_depth,
+                "enqueued": self._enqueued,
+                "written": self.operations_written,
+                "batches": batches,
+                "flush_errors": self.flush_errors,
+                "dropped": self.operations_dropped,
+                "last_error": self.last_error,
+                "last_flush_ms": self.last_flush_latency * 1000.0,
+                "avg_flush_ms": (self._total_flush_latency / batches * 1000.0) if batches else 0.0,
+                "max_flush_ms": self.max_flush_latency * 1000.0,
+            }
+
+    def _start(self) -> None:
+        # The thread only holds a weak reference between batches so an
+        # abandoned manager can still be garbage collected (and flushed).
+        self._thread = threading.Thread(
+            target=BatchWriter._run, args=(weakref.ref(self),), name="SQLiteBatchWriter", daemon=True
+        )
+        self._thread.start()
+
+    def _due(self) -> bool:
+        if self._flush_requested:
+            return True
+        if not self.queue:
+            return False
+        if len(self.queue) >= self.batch_size:
+            return True
+        return time.monotonic() - (self._oldest_enqueued or 0.0) >= self.flush_interval
+
+    @staticmethod
+    def _run(ref) -> None:
+        while True:
+            writer = ref()
+            if writer is None or not writer._step():
+                return
+            del writer
+
+    def _step(self) -> bool:
+        """Wait for the next due batch and write it. Returns False to stop."""
+        with self._cond:
+            if not self._closed and not self._due():
+                if self.queue:
+                    waited = time.monotonic() - (self._oldest_enqueued or 0.0)
+                    self._cond.wait(max(0.0, self.flush_interval - waited))
+                else:
+                    self._cond.wait(max(1.0, self.flush_interval))
+            if self._closed:
+                return False
+            if not self._due():
+                return True
+            self._flush_requested = False
+        try:
+            self.flush()
+        except Exception:
+            # Kept queued; back off for one interval before retrying.
+            time.sleep(self.flush_interval)
+        return True
+
+    def _write(self, batch) -> None:
+        manager = self.db_manager
+        with manager._lock:
+            if manager.connection is None:
+                raise RuntimeError("SQLite connection is closed")
+            try:
+                manager.connection.execute("BEGIN")
+                cur = manager.connection.cursor()
+                for operation, args, _attempts in batch:
+                    cur.execute(self.operations[operation], args)
+                manager.connection.execute("COMMIT")
+            except Exception:
+                manager.connection.execute("ROLLBACK")
+                raise
 
     def __del__(self):
         """Ensure pending operations are flushed."""
-        self.flush()
+        try:
+            self.close(timeout=0)
+        except Exception:
+            pass
 
 
 class SQLiteManager:
@@ -320,6 +581,9 @@ class SQLiteManager:
         Returns:
             List of dictionaries containing history records, sorted by created_at and updated_at
         """
+        # Read-your-writes: queued history rows should be visible to the caller,
+        # but a stuck write must not block readers indefinitely.
+        self._read_barrier()
         with self._lock:
             cur = self.connection.execute(
                 """
@@ -351,6 +615,7 @@ class SQLiteManager:
 
     def reset(self) -> None:
         """Drop and recreate the history table."""
+        self._read_barrier()
         with self._lock:
             try:
                 self.connection.execute("BEGIN")
@@ -362,13 +627,42 @@ class SQLiteManager:
                 logger.error(f"Failed to reset history table: {e}")
                 raise
 
+    def flush(self) -> int:
+        """Commit queued history writes now. Returns the number written."""
+        if self.enable_batch_writing and hasattr(self, 'batch_writer'):
+            return self.batch_writer.flush()
+        return 0
+
+    def wait_durable(self, timeout: Optional[float] = None) -> bool:
+        """Block until history writes queued so far are committed."""
+        if self.enable_batch_writing and hasattr(self, 'batch_writer'):
+            return self.batch_writer.wait_durable(timeout)
+        return True
+
+    def _read_barrier(self) -> bool:
+        """Wait up to ``READ_BARRIER_TIMEOUT`` for queued writes; log if they are not durable."""
+        if self.wait_durable(timeout=READ_BARRIER_TIMEOUT):
+            return True
+        stats = self.get_batch_stats()
+        logger.warning(
+            f"Reading history with {stats.get('queue_depth', 0)} writes still queued "
+            f"(last error: {stats.get('last_error')})"
+        )
+        return False
+
+    def get_batch_stats(self) -> Dict[str, Any]:
+        """Return batch writer metrics (empty when batch writing is disabled)."""
+        if self.enable_batch_writing and hasattr(self, 'batch_writer'):
+            return self.batch_writer.stats()
+        return {}
+
     def close(self) -> None:
         """Close the database connection."""
-        # OPTIMIZATION: Flush any pending batch operations before closing
-        if self.enable_batch_writing and hasattr(self, 'batch_writer'):
-            self.batch_writer.flush()
+        # Flush any pending batch operations and stop the writer before closing
+        if getattr(self, 'enable_batch_writing', False) and hasattr(self, 'batch_writer'):
+            self.batch_writer.close()
 
-        if self.connection:
+        if getattr(self, 'connection', None):
             self.connection.close()
             self.connection = None
 
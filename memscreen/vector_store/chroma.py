@@ -5,7 +5,7 @@
 ### license: MIT                 ###
 
 import logging
-from typing import Dict, List, Optional, Literal, ClassVar, Any
+from typing import Dict, Iterator, List, Optional, Literal, ClassVar, Any
 from abc import ABC, abstractmethod
 
 from pydantic import BaseModel, model_validator, Field
@@ -210,6 +210,67 @@ class ChromaDB(VectorStoreBase):
         final_results = self._parse_output(results)
         return final_results
 
+    def search_batch(
+        self, vectors: List[list], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[List[OutputData]]:
+        """
+        Search for several query vectors in a single collection query.
+
+        Args:
+            vectors (List[list]): Query vectors.
+            limit (int, optional): Number of results per query. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            List[List[OutputData]]: One result list per query vector, in input order.
+        """
+        if not vectors:
+            return []
+        where_clause = self._generate_where_clause(filters) if filters else None
+        results = self.collection.query(query_embeddings=vectors, where=where_clause, n_results=limit)
+        ids = results.get("ids") or []
+        distances = results.get("distances") or []
+        metadatas = results.get("metadatas") or []
+
+        batches = []
+        for i in range(len(vectors)):
+            query_ids = ids[i] if i < len(ids) else []
+            query_distances = distances[i] if i < len(distances) and distances[i] is not None else []
+            query_metadatas = metadatas[i] if i < len(metadatas) and metadatas[i] is not None else []
+            batches.append([
+                OutputData(
+                    id=vector_id,
+                    score=query_distances[j] if j < len(query_distances) else None,
+                    payload=query_metadatas[j] if j < len(query_metadatas) else None,
+                )
+                for j, vector_id in enumerate(query_ids)
+            ])
+        return batches
+
+    def get_many(self, vector_ids: List[str]) -> Dict[str, OutputData]:
+        """
+        Retrieve several vectors by ID in one call.
+
+        Args:
+            vector_ids (List[str]): IDs to retrieve; unknown IDs are skipped.
+
+        Returns:
+            Dict[str, OutputData]: Retrieved entries keyed by ID.
+        """
+        if not vector_ids:
+            return {}
+        result = self.collection.get(ids=list(vector_ids), include=["metadatas"])
+        ids = result.get("ids") or []
+        metadatas = result.get("metadatas") or []
+        return {
+            vector_id: OutputData(
+                id=vector_id,
+                score=None,
+                payload=metadatas[i] if i < len(metadatas) else None,
+            )
+            for i, vector_id in enumerate(ids)
+        }
+
     def delete(self, vector_id: str):
         """
         Delete a vector by ID.
@@ -257,6 +318,82 @@ class ChromaDB(VectorStoreBase):
         """
         return self.client.list_collections()
 
+    def get_col_metadata(self) -> Dict:
+        """
+        Get the collection-level metadata.
+
+        Returns:
+            Dict: Collection metadata (empty if none was set).
+        """
+        return dict(self.collection.metadata or {})
+
+    def set_col_metadata(self, **values) -> None:
+        """
+        Merge values into the collection-level metadata.
+
+        Index settings (``hnsw:*``) are fixed at creation and left untouched.
+        """
+        metadata = {k: v for k, v in self.get_col_metadata().items() if not k.startswith("hnsw:")}
+        metadata.update(values)
+        self.collection.modify(metadata=metadata)
+
+    def count(self) -> int:
+        """Return the number of vectors in the collection."""
+        return self.collection.count()
+
+    def iter_batches(self, batch_size: int = 500) -> Iterator[List[OutputData]]:
+        """
+        Page through every vector's id and payload.
+
+        Args:
+            batch_size (int, optional): Rows per page. Defaults to 500.
+
+        Yields:
+            List[OutputData]: One page of entries (``score`` is None).
+        """
+        offset = 0
+        while True:
+            result = self.collection.get(limit=batch_size, offset=offset, include=["metadatas"])
+            ids = result.get("ids") or []
+            if not ids:
+                return
+            metadatas = result.get("metadatas") or []
+            yield [
+                OutputData(id=vector_id, score=None, payload=metadatas[i] if i < len(metadatas) else None)
+                for i, vector_id in enumerate(ids)
+            ]
+            offset += len(ids)
+
+    def iter_vectors(self, batch_size: int = 500, offset: int = 0) -> Iterator[tuple]:
+        """
+        Page through every vector.
+
+        Args:
+            batch_size (int, optional): Rows per page. Defaults to 500.
+            offset (int, optional): Row to start from. Defaults to 0.
+
+        Yields:
+            Tuple[List[str], List[list]]: IDs and vectors of one page.
+        """
+        while True:
+            result = self.collection.get(limit=batch_size, offset=offset, include=["embeddings"])
+            ids = result.get("ids") or []
+            if not ids:
+                return
+            yield list(ids), list(result.get("embeddings"))
+            offset += len(ids)
+
+    def update_vectors(self, vector_ids: List[str], vectors: List[list]) -> None:
+        """
+        Replace the vectors of several entries, keeping their payloads.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (List[list]): New vectors, in the same order.
+        """
+        if vector_ids:
+            self.collection.update(ids=list(vector_ids), embeddings=list(vectors))
+
     def delete_col(self):
         """
         Delete a collection.
@@ -312,7 +449,8 @@ class ChromaDB(VectorStoreBase):
             return where
         where_filters = []
         for k, v in where.items():
-            if isinstance(v, str):
+            # Plain values and operator expressions such as {"$in": [...]}
+            if isinstance(v, (str, int, float, bool, dict)):
                 where_filters.append({k: v})
         return {"$and": where_filters}
 
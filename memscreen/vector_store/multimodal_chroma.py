@@ -13,6 +13,8 @@ This module extends ChromaDB to support dual-vector storage and retrieval:
 """
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Literal, Tuple, Any
 from pathlib import Path
 
@@ -24,6 +26,21 @@ __all__ = [
     "MultimodalChromaDB",
 ]
 
+_QUERY_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_QUERY_EXECUTOR_LOCK = threading.Lock()
+
+
+def _query_executor() -> ThreadPoolExecutor:
+    """Shared pool used to query the text and vision collections side by side."""
+    global _QUERY_EXECUTOR
+    if _QUERY_EXECUTOR is None:
+        with _QUERY_EXECUTOR_LOCK:
+            if _QUERY_EXECUTOR is None:
+                _QUERY_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="multimodal-query"
+                )
+    return _QUERY_EXECUTOR
+
 
 class MultimodalChromaDB:
     """
@@ -61,6 +78,9 @@ class MultimodalChromaDB:
         ```
     """
 
+    # Reciprocal Rank Fusion constant
+    RRF_K = 60
+
     def __init__(
         self,
         collection_name: str,
@@ -221,79 +241,173 @@ class MultimodalChromaDB:
                 "At least one of query_text_embedding or query_vision_embedding must be provided"
             )
 
-        # Search text collection
-        text_results = []
-        text_scores = {}
-        if query_text_embedding is not None:
-            text_results = self.text_store.search(
-                query="",
-                vectors=[query_text_embedding],
-                limit=limit * 2,  # Retrieve more for fusion
-                filters=filters,
-            )
-            # Score by rank (RRF)
-            k = 60  # RRF constant
-            for i, result in enumerate(text_results):
-                score = 1 / (k + i + 1)
-                text_scores[result.id] = score
-
-        # Search vision collection
-        vision_results = []
-        vision_scores = {}
-        if query_vision_embedding is not None:
-            vision_results = self.vision_store.search(
-                query="",
-                vectors=[query_vision_embedding],
-                limit=limit * 2,  # Retrieve more for fusion
-                filters=filters,
-            )
-            # Score by rank (RRF)
-            k = 60  # RRF constant
-            for i, result in enumerate(vision_results):
-                score = 1 / (k + i + 1)
-                vision_scores[result.id] = score
-
-        # Fuse scores
-        fused_scores = {}
-        all_ids = set(text_scores.keys()) | set(vision_scores.keys())
-
-        for memory_id in all_ids:
-            text_score = text_scores.get(memory_id, 0)
-            vision_score = vision_scores.get(memory_id, 0)
-
-            # Weighted fusion
-            final_score = (
-                fusion_weight * text_score +
-                (1 - fusion_weight) * vision_score
+        return self.search_hybrid_batch(
+            query_text_embeddings=[query_text_embedding],
+            query_vision_embeddings=[query_vision_embedding],
+            limit=limit,
+            filters=filters,
+            fusion_weight=fusion_weight,
+        )[0]
+
+    def search_hybrid_batch(
+        self,
+        query_text_embeddings: Optional[List[Optional[List[float]]]] = None,
+        query_vision_embeddings: Optional[List[Optional[List[float]]]] = None,
+        limit: int = 10,
+        filters: Optional[Dict] = None,
+        fusion_weight: float = 0.6,
+    ) -> List[List[OutputData]]:
+        """
+        Hybrid search for several queries in one round trip per collection.
+
+        Each collection receives a single multi-vector query, and the text and
+        vision collections are queried concurrently. Fused hits that were only
+        found in the vision collection get their payload from the text
+        collection with one batched ``get(ids=...)``, falling back to the
+        vision payload for memories that have no text embedding.
+
+        Args:
+            query_text_embeddings: Text query embeddings, one per query (entries may be None)
+            query_vision_embeddings: Vision query embeddings, one per query (entries may be None)
+            limit: Maximum number of results per query
+            filters: Metadata filters to apply
+            fusion_weight: Weight for text results (0-1), vision weight = 1 - fusion_weight
+
+        Returns:
+            One fused and ranked result list per query, in input order
+        """
+        text_queries = list(query_text_embeddings or [])
+        vision_queries = list(query_vision_embeddings or [])
+        if text_queries and vision_queries and len(text_queries) != len(vision_queries):
+            raise ValueError(
+                "query_text_embeddings and query_vision_embeddings must have the same length"
             )
-            fused_scores[memory_id] = final_score
-
-        # Get full results from text collection (has full payloads)
-        all_results = text_results if text_results else vision_results
-        result_map = {r.id: r for r in all_results}
-
-        # Sort by fused score
-        sorted_ids = sorted(
-            fused_scores.keys(),
-            key=lambda mid: fused_scores[mid],
-            reverse=True
-        )[:limit]
-
-        # Build final results with fused scores
-        final_results = []
-        for memory_id in sorted_ids:
-            if memory_id in result_map:
-                result = result_map[memory_id]
-                result.score = fused_scores[memory_id]
-                final_results.append(result)
+        num_queries = max(len(text_queries), len(vision_queries))
+        text_queries += [None] * (num_queries - len(text_queries))
+        vision_queries += [None] * (num_queries - len(vision_queries))
+        for i in range(num_queries):
+            if text_queries[i] is None and vision_queries[i] is None:
+                raise ValueError(
+                    f"Query {i} has neither a text nor a vision embedding"
+                )
+        if num_queries == 0:
+            return []
+
+        # Retrieve more for fusion
+        fetch_limit = limit * 2
+        jobs = {}
+        if any(q is not None for q in text_queries):
+            jobs["text"] = (self.text_store, text_queries)
+        if any(q is not None for q in vision_queries):
+            jobs["vision"] = (self.vision_store, vision_queries)
+
+        if len(jobs) == 1:
+            (name, (store, queries)), = jobs.items()
+            hits = {name: self._search_many(store, queries, fetch_limit, filters)}
+        else:
+            executor = _query_executor()
+            futures = {
+                name: executor.submit(self._search_many, store, queries, fetch_limit, filters)
+                for name, (store, queries) in jobs.items()
+            }
+            hits = {name: future.result() for name, future in futures.items()}
+        text_hits = hits.get("text", [[] for _ in range(num_queries)])
+        vision_hits = hits.get("vision", [[] for _ in range(num_queries)])
+
+        # Fuse scores per query
+        fused = []
+        for text_results, vision_results in zip(text_hits, vision_hits):
+            text_scores = self._rrf_scores(text_results)
+            vision_scores = self._rrf_scores(vision_results)
+            fused_scores = {
+                memory_id: (
+                    fusion_weight * text_scores.get(memory_id, 0)
+                    + (1 - fusion_weight) * vision_scores.get(memory_id, 0)
+                )
+                for memory_id in set(text_scores) | set(vision_scores)
+            }
+            sorted_ids = sorted(
+                fused_scores.keys(),
+                key=lambda mid: fused_scores[mid],
+                reverse=True
+            )[:limit]
+            fused.append((sorted_ids, fused_scores))
+
+        # Text payloads are authoritative; hydrate vision-only hits in one call
+        payloads: Dict[str, Optional[Dict]] = {}
+        for text_results in text_hits:
+            for result in text_results:
+                if result.payload is not None:
+                    payloads.setdefault(result.id, result.payload)
+        missing = [
+            memory_id
+            for sorted_ids, _ in fused
+            for memory_id in sorted_ids
+            if memory_id not in payloads
+        ]
+        if missing:
+            try:
+                hydrated = self.text_store.get_many(list(dict.fromkeys(missing)))
+            except Exception as e:
+                logger.debug(f"Payload hydration failed: {e}")
+                hydrated = {}
+            for memory_id, data in hydrated.items():
+                if data.payload is not None:
+                    payloads[memory_id] = data.payload
+        for vision_results in vision_hits:
+            for result in vision_results:
+                if result.payload is not None:
+                    payloads.setdefault(result.id, result.payload)
+
+        final_results = [
+            [
+                OutputData(
+                    id=memory_id,
+                    score=fused_scores[memory_id],
+                    payload=payloads.get(memory_id),
+                )
+                for memory_id in sorted_ids
+            ]
+            for sorted_ids, fused_scores in fused
+        ]
 
         logger.info(
-            f"Hybrid search returned {len(final_results)} results "
-            f"(text: {len(text_results)}, vision: {len(vision_results)})"
+            f"Hybrid search for {num_queries} queries returned "
+            f"{sum(len(r) for r in final_results)} results "
+            f"(text: {sum(len(r) for r in text_hits)}, "
+            f"vision: {sum(len(r) for r in vision_hits)}, "
+            f"hydrated: {len(missing)})"
         )
 
         return final_results
 
+    @staticmethod
+    def _search_many(
+        store: ChromaDB,
+        queries: List[Optional[List[float]]],
+        limit: int,
+        filters: Optional[Dict],
+    ) -> List[List[OutputData]]:
+        """Run the non-empty queries as one batch; absent queries get no hits."""
+        positions = [i for i, q in enumerate(queries) if q is not None]
+        results: List[List[OutputData]] = [[] for _ in queries]
+        batch = store.search_batch(
+            vectors=[queries[i] for i in positions],
+            limit=limit,
+            filters=filters,
+        )
+        for i, hits in zip(positions, batch):
+            results[i] = hits
+        return results
+
+    @classmethod
+    def _rrf_scores(cls, results: List[OutputData]) -> Dict[str, float]:
+        """Score results by rank (RRF), keeping the best rank of duplicate IDs."""
+        scores: Dict[str, float] = {}
+        for i, result in enumerate(results):
+            scores.setdefault(result.id, 1 / (cls.RRF_K + i + 1))
+        return scores
+
     def search_text(
         self,
         query_embedding: List[float],
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import threading
+import time
+import unittest
+
+from memscreen.agent import AgentConfig, BaseAgent, BaseSkill, Plan, PlanStep, SkillResult
+
+
+class _SleepSkill(BaseSkill):
+  """Blocks its worker thread for ``seconds``, like a memory search or LLM call."""
+
+  name = 'sleep'
+
+  async def execute(self, **kwargs):
+    seconds = kwargs.get('seconds', 0.1)
+    await self.run_blocking(time.sleep, seconds)
+    return SkillResult(success=True, data=seconds)
+
+
+class _SerialSleepSkill(_SleepSkill):
+  name = 'serial_sleep'
+  max_concurrency = 1
+
+
+class _SlowSkill(_SleepSkill):
+  name = 'slow'
+  timeout = 0.05
+
+
+class _SerialSlowSkill(_SleepSkill):
+  """Records when each call's thread starts and stops."""
+
+  name = 'serial_slow'
+  max_concurrency = 1
+  timeout = 0.05
+
+  def __init__(self):
+    super().__init__()
+    self.spans = []
+
+  def _sleep(self, seconds):
+    started = time.perf_counter()
+    time.sleep(seconds)
+    self.spans.append((started, time.perf_counter()))
+
+  async def execute(self, **kwargs):
+    seconds = kwargs.get('seconds', 0.1)
+    await self.run_blocking(self._sleep, seconds)
+    return SkillResult(success=True, data=seconds)
+
+
+def _plan(*steps):
+  return Plan(plan_id='p', goal='test', steps=[
+      PlanStep(step_id=i, description='', skill_name=skill, parameters={'seconds': seconds}, depends_on=deps)
+      for i, skill, seconds, deps in steps
+  ])
+
+
+class AgentSchedulerTest(unittest.TestCase):
+  def setUp(self):
+    self.agent = BaseAgent(config=AgentConfig(max_parallel_steps=4, max_blocking_workers=4))
+    self.serial_slow = _SerialSlowSkill()
+    for skill in (_SleepSkill(), _SerialSleepSkill(), _SlowSkill(), self.serial_slow):
+      self.agent.register_skill(skill)
+
+  def tearDown(self):
+    self.agent.close()
+
+  def _run(self, plan):
+    return asyncio.run(self.agent._execute_plan(plan))
+
+  def test_steps_start_when_their_dependencies_finish(self):
+    result = self._run(_plan(
+        (1, 'sleep', 0.05, []),
+        (2, 'sleep', 0.3, []),
+        (3, 'sleep', 0.05, [1]),
+    ))
+    self.assertTrue(result['success'])
+    timing = {r['step_id']: r['timing'] for r in result['results']}
+    # Blocking work overlaps, and step 3 does not wait for the slow sibling of its dependency.
+    self.assertLess(timing[2]['started'], timing[1]['finished'])
+    self.assertLess(timing[3]['finished'], timing[2]['finished'])
+    self.assertGreaterEqual(timing[3]['started'], timing[1]['finished'])
+    self.assertLess(result['elapsed'], 0.5)
+
+  def test_per_skill_concurrency_limit(self):
+    result = self._run(_plan(*[(i, 'serial_sleep', 0.05, []) for i in range(1, 4)]))
+    spans = sorted((r['timing']['started'], r['timing']['finished']) for r in result['results'])
+    for (_, finished), (started, _) in zip(spans, spans[1:]):
+      self.assertGreaterEqual(started, finished)
+    self.assertGreater(max(r['timing']['queued'] for r in result['results']), 0.05)
+
+  def test_timed_out_step_fails_and_blocks_dependents(self):
+    plan = _plan((1, 'slow', 0.3, []), (2, 'sleep', 0.01, [1]), (3, 'sleep', 0.01, []))
+    result = self._run(plan)
+    self.assertFalse(result['success'])
+    self.assertEqual([s.status for s in plan.steps], ['failed', 'pending', 'completed'])
+    self.assertIn('timed out', result['results'][0]['error'])
+    self.assertLess(result['results'][0]['timing']['duration'], 0.2)
+
+  def test_timed_out_step_holds_its_skill_slot_until_its_thread_returns(self):
+    result = self._run(_plan((1, 'serial_slow', 0.3, []), (2, 'serial_slow', 0.01, [])))
+    timing = {r['step_id']: r['timing'] for r in result['results']}
+    self.assertLess(timing[1]['duration'], 0.2)  # the failure is reported at once
+    spans = sorted(self.serial_slow.spans)
+    self.assertEqual(len(spans), 2)
+    self.assertGreaterEqual(spans[1][0], spans[0][1])  # but the threads never overlap
+
+  def test_planner_llm_call_runs_on_the_agent_executor(self):
+    threads = []
+
+    class _LLM:
+      def generate_response(self, messages):
+        threads.append(threading.current_thread().name)
+        return '{}'
+
+    agent = BaseAgent(llm_client=_LLM())
+    self.addCleanup(agent.close)
+    self.assertIs(agent.planner.executor, agent._executor)
+    asyncio.run(agent.planner._generate_plan('plan'))
+    self.assertTrue(threads[0].startswith('agent-skill'), threads)
+
+  @unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+  def test_fan_out_plan_wall_time(self):
+    steps = [(i, 'sleep', 0.1, []) for i in range(1, 5)] + [(5, 'sleep', 0.1, [1, 2, 3, 4])]
+    result = self._run(_plan(*steps))
+    serial = sum(seconds for _, _, seconds, _ in steps)
+    print(f"\nplan wall time {result['elapsed']:.2f}s (serial {serial:.2f}s)")
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -262,6 +262,8 @@ class ApiRouterSmokeTest(unittest.TestCase):
     self.assertEqual(self.client.get('/video/list').json()['videos'][0]['filename'], '/tmp/demo.mp4')
     self.assertEqual(self.client.get('/config').status_code, 200)
     self.assertEqual(self.client.get('/health').status_code, 200)
+    caches = self.client.get('/health', params={'include_caches': True}).json()['caches']
+    self.assertIn('memory.search', caches['namespaces'])
 
   def test_recording_routes(self):
     start = self.client.post('/recording/start', json={
@@ -0,0 +1,123 @@
+import gc
+import os
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from memscreen.cache import CacheRegistry, estimate_size
+from memscreen.llm.performance_config import ModelPerformanceConfig, PerformanceOptimizer
+
+
+class _Store:
+  def stats(self):
+    return {'size': 1, 'bytes': 4096}
+
+
+class CacheRegistryTest(unittest.TestCase):
+  def test_budget_is_split_and_enforced_in_bytes(self):
+    registry = CacheRegistry(budget_bytes=20_000)
+    text = registry.namespace('text')
+    self.assertEqual(text.max_bytes, 20_000)
+    arrays = registry.namespace('arrays', weight=3.0)
+    self.assertEqual((text.max_bytes, arrays.max_bytes), (5_000, 15_000))
+
+    for i in range(10):
+      arrays.set(i, np.zeros(1000, dtype=np.float32))  # ~4 KB each
+    self.assertLessEqual(arrays.bytes, 15_000)
+    self.assertEqual(arrays.keys(), [7, 8, 9])
+    self.assertFalse(text.set('huge', 'x' * 10_000))  # larger than the namespace budget
+    self.assertNotIn('huge', text)
+
+    stats = registry.stats()
+    self.assertEqual(stats['bytes'], arrays.bytes)
+    self.assertEqual(stats['namespaces']['arrays']['evictions'], 7)
+    self.assertEqual(stats['namespaces']['text']['rejected'], 1)
+
+  def test_lru_and_ttl_eviction(self):
+    ns = CacheRegistry().namespace('lru', max_entries=3, ttl=60)
+    for key in 'abc':
+      ns.set(key, key)
+    ns.get('a')
+    ns.set('d', 'd')
+    self.assertEqual(ns.keys(), ['c', 'a', 'd'])
+
+    ns.set('short', 1, ttl=0.01)
+    time.sleep(0.02)
+    self.assertIsNone(ns.get('short'))
+    self.assertEqual(ns.stats()['expirations'], 1)
+    self.assertEqual(ns.sweep(), (0, 0))
+
+  def test_discarded_components_stop_counting(self):
+    registry = CacheRegistry(budget_bytes=1000)
+    kept = registry.namespace('kept')
+    registry.namespace('dropped')
+    store = _Store()
+    registry.register_source('store', store.stats)
+    gc.collect()
+    self.assertEqual(list(registry.stats()['namespaces']), ['kept'])
+    self.assertEqual(registry.stats()['source_bytes'], 4096)
+    self.assertEqual(registry.namespace('other').max_bytes, 500)
+    self.assertEqual(kept.max_bytes, 500)
+
+    del store
+    gc.collect()
+    self.assertEqual(registry.stats()['sources'], {})
+
+  def test_concurrent_access_stays_within_bounds(self):
+    ns = CacheRegistry(budget_bytes=50_000).namespace('shared', max_entries=200)
+    errors = []
+
+    def worker(offset):
+      try:
+        for i in range(3000):
+          ns.set((offset, i % 300), 'v' * (i % 50))
+          ns.get((offset, (i * 7) % 300))
+          if i % 500 == 0:
+            ns.sweep()
+      except Exception as e:  # pragma: no cover - surfaced below
+        errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    self.assertEqual(errors, [])
+    self.assertLessEqual(len(ns), 200)
+    self.assertLessEqual(ns.bytes, 50_000)
+    self.assertEqual(ns.bytes, sum(estimate_size(ns.peek(k)) for k in ns.keys()))
+
+  def test_llm_response_cache_evicts_least_recently_used(self):
+    optimizer = PerformanceOptimizer(ModelPerformanceConfig(cache_max_size=2))
+    optimizer.add_to_cache('a', 'A')
+    optimizer.add_to_cache('b', 'B')
+    self.assertEqual(optimizer.check_cache('a'), 'A')
+    optimizer.add_to_cache('c', 'C')
+    self.assertIsNone(optimizer.check_cache('b'))
+    self.assertEqual(optimizer.check_cache('a'), 'A')
+    self.assertEqual(optimizer.performance_stats['cache_hits'], 2)
+
+  @unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+  def test_eviction_cost_against_min_scan(self):
+    size, inserts = 5000, 20000
+    legacy = {}
+    started = time.perf_counter()
+    for i in range(inserts):
+      if len(legacy) >= size:
+        del legacy[min(legacy.keys(), key=lambda k: legacy[k]['timestamp'])]
+      legacy[i] = {'response': 'r', 'timestamp': time.time()}
+    legacy_elapsed = time.perf_counter() - started
+
+    optimizer = PerformanceOptimizer(ModelPerformanceConfig(cache_max_size=size))
+    started = time.perf_counter()
+    for i in range(inserts):
+      optimizer.add_to_cache(str(i), 'r')
+    elapsed = time.perf_counter() - started
+    print(f'\nmin() scan: {legacy_elapsed * 1e3:.0f} ms, namespace LRU: {elapsed * 1e3:.0f} ms')
+    self.assertLess(elapsed, legacy_elapsed)
+
+
+if __name__ == '__main__':
+  unittest.main()
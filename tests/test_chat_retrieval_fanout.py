@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+
+from memscreen.presenters.chat_presenter import ChatPresenter
+
+
+class _SlowMemory:
+  def __init__(self, delay=0.1, slow_type=None):
+    self.delay = delay
+    self.slow_type = slow_type
+    self.embedded = []
+    self.calls = []
+    self._lock = threading.Lock()
+
+  def embed_query(self, query):
+    self.embedded.append(query)
+    return [0.1, 0.2]
+
+  def search(self, query, user_id=None, filters=None, limit=10, threshold=None, vectors=None):
+    mem_type = (filters or {}).get('type', 'main')
+    with self._lock:
+      self.calls.append((query, mem_type, vectors))
+    time.sleep(1.0 if mem_type == self.slow_type else self.delay)
+    shared = {'id': 'shared', 'memory': 'seen in both', 'metadata': {'type': 'screen_recording'}}
+    return {'results': [shared, {'id': f'{mem_type}-1', 'memory': mem_type, 'metadata': {'type': mem_type}}]}
+
+
+def _presenter(memory, budget=5.0):
+  presenter = ChatPresenter.__new__(ChatPresenter)
+  presenter.memory_system = memory
+  presenter.retrieval_max_workers = 4
+  presenter.retrieval_budget_seconds = budget
+  presenter._retrieval_pool = None
+  presenter._retrieval_pool_lock = threading.Lock()
+  presenter._retrieval_stragglers = set()
+  presenter._probe_vectors = {}
+  presenter._memory_belongs_to_active_thread = lambda metadata: True
+  presenter._load_recent_recordings_from_db = lambda limit=5: (time.sleep(0.1), [{'basename': 'a.mp4'}])[1]
+  return presenter
+
+
+class TieredRetrievalFanOutTest(unittest.TestCase):
+  def test_searches_run_concurrently_and_merge_in_order(self):
+    memory = _SlowMemory()
+    presenter = _presenter(memory)
+    presenter._warmup_retrieval_probes()
+
+    started = time.perf_counter()
+    memories, db_rows = presenter._fan_out_tiered_retrieval(
+        'what did I see today', need_recording_fallback=True, need_process_fallback=True)
+    elapsed = time.perf_counter() - started
+
+    self.assertLess(elapsed, 0.3)  # four 100 ms lookups, not their sum
+    self.assertEqual([m['id'] for m in memories], ['shared', 'main-1', 'screen_recording-1', 'process_session-1'])
+    self.assertEqual(db_rows, [{'basename': 'a.mp4'}])
+
+    self.assertEqual(sorted(memory.embedded), sorted([
+        ChatPresenter._RECORDING_PROBE_QUERY, ChatPresenter._PROCESS_PROBE_QUERY]))
+    vectors_by_type = {mem_type: vectors for _, mem_type, vectors in memory.calls}
+    self.assertIsNone(vectors_by_type['main'])
+    self.assertEqual(vectors_by_type['screen_recording'], [0.1, 0.2])
+    self.assertEqual(vectors_by_type['process_session'], [0.1, 0.2])
+
+  def test_budget_returns_partial_results(self):
+    presenter = _presenter(_SlowMemory(delay=0.01, slow_type='process_session'), budget=0.3)
+    started = time.perf_counter()
+    memories, _ = presenter._fan_out_tiered_retrieval(
+        'plan my day', need_recording_fallback=False, need_process_fallback=True)
+    self.assertLess(time.perf_counter() - started, 1.0)
+    self.assertEqual([m['id'] for m in memories], ['shared', 'main-1'])
+
+  def test_overrunning_searches_do_not_starve_the_next_turn(self):
+    memory = _SlowMemory(delay=0.01, slow_type='process_session')
+    presenter = _presenter(memory, budget=0.2)
+    presenter.retrieval_max_workers = 2
+    presenter._fan_out_tiered_retrieval('plan', need_recording_fallback=False, need_process_fallback=True)
+
+    memory.slow_type = None
+    started = time.perf_counter()
+    memories, _ = presenter._fan_out_tiered_retrieval(
+        'plan', need_recording_fallback=False, need_process_fallback=True)
+    self.assertLess(time.perf_counter() - started, 0.2)
+    self.assertEqual([m['id'] for m in memories], ['shared', 'main-1', 'process_session-1'])
+    self.assertEqual(len(presenter._retrieval_stragglers), 1)
+
+  def test_vector_support_is_checked_up_front(self):
+    class _NoVectors:
+      def __init__(self):
+        self.calls = 0
+
+      def search(self, query, user_id=None, filters=None, limit=10, threshold=None):
+        self.calls += 1
+        raise TypeError('bug inside search')
+
+    memory = _NoVectors()
+    presenter = _presenter(memory)
+    presenter._probe_vectors[ChatPresenter._RECORDING_PROBE_QUERY] = [0.1]
+    self.assertFalse(presenter._search_accepts_vectors())
+    with self.assertRaisesRegex(TypeError, 'bug inside search'):
+      presenter._search_memory_results(ChatPresenter._RECORDING_PROBE_QUERY, limit=3)
+    self.assertEqual(memory.calls, 1)  # not retried without vectors
+
+  def test_unfinished_recording_db_prefetch_is_not_reported_as_empty(self):
+    presenter = _presenter(_SlowMemory(delay=0.01), budget=0.2)
+    presenter._load_recent_recordings_from_db = lambda limit=5: (time.sleep(1.0), [{'basename': 'a.mp4'}])[1]
+    _, db_rows = presenter._fan_out_tiered_retrieval(
+        'what did I see today', need_recording_fallback=True, need_process_fallback=False)
+    self.assertIsNone(db_rows)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,163 @@
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+import unittest
+
+import httpx
+import uvicorn
+
+from memscreen.api import deps
+from memscreen.api.app import app
+from memscreen.presenters.chat_presenter import _ThinkStreamFilter
+
+_TOKENS = 20
+_TOKEN_INTERVAL = 0.005
+
+
+class _TokenPresenter:
+  """Emits one token every few milliseconds from its own worker thread, like the LLM path."""
+
+  def switch_chat_thread(self, thread_id):
+    return True
+
+  def send_message_sync(self, user_message, on_done, on_chunk=None, on_replace=None):
+    def run():
+      tokens = [f'{user_message}-{i} ' for i in range(_TOKENS)]
+      for token in tokens:
+        time.sleep(_TOKEN_INTERVAL)
+        if on_chunk:
+          on_chunk(token)
+      if user_message == 'rewrite':
+        on_replace('rewritten reply')
+        on_done('rewritten reply', None)
+        return
+      on_done(''.join(tokens), None)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _free_port():
+  with socket.socket() as sock:
+    sock.bind(('127.0.0.1', 0))
+    return sock.getsockname()[1]
+
+
+class ChatStreamTest(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.old_chat = deps._chat_presenter
+    cls.old_chat_init = deps._chat_presenter_initialized
+    deps._chat_presenter = _TokenPresenter()
+    deps._chat_presenter_initialized = True
+
+    port = _free_port()
+    cls.base_url = f'http://127.0.0.1:{port}'
+    cls.server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning'))
+    cls.thread = threading.Thread(target=cls.server.run, daemon=True)
+    cls.thread.start()
+    deadline = time.time() + 10
+    while not cls.server.started and time.time() < deadline:
+      time.sleep(0.02)
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.should_exit = True
+    cls.thread.join(timeout=5)
+    deps._chat_presenter = cls.old_chat
+    deps._chat_presenter_initialized = cls.old_chat_init
+
+  def _stream(self, message, out):
+    arrivals, chunks, done, replaced = [], [], None, []
+    with httpx.Client(base_url=self.base_url, timeout=30, trust_env=False) as client:
+      started = time.perf_counter()
+      with client.stream('POST', '/chat/stream', json={'message': message}) as response:
+        for line in response.iter_lines():
+          if not line.startswith('data: '):
+            continue
+          payload = json.loads(line[6:])
+          if 'chunk' in payload:
+            arrivals.append(time.perf_counter() - started)
+            chunks.append(payload['chunk'])
+          if 'replace' in payload:
+            replaced.append(payload['replace'])
+          if payload.get('done'):
+            done = payload['full']
+    out[message] = (arrivals, chunks, done)
+    return replaced
+
+  def _run_concurrent(self, n):
+    results = {}
+    threads = [threading.Thread(target=self._stream, args=(f'm{i}', results)) for i in range(n)]
+    started = time.perf_counter()
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    return results, time.perf_counter() - started
+
+  def test_concurrent_streams_are_isolated_and_incremental(self):
+    results, elapsed = self._run_concurrent(8)
+
+    self.assertEqual(len(results), 8)
+    for message, (arrivals, chunks, done) in results.items():
+      self.assertEqual(len(chunks), _TOKENS)
+      self.assertTrue(all(chunk.startswith(f'{message}-') for chunk in chunks))
+      self.assertEqual(''.join(chunks), done)
+      # Chunks are pushed as produced rather than delivered in one burst at the end.
+      self.assertGreater(arrivals[-1] - arrivals[0], _TOKEN_INTERVAL * (_TOKENS - 1) * 0.5)
+    self.assertLess(elapsed, 8 * _TOKENS * _TOKEN_INTERVAL)
+
+  def test_final_text_that_diverges_from_the_stream_is_sent_as_replace(self):
+    out = {}
+    replaced = self._stream('rewrite', out)
+    _, chunks, done = out['rewrite']
+    self.assertEqual(len(chunks), _TOKENS)
+    self.assertEqual(replaced, ['rewritten reply'])
+    self.assertEqual(done, 'rewritten reply')
+
+  @unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+  def test_stream_latency_under_load(self):
+    for n in (1, 8, 32):
+      results, _ = self._run_concurrent(n)
+      ttft = [arrivals[0] for arrivals, _, _ in results.values()]
+      # Extra delay per token beyond the producer's own pacing.
+      overhead = [
+          (b - a) - _TOKEN_INTERVAL
+          for arrivals, _, _ in results.values()
+          for a, b in zip(arrivals, arrivals[1:])
+      ]
+      print(
+          f'\n{n:>2} streams: ttft p50 {statistics.median(ttft) * 1000:.1f} ms, '
+          f'max {max(ttft) * 1000:.1f} ms; per-token overhead p50 '
+          f'{statistics.median(overhead) * 1000:.2f} ms'
+      )
+      self.assertLess(statistics.median(overhead), 0.02)
+
+
+class ThinkStreamFilterTest(unittest.TestCase):
+  def test_think_spans_split_across_deltas_are_dropped(self):
+    emitted = []
+    stream = _ThinkStreamFilter(emitted.append)
+    for delta in ['<thi', 'nk>plan', ' more</th', 'ink>\n\nHello', ' <', 'b>world</b>', '<think>x</think>!']:
+      stream(delta)
+    self.assertEqual(''.join(emitted), 'Hello <b>world</b>!')
+    self.assertEqual(stream.text, 'Hello <b>world</b>!')
+
+  def test_finish_appends_a_tail_or_replaces_diverging_text(self):
+    emitted, replaced = [], []
+    stream = _ThinkStreamFilter(emitted.append)
+    stream('Hello world')
+    stream.finish('Hello world\n\nEvidence', replaced.append)
+    self.assertEqual((emitted, replaced), (['Hello world', '\n\nEvidence'], []))
+
+    stream.finish('Sanitized reply', replaced.append)
+    self.assertEqual(replaced, ['Sanitized reply'])
+    self.assertEqual(stream.text, 'Sanitized reply')
+    self.assertEqual(len(emitted), 2)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,131 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from memscreen.presenters.chat_presenter import ChatPresenter
+from memscreen.storage import ChatThreadRepository, get_pool
+
+
+def _presenter(db_path):
+  presenter = ChatPresenter.__new__(ChatPresenter)
+  presenter.conversation_history = []
+  presenter._chat_threads_store_path = db_path
+  presenter._chat_thread_store = ChatThreadRepository(db_path)
+  presenter._load_chat_threads()
+  return presenter
+
+
+class ChatThreadStoreTest(unittest.TestCase):
+  def setUp(self):
+    self.tmp = tempfile.mkdtemp()
+    self.db_path = str(Path(self.tmp) / 'chat.db')
+
+  def tearDown(self):
+    get_pool(self.db_path).close()
+    shutil.rmtree(self.tmp)
+
+  def test_appending_a_message_only_writes_that_message(self):
+    presenter = _presenter(self.db_path)
+    store = presenter._chat_thread_store
+    store.replace_thread = store.import_threads = lambda *args: self.fail('thread log rewritten')
+    for i in range(5):
+      presenter._append_history_message('user', f'question {i}')
+
+    first = presenter.get_active_thread_id()
+    second = presenter.create_chat_thread()['id']
+    presenter._append_history_message('user', 'other thread')
+
+    restarted = _presenter(self.db_path)
+    self.assertEqual(restarted.get_active_thread_id(), second)
+    self.assertEqual(list(restarted._chat_threads), [second])  # other threads stay on disk
+    threads = {t['id']: t for t in restarted.list_chat_threads()}
+    self.assertEqual(threads[first]['message_count'], 5)
+    self.assertEqual(threads[first]['title'], 'question 0')
+    self.assertEqual(threads[first]['preview'], 'question 4')
+    self.assertEqual([m.content for m in restarted.get_thread_history(first)][-1], 'question 4')
+    self.assertEqual(list(restarted._chat_threads), [second])
+
+    self.assertTrue(restarted.switch_chat_thread(first))
+    self.assertEqual(len(restarted.get_conversation_history()), 5)
+    self.assertEqual(list(restarted._chat_threads), [first])
+
+  def test_cleared_thread_is_rewritten_and_compacted(self):
+    presenter = _presenter(self.db_path)
+    for i in range(400):
+      presenter._append_history_message('assistant', f'{i} ' + 'x' * 400)
+    presenter.conversation_history.clear()
+    presenter._mark_active_thread_changed()
+    size = os.path.getsize(self.db_path)
+    self.assertTrue(presenter._chat_thread_store.compact())
+    self.assertLess(os.path.getsize(self.db_path), size)
+    self.assertFalse(presenter._chat_thread_store.compact())
+    self.assertEqual(_presenter(self.db_path).get_conversation_history(), [])
+
+  def test_legacy_json_store_is_migrated_once(self):
+    legacy = Path(self.tmp) / 'chat_threads.json'
+    legacy.write_text(json.dumps({
+        'active_thread_id': 'thread_b',
+        'threads': [
+            {'id': 'thread_a', 'meta': {'updated_at': '2026-01-01T00:00:00', 'auto_title': True},
+             'messages': [{'role': 'user', 'content': 'hello there', 'timestamp': 't1'}]},
+            {'id': 'thread_b', 'meta': {'title': 'Pinned', 'updated_at': '2026-01-02T00:00:00'},
+             'messages': []},
+        ],
+    }), encoding='utf-8')
+
+    presenter = _presenter(self.db_path)
+    self.assertFalse(legacy.exists())
+    self.assertTrue(os.path.exists(str(legacy) + '.migrated'))
+    self.assertEqual(presenter.get_active_thread_id(), 'thread_b')
+    threads = {t['id']: t for t in presenter.list_chat_threads()}
+    self.assertEqual(threads['thread_a']['title'], 'hello there')
+    self.assertEqual(threads['thread_b']['title'], 'Pinned')
+    history = presenter.get_thread_history('thread_a')
+    self.assertEqual([(m.role, m.content, m.timestamp) for m in history], [('user', 'hello there', 't1')])
+
+  def test_load_does_not_compact_and_compaction_errors_are_contained(self):
+    presenter = _presenter(self.db_path)
+    presenter._append_history_message('user', 'keep me')
+    store = ChatThreadRepository(self.db_path)
+    store.compact = mock.Mock(side_effect=RuntimeError('database is locked'))
+    presenter = ChatPresenter.__new__(ChatPresenter)
+    presenter.conversation_history = []
+    presenter._chat_threads_store_path = self.db_path
+    presenter._chat_thread_store = store
+
+    presenter._load_chat_threads()
+    store.compact.assert_not_called()
+    self.assertEqual([m.content for m in presenter.get_conversation_history()], ['keep me'])
+    presenter._compact_chat_threads()
+    store.compact.assert_called_once()
+    self.assertEqual(len(presenter.list_chat_threads()), 1)
+
+  def test_threads_use_a_dedicated_database_in_db_dir(self):
+    db_dir = Path(self.tmp) / 'db'
+    config = SimpleNamespace(db_dir=db_dir, db_path=db_dir / 'screen_capture.db')
+    with mock.patch('memscreen.config.get_config', return_value=config):
+      path = ChatPresenter.__new__(ChatPresenter)._get_chat_threads_store_path()
+    self.assertEqual(path, str(db_dir / 'chat_threads.db'))
+    self.assertTrue(db_dir.is_dir())
+
+  @unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+  def test_append_cost_does_not_grow_with_history(self):
+    presenter = _presenter(self.db_path)
+    timings = []
+    for i in range(2000):
+      started = time.perf_counter()
+      presenter._append_history_message('user', f'message {i} ' + 'y' * 200)
+      timings.append(time.perf_counter() - started)
+    first, last = sum(timings[:200]) / 200, sum(timings[-200:]) / 200
+    print(f'\nappend: first 200 {first * 1e3:.2f} ms/msg, last 200 {last * 1e3:.2f} ms/msg')
+    self.assertLess(last, first * 3)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from memscreen.memory.conflict_resolver import ConflictResolver, ConflictResolverConfig
+
+_AXES = {'size': [1.0, 0.0, 0.0], 'color': [0.0, 1.0, 0.0], 'other': [0.0, 0.0, 1.0]}
+
+
+class _Embedder:
+  def __init__(self):
+    self.batches = []
+
+  def embed(self, text, memory_action=None):
+    return self.embed_batch([text], memory_action)[0]
+
+  def embed_batch(self, texts, memory_action=None):
+    self.batches.append(list(texts))
+    return [_AXES[next((axis for axis in _AXES if axis in text), 'other')] for text in texts]
+
+
+class _LLM:
+  def __init__(self, delay=0.05):
+    self.delay = delay
+    self.calls = 0
+    self.active = 0
+    self.peak = 0
+    self._lock = threading.Lock()
+
+  def generate_response(self, messages, response_format=None, options=None):
+    with self._lock:
+      self.calls += 1
+      self.active += 1
+      self.peak = max(self.peak, self.active)
+    time.sleep(self.delay)
+    with self._lock:
+      self.active -= 1
+    prompt = messages[0]['content']
+    kind = 'CONTRADICTORY' if '100MB' in prompt and '200MB' in prompt else 'EQUIVALENT'
+    return json.dumps({'type': kind, 'confidence': 0.9, 'reasoning': '', 'suggestion': 'update'})
+
+
+def _existing():
+  return [
+      {'id': 'dup', 'data': 'the color is red', 'embedding': _AXES['color']},
+      {'id': 'big', 'data': 'file size is 200MB', 'embedding': _AXES['size']},
+      {'id': 'far', 'data': 'meeting at noon', 'embedding': _AXES['other']},
+      {'id': 'lazy', 'data': 'size of the disk is 1TB', 'embedding': None},
+  ]
+
+
+class ConflictResolverBatchTest(unittest.TestCase):
+  def test_batch_matches_single_detection_with_one_embedding_call(self):
+    embedder, llm = _Embedder(), _LLM()
+    resolver = ConflictResolver(embedder, llm, ConflictResolverConfig(llm_max_workers=3))
+    new = ['the color is red', 'file size is 100MB', 'picnic tomorrow']
+
+    batch = resolver.detect_conflicts_batch(new, _existing())
+
+    self.assertEqual(len(embedder.batches), 1)  # new facts and unembedded candidates together
+    self.assertEqual(embedder.batches[0][-1], 'size of the disk is 1TB')
+    summary = [[(c['memory_id'], c['conflict_type']) for c in conflicts] for conflicts in batch]
+    self.assertEqual(summary[0], [('dup', 'duplicate')])
+    self.assertEqual(summary[1], [('big', 'contradictory'), ('lazy', 'equivalent')])
+    self.assertEqual(summary[2], [('far', 'equivalent')])
+    self.assertEqual(llm.calls, 3)
+    self.assertGreater(llm.peak, 1)
+    self.assertLessEqual(llm.peak, 3)
+
+    stats = resolver.last_batch_stats
+    self.assertEqual(stats['pairs_checked'], 12)
+    self.assertEqual((stats['duplicates'], stats['similar_pairs'], stats['llm_calls']), (1, 3, 3))
+    self.assertGreater(stats['pairs_per_sec'], 0)
+
+    # Verdicts are cached, and the single-item API goes through the same path.
+    single = resolver.detect_conflict('file size is 100MB', _existing())
+    self.assertEqual([(c['memory_id'], c['conflict_type']) for c in single], summary[1])
+    self.assertEqual(llm.calls, 3)
+
+  def test_without_llm_similar_pairs_are_equivalent(self):
+    resolver = ConflictResolver(_Embedder(), _LLM(), ConflictResolverConfig(enable_llm_check=False))
+    existing = _existing()
+    existing[0]['hash'] = hashlib.md5(b'color: red').hexdigest()
+    conflicts = resolver.detect_conflicts_batch(['color: red', 'no match'], existing[:3])
+    self.assertEqual([c['memory_id'] for c in conflicts[0]], ['dup'])
+    self.assertEqual(conflicts[0][0]['conflict_type'], 'duplicate')
+    self.assertEqual(conflicts[1][0]['conflict_type'], 'equivalent')
+    self.assertAlmostEqual(conflicts[1][0]['confidence'], 1.0, places=5)
+    self.assertEqual(resolver.detect_conflicts_batch([], existing), [])
+
+  def test_candidates_with_other_embedding_lengths_are_re_embedded(self):
+    embedder = _Embedder()
+    resolver = ConflictResolver(embedder, _LLM(), ConflictResolverConfig(enable_llm_check=False))
+    existing = _existing()[:3]
+    existing[1]['embedding'] = [0.5] * 768  # written by a different embedding model
+    existing[2]['embedding'] = []
+
+    conflicts = resolver.detect_conflicts_batch(['file size is 100MB', 'picnic tomorrow'], existing)
+
+    self.assertEqual([c['memory_id'] for c in conflicts[0]], ['big'])
+    self.assertEqual([c['memory_id'] for c in conflicts[1]], ['far'])
+    self.assertEqual(embedder.batches[-1], ['file size is 200MB'])
+
+  def test_rows_that_still_mismatch_score_zero(self):
+    class _Ragged(_Embedder):
+      def embed_batch(self, texts, memory_action=None):
+        return [[1.0, 0.0] if 'size' in t else _AXES['other'] for t in texts]
+
+    resolver = ConflictResolver(_Ragged(), _LLM(), ConflictResolverConfig(enable_llm_check=False))
+    existing = [{'id': 'odd', 'data': 'size 5', 'embedding': [1.0, 0.0]},
+                {'id': 'far', 'data': 'meeting', 'embedding': _AXES['other']}]
+    conflicts = resolver.detect_conflicts_batch(['picnic', 'size 9'], existing)
+    self.assertEqual([[c['memory_id'] for c in row] for row in conflicts], [['far'], []])
+
+  @unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+  def test_pairs_per_second_against_python_loop(self):
+    rng = np.random.default_rng(3)
+    new_vectors = rng.standard_normal((100, 384)).astype(np.float32)
+    existing = [
+        {'id': str(j), 'data': f'fact {j}', 'embedding': row.tolist()}
+        for j, row in enumerate(rng.standard_normal((2000, 384)))
+    ]
+
+    def cosine(a, b):
+      dot = sum(x * y for x, y in zip(a, b))
+      return dot / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+    started = time.perf_counter()
+    for vector in new_vectors[:5].tolist():
+      for mem in existing:
+        cosine(vector, mem['embedding'])
+    legacy_rate = 5 * len(existing) / (time.perf_counter() - started)
+
+    class _Fixed:
+      def embed_batch(self, texts, memory_action=None):
+        return new_vectors[:len(texts)]
+
+    resolver = ConflictResolver(_Fixed(), None, ConflictResolverConfig(enable_llm_check=False))
+    resolver.detect_conflicts_batch([f'new {i}' for i in range(100)], existing)
+    rate = resolver.last_batch_stats['pairs_per_sec']
+    print(f'\npython loop: {legacy_rate:,.0f} pairs/sec, batch: {rate:,.0f} pairs/sec')
+    self.assertGreater(rate, legacy_rate)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+import uuid
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import chromadb
+
+from memscreen.embeddings import CachedEmbedding, EmbeddingCache
+from memscreen.embeddings.base import BaseEmbedderConfig, EmbeddingBase
+from memscreen.memory.memory import Memory
+from memscreen.vector_store.chroma import ChromaDB
+
+
+class _CountingEmbedder(EmbeddingBase):
+  def __init__(self):
+    super().__init__(BaseEmbedderConfig(model='counting'))
+    self.calls = []
+
+  def embed(self, text, memory_action=None):
+    self.calls.append([text])
+    return [float(len(text)), 0.5, -1.0]
+
+  def embed_batch(self, texts, memory_action=None):
+    self.calls.append(list(texts))
+    return [[float(len(t)), 0.5, -1.0] for t in texts]
+
+
+class EmbeddingCacheTest(unittest.TestCase):
+  def test_batch_only_embeds_misses_and_persists_across_instances(self):
+    with TemporaryDirectory() as tmp:
+      path = str(Path(tmp) / 'emb.db')
+      inner = _CountingEmbedder()
+      cached = CachedEmbedding(inner, EmbeddingCache(path))
+
+      self.assertEqual(cached.embed('hello', 'add'), [5.0, 0.5, -1.0])
+      vectors = cached.embed_batch(['hello', 'abc', 'abc'], 'add')
+      self.assertEqual(vectors, [[5.0, 0.5, -1.0], [3.0, 0.5, -1.0], [3.0, 0.5, -1.0]])
+      self.assertEqual(inner.calls, [['hello'], ['abc']])
+      cached.cache.close()
+
+      reopened = CachedEmbedding(_CountingEmbedder(), EmbeddingCache(path))
+      self.assertEqual(reopened.embed('abc', 'search'), [3.0, 0.5, -1.0])
+      self.assertEqual(reopened.embedder.calls, [])
+      stats = reopened.cache.stats()
+      self.assertEqual(stats['entries'], 2)
+      self.assertEqual(stats['hits'], 1)
+      self.assertEqual(stats['misses'], 0)
+      reopened.cache.close()
+
+  def test_lru_eviction_keeps_recently_used_entries(self):
+    cache = EmbeddingCache(':memory:', max_entries=3)
+    cache.put_many('m', [('a', [1.0]), ('b', [2.0]), ('c', [3.0])])
+    cache.get_many('m', ['a'])
+    cache._pending_touches[('m', 'a')] += 10
+    cache.put_many('m', [('d', [4.0])])
+
+    remaining = cache.get_many('m', ['a', 'b', 'c', 'd'])
+    self.assertIn('a', remaining)
+    self.assertIn('d', remaining)
+    self.assertNotIn('b', remaining)
+    self.assertLessEqual(cache.stats()['entries'], 3)
+    self.assertGreater(cache.stats()['evictions'], 0)
+
+  def test_wrapper_forwards_provider_attributes(self):
+    inner = _CountingEmbedder()
+    inner.client = object()
+    cached = CachedEmbedding(inner, EmbeddingCache(':memory:'))
+    self.assertIs(cached.client, inner.client)
+    self.assertEqual(cached.config.model, 'counting')
+
+  def test_output_variant_is_part_of_the_cache_key(self):
+    cache = EmbeddingCache(':memory:')
+    CachedEmbedding(_CountingEmbedder(), cache).embed('hello', 'add')
+    normalized = _CountingEmbedder()
+    normalized.embedding_variant = 'l2norm'
+    cached = CachedEmbedding(normalized, cache)
+
+    self.assertEqual(cached.embedding_variant, 'l2norm')
+    cached.embed('hello', 'add')
+    self.assertEqual(normalized.calls, [['hello']])  # raw vector is not reused
+    self.assertEqual(cache.stats()['entries'], 2)
+
+
+class EmbeddingVariantMigrationTest(unittest.TestCase):
+  def _memory(self, embedder, store):
+    memory = Memory.__new__(Memory)
+    memory.collection_name = store.collection_name
+    memory.embedding_model = embedder
+    memory.vector_store = store
+    return memory
+
+  def _store(self, vectors):
+    store = ChromaDB(f'variant-{uuid.uuid4().hex}', client=chromadb.EphemeralClient())
+    self.addCleanup(store.delete_col)
+    store.insert(vectors, payloads=[{'data': 'abc'}, {'data': 'hello'}, {'hash': 'no text'}],
+                 ids=['a', 'b', 'c'])
+    return store
+
+  def _vectors(self, store):
+    vectors = store.collection.get(ids=['a', 'b', 'c'], include=['embeddings'])['embeddings']
+    return [[round(float(x), 4) for x in v] for v in vectors]
+
+  def test_raw_collection_is_normalized_in_place_in_the_background(self):
+    store = self._store([[3.0, 4.0, 0.0], [0.0, 0.0, 2.0], [1.0, 1.0, 1.0]])
+
+    raw = _CountingEmbedder()
+    self._memory(raw, store)._sync_embedding_variant()
+    self.assertEqual(store.get_col_metadata(), {'embedding_variant': 'raw'})
+
+    normalized = _CountingEmbedder()
+    normalized.embedding_variant = 'l2norm'
+    memory = self._memory(normalized, store)
+    memory._sync_embedding_variant()
+    memory._embedding_migration.join(timeout=10)
+    self.assertEqual(normalized.calls, [])  # no re-embedding, only normalization
+    self.assertEqual(store.get_col_metadata()['embedding_variant'], 'l2norm')
+    self.assertEqual(self._vectors(store), [[0.6, 0.8, 0.0], [0.0, 0.0, 1.0], [0.5774, 0.5774, 0.5774]])
+
+    memory._embedding_migration = None
+    memory._sync_embedding_variant()
+    self.assertIsNone(memory._embedding_migration)
+
+  def test_interrupted_normalization_resumes_from_its_cursor(self):
+    store = self._store([[3.0, 4.0, 0.0], [0.0, 0.0, 2.0], [1.0, 1.0, 1.0]])
+    store.set_col_metadata(embedding_variant='raw', embedding_migration_offset=1)
+    normalized = _CountingEmbedder()
+    normalized.embedding_variant = 'l2norm'
+
+    self.assertEqual(self._memory(normalized, store).normalize_stored_vectors(batch_size=1), 2)
+    self.assertEqual(self._vectors(store)[0], [3.0, 4.0, 0.0])  # already past the cursor
+    self.assertEqual(self._vectors(store)[1], [0.0, 0.0, 1.0])
+    metadata = store.get_col_metadata()
+    self.assertEqual((metadata['embedding_variant'], metadata['embedding_migration_offset']), ('l2norm', 0))
+
+  def test_failed_normalization_keeps_the_old_variant(self):
+    store = self._store([[3.0, 4.0, 0.0], [0.0, 0.0, 2.0], [1.0, 1.0, 1.0]])
+    store.set_col_metadata(embedding_variant='raw')
+    memory = self._memory(_CountingEmbedder(), store)
+    original = store.update_vectors
+    calls = []
+
+    def flaky(ids, vectors):
+      calls.append(ids)
+      if len(calls) == 2:
+        raise RuntimeError('disk full')
+      original(ids, vectors)
+
+    store.update_vectors = flaky
+    self.assertEqual(memory.normalize_stored_vectors(batch_size=1), 1)
+    metadata = store.get_col_metadata()
+    self.assertEqual((metadata['embedding_variant'], metadata['embedding_migration_offset']), ('raw', 1))
+
+  def test_reembed_all_records_the_embedders_variant(self):
+    store = self._store([[9.0, 9.0, 9.0], [9.0, 9.0, 9.0], [1.0, 1.0, 1.0]])
+    normalized = _CountingEmbedder()
+    normalized.embedding_variant = 'l2norm'
+    self.assertEqual(self._memory(normalized, store).reembed_all(), 2)
+    self.assertEqual(sorted(normalized.calls[0]), ['abc', 'hello'])
+    self.assertEqual(self._vectors(store), [[3.0, 0.5, -1.0], [5.0, 0.5, -1.0], [1.0, 1.0, 1.0]])
+    self.assertEqual(store.get_col_metadata()['embedding_variant'], 'l2norm')
+
+if __name__ == '__main__':
+  unittest.main()
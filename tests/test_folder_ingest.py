@@ -0,0 +1,178 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from memscreen.file_loader import FileLoader
+from memscreen.file_processor import FolderProcessor
+from memscreen.memory.memory import Memory
+from memscreen.storage import IngestManifestRepository, get_pool
+
+
+class _FakeEmbedder:
+  def __init__(self):
+    self.batches = []
+
+  def embed_batch(self, texts, memory_action=None):
+    self.batches.append(len(texts))
+    return [[float(len(text)), 1.0] for text in texts]
+
+
+class _FakeVectorStore:
+  def __init__(self):
+    self.rows = {}
+    self.inserts = []
+
+  def insert(self, vectors, payloads=None, ids=None):
+    self.inserts.append(len(ids))
+    self.rows.update(zip(ids, payloads))
+
+
+def _memory():
+  memory = Memory.__new__(Memory)
+  memory.collection_name = 'ingest-test'
+  memory.config = SimpleNamespace(timezone='UTC')
+  memory.embedding_model = _FakeEmbedder()
+  memory.vector_store = _FakeVectorStore()
+  memory.db = SimpleNamespace(add_history=lambda *args, **kwargs: None)
+  memory.delete = lambda memory_id: memory.vector_store.rows.pop(memory_id)
+  return memory
+
+
+class FolderIngestTest(unittest.TestCase):
+  def setUp(self):
+    self.tmp = tempfile.mkdtemp()
+    self.root = Path(self.tmp) / 'docs'
+    (self.root / 'sub').mkdir(parents=True)
+    (self.root / 'a.md').write_text('\n'.join(f'line {i} ' + 'x' * 60 for i in range(100)))
+    (self.root / 'sub' / 'b.txt').write_text('short note')
+    (self.root / 'empty.txt').write_text('')
+    (self.root / 'image.bin').write_bytes(b'\x00\x01')
+    self.db_path = str(Path(self.tmp) / 'manifest.db')
+    self.manifest = IngestManifestRepository(self.db_path)
+    patcher = mock.patch('memscreen.memory.memory.capture_event')
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def tearDown(self):
+    get_pool(self.db_path).close()
+    shutil.rmtree(self.tmp)
+
+  def _ingest(self, memory, **kwargs):
+    return FolderProcessor(str(self.root)).ingest(
+        memory, user_id='alice', manifest=self.manifest, chunk_size=500, batch_size=8, **kwargs)
+
+  def test_ingest_stores_chunks_in_batches_and_skips_unchanged_files(self):
+    memory = _memory()
+    summary = self._ingest(memory)
+    store = memory.vector_store
+
+    self.assertEqual((summary['files'], summary['skipped'], summary['failed']), (3, 0, 0))
+    self.assertEqual(summary['memories'], len(store.rows))
+    self.assertGreater(summary['chunks'], 8)
+    self.assertLessEqual(max(store.inserts), 8)
+    self.assertEqual(memory.embedding_model.batches, store.inserts)
+    payload = next(p for p in store.rows.values() if p['relative_path'] == os.path.join('sub', 'b.txt'))
+    self.assertEqual((payload['data'], payload['user_id'], payload['chunk_count']), ('short note', 'alice', 1))
+
+    again = self._ingest(memory)
+    self.assertEqual((again['files'], again['skipped'], again['memories']), (0, 3, 0))
+
+    b_path = self.root / 'sub' / 'b.txt'
+    b_path.write_text('a longer, edited note')
+    stat = b_path.stat()
+    os.utime(b_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    edited = self._ingest(memory)
+    self.assertEqual((edited['files'], edited['skipped'], edited['replaced']), (1, 2, 1))
+    self.assertEqual(len(store.rows), summary['memories'])
+    self.assertIn('a longer, edited note', [p['data'] for p in store.rows.values()])
+    self.assertNotIn('short note', [p['data'] for p in store.rows.values()])
+
+  def test_deleted_and_unloadable_files_lose_their_memories(self):
+    memory = _memory()
+    self._ingest(memory)
+    store = memory.vector_store
+    a_path, b_path = str(self.root / 'a.md'), str(self.root / 'sub' / 'b.txt')
+    a_ids = self.manifest.get_many([a_path], 'user_id=alice')[a_path][2]
+
+    os.remove(a_path)
+    b_stat = os.stat(b_path)
+    os.utime(b_path, ns=(b_stat.st_atime_ns, b_stat.st_mtime_ns + 10**9))
+    with mock.patch.object(FolderProcessor, '_load_file', return_value=None):
+      summary = self._ingest(memory)
+
+    self.assertEqual((summary['failed'], summary['removed']), (1, len(a_ids) + 1))
+    self.assertEqual(store.rows, {})
+    self.assertEqual(set(self.manifest.list_under(str(self.root), 'user_id=alice')), {str(self.root / 'empty.txt')})
+
+  def test_manifest_is_kept_per_scope(self):
+    memory = _memory()
+    first = self._ingest(memory)
+    other = FolderProcessor(str(self.root)).ingest(
+        memory, user_id='bob', manifest=self.manifest, chunk_size=500, batch_size=8)
+    self.assertEqual((other['files'], other['skipped'], other['replaced']), (3, 0, 0))
+    self.assertEqual(len(memory.vector_store.rows), 2 * first['memories'])
+    self.assertEqual(sorted({p['user_id'] for p in memory.vector_store.rows.values()}), ['alice', 'bob'])
+
+  def test_manifest_without_scopes_is_migrated(self):
+    pool = get_pool(self.db_path)
+    with pool.connection() as conn:
+      conn.execute('CREATE TABLE ingest_manifest (path TEXT PRIMARY KEY, size INTEGER NOT NULL, '
+                   "mtime_ns INTEGER NOT NULL, memory_ids TEXT NOT NULL DEFAULT '[]', ingested_at REAL NOT NULL)")
+      conn.execute("INSERT INTO ingest_manifest VALUES ('/x/a.md', 3, 7, '[\"m1\"]', 1.0)")
+      conn.commit()
+    self.assertEqual(self.manifest.get_many(['/x/a.md']), {'/x/a.md': (3, 7, ['m1'])})
+    self.assertEqual(self.manifest.get_many(['/x/a.md'], 'user_id=alice'), {})
+
+  def test_iter_files_yields_records_in_scan_order(self):
+    processor = FolderProcessor(str(self.root))
+    paths = processor.scan_directory()
+    records = list(processor.iter_files(paths, max_workers=3))
+    self.assertEqual([r['path'] for r in records], paths)
+    self.assertEqual(processor.results['success'], [])  # streamed, not accumulated
+
+    results = FolderProcessor(str(self.root)).process_folder(max_workers=3)
+    self.assertEqual(results['success_count'], 3)
+    self.assertEqual(results['success'][-1]['content'], 'short note')
+
+  def test_read_file_matches_text_mode_decoding(self):
+    path = Path(self.tmp) / 'gbk.txt'
+    text = '中文文本内容\r\nsecond line\r\n' * 4000
+    path.write_bytes(text.encode('gbk'))
+    content, encoding = FileLoader.read_file(str(path))
+    with open(path, 'r', encoding=encoding) as f:
+      self.assertEqual(content, f.read())
+    self.assertGreater(len(content), FileLoader.VALIDATION_CHARS)
+    self.assertNotIn('\r', content)
+
+  def test_chunk_text_prefers_line_breaks_and_overlaps(self):
+    text = '\n'.join(f'{i:03d} ' + 'y' * 20 for i in range(40))
+    chunks = FolderProcessor.chunk_text(text, chunk_size=200, overlap=30)
+    self.assertTrue(all(len(c) <= 200 for c in chunks))
+    self.assertTrue(all(c.endswith('y') for c in chunks))
+    self.assertIn('039', chunks[-1])
+    self.assertEqual(FolderProcessor.chunk_text('  \n '), [])
+
+  @unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+  def test_ingest_throughput(self):
+    for i in range(200):
+      (self.root / 'sub' / f'doc{i}.md').write_text(f'# Doc {i}\n' + ('paragraph text ' * 10 + '\n') * 400)
+    variants = (('1 thread', {'max_workers': 1}), ('4 threads', {'max_workers': 4}),
+                ('4 processes', {'max_workers': 4, 'use_processes': True}))
+    for n, (label, kwargs) in enumerate(variants):
+      get_pool(self.db_path).close()
+      self.db_path = str(Path(self.tmp) / f'manifest{n}.db')
+      self.manifest = IngestManifestRepository(self.db_path)
+      summary = self._ingest(_memory(), **kwargs)
+      print(f"\n{label:>11}: {summary['files_per_sec']:.0f} files/sec ({summary['memories']} memories)")
+    started = time.perf_counter()
+    rerun = self._ingest(_memory())
+    print(f"\nunchanged re-run: {rerun['skipped']} files skipped in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from memscreen.services.frame_change import FrameChangeDetector
+
+
+class FrameChangeDetectorTest(unittest.TestCase):
+  def test_skips_identical_frames_and_records_repeat_markers(self):
+    detector = FrameChangeDetector(threshold=1.0, max_hold_seconds=None)
+    idle = np.full((120, 160, 3), 40, dtype=np.uint8)
+    changed = idle.copy()
+    changed[:60, :80] = 220
+
+    self.assertTrue(detector.check(idle, 0.0)[0])
+    self.assertFalse(detector.check(idle.copy(), 2.0)[0])
+    self.assertFalse(detector.check(idle.copy(), 4.0)[0])
+    keep, score = detector.check(changed, 6.0)
+    self.assertTrue(keep)
+    self.assertGreater(score, 1.0)
+    self.assertFalse(detector.check(changed.copy(), 8.0)[0])
+
+    self.assertEqual(detector.repeat_markers(), [[0, 2.0, 4.0, 2], [1, 8.0, 8.0, 1]])
+    stats = detector.stats()
+    self.assertEqual(stats['frames_seen'], 5)
+    self.assertEqual(stats['frames_kept'], 2)
+    self.assertEqual(stats['frames_skipped'], 3)
+
+  def test_max_hold_forces_periodic_keyframe(self):
+    detector = FrameChangeDetector(threshold=5.0, max_hold_seconds=10.0)
+    frame = np.zeros((64, 64), dtype=np.uint8)
+    kept = [detector.check(frame, float(t))[0] for t in range(0, 24, 2)]
+    self.assertEqual([t for t, k in zip(range(0, 24, 2), kept) if k], [0, 10, 20])
+
+  def test_segment_boundary_restarts_markers_but_keeps_counters(self):
+    detector = FrameChangeDetector(threshold=1.0)
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+    detector.check(frame, 0.0)
+    detector.check(frame, 1.0)
+    detector.start_segment()
+
+    self.assertEqual(detector.repeat_markers(), [])
+    self.assertTrue(detector.check(frame, 0.0)[0])
+    self.assertEqual(detector.stats()['frames_seen'], 3)
+
+  def test_zero_threshold_keeps_every_frame(self):
+    detector = FrameChangeDetector(threshold=0)
+    frame = np.zeros((16, 16, 3), dtype=np.uint8)
+    self.assertTrue(all(detector.check(frame, float(t))[0] for t in range(5)))
+    self.assertEqual(detector.repeat_markers(), [])
+
+
+if __name__ == '__main__':
+  unittest.main()
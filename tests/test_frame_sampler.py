@@ -0,0 +1,89 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from memscreen.cache import CacheRegistry
+from memscreen.cv2_loader import get_cv2
+from memscreen.services.frame_sampler import VideoFrameSampler
+
+
+def _write_video(cv2, path, frame_count):
+  writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 2.0, (64, 48))
+  for idx in range(frame_count):
+    writer.write(np.full((48, 64, 3), idx * 8, dtype=np.uint8))
+  writer.release()
+
+
+class VideoFrameSamplerTest(unittest.TestCase):
+  def setUp(self):
+    self.cv2 = get_cv2()
+    if self.cv2 is None:
+      self.skipTest('cv2 not available')
+    self._tmp = TemporaryDirectory()
+    self.addCleanup(self._tmp.cleanup)
+    self.path = os.path.join(self._tmp.name, 'clip.avi')
+    _write_video(self.cv2, self.path, 20)
+
+  def test_single_pass_sampling_matches_requested_frames(self):
+    sampler = VideoFrameSampler()
+    samples = sampler.sample(self.path, [15, 3, 9, 99])
+
+    self.assertEqual([s['source_frame'] for s in samples], [3, 9, 15])
+    self.assertEqual([s['time_offset'] for s in samples], [1.5, 4.5, 7.5])
+    for sample in samples:
+      expected = sample['source_frame'] * 8
+      self.assertLess(abs(float(sample['frame'].mean()) - expected), 3.0)
+    # One forward pass: frames 0..15 decoded exactly once.
+    self.assertEqual(sampler.decoded_frames, 16)
+
+  def test_cache_reuses_decoded_frames_and_tracks_mtime(self):
+    sampler = VideoFrameSampler()
+    first = sampler.sample(self.path, lambda total: [0, total - 1])
+    decoded = sampler.decoded_frames
+    second = sampler.sample(self.path, [0, 19])
+
+    self.assertEqual(sampler.decoded_frames, decoded)
+    self.assertIs(first[0]['frame'], second[0]['frame'])
+    self.assertEqual(sampler.stats()['hits'], 2)
+    self.assertEqual(sampler.probe(self.path), (20, 2.0))
+
+    sampler.invalidate(self.path)
+    self.assertEqual(sampler.stats()['files'], 0)
+
+  def test_max_width_downscales_and_byte_budget_evicts(self):
+    sampler = VideoFrameSampler(max_cache_bytes=64 * 48 * 3 * 2)
+    small = sampler.sample(self.path, [1], max_width=32)
+    self.assertEqual(small[0]['frame'].shape, (24, 32, 3))
+
+    sampler.sample(self.path, [2, 3, 4, 5])
+    self.assertLessEqual(sampler.stats()['bytes'], sampler.max_cache_bytes + 64 * 48 * 3 * 4)
+    self.assertEqual(sampler.stats()['files'], 1)
+
+  def test_frames_count_against_the_registry_budget(self):
+    registry = CacheRegistry(budget_bytes=64 * 48 * 3 * 10)
+    other = registry.namespace('other')
+    sampler = VideoFrameSampler(registry=registry, cache_weight=1.0)
+    self.assertEqual(sampler.max_cache_bytes, 64 * 48 * 3 * 5)
+
+    sampler.sample(self.path, [0, 1, 2])
+    stats = registry.stats()
+    names = [name for name in stats['namespaces'] if name.startswith('frame_sampler:')]
+    self.assertEqual(len(names), 1)
+    self.assertEqual(stats['namespaces'][names[0]]['bytes'], 64 * 48 * 3 * 3)
+
+    registry.set_budget(64 * 48 * 3 * 4)
+    self.assertEqual(sampler.stats()['files'], 0)  # 3 frames no longer fit in half of 4
+    self.assertIsNotNone(other)
+
+  def test_fixed_cap_is_reported_as_a_registry_source(self):
+    registry = CacheRegistry()
+    sampler = VideoFrameSampler(max_cache_bytes=1024 * 1024, registry=registry)
+    sampler.sample(self.path, [0])
+    sources = registry.stats()['sources']
+    self.assertEqual([source['bytes'] for source in sources.values()], [64 * 48 * 3])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,110 @@
+import os
+import re
+import time
+import unittest
+
+from memscreen.memory.dynamic_models import MemoryCategory, QueryIntent
+from memscreen.memory.input_classifier import InputClassifier, _PatternTable
+
+_CORPUS = [
+    'Remember to buy milk tomorrow',
+    'What did I say about the meeting with Alice?',
+    'def parse(path):\n    import json\n    return json.load(open(path))',
+    'SELECT id, name FROM users WHERE active = 1',
+    'TODO: fix the login bug before Friday, urgent',
+    'Meeting at 3pm in room 204 with the design team',
+    'I prefer dark mode and vim keybindings',
+    'how to configure the proxy? see https://example.com/docs',
+    'File Edit View Window Help  Terminal — zsh — 80x24',
+    'Error: ModuleNotFoundError: No module named "torch"',
+    'daily standup notes: shipped the exporter',
+    'Why does the build fail on CI?',
+    'const x = async () => await fetch(url)',
+    '',
+    '   ',
+    'ok',
+]
+
+
+def _legacy_category(classifier, text):
+  """Per-pattern re.search scoring, as the classifier did before precompilation."""
+  text_lower = text.lower()
+  scores = {}
+  for category, patterns in classifier.PATTERNS.items():
+    score = sum(1 for pattern in patterns if re.search(pattern, text_lower, re.IGNORECASE))
+    if score > 0:
+      scores[category] = score
+  if not scores:
+    return MemoryCategory.GENERAL, 0.5
+  best = max(scores, key=scores.get)
+  return best, min(0.9, 0.5 + scores[best] * 0.1)
+
+
+def _legacy_intent(classifier, query):
+  for intent, patterns in classifier.QUERY_PATTERNS.items():
+    for pattern in patterns:
+      if re.search(pattern, query.lower(), re.IGNORECASE):
+        return intent
+  return QueryIntent.GENERAL_SEARCH
+
+
+class InputClassifierPatternsTest(unittest.TestCase):
+  def test_compiled_tables_match_per_pattern_search(self):
+    classifier = InputClassifier()
+    for text in _CORPUS:
+      self.assertEqual(classifier._classify_by_patterns(text), _legacy_category(classifier, text), text)
+      self.assertEqual(classifier._detect_query_intent(text), _legacy_intent(classifier, text), text)
+
+  def test_pattern_table_counts_every_pattern_independently(self):
+    table = _PatternTable({
+        'a': [r'\bcat\b', r'dog', r'^the'],
+        'b': [r'cat', r'\?$'],
+        'c': [r'zebra'],
+    })
+    self.assertEqual(table.counts('the dog chased a cat?'), {'a': 3, 'b': 2})
+    self.assertEqual(table.counts('nothing here'), {})
+    self.assertEqual(table.first('a dog?'), 'a')
+    self.assertEqual(table.first('why?'), 'b')
+    self.assertIsNone(table.first('nothing'))
+
+  def test_classify_cached_is_a_bounded_lru(self):
+    classifier = InputClassifier(cache_size=3)
+    calls = []
+    classify = classifier.classify_input
+    classifier.classify_input = lambda text: (calls.append(text), classify(text))[1]
+
+    first = classifier.classify_cached('remember the milk')
+    self.assertIs(classifier.classify_cached('remember the milk'), first)
+    for text in ('a', 'b', 'c'):
+      classifier.classify_cached(text)
+    classifier.classify_cached('remember the milk')
+
+    self.assertEqual(calls, ['remember the milk', 'a', 'b', 'c', 'remember the milk'])
+    self.assertEqual(len(classifier._classification_cache), 3)
+    self.assertEqual(classifier._classification_cache.stats()['hits'], 1)
+    self.assertEqual(len(InputClassifier()._classification_cache), 0)  # not shared between instances
+
+  @unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+  def test_per_call_cost_over_chat_and_ocr_corpus(self):
+    classifier = InputClassifier()
+    corpus = [f'{text} #{i}' for i in range(200) for text in _CORPUS]
+    repeated = _CORPUS * 200
+    variants = (
+        ('per-pattern', lambda text: _legacy_category(classifier, text), corpus),
+        ('compiled', classifier._classify_by_patterns, corpus),
+        ('classify_input', classifier.classify_input, corpus),
+        ('cached (misses)', classifier.classify_cached, corpus),
+        ('cached (repeats)', classifier.classify_cached, repeated),
+    )
+    for label, classify, corpus in variants:
+      for text in corpus[:50]:
+        classify(text)
+      started = time.perf_counter()
+      for text in corpus:
+        classify(text)
+      elapsed = time.perf_counter() - started
+      print(f'\n{label:>16}: {elapsed / len(corpus) * 1e6:.1f} us/call')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -4,7 +4,7 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 
 from memscreen.process_mining import ProcessMiningAnalyzer
-from memscreen.storage import InputEventRepository
+from memscreen.storage import InputEventRepository, InputEventWriter
 
 
 class InputEventRepositoryTest(unittest.TestCase):
@@ -73,6 +73,33 @@ class InputEventRepositoryTest(unittest.TestCase):
       self.assertEqual(events[1]['activity'], 'mouse_press')
       self.assertEqual(events[1]['resource'], 'mouse')
 
+  def test_writer_batches_events_and_flushes_on_demand(self):
+    with TemporaryDirectory() as tmp:
+      repo = InputEventRepository(str(Path(tmp) / 'input.db'))
+      writer = InputEventWriter(repo, batch_size=50, flush_interval=30.0)
+      writer.start()
+      try:
+        for i in range(5):
+          self.assertTrue(writer.submit('keyboard', 'press', str(i), '', '2026-03-09T10:00:00+08:00'))
+        writer.flush()
+        self.assertEqual(writer.stats()['written'], 5)
+        self.assertEqual(repo.get_latest_event_id(), 5)
+        self.assertEqual(repo.list_recent_events(limit=1)[0]['content'], '4')
+      finally:
+        writer.stop()
+      self.assertEqual(writer.stats()['pending'], 0)
+      self.assertLessEqual(writer.stats()['batches'], 2)
+
+  def test_writer_drops_when_queue_is_full(self):
+    with TemporaryDirectory() as tmp:
+      repo = InputEventRepository(str(Path(tmp) / 'input.db'))
+      writer = InputEventWriter(repo, max_pending=3)
+      accepted = [writer.submit('mouse', 'press', 'left') for _ in range(5)]
+      self.assertEqual(accepted, [True, True, True, False, False])
+      self.assertEqual(writer.stats()['dropped'], 2)
+      writer.stop()
+      self.assertEqual(repo.get_latest_event_id(), 3)
+
 
 if __name__ == '__main__':
   unittest.main()
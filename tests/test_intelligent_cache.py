@@ -0,0 +1,128 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from memscreen.cache import IntelligentCache
+from memscreen.memory.memory import Memory
+
+
+class IntelligentCacheTest(unittest.TestCase):
+  def test_scoped_invalidation_only_drops_dependent_entries(self):
+    cache = IntelligentCache(max_size=10)
+    cache.set('alice', 1, scopes=['user_id=alice'])
+    cache.set('bob', 2, scopes=['user_id=bob'])
+    cache.set('all', 3, scopes=['*all'])
+
+    cache.invalidate(['user_id=alice'])
+    self.assertIsNone(cache.get('alice'))
+    self.assertEqual(cache.get('bob'), 2)
+    self.assertEqual(cache.get('all'), 3)
+
+    cache.invalidate()
+    self.assertIsNone(cache.get('bob'))
+    self.assertEqual(cache.get_stats()['invalidations'], 2)
+
+  def test_snapshot_taken_before_a_write_makes_the_result_stale(self):
+    cache = IntelligentCache()
+    generations = cache.snapshot(['user_id=alice'])
+    cache.invalidate(['user_id=alice'])  # write lands while the search runs
+    cache.set('q', ['old'], generations=generations)
+    self.assertIsNone(cache.get('q'))
+
+  def test_generation_counters_stay_bounded(self):
+    cache = IntelligentCache(max_size=10)
+    for run in range(20000):
+      cache.invalidate([f'run_id={run}'])
+    self.assertEqual(len(cache._generations), IntelligentCache.GENERATION_BUCKETS)
+
+    cache.set('run', 1, scopes=['run_id=7'])
+    self.assertEqual(cache.get('run'), 1)
+    cache.invalidate(['run_id=7'])
+    self.assertIsNone(cache.get('run'))
+
+  def test_background_sweeper_removes_expired_entries(self):
+    cache = IntelligentCache(default_ttl=0.01, sweep_interval=0.02)
+    try:
+      cache.set('a', 1)
+      deadline = time.time() + 2
+      while len(cache) and time.time() < deadline:
+        time.sleep(0.01)
+      self.assertEqual(len(cache), 0)
+    finally:
+      cache.stop_sweeper()
+
+  def test_concurrent_access_keeps_size_bounded(self):
+    cache = IntelligentCache(max_size=50)
+    errors = []
+
+    def worker(offset):
+      try:
+        for i in range(2000):
+          key = f'{offset}:{i % 80}'
+          cache.set(key, i, scopes=[f'user_id={offset % 3}'])
+          cache.get(key)
+          if i % 97 == 0:
+            cache.invalidate([f'user_id={i % 3}'])
+            cache.cleanup_expired()
+      except Exception as e:  # pragma: no cover - surfaced below
+        errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    self.assertEqual(errors, [])
+    self.assertLessEqual(len(cache), 50)
+
+
+class _FakeEmbedder:
+  def embed(self, text, memory_action=None):
+    return [1.0, 0.0]
+
+
+class _FakeVectorStore:
+  def __init__(self):
+    self.rows = []
+    self.searches = 0
+
+  def search(self, query, vectors, limit, filters):
+    self.searches += 1
+    return [
+        SimpleNamespace(id=str(i), score=0.9, payload=payload)
+        for i, payload in enumerate(self.rows)
+        if all(payload.get(k) == v for k, v in filters.items())
+    ][:limit]
+
+
+class MemorySearchCacheTest(unittest.TestCase):
+  def _memory(self, collection):
+    memory = Memory.__new__(Memory)
+    memory.collection_name = collection
+    memory.enable_search_cache = True
+    memory.embedding_model = _FakeEmbedder()
+    memory.vector_store = _FakeVectorStore()
+    return memory
+
+  def test_writes_invalidate_only_matching_user_searches(self):
+    memory = self._memory('cache-test-collection')
+    store = memory.vector_store
+    store.rows.append({'data': 'first', 'user_id': 'alice'})
+
+    self.assertEqual(len(memory._search_vector_store('q', {'user_id': 'alice'}, 5)), 1)
+    memory._search_vector_store('q', {'user_id': 'bob'}, 5)
+    memory._search_vector_store('q', {'user_id': 'alice'}, 5)
+    self.assertEqual(store.searches, 2)
+
+    payload = {'data': 'enriched', 'user_id': 'alice'}
+    store.rows.append(payload)
+    memory.invalidate_search_cache(payload)
+
+    self.assertEqual(len(memory._search_vector_store('q', {'user_id': 'alice'}, 5)), 2)
+    memory._search_vector_store('q', {'user_id': 'bob'}, 5)
+    self.assertEqual(store.searches, 3)
+
+
+if __name__ == '__main__':
+  unittest.main()
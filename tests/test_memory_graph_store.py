@@ -0,0 +1,156 @@
+import os
+import time
+import unittest
+from collections import deque
+
+from memscreen.graph.memory_graph import MemoryGraphStore
+from memscreen.graph.models import GraphEdge, GraphNode
+
+
+def _node(node_id, label, **properties):
+  return GraphNode(id=node_id, label=label, node_type='entity', properties=properties, created_at='t')
+
+
+def _edge(edge_id, source, target):
+  return GraphEdge(id=edge_id, source=source, target=target, edge_type='related_to', created_at='t')
+
+
+def _scan_search(store, query, limit=10, filters=None):
+  query_lower = query.lower()
+  results = []
+  for node in store.nodes.values():
+    texts = [node.label.lower()] + [v.lower() for v in node.properties.values() if isinstance(v, str)]
+    if any(query_lower in t for t in texts) and (
+        filters is None or all(node.properties.get(k) == v for k, v in filters.items())):
+      results.append(node)
+  return results[:limit]
+
+
+def _copying_bfs(store, source_id, target_id, max_depth=3):
+  queue = deque([(source_id, [source_id])])
+  visited = {source_id}
+  while queue:
+    current_id, path = queue.popleft()
+    if current_id == target_id:
+      return path
+    if len(path) >= max_depth + 1:
+      continue
+    for neighbor_id, _ in store.adjacency[current_id]:
+      if neighbor_id not in visited:
+        visited.add(neighbor_id)
+        queue.append((neighbor_id, path + [neighbor_id]))
+  return []
+
+
+class MemoryGraphStoreTest(unittest.TestCase):
+  def setUp(self):
+    self.store = MemoryGraphStore()
+    self.store.add_node(_node('a', 'Python', kind='language', owner='alice'))
+    self.store.add_node(_node('b', 'Jupyter notebook', kind='tool', note='runs python code'))
+    self.store.add_node(_node('c', 'Rust', kind='language', tags=['systems']))
+    self.store.add_node(_node('d', 'Py', kind='language'))
+
+  def test_search_keeps_substring_semantics_and_insertion_order(self):
+    for query in ('pyth', 'PY', 'o', '', 'ust', 'missing', 'notebook'):
+      self.assertEqual(
+          [n.id for n in self.store.search_nodes(query, limit=10)],
+          [n.id for n in _scan_search(self.store, query)],
+          query,
+      )
+    self.assertEqual([n.id for n in self.store.search_nodes('py', filters={'kind': 'language'})], ['a', 'd'])
+    self.assertEqual([n.id for n in self.store.search_nodes('', filters={'tags': ['systems']})], ['c'])
+    self.assertEqual([n.id for n in self.store.search_nodes('py', filters={'owner': None})], ['b', 'd'])
+    self.assertEqual([n.id for n in self.store.search_nodes('python', limit=1)], ['a'])
+
+  def test_indexes_follow_replacement_and_deletion(self):
+    self.store.add_node(_node('a', 'Go', kind='language'))
+    self.assertEqual([n.id for n in self.store.search_nodes('python')], ['b'])
+    self.store.delete_node('b')
+    self.assertEqual(self.store.search_nodes('python'), [])
+    self.assertEqual(self.store._trigram_index.get('pyt'), None)
+
+    self.store.delete_all(filters={'kind': 'language'})
+    self.assertEqual(self.store.nodes, {})
+
+  def test_mutated_node_readded_drops_its_old_index_entries(self):
+    node = self.store.get_node('a')
+    node.label = 'Go'
+    node.properties = {'kind': 'runtime'}
+    self.store.add_node(node)
+
+    self.assertEqual([n.id for n in self.store.search_nodes('', filters={'kind': 'language'})], ['c', 'd'])
+    self.assertEqual([n.id for n in self.store.search_nodes('', filters={'kind': 'runtime'})], ['a'])
+    self.assertNotIn(('owner', 'alice'), self.store._property_index)
+    self.assertEqual([n.id for n in self.store.search_nodes('pyth')], ['b'])
+
+  def test_readded_node_keeps_its_position_in_both_search_paths(self):
+    self.store.add_node(self.store.get_node('a'))
+    indexed = [n.id for n in self.store.search_nodes('python')]
+    scanned = [n.id for n in self.store.search_nodes('py')]
+    self.assertEqual(indexed, ['a', 'b'])
+    self.assertEqual(scanned, ['a', 'b', 'd'])
+
+    self.store.delete_node('a')
+    self.store.add_node(_node('a', 'Python'))
+    self.assertEqual([n.id for n in self.store.search_nodes('python')], ['b', 'a'])
+    self.assertEqual([n.id for n in self.store.search_nodes('py')], ['b', 'd', 'a'])
+
+  def test_find_path_and_delete_node_edges(self):
+    for node_id in 'xyz':
+      self.store.add_node(_node(node_id, node_id))
+    self.store.add_edge(_edge('e1', 'a', 'b'))
+    self.store.add_edge(_edge('e2', 'b', 'c'))
+    self.store.add_edge(_edge('e3', 'c', 'x'))
+    self.store.add_edge(_edge('e4', 'a', 'x'))
+    self.store.add_edge(_edge('e5', 'x', 'y'))
+
+    self.assertEqual([n.id for n in self.store.find_path('a', 'y')], ['a', 'x', 'y'])
+    self.assertEqual([n.id for n in self.store.find_path('a', 'a')], ['a'])
+    self.assertEqual(self.store.find_path('a', 'y', max_depth=1), [])
+    self.assertEqual(self.store.find_path('y', 'a'), [])
+
+    self.store.delete_node('x')
+    self.assertEqual(sorted(self.store.edges), ['e1', 'e2'])
+    self.assertEqual(self.store.adjacency['c'], [])
+    self.assertEqual(self.store.find_path('a', 'y'), [])
+
+
+@unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+class MemoryGraphStoreBenchmark(unittest.TestCase):
+  def test_indexed_search_and_path_on_100k_nodes(self):
+    store = MemoryGraphStore()
+    n = 100_000
+    for i in range(n):
+      store.add_node(_node(f'n{i}', f'entity {i} topic{i % 500}', kind=f'k{i % 50}', source='memory'))
+    for i in range(n - 1):
+      store.add_edge(_edge(f'e{i}', f'n{i}', f'n{i + 1}'))
+      if i % 7 == 0 and i + 13 < n:
+        store.add_edge(_edge(f's{i}', f'n{i}', f'n{i + 13}'))
+
+    queries = ['topic499', 'entity 99999', 'topic42 ', 'missing-term']
+
+    start = time.perf_counter()
+    for query in queries:
+      _scan_search(store, query, filters={'kind': 'k7'})
+    scan_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in queries:
+      store.search_nodes(query, filters={'kind': 'k7'})
+    indexed_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = _copying_bfs(store, 'n0', 'n99999', max_depth=400)
+    copy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    path = store.find_path('n0', 'n99999', max_depth=400)
+    pointer_time = time.perf_counter() - start
+
+    print(f'\nsearch: scan {scan_time * 1000:.1f} ms, indexed {indexed_time * 1000:.1f} ms')
+    print(f'find_path: copying {copy_time * 1000:.1f} ms, parent pointers {pointer_time * 1000:.1f} ms')
+    self.assertEqual(len(path), len(expected))
+    self.assertLess(indexed_time, scan_time)
+
+
+if __name__ == '__main__':
+  unittest.main()
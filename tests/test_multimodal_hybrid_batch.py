@@ -0,0 +1,158 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+import unittest
+
+from memscreen.vector_store.multimodal_chroma import MultimodalChromaDB
+
+_TEXT_DIMS = 8
+_VISION_DIMS = 12
+
+
+def _unit(rng, dims):
+  vector = [rng.gauss(0, 1) for _ in range(dims)]
+  norm = sum(v * v for v in vector) ** 0.5
+  return [v / norm for v in vector]
+
+
+def _legacy_search_hybrid(store, text_embedding, vision_embedding, limit=10, fusion_weight=0.6):
+  """The previous search_hybrid: sequential queries, payloads from one list only."""
+  text_results = store.text_store.search(query='', vectors=[text_embedding], limit=limit * 2) if text_embedding else []
+  vision_results = store.vision_store.search(query='', vectors=[vision_embedding], limit=limit * 2) if vision_embedding else []
+  text_scores = {r.id: 1 / (61 + i) for i, r in enumerate(text_results)}
+  vision_scores = {r.id: 1 / (61 + i) for i, r in enumerate(vision_results)}
+  fused = {
+      mid: fusion_weight * text_scores.get(mid, 0) + (1 - fusion_weight) * vision_scores.get(mid, 0)
+      for mid in set(text_scores) | set(vision_scores)
+  }
+  result_map = {r.id: r for r in (text_results or vision_results)}
+  ranked = sorted(fused, key=fused.get, reverse=True)[:limit]
+  return [result_map[mid] for mid in ranked if mid in result_map]
+
+
+class MultimodalHybridBatchTest(unittest.TestCase):
+  def setUp(self):
+    self.db_dir = tempfile.mkdtemp()
+    self.store = MultimodalChromaDB(
+        collection_name='hybrid_batch',
+        text_embedding_dims=_TEXT_DIMS,
+        vision_embedding_dims=_VISION_DIMS,
+        path=self.db_dir,
+    )
+    self.rng = random.Random(7)
+
+  def tearDown(self):
+    self.store.reset()
+    shutil.rmtree(self.db_dir)
+
+  def _populate(self, both=40, vision_only=40):
+    vectors = {}
+    for i in range(both):
+      mid = f'both-{i}'
+      vectors[mid] = (_unit(self.rng, _TEXT_DIMS), _unit(self.rng, _VISION_DIMS))
+      self.store.insert_multimodal(
+          ids=[mid], text_embeddings=[vectors[mid][0]], vision_embeddings=[vectors[mid][1]],
+          payloads=[{'content': mid}])
+    for i in range(vision_only):
+      mid = f'frame-{i}'
+      vectors[mid] = (None, _unit(self.rng, _VISION_DIMS))
+      self.store.insert_multimodal(ids=[mid], vision_embeddings=[vectors[mid][1]], payloads=[{'content': mid}])
+    return vectors
+
+  def test_vision_only_hits_keep_their_payload(self):
+    vectors = self._populate(both=5, vision_only=5)
+    results = self.store.search_hybrid(
+        query_text_embedding=vectors['both-0'][0],
+        query_vision_embedding=vectors['frame-0'][1],
+        limit=10,
+    )
+    by_id = {r.id: r for r in results}
+    self.assertIn('frame-0', by_id)
+    self.assertEqual(by_id['frame-0'].payload['content'], 'frame-0')
+    self.assertEqual(by_id['both-0'].payload['content'], 'both-0')
+
+  def test_vision_hits_are_hydrated_from_text_collection_in_one_call(self):
+    self.store.text_store.insert(vectors=[[1.0] + [0.0] * (_TEXT_DIMS - 1)], payloads=[{'content': 'full'}], ids=['m1'])
+    self.store.vision_store.insert(vectors=[[1.0] + [0.0] * (_VISION_DIMS - 1)], payloads=None, ids=['m1'])
+    self.store.text_store.insert(vectors=[[0.0, 1.0] + [0.0] * (_TEXT_DIMS - 2)], payloads=[{'content': 'other'}], ids=['m2'])
+
+    calls = []
+    original = self.store.text_store.get_many
+    self.store.text_store.get_many = lambda ids: (calls.append(list(ids)), original(ids))[1]
+
+    batches = self.store.search_hybrid_batch(
+        query_vision_embeddings=[[1.0] + [0.0] * (_VISION_DIMS - 1)] * 3, limit=1)
+    self.assertEqual([[r.id for r in hits] for hits in batches], [['m1']] * 3)
+    self.assertTrue(all(hits[0].payload == {'content': 'full'} for hits in batches))
+    self.assertEqual(calls, [['m1']])
+
+  def test_batch_matches_single_queries(self):
+    vectors = self._populate(both=20, vision_only=20)
+    text_queries = [vectors[f'both-{i}'][0] for i in range(4)] + [None]
+    vision_queries = [vectors[f'frame-{i}'][1] for i in range(4)] + [vectors['both-3'][1]]
+
+    batches = self.store.search_hybrid_batch(text_queries, vision_queries, limit=5)
+    self.assertEqual(len(batches), 5)
+    for text_q, vision_q, hits in zip(text_queries, vision_queries, batches):
+      single = self.store.search_hybrid(query_text_embedding=text_q, query_vision_embedding=vision_q, limit=5)
+      self.assertEqual([(r.id, r.score) for r in hits], [(r.id, r.score) for r in single])
+
+    with self.assertRaises(ValueError):
+      self.store.search_hybrid_batch([vectors['both-0'][0]], [None, None])
+    with self.assertRaises(ValueError):
+      self.store.search_hybrid_batch([None])
+
+  def test_retriever_batches_uncached_queries(self):
+    from memscreen.memory.hybrid_retriever import HybridRetrieverConfig, HybridVisionRetriever
+
+    vectors = self._populate(both=10, vision_only=0)
+    lookup = {f'q{i}': vectors[f'both-{i}'][0] for i in range(3)}
+
+    class _Embedder:
+      batches = []
+
+      def embed_batch(self, texts, memory_action=None):
+        self.batches.append(list(texts))
+        return [lookup[text] for text in texts]
+
+    embedder = _Embedder()
+    retriever = HybridVisionRetriever(
+        text_embedder=embedder, vision_encoder=None, vector_store=self.store,
+        config=HybridRetrieverConfig(enable_query_rewriting=False))
+    retriever.retrieve_batch(['q0'], limit=3)
+    results = retriever.retrieve_batch(['q0', 'q1', 'q2'], limit=3)
+
+    self.assertEqual([hits[0].id for hits in results], ['both-0', 'both-1', 'both-2'])
+    self.assertEqual(embedder.batches, [['q0'], ['q1', 'q2']])
+
+  @unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+  def test_recall_and_latency_against_sequential_path(self):
+    vectors = self._populate(both=500, vision_only=500)
+    targets = [f'both-{i}' for i in range(0, 500, 25)] + [f'frame-{i}' for i in range(0, 500, 25)]
+    # Screen frames have no text embedding, so their text query matches something unrelated.
+    queries = [(vectors[mid][0] or _unit(self.rng, _TEXT_DIMS), vectors[mid][1]) for mid in targets]
+
+    started = time.perf_counter()
+    legacy = [_legacy_search_hybrid(self.store, t, v, limit=10, fusion_weight=0.5) for t, v in queries]
+    legacy_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    batched = self.store.search_hybrid_batch(
+        [t for t, _ in queries], [v for _, v in queries], limit=10, fusion_weight=0.5)
+    batched_ms = (time.perf_counter() - started) * 1000
+
+    def recall(results):
+      return sum(mid in {r.id for r in hits} for mid, hits in zip(targets, results)) / len(targets)
+
+    print(
+        f'\n{len(queries)} hybrid queries: sequential {legacy_ms:.1f} ms, recall {recall(legacy):.2f}; '
+        f'batched {batched_ms:.1f} ms, recall {recall(batched):.2f}'
+    )
+    self.assertGreaterEqual(recall(batched), recall(legacy))
+    self.assertTrue(all(r.payload for hits in batched for r in hits))
+
+
+if __name__ == '__main__':
+  unittest.main()
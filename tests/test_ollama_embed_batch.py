@@ -0,0 +1,97 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from memscreen.embeddings.base import BaseEmbedderConfig
+from memscreen.embeddings.ollama import OllamaEmbedding
+
+
+def _vector(text):
+  return [float(len(text)), 1.0]
+
+
+def _unit(text):
+  x, y = _vector(text)
+  norm = (x * x + y * y) ** 0.5
+  return [x / norm, y / norm]
+
+
+class _OllamaStandIn(BaseHTTPRequestHandler):
+  supports_embed = True
+  requests = []
+
+  def log_message(self, *args):
+    pass
+
+  def _reply(self, status, payload):
+    body = json.dumps(payload).encode('utf-8')
+    self.send_response(status)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Content-Length', str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def do_GET(self):
+    self._reply(200, {'models': [{'name': 'nomic-embed-text'}]})
+
+  def do_POST(self):
+    length = int(self.headers.get('Content-Length') or 0)
+    payload = json.loads(self.rfile.read(length) or b'{}')
+    type(self).requests.append((self.path, payload))
+    if self.path == '/api/embed':
+      if not type(self).supports_embed:
+        self._reply(404, {'error': '404 page not found'})
+        return
+      inputs = payload['input']
+      inputs = [inputs] if isinstance(inputs, str) else inputs
+      # Like Ollama, /api/embed normalizes; the legacy /api/embeddings does not.
+      self._reply(200, {'model': payload['model'], 'embeddings': [_unit(t) for t in inputs]})
+    elif self.path == '/api/embeddings':
+      self._reply(200, {'embedding': _vector(payload['prompt'])})
+    else:
+      self._reply(404, {'error': 'not found'})
+
+
+class OllamaEmbedBatchTest(unittest.TestCase):
+  def setUp(self):
+    _OllamaStandIn.requests = []
+    _OllamaStandIn.supports_embed = True
+    self.server = ThreadingHTTPServer(('127.0.0.1', 0), _OllamaStandIn)
+    threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    self.addCleanup(self.server.server_close)
+    self.addCleanup(self.server.shutdown)
+
+  def _embedder(self, **kwargs):
+    host, port = self.server.server_address
+    config = BaseEmbedderConfig(ollama_base_url=f'http://{host}:{port}', **kwargs)
+    embedder = OllamaEmbedding(config)
+    _OllamaStandIn.requests = []
+    return embedder
+
+  def test_batches_are_chunked_list_requests(self):
+    embedder = self._embedder(embed_batch_size=2, embed_concurrency=2)
+    texts = ['a', 'bb', 'ccc', 'dddd', 'eeeee']
+
+    self.assertEqual(embedder.embed_batch(texts, 'add'), [_unit(t) for t in texts])
+    paths = [path for path, _ in _OllamaStandIn.requests]
+    self.assertEqual(paths, ['/api/embed'] * 3)
+    sizes = sorted(len(payload['input']) for _, payload in _OllamaStandIn.requests)
+    self.assertEqual(sizes, [1, 2, 2])
+
+  def test_falls_back_to_per_text_api_when_embed_route_is_missing(self):
+    _OllamaStandIn.supports_embed = False
+    embedder = self._embedder(embed_batch_size=8, embed_concurrency=1)
+
+    vectors = embedder.embed_batch(['x', 'yy'], 'add') + [embedder.embed('zzz', 'search')]
+    # The fallback is normalized like /api/embed, so both paths share one vector space.
+    for vector, text in zip(vectors, ['x', 'yy', 'zzz']):
+      for got, want in zip(vector, _unit(text)):
+        self.assertAlmostEqual(got, want)
+    paths = [path for path, _ in _OllamaStandIn.requests]
+    self.assertEqual(paths, ['/api/embed'] + ['/api/embeddings'] * 3)
+    self.assertEqual(embedder.embedding_variant, 'l2norm')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,90 @@
+import datetime
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from memscreen.process_mining import ProcessMiningAnalyzer
+from memscreen.storage import InputEventRepository
+
+_BASE = datetime.datetime(2026, 3, 9, 10, 0, 0)
+_SCRIPT = [
+    (0.0, 'keyboard', 'press', 'ctrl'),
+    (0.2, 'keyboard', 'press', 'c'),
+    (0.9, 'keyboard', 'release', 'c'),
+    (1.5, 'keyboard', 'press', 'v'),
+    (6.0, 'mouse', 'press', 'left'),
+    (6.1, 'mouse', 'release', 'left'),
+    (3590.0, 'keyboard', 'press', 'a'),
+    (3600.5, 'keyboard', 'press', 'b'),
+    (3601.0, 'keyboard', 'press', 'c'),
+    (3601.5, 'keyboard', 'press', 'd'),
+    (3605.0, 'mouse', 'press', 'right'),
+    (3605.2, 'mouse', 'release', 'right'),
+]
+
+
+class IncrementalProcessMiningTest(unittest.TestCase):
+  def _insert(self, repo, script):
+    for offset, event_type, action, content in script:
+      repo.insert_event(
+          event_type=event_type,
+          action=action,
+          content=content,
+          details='',
+          operate_time=(_BASE + datetime.timedelta(seconds=offset)).isoformat(),
+      )
+
+  def _batch_report(self, analyzer):
+    events = analyzer.load_event_logs()
+    return {
+        'activity_frequency': analyzer.analyze_activity_frequency(events),
+        'frequent_sequences': analyzer.discover_sequences(events, min_support=2),
+        'time_patterns': analyzer.analyze_time_patterns(events),
+        'workflow_patterns': analyzer.discover_workflow_patterns(events),
+        'common_patterns': analyzer.identify_common_patterns(events),
+    }
+
+  def test_incremental_updates_match_full_analysis(self):
+    with TemporaryDirectory() as tmp:
+      db_path = str(Path(tmp) / 'input.db')
+      repo = InputEventRepository(db_path)
+      analyzer = ProcessMiningAnalyzer(db_path)
+
+      self._insert(repo, _SCRIPT[:5])
+      self.assertEqual(analyzer.update_summaries(batch_size=2), 5)
+      self._insert(repo, _SCRIPT[5:])
+      report = analyzer.generate_full_report()
+      self.assertEqual(analyzer.update_summaries(), 0)
+
+      expected = self._batch_report(analyzer)
+      self.assertEqual(report['summary']['total_events'], len(_SCRIPT))
+      self.assertEqual(report['activity_frequency'], expected['activity_frequency'])
+      self.assertEqual(
+          sorted((tuple(s), c) for s, c in report['frequent_sequences']),
+          sorted((tuple(s), c) for s, c in expected['frequent_sequences']),
+      )
+      self.assertEqual(report['common_patterns'], expected['common_patterns'])
+      self.assertEqual(report['workflow_patterns']['directly_follows'],
+                       expected['workflow_patterns']['directly_follows'])
+      self.assertEqual(report['workflow_patterns']['total_cases'], 2)
+
+      time_patterns = report['time_patterns']
+      for key in ('hourly_distribution', 'daily_distribution', 'min_duration', 'max_duration'):
+        self.assertEqual(time_patterns[key], expected['time_patterns'][key])
+      self.assertAlmostEqual(time_patterns['average_duration_between_events'],
+                             expected['time_patterns']['average_duration_between_events'])
+
+  def test_windowed_reports_still_scan_the_window(self):
+    with TemporaryDirectory() as tmp:
+      db_path = str(Path(tmp) / 'input.db')
+      self._insert(InputEventRepository(db_path), _SCRIPT)
+      analyzer = ProcessMiningAnalyzer(db_path)
+
+      report = analyzer.generate_full_report(
+          start_time=_BASE, end_time=_BASE + datetime.timedelta(minutes=30))
+      self.assertEqual(report['summary']['total_events'], 6)
+      self.assertEqual(analyzer.summary_repo.load_state(), {})
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -68,7 +68,7 @@ def test_recording_flow():
     print("\n⏹️ ...")
     result = presenter.stop_recording()
     print(f"   - : {result}")
-    print(f"   - : {len(presenter.recording_frames)}")
+    print(f"   - : {presenter.frame_count}")
 
     # Wait for save thread to complete
     print("\n⏳ ...")
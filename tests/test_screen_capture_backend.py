@@ -0,0 +1,95 @@
+import sys
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from memscreen.services import screen_capture
+from memscreen.services.screen_capture import (
+    MssCaptureBackend,
+    PILCaptureBackend,
+    create_capture_backend,
+    pil_image_to_bgr,
+)
+
+
+class _FakeShot:
+  def __init__(self, width, height):
+    self.width = width
+    self.height = height
+    pixels = np.zeros((height, width, 4), dtype=np.uint8)
+    pixels[..., 0] = 10   # B
+    pixels[..., 1] = 20   # G
+    pixels[..., 2] = 30   # R
+    pixels[..., 3] = 255  # A
+    self.raw = bytearray(pixels.tobytes())
+
+
+class _FakeMss:
+  def __init__(self):
+    self.monitors = [{'left': 0, 'top': 0, 'width': 8, 'height': 6}]
+    self.requests = []
+    self.closed = False
+
+  def grab(self, monitor):
+    self.requests.append(dict(monitor))
+    return _FakeShot(monitor['width'], monitor['height'])
+
+  def close(self):
+    self.closed = True
+
+
+class ScreenCaptureBackendTest(unittest.TestCase):
+  def setUp(self):
+    self.instances = []
+
+    def factory():
+      instance = _FakeMss()
+      self.instances.append(instance)
+      return instance
+
+    fake_module = types.SimpleNamespace(mss=factory)
+    patcher = mock.patch.dict(sys.modules, {'mss': fake_module})
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def test_mss_backend_returns_bgr_from_raw_buffer(self):
+    backend = MssCaptureBackend()
+    frame = backend.grab((10, 20, 14, 23))
+
+    self.assertEqual(frame.shape, (3, 4, 3))
+    self.assertEqual(frame.dtype, np.uint8)
+    self.assertTrue(frame.flags['C_CONTIGUOUS'])
+    self.assertEqual(frame[0, 0].tolist(), [10, 20, 30])
+    self.assertEqual(
+        self.instances[0].requests,
+        [{'left': 10, 'top': 20, 'width': 4, 'height': 3}],
+    )
+
+    full = backend.grab(None)
+    self.assertEqual(full.shape, (6, 8, 3))
+    self.assertEqual(len(self.instances), 1)
+
+    backend.close()
+    self.assertTrue(self.instances[0].closed)
+
+  def test_factory_selects_backend(self):
+    self.assertIsInstance(create_capture_backend('auto'), MssCaptureBackend)
+    self.assertIsInstance(create_capture_backend('pil'), PILCaptureBackend)
+    with self.assertRaises(ValueError):
+      create_capture_backend('x11')
+
+  def test_pil_conversion_handles_rgba(self):
+    if screen_capture.get_cv2() is None:
+      self.skipTest('cv2 not available')
+    rgba = np.zeros((2, 2, 4), dtype=np.uint8)
+    rgba[..., 0] = 30
+    rgba[..., 2] = 10
+    frame = pil_image_to_bgr(rgba)
+    self.assertEqual(frame.shape, (2, 2, 3))
+    self.assertEqual(frame[0, 0].tolist(), [10, 0, 30])
+
+
+if __name__ == '__main__':
+  unittest.main()
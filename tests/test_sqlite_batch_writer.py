@@ -0,0 +1,137 @@
+import sqlite3
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from memscreen.storage import sqlite as sqlite_storage
+from memscreen.storage.sqlite import SQLiteManager
+
+
+def _count_rows(db_path):
+  conn = sqlite3.connect(db_path)
+  try:
+    return conn.execute('SELECT COUNT(*) FROM history').fetchone()[0]
+  finally:
+    conn.close()
+
+
+class BatchWriterTest(unittest.TestCase):
+  def setUp(self):
+    self._tmp = TemporaryDirectory()
+    self.db_path = str(Path(self._tmp.name) / 'history.db')
+    self.manager = SQLiteManager(self.db_path)
+
+  def tearDown(self):
+    self.manager.close()
+    self._tmp.cleanup()
+
+  def test_timer_flushes_a_partial_batch(self):
+    self.manager.batch_writer.flush_interval = 0.05
+    self.manager.add_history('m1', None, 'hello', 'ADD')
+
+    deadline = time.time() + 2
+    while _count_rows(self.db_path) == 0 and time.time() < deadline:
+      time.sleep(0.01)
+    self.assertEqual(_count_rows(self.db_path), 1)
+    stats = self.manager.get_batch_stats()
+    self.assertEqual(stats['queue_depth'], 0)
+    self.assertEqual(stats['written'], 1)
+    self.assertGreaterEqual(stats['batches'], 1)
+
+  def test_barriers_and_reads_see_queued_writes(self):
+    self.manager.batch_writer.flush_interval = 60
+    for i in range(3):
+      self.manager.add_history('m1', None, f'v{i}', 'ADD')
+    self.assertEqual(self.manager.get_batch_stats()['queue_depth'], 3)
+
+    self.assertEqual(len(self.manager.get_history('m1')), 3)
+    self.assertEqual(_count_rows(self.db_path), 3)
+
+    self.manager.add_history('m2', None, 'x', 'ADD')
+    self.assertTrue(self.manager.wait_durable(timeout=5))
+    self.assertEqual(_count_rows(self.db_path), 4)
+    self.assertEqual(self.manager.flush(), 0)
+
+  def test_generic_operations_preserve_order(self):
+    writer = self.manager.batch_writer
+    writer.flush_interval = 60
+    writer.register_operation('mark_deleted', 'UPDATE history SET is_deleted = 1, updated_at = ? WHERE memory_id = ?')
+    writer.register_operation('delete_history', 'DELETE FROM history WHERE memory_id = ?')
+    self.manager.add_history('m1', None, 'a', 'ADD')
+    writer.add('mark_deleted', '2026-01-01', 'm1')
+    self.manager.add_history('m2', None, 'b', 'ADD')
+    writer.add('delete_history', 'm2')
+    self.assertEqual(writer.flush(), 4)
+
+    self.assertTrue(all(r['is_deleted'] for r in self.manager.get_history('m1')))
+    self.assertEqual(self.manager.get_history('m2'), [])
+    with self.assertRaises(ValueError):
+      writer.add('drop_everything')
+
+  def test_failed_flush_keeps_operations_for_retry(self):
+    writer = self.manager.batch_writer
+    writer.flush_interval = 60
+    writer.register_operation('insert_note', 'INSERT INTO notes (body) VALUES (?)')
+    writer.add('insert_note', 'kept')
+    with self.assertRaises(sqlite3.OperationalError):
+      writer.flush()
+    self.assertEqual(writer.stats()['queue_depth'], 1)
+    self.assertEqual(writer.stats()['flush_errors'], 1)
+
+    with self.manager._lock:
+      self.manager.connection.execute('CREATE TABLE notes (body TEXT)')
+    self.assertEqual(writer.flush(), 1)
+
+  def test_bad_operation_is_isolated_and_dropped_after_retries(self):
+    writer = self.manager.batch_writer
+    writer.flush_interval = 60
+    writer.register_operation('bad_insert', 'INSERT INTO history (id, memory_id) VALUES (?, ?)')
+    writer.add('bad_insert', 'dup', 'm0')
+    writer.add('bad_insert', 'dup', 'm0')  # primary key conflict, fails on every attempt
+    self.manager.add_history('m1', None, 'a', 'ADD')
+
+    for _ in range(writer.max_retries - 1):
+      with self.assertRaises(sqlite3.IntegrityError):
+        writer.flush()
+      self.assertEqual(writer.stats()['queue_depth'], 1)
+      self.assertEqual(_count_rows(self.db_path), 2)  # later writes are not held back
+
+    self.manager.add_history('m2', None, 'b', 'ADD')
+    self.assertEqual(writer.flush(), 1)
+    stats = writer.stats()
+    self.assertEqual((stats['queue_depth'], stats['dropped']), (0, 1))
+    self.assertEqual(_count_rows(self.db_path), 3)
+    self.assertTrue(self.manager.wait_durable(timeout=1))
+
+  def test_reads_do_not_block_on_a_stuck_write(self):
+    writer = self.manager.batch_writer
+    writer.flush_interval = 0.05
+    self.manager.add_history('m1', None, 'a', 'ADD')
+    self.assertTrue(self.manager.wait_durable(timeout=5))
+    writer.register_operation('insert_note', 'INSERT INTO notes (body) VALUES (?)')
+    writer.add('insert_note', 'stuck')  # table does not exist yet: stays queued
+
+    original = sqlite_storage.READ_BARRIER_TIMEOUT
+    sqlite_storage.READ_BARRIER_TIMEOUT = 0.2
+    self.addCleanup(setattr, sqlite_storage, 'READ_BARRIER_TIMEOUT', original)
+    started = time.monotonic()
+    with self.assertLogs('memscreen.storage.sqlite', level='WARNING') as logs:
+      self.assertEqual(len(self.manager.get_history('m1')), 1)
+    self.assertLess(time.monotonic() - started, 2)
+    self.assertTrue(any('still queued' in line and 'notes' in line for line in logs.output))
+    self.assertFalse(self.manager.wait_durable(timeout=0.1))
+
+    with self.manager._lock:
+      self.manager.connection.execute('CREATE TABLE notes (body TEXT)')
+    self.assertTrue(self.manager.wait_durable(timeout=5))
+
+  def test_close_makes_pending_writes_durable(self):
+    self.manager.batch_writer.flush_interval = 60
+    self.manager.add_history('m1', None, 'a', 'ADD')
+    self.manager.close()
+    self.assertEqual(_count_rows(self.db_path), 1)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sqlite3
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from memscreen.storage import (
+    InputEventRepository,
+    ProcessSessionRepository,
+    RecordingMetadataRepository,
+    get_pool,
+)
+
+
+class SQLiteConnectionPoolTest(unittest.TestCase):
+  def setUp(self):
+    self._tmp = TemporaryDirectory()
+    self.db_path = str(Path(self._tmp.name) / 'nested' / 'app.db')
+
+  def tearDown(self):
+    get_pool(self.db_path).close()
+    self._tmp.cleanup()
+
+  def test_repositories_share_connections_and_schema_work(self):
+    pool = get_pool(self.db_path)
+    sessions = ProcessSessionRepository(self.db_path)
+    calls = []
+    original = ProcessSessionRepository._create_schema
+
+    def counting_create(conn):
+      calls.append(1)
+      return original(conn)
+
+    sessions._create_schema = counting_create
+    for _ in range(20):
+      sessions.insert_session(events=[{'type': 'click'}], start_time='a', end_time='b')
+      ProcessSessionRepository(self.db_path).list_sessions(limit=5)
+      InputEventRepository(self.db_path).get_latest_event_id()
+
+    # Re-checked once more after the input-event DDL bumped schema_version.
+    self.assertEqual(len(calls), 2)
+    self.assertEqual(pool.stats()['created'], 1)
+    self.assertEqual(len(sessions.list_sessions(limit=100)), 20)
+    conn = sqlite3.connect(self.db_path)
+    try:
+      self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+    finally:
+      conn.close()
+
+  def test_column_cache_follows_schema_changes(self):
+    os.makedirs(os.path.dirname(self.db_path))
+    conn = sqlite3.connect(self.db_path)
+    try:
+      conn.execute('CREATE TABLE recordings (id INTEGER PRIMARY KEY, filename TEXT NOT NULL, frame_count INTEGER)')
+      conn.execute("INSERT INTO recordings (filename, frame_count) VALUES ('a.mp4', 3)")
+      conn.commit()
+    finally:
+      conn.close()
+
+    repo = RecordingMetadataRepository(self.db_path)
+    row = repo.get_recording('a.mp4')
+    self.assertEqual(row['frame_count'], 3)
+    self.assertEqual(row['fps'], 0.0)
+
+    repo.ensure_schema()  # migration adds the missing columns
+    repo.update_content_metadata(filename='a.mp4', content_tags=['x'], content_summary='done')
+    self.assertEqual(repo.get_recording('a.mp4')['content_summary'], 'done')
+
+  def test_replaced_database_file_is_reopened(self):
+    repo = ProcessSessionRepository(self.db_path)
+    repo.insert_session(events=[], start_time='a', end_time='b')
+    for suffix in ('', '-wal', '-shm'):
+      if os.path.exists(self.db_path + suffix):
+        os.remove(self.db_path + suffix)
+
+    self.assertEqual(repo.list_sessions(), [])
+    repo.insert_session(events=[], start_time='c', end_time='d')
+    self.assertEqual([s['start_time'] for s in repo.list_sessions()], ['c'])
+
+
+if __name__ == '__main__':
+  unittest.main()
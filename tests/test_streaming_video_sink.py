@@ -0,0 +1,161 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from memscreen.presenters.recording_presenter import RecordingPresenter
+from memscreen.services.frame_change import FrameChangeDetector
+from memscreen.services.video_sink import StreamingVideoSink
+
+
+class _FakeWriter:
+  def __init__(self, gate=None):
+    self.frames = []
+    self.values = []
+    self.released = False
+    self._gate = gate
+
+  def write(self, frame):
+    if self._gate is not None:
+      self._gate.wait(timeout=5)
+    self.frames.append(frame.shape)
+    self.values.append(int(frame[0, 0, 0]))
+
+  def release(self):
+    self.released = True
+
+
+class _FakeCv2:
+  def __init__(self):
+    self.resized = 0
+
+  def resize(self, frame, size):
+    self.resized += 1
+    width, height = size
+    return np.zeros((height, width, 3), dtype=np.uint8)
+
+
+class StreamingVideoSinkTest(unittest.TestCase):
+  def _make_sink(self, writer, path='/tmp/segment_test.mp4', **kwargs):
+    opened = []
+
+    def open_writer(cv2, path, fps, size):
+      opened.append((path, fps, size))
+      return writer, path, 'mp4'
+
+    cv2 = _FakeCv2()
+    sink = StreamingVideoSink(
+        cv2,
+        path,
+        0.5,
+        open_writer=open_writer,
+        normalize_size=lambda w, h: (w - w % 2, h - h % 2),
+        **kwargs,
+    )
+    return sink, opened, cv2
+
+  def test_streams_frames_and_normalizes_size(self):
+    writer = _FakeWriter()
+    sink, opened, cv2 = self._make_sink(writer)
+
+    self.assertTrue(sink.write(np.zeros((11, 21, 3), dtype=np.uint8)))
+    self.assertTrue(sink.write(np.zeros((10, 20, 3), dtype=np.uint8)))
+    self.assertTrue(sink.write(np.zeros((30, 40, 3), dtype=np.uint8)))
+    stats = sink.close(timeout=5)
+
+    self.assertEqual(opened, [('/tmp/segment_test.mp4', 0.5, (20, 10))])
+    self.assertEqual(writer.frames, [(10, 20, 3)] * 3)
+    self.assertTrue(writer.released)
+    self.assertEqual(stats['frames_written'], 3)
+    self.assertEqual(stats['frames_dropped'], 0)
+    self.assertEqual(cv2.resized, 2)
+    self.assertFalse(sink.write(np.zeros((10, 20, 3), dtype=np.uint8)))
+
+  def test_queue_is_bounded_and_drops_when_encoder_stalls(self):
+    gate = threading.Event()
+    writer = _FakeWriter(gate=gate)
+    sink, _opened, _cv2 = self._make_sink(writer, max_pending=2, put_timeout=0.05)
+
+    accepted = [sink.write(np.zeros((4, 4, 3), dtype=np.uint8)) for _ in range(6)]
+    self.assertLessEqual(sink.pending, 2)
+    self.assertIn(False, accepted)
+    self.assertGreater(sink.frames_dropped, 0)
+
+    gate.set()
+    stats = sink.close(timeout=5)
+    self.assertEqual(stats['frames_written'], stats['frames_submitted'])
+    self.assertEqual(stats['frames_submitted'] + stats['frames_dropped'], 6)
+
+  def test_close_without_frames_never_opens_writer(self):
+    sink, opened, _cv2 = self._make_sink(_FakeWriter())
+    stats = sink.close(timeout=5)
+    self.assertEqual(opened, [])
+    self.assertEqual(stats['frames_written'], 0)
+
+  def test_gated_recording_keeps_wall_clock_length_and_audio_sync(self):
+    # 2s capture interval; the screen changes at 0s, 10s and 20s. Capture
+    # jitter puts one frame late (8.4s) and one capture slot (12s) is missed.
+    capture_times = [0, 2, 4, 6, 8.4, 10, 14.1, 16, 18, 20, 22, 24, 26, 28]
+    screen_at = lambda t: 0 if t < 10 else (100 if t < 20 else 200)
+    audio_seconds = 30.0
+
+    writer = _FakeWriter()
+    handle, path = tempfile.mkstemp(suffix='.mp4')
+    os.close(handle)
+    self.addCleanup(os.remove, path)
+    sink, _opened, _cv2 = self._make_sink(writer, path=path)
+    detector = FrameChangeDetector(threshold=1.0)
+    started = 1_000_000.0
+    for t in capture_times:
+      frame = np.full((8, 8, 3), screen_at(t), dtype=np.uint8)
+      if detector.check(frame, t)[0]:
+        sink.write(frame, captured_at=started + t)
+      else:
+        sink.repeat(captured_at=started + t)
+
+    presenter = RecordingPresenter.__new__(RecordingPresenter)
+    presenter.memory_system = object()
+    with mock.patch.object(presenter, '_save_to_database') as save, \
+        mock.patch.object(presenter, '_add_video_to_memory') as add:
+      presenter._save_video_segment(sink, detector.repeat_markers())
+
+    self.assertEqual(detector.frames_skipped, 11)
+    self.assertEqual(sink.frames_repeated, 12)
+    self.assertEqual(len(writer.values), 15)
+    # Frame i is shown at i / fps; it must be what was on screen at that time.
+    self.assertEqual(writer.values, [screen_at(i / sink.fps) for i in range(15)])
+    _filename, frame_count, fps, duration, _size = save.call_args[0]
+    self.assertEqual((frame_count, fps), (15, 0.5))
+    self.assertAlmostEqual(duration, audio_seconds)
+    self.assertAlmostEqual(frame_count / fps, audio_seconds)
+    self.assertAlmostEqual(add.call_args[0][3], audio_seconds)
+
+  def test_long_capture_gap_is_capped_and_re_anchored(self):
+    writer = _FakeWriter()
+    sink, _opened, _cv2 = self._make_sink(writer, max_gap_seconds=10)
+    frame = lambda value: np.full((4, 4, 3), value, dtype=np.uint8)
+
+    self.assertTrue(sink.write(frame(1), captured_at=0))
+    self.assertTrue(sink.write(frame(2), captured_at=2))
+    # The machine slept for an hour: pad 10s (5 slots), then carry on from there.
+    self.assertTrue(sink.write(frame(3), captured_at=3602))
+    self.assertTrue(sink.write(frame(4), captured_at=3604))
+    stats = sink.close(timeout=5)
+
+    self.assertEqual(writer.values, [1, 2, 2, 2, 2, 2, 2, 3, 4])
+    self.assertEqual(stats['frames_repeated'], 5)
+    self.assertAlmostEqual(stats['wall_seconds'], 9 * 2.0)
+    self.assertAlmostEqual(stats['gap_seconds_skipped'], 3602 - 7 * 2.0)
+
+  def test_repeat_before_first_frame_is_ignored(self):
+    sink, opened, _cv2 = self._make_sink(_FakeWriter())
+    self.assertFalse(sink.repeat())
+    self.assertEqual(sink.close(timeout=5)['frames_written'], 0)
+    self.assertEqual(opened, [])
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,100 @@
+import datetime
+import unittest
+
+import numpy as np
+
+from memscreen.memory.temporal_vision_memory import TemporalMemoryConfig, TemporalVisionMemory
+
+
+class _BatchEncoder:
+  def __init__(self):
+    self.calls = 0
+
+  def encode_image_batch(self, image_paths, return_tensor=False, use_cache=True):
+    from PIL import Image
+
+    self.calls += 1
+    out = []
+    for path in image_paths:
+      pixels = np.asarray(Image.open(path), dtype=np.float32)
+      out.append([float(pixels[..., c].mean()) + 1.0 for c in range(3)])
+    return out
+
+
+def _reference_events(memory, features, timestamps):
+  distances = [
+      memory._compute_frame_distance(features[i - 1], features[i])
+      for i in range(1, len(features))
+  ]
+  threshold = np.mean(distances) + memory.config.scene_change_threshold * np.std(distances)
+  change_points = [i for i, d in enumerate(distances) if d > threshold]
+  events, start = [], 0
+  for point in change_points:
+    if point - start > 0:
+      events.append((start, point))
+    start = point
+  events.append((start, len(features)))
+  return events
+
+
+class TemporalSceneChangeTest(unittest.TestCase):
+  def setUp(self):
+    rng = np.random.default_rng(7)
+    self.timestamps = [
+        datetime.datetime(2026, 3, 9, 10, 0, 0) + datetime.timedelta(seconds=i)
+        for i in range(40)
+    ]
+    self.frames = []
+    for i in range(40):
+      base = 30 if i < 15 else 200 if i < 28 else 90
+      frame = np.full((24, 32, 3), base, dtype=np.uint8)
+      frame[:, :, i % 3] = np.clip(base + rng.integers(-5, 5), 0, 255)
+      self.frames.append(frame)
+
+  def test_vectorized_distances_match_pairwise_path(self):
+    memory = TemporalVisionMemory(vision_encoder=None, llm=None)
+    features = memory._extract_frame_features(self.frames, 'video.mp4')
+    rng = np.random.default_rng(3)
+    for feature in features[::2]:
+      feature['embedding'] = rng.normal(size=16).tolist()
+
+    expected = [
+        memory._compute_frame_distance(features[i - 1], features[i])
+        for i in range(1, len(features))
+    ]
+    np.testing.assert_allclose(memory._compute_frame_distances(features), expected, atol=1e-6)
+
+    events = memory._detect_scene_changes(features, self.timestamps, 'video.mp4')
+    self.assertEqual(
+        [(e['start_frame'], e['end_frame']) for e in events],
+        _reference_events(memory, features, self.timestamps),
+    )
+
+  def test_frame_embeddings_come_from_one_batch_call(self):
+    encoder = _BatchEncoder()
+    memory = TemporalVisionMemory(vision_encoder=encoder, llm=None)
+    features = memory._extract_frame_features(self.frames, 'video.mp4')
+
+    self.assertEqual(encoder.calls, 1)
+    self.assertTrue(all(f['embedding'] for f in features))
+    events = memory._detect_scene_changes(features, self.timestamps, 'video.mp4')
+    self.assertEqual(
+        [(e['start_frame'], e['end_frame']) for e in events],
+        _reference_events(memory, features, self.timestamps),
+    )
+
+  def test_rolling_threshold_uses_trailing_window(self):
+    memory = TemporalVisionMemory(
+        vision_encoder=None,
+        llm=None,
+        config=TemporalMemoryConfig(scene_change_threshold=1.0, threshold_window=4),
+    )
+    distances = np.array([0.1, 0.1, 0.1, 0.1, 5.0, 0.1, 0.1])
+    thresholds = memory._change_thresholds(distances)
+    for i in range(len(distances)):
+      window = distances[max(0, i - 3):i + 1]
+      self.assertAlmostEqual(thresholds[i], window.mean() + window.std())
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,117 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from memscreen.memory.tiered_memory_manager import MemoryTier, TieredMemoryConfig, TieredMemoryManager
+from memscreen.storage import get_pool
+from memscreen.vector_store.multimodal_chroma import MultimodalChromaDB
+
+_DIMS = 4
+
+
+class _Embedder:
+  def embed(self, text, memory_action=None):
+    # Everything that mentions "editor" sits on the same axis as the query.
+    return [1.0, 0.0, 0.0, 0.0] if 'editor' in text else [0.0, 1.0, 0.0, 0.0]
+
+
+class _LLM:
+  def __init__(self):
+    self.calls = 0
+
+  def generate_response(self, messages, options=None):
+    self.calls += 1
+    return 'summary'
+
+
+class TieredMemoryManagerTest(unittest.TestCase):
+  def setUp(self):
+    self.tmp = tempfile.mkdtemp()
+    self.db_path = str(Path(self.tmp) / 'tiers.db')
+    self.store = MultimodalChromaDB('tiers', text_embedding_dims=_DIMS, vision_embedding_dims=_DIMS, path=self.tmp)
+    self.llm = _LLM()
+
+  def tearDown(self):
+    get_pool(self.db_path).close()
+    self.store.reset()
+    shutil.rmtree(self.tmp)
+
+  def _manager(self, invalidate_cache=None, **config):
+    return TieredMemoryManager(
+        vector_store=self.store, embedding_model=_Embedder(), llm=self.llm,
+        config=TieredMemoryConfig(**config), db_path=self.db_path, invalidate_cache=invalidate_cache)
+
+  def test_single_query_reranks_by_tier_and_importance(self):
+    manager = self._manager()
+    low = manager.add_memory('old editor note', {}, importance_score=0.2)
+    high = manager.add_memory('fresh editor note', {}, importance_score=0.6)
+    manager.add_memory('unrelated', {}, importance_score=0.45)
+
+    calls = []
+    original = self.store.search_text
+    self.store.search_text = lambda **kwargs: (calls.append(kwargs), original(**kwargs))[1]
+    results = manager.retrieve('editor', limit=2)
+
+    self.assertEqual(len(calls), 1)
+    self.assertEqual(calls[0]['filters'], {'tier': {'$in': ['short_term', 'long_term']}})
+    self.assertEqual([r.id for r in results], [high, low])
+    self.assertGreater(results[0].score, results[1].score)
+
+  def test_tier_state_survives_restart(self):
+    manager = self._manager()
+    memory_id = manager.add_memory('editor', {}, importance_score=0.2)
+    self.assertEqual(manager.get_tier(memory_id), MemoryTier.LONG_TERM)
+    manager.retrieve('editor', limit=1)  # long-term hits are promoted on access
+
+    restarted = self._manager()
+    self.assertEqual(restarted.get_tier(memory_id), MemoryTier.SHORT_TERM)
+    self.assertEqual(restarted._tiers.get_state(memory_id)['access_count'], 1)
+    self.assertEqual(restarted.get_stats()['tier_counts'], {'working': 0, 'short_term': 1, 'long_term': 0})
+
+  def test_decay_sweeps_only_memories_past_their_boundary(self):
+    manager = self._manager(short_term_days=0, decay_batch_size=2)
+    stale = [manager.add_memory(f'editor {i}', {}, importance_score=0.5) for i in range(3)]
+    popular = manager.add_memory('editor popular', {}, importance_score=0.5)
+    manager._tiers.record_access([popular], 0)
+    manager._tiers.record_access([popular], 0)
+    archived = manager.add_memory('editor archived', {}, importance_score=0.1)
+
+    fetched = []
+    original = manager._get_payloads
+    manager._get_payloads = lambda ids: (fetched.append(list(ids)), original(ids))[1]
+    manager.decay_and_compress()
+
+    self.assertEqual(self.llm.calls, 3)
+    self.assertEqual(sorted(i for batch in fetched for i in batch), sorted(stale + [popular]))
+    self.assertEqual(len(fetched), 2)  # one bulk fetch per batch of two
+    for memory_id in stale:
+      self.assertEqual(manager.get_tier(memory_id), MemoryTier.LONG_TERM)
+      self.assertTrue(self.store.text_store.get(memory_id).payload['compressed'])
+    self.assertEqual(manager.get_tier(popular), MemoryTier.SHORT_TERM)
+    self.assertEqual(manager.get_tier(archived), MemoryTier.LONG_TERM)
+
+    fetched.clear()
+    manager.decay_and_compress()
+    self.assertEqual(fetched, [])
+    self.assertEqual(self.llm.calls, 3)
+
+  def test_tier_moves_and_compression_invalidate_cached_searches(self):
+    invalidated = []
+    manager = self._manager(invalidate_cache=invalidated.append, short_term_days=0)
+    memory_id = manager.add_memory('editor', {'user_id': 'u1'}, importance_score=0.2)
+    self.assertEqual(invalidated[-1]['user_id'], 'u1')
+
+    invalidated.clear()
+    manager.retrieve('editor', limit=1)  # promotes long-term -> short-term
+    self.assertEqual(invalidated, [None])
+
+    invalidated.clear()
+    manager.decay_and_compress()
+    self.assertEqual(manager.get_tier(memory_id), MemoryTier.LONG_TERM)
+    self.assertEqual(len(invalidated), 1)
+    self.assertEqual((invalidated[0]['user_id'], invalidated[0]['compressed']), ('u1', True))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,91 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from memscreen.embeddings.vision_cache import VisionEmbeddingCache
+from memscreen.embeddings.vision_encoder import VisionEncoder, VisionEncoderConfig
+
+_DIMS = 8
+
+
+class _FakeModel:
+  def __init__(self):
+    self.encoded = 0
+
+  def encode(self, images):
+    self.encoded += len(images)
+    # Deterministic embedding derived from the top-left pixel colour.
+    return np.array([[img.getpixel((0, 0))[0] / 255.0] * _DIMS for img in images], dtype=np.float32)
+
+
+def _encoder(cache_dir, model=None, cache_size=100):
+  encoder = VisionEncoder(VisionEncoderConfig(
+      model_type='clip', embedding_dims=_DIMS, cache_size=cache_size, cache_dir=cache_dir))
+  encoder.model = model
+  encoder._model_loaded = model is not None
+  return encoder
+
+
+class VisionEmbeddingCacheTest(unittest.TestCase):
+  def setUp(self):
+    self.tmp = tempfile.mkdtemp()
+    self.cache_dir = str(Path(self.tmp) / 'cache')
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp)
+
+  def _image(self, name, red):
+    path = Path(self.tmp) / name
+    Image.new('RGB', (8, 8), color=(red, 0, 0)).save(path)
+    return str(path)
+
+  def test_reprocessing_skips_frames_encoded_by_an_earlier_run(self):
+    frames = [self._image(f'f{i}.png', 10 * i) for i in range(4)]
+    model = _FakeModel()
+    first = _encoder(self.cache_dir, model).encode_image_batch(frames + frames[:1], return_tensor=True)
+    self.assertEqual(model.encoded, 4)  # duplicate frame encoded once
+    self.assertEqual(first.shape, (5, _DIMS))
+
+    restarted = _encoder(self.cache_dir)
+    restarted._load_model = lambda: self.fail('model loaded for cached frames')
+    again = restarted.encode_image_batch(frames, return_tensor=True)
+    np.testing.assert_allclose(again, first[:4], atol=1e-3)
+    self.assertEqual(again.dtype, np.float32)
+    self.assertEqual(restarted.get_cache_stats()['hits'], 4)
+
+  def test_changed_file_at_same_path_is_re_encoded(self):
+    path = self._image('frame.png', 0)
+    model = _FakeModel()
+    encoder = _encoder(self.cache_dir, model)
+    self.assertEqual(encoder.encode_image(path)[0], 0.0)
+
+    Image.new('RGB', (8, 8), color=(255, 0, 0)).save(path)
+    self.assertEqual(encoder.encode_image(path)[0], 1.0)
+    self.assertEqual(model.encoded, 2)
+    with self.assertRaises(FileNotFoundError):
+      encoder.encode_image(str(Path(self.tmp) / 'missing.png'))
+
+  def test_capacity_evicts_least_recently_used(self):
+    cache = VisionEmbeddingCache(dims=_DIMS, capacity=20, cache_dir=self.cache_dir)
+    cache.put_many([(f'k{i}', np.full(_DIMS, i, dtype=np.float32)) for i in range(20)])
+    cache.get_many(['k0'])  # keep k0 warm
+    cache.put_many([('new', np.ones(_DIMS))])
+
+    self.assertEqual(len(cache), 20)
+    self.assertIn('k0', cache)
+    self.assertNotIn('k1', cache)
+    self.assertEqual(cache.stats()['evictions'], 1)
+    self.assertEqual(cache.stats()['bytes'], 20 * _DIMS * 2)  # float16 storage
+
+  def test_layout_change_starts_a_fresh_cache(self):
+    VisionEmbeddingCache(dims=_DIMS, cache_dir=self.cache_dir).put_many([('a', np.ones(_DIMS))])
+    self.assertIn('a', VisionEmbeddingCache(dims=_DIMS, cache_dir=self.cache_dir))
+    self.assertNotIn('a', VisionEmbeddingCache(dims=_DIMS * 2, cache_dir=self.cache_dir))
+
+
+if __name__ == '__main__':
+  unittest.main()
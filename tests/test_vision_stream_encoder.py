@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from memscreen.embeddings.vision_encoder import VisionEncoder, VisionEncoderConfig
+
+
+def _frames(n, size=32):
+  rng = np.random.default_rng(5)
+  return [rng.integers(0, 255, size=(size, size, 3), dtype=np.uint8) for _ in range(n)]
+
+
+def _mock_encoder(**config):
+  encoder = VisionEncoder(VisionEncoderConfig(model_type='mock', **config))
+  encoder._load_model()
+  batches = []
+  encode = encoder.model.encode
+  encoder.model.encode = lambda images: (batches.append(len(images)), encode(images))[1]
+  return encoder, batches
+
+
+class StreamingVisionEncoderTest(unittest.TestCase):
+  def setUp(self):
+    self.tmp = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree(self.tmp)
+
+  def test_long_input_is_encoded_in_bounded_chunks(self):
+    encoder, batches = _mock_encoder(batch_size=32, prefetch_chunks=2)
+    frames = _frames(300)
+
+    seen = []
+    for indices, embeddings in encoder.iter_encode_images(frames):
+      self.assertEqual(embeddings.shape, (len(indices), 64))
+      seen.extend(indices)
+    self.assertEqual(seen, list(range(300)))
+    self.assertLessEqual(max(batches), 32)
+    self.assertEqual(encoder.last_encode_stats['chunks'], 10)
+    self.assertGreater(encoder.last_encode_stats['frames_per_sec'], 0)
+
+    batches.clear()
+    again = encoder.encode_image_batch(frames, return_tensor=True)
+    self.assertEqual(batches, [])  # every frame served from the cache
+    self.assertEqual(again.shape, (300, 64))
+
+  def test_paths_pil_images_and_arrays_are_interchangeable(self):
+    encoder, _ = _mock_encoder()
+    frame = _frames(1)[0]
+    path = str(Path(self.tmp) / 'frame.png')
+    Image.fromarray(frame).save(path)
+
+    embeddings = encoder.encode_image_batch(
+        [path, Image.fromarray(frame), frame, str(Path(self.tmp) / 'missing.png')],
+        return_tensor=True, use_cache=False)
+    self.assertEqual(embeddings.shape, (3, 64))
+    np.testing.assert_allclose(embeddings[0], embeddings[1], atol=1e-6)
+    np.testing.assert_allclose(embeddings[1], embeddings[2], atol=1e-6)
+
+  def test_worker_process_matches_in_process_model(self):
+    frames = _frames(12)
+    local, _ = _mock_encoder(batch_size=5)
+    remote = VisionEncoder(VisionEncoderConfig(model_type='mock', batch_size=5, use_worker_process=True))
+    try:
+      np.testing.assert_allclose(
+          remote.encode_image_batch(frames, return_tensor=True),
+          local.encode_image_batch(frames, return_tensor=True),
+          atol=1e-5)
+      self.assertFalse(remote._model_loaded)
+    finally:
+      remote.close()
+
+  @unittest.skipUnless(os.getenv('MEMSCREEN_RUN_BENCHMARKS'), 'set MEMSCREEN_RUN_BENCHMARKS=1 to run')
+  def test_chunked_encoding_throughput_and_peak_memory(self):
+    frames = _frames(2000, size=128)
+    for label, batch_size in (('one batch', len(frames)), ('chunked', 64)):
+      encoder, _ = _mock_encoder(batch_size=batch_size, cache_size=4000)
+      tracemalloc.start()
+      started = time.perf_counter()
+      count = sum(len(indices) for indices, _ in encoder.iter_encode_images(frames, use_cache=False))
+      elapsed = time.perf_counter() - started
+      _, peak = tracemalloc.get_traced_memory()
+      tracemalloc.stop()
+      self.assertEqual(count, len(frames))
+      print(f'\n{label:>9}: {count / elapsed:.0f} frames/sec, peak {peak / 2**20:.1f} MiB')
+
+
+if __name__ == '__main__':
+  unittest.main()